@@ -12,12 +12,15 @@ from kivy.metrics import dp, sp
 from kivy.uix.widget import Widget
 from kivy.uix.scrollview import ScrollView
 from kivy.utils import platform
-from threading import Thread
+from task_executor import executor, PRIORITY_NORMAL
 from api_client import api
 from session_manager import session
+import responsive
+from responsive import ResponsiveLayout
 
 
 # ------------------ UTILIDADES RESPONSIVE ------------------
+@responsive.tracked
 class ResponsiveHelper:
     @staticmethod
     def is_mobile():
@@ -115,17 +118,12 @@ class RoundedTextInput(TextInput):
             )
 
         self.bind(pos=self._update_rects, size=self._update_rects)
-        Window.bind(on_resize=self.on_window_resize)
 
     def _update_rects(self, *args):
         self.bg_rect.pos = self.pos
         self.bg_rect.size = self.size
         self.border_rect.pos = (self.pos[0]+dp(2), self.pos[1]+dp(2))
         self.border_rect.size = (self.size[0]-dp(4), self.size[1]-dp(4))
-    
-    def on_window_resize(self, instance, width, height):
-        self.font_size = ResponsiveHelper.get_font_size(18)
-        self.height = dp(55)
 
     def on_focus(self, instance, value):
         if value:
@@ -182,15 +180,10 @@ class HoverButton(Button):
             self.rect = RoundedRectangle(pos=self.pos, size=self.size, radius=[self.border_radius])
 
         self.bind(pos=self.update_rect, size=self.update_rect)
-        Window.bind(on_resize=self.on_window_resize)
 
     def update_rect(self, *args):
         self.rect.pos = self.pos
         self.rect.size = self.size
-    
-    def on_window_resize(self, instance, width, height):
-        self.font_size = ResponsiveHelper.get_font_size(18)
-        self.height = dp(50)
 
 
 # ------------------ PANTALLA ACTUALIZAR DATOS ------------------
@@ -198,8 +191,8 @@ class ActualizarDatosScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.admin_data = None
-        self.build_ui()
-        Window.bind(on_resize=self.on_window_resize)
+        self.responsive = ResponsiveLayout(self, build=self.build_ui, reflow=self.reflow_layout)
+        self.responsive.build()
 
     def on_pre_enter(self):
         """Se ejecuta antes de mostrar la pantalla"""
@@ -281,7 +274,7 @@ class ActualizarDatosScreen(Screen):
         # Logo responsive centrado
         logo_height = ResponsiveHelper.get_logo_height()
         logo_container = BoxLayout(size_hint=(1, None), height=logo_height)
-        logo = Image(
+        self.logo = logo = Image(
             source="Imagen5-Photoroom.png",
             size_hint=(None, None),
             width=logo_height * 1.2,
@@ -403,7 +396,7 @@ class ActualizarDatosScreen(Screen):
         form_container.add_widget(Widget(size_hint_y=None, height=dp(10)))
 
         # Contenedor de botones responsive
-        botones_layout = BoxLayout(
+        self.botones_layout = botones_layout = BoxLayout(
             orientation=ResponsiveHelper.get_button_layout_orientation(),
             spacing=dp(15),
             size_hint_y=None,
@@ -451,8 +444,10 @@ class ActualizarDatosScreen(Screen):
         self.background_rect.size = instance.size
         self.background_rect.pos = instance.pos
         
-    def on_window_resize(self, instance, width, height):
-        Clock.schedule_once(lambda dt: self.build_ui(), 0.1)
+    def reflow_layout(self):
+        """Lo que build_ui calcula a mano; el resto lo actualiza ResponsiveLayout"""
+        self.logo.width = self.logo.height * 1.2
+        self.botones_layout.orientation = ResponsiveHelper.get_button_layout_orientation()
 
     def on_enter(self, *args):
         Clock.schedule_once(self.establecer_foco, 0.1)
@@ -546,7 +541,7 @@ class ActualizarDatosScreen(Screen):
                 Clock.schedule_once(_error, 0)
         
         # Ejecutar en hilo separado
-        Thread(target=_save_task, daemon=True).start()
+        executor.submit(_save_task, priority=PRIORITY_NORMAL)
 
     def cancelar(self, instance):
         # Limpiar campo de contraseña al cancelar
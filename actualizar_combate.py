@@ -16,7 +16,7 @@ from kivy.uix.spinner import Spinner
 from kivy.properties import ObjectProperty
 from datetime import datetime, date
 import calendar
-from threading import Thread
+from task_executor import executor, PRIORITY_NORMAL
 
 # Importar el cliente API
 try:
@@ -1084,9 +1084,7 @@ class ActualizarCombateScreen(Screen):
                     lambda dt: self.mostrar_mensaje("Error", f"Error al crear: {str(e)}")
                 )
         
-        thread = Thread(target=_do_create)
-        thread.daemon = True
-        thread.start()
+        executor.submit(_do_create, priority=PRIORITY_NORMAL)
 
     def _on_create_success(self, result):
         """Callback cuando se crea exitosamente"""
@@ -1131,9 +1129,7 @@ class ActualizarCombateScreen(Screen):
                     lambda dt: self.mostrar_mensaje("Error", f"Error al actualizar: {str(e)}")
                 )
         
-        thread = Thread(target=_do_update)
-        thread.daemon = True
-        thread.start()
+        executor.submit(_do_update, priority=PRIORITY_NORMAL)
 
     def _on_update_success(self):
         """Callback cuando se actualiza exitosamente"""
@@ -19,9 +19,12 @@ from kivy.utils import platform
 from datetime import datetime, date
 import calendar
 from api_client import api
+import responsive
+from responsive import ResponsiveLayout
 
 
 # ------------------ UTILIDADES RESPONSIVE ------------------
+@responsive.tracked
 class ResponsiveHelper:
     @staticmethod
     def is_mobile():
@@ -132,13 +135,6 @@ class DateSelector(BoxLayout):
         # Bind para actualizar días cuando cambia mes o año
         self.month_spinner.bind(text=self.update_days_on_change)
         self.year_spinner.bind(text=self.update_days_on_change)
-        Window.bind(on_resize=self.on_window_resize)
-
-    def on_window_resize(self, instance, width, height):
-        self.year_spinner.font_size = ResponsiveHelper.get_font_size(18)
-        self.month_spinner.font_size = ResponsiveHelper.get_font_size(18)
-        self.day_spinner.font_size = ResponsiveHelper.get_font_size(18)
-        self.height = dp(55)
         
     def update_days_on_change(self, *args):
         self.update_days()
@@ -236,12 +232,6 @@ class TimeSelector(BoxLayout):
        
         self.hour_spinner.bind(text=self.update_time)
         self.minute_spinner.bind(text=self.update_time)
-        Window.bind(on_resize=self.on_window_resize)
-
-    def on_window_resize(self, instance, width, height):
-        self.hour_spinner.font_size = ResponsiveHelper.get_font_size(18)
-        self.minute_spinner.font_size = ResponsiveHelper.get_font_size(18)
-        self.height = dp(55)
         
     def update_time(self, *args):
         self.get_selected_time()
@@ -293,17 +283,12 @@ class RoundedTextInput(TextInput):
             )
 
         self.bind(pos=self._update_rects, size=self._update_rects)
-        Window.bind(on_resize=self.on_window_resize)
 
     def _update_rects(self, *args):
         self.bg_rect.pos = self.pos
         self.bg_rect.size = self.size
         self.border_rect.pos = (self.pos[0]+dp(2), self.pos[1]+dp(2))
         self.border_rect.size = (self.size[0]-dp(4), self.size[1]-dp(4))
-    
-    def on_window_resize(self, instance, width, height):
-        self.font_size = ResponsiveHelper.get_font_size(18)
-        self.height = dp(55)
 
     def on_focus(self, instance, value):
         if value:
@@ -361,15 +346,10 @@ class HoverButton(Button):
             )
 
         self.bind(pos=self.update_rect, size=self.update_rect)
-        Window.bind(on_resize=self.on_window_resize)
 
     def update_rect(self, *args):
         self.rect.pos = self.pos
         self.rect.size = self.size
-    
-    def on_window_resize(self, instance, width, height):
-        self.font_size = ResponsiveHelper.get_font_size(18)
-        self.height = dp(50)
 
 
 # ------------------ PANTALLA ACTUALIZAR TORNEO RESPONSIVE ------------------
@@ -380,8 +360,8 @@ class ActualizarTorneoScreen(Screen):
         self.on_save = on_save
         self.torneo_completo = None  # Almacenará los datos completos del backend
         self.cargar_datos_torneo()
-        self.build_ui()
-        Window.bind(on_resize=self.on_window_resize)
+        self.responsive = ResponsiveLayout(self, build=self.build_ui, reflow=self.reflow_layout)
+        self.responsive.build()
     
     def cargar_datos_torneo(self):
         """Carga los datos completos del torneo desde el backend"""
@@ -447,7 +427,8 @@ class ActualizarTorneoScreen(Screen):
         
         # Espaciador superior
         top_spacer_height = max(dp(20), Window.height * 0.03)
-        main_layout.add_widget(Widget(size_hint_y=None, height=top_spacer_height))
+        self.top_spacer = Widget(size_hint_y=None, height=top_spacer_height)
+        main_layout.add_widget(self.top_spacer)
 
         # Contenedor del formulario centrado
         form_container = BoxLayout(
@@ -460,14 +441,14 @@ class ActualizarTorneoScreen(Screen):
 
         # Logo responsive
         logo_height = min(dp(120), Window.height * 0.15)
-        logo = Image(
+        self.logo = Image(
             source="Imagen5-Photoroom.png",
             size_hint=(1, None),
             height=logo_height,
             allow_stretch=True,
             keep_ratio=True
         )
-        form_container.add_widget(logo)
+        form_container.add_widget(self.logo)
 
         # Título
         titulo = Label(
@@ -545,7 +526,7 @@ class ActualizarTorneoScreen(Screen):
         form_container.add_widget(Widget(size_hint_y=None, height=dp(15)))
 
         # Botones responsive
-        botones_layout = BoxLayout(
+        self.botones_layout = botones_layout = BoxLayout(
             orientation='horizontal' if Window.width > 600 else 'vertical',
             spacing=dp(15),
             size_hint_y=None,
@@ -571,10 +552,13 @@ class ActualizarTorneoScreen(Screen):
         scroll_view.add_widget(main_layout)
         self.add_widget(scroll_view)
 
-    def on_window_resize(self, instance, width, height):
-        # Reconstruir la UI en resize para aplicar los ajustes de ResponsiveHelper
-        # usando Clock.schedule_once para evitar problemas de re-entrada/layout
-        Clock.schedule_once(self.build_ui, 0.1)
+    def reflow_layout(self):
+        """Lo que build_ui calcula a mano; el resto lo actualiza ResponsiveLayout"""
+        self.top_spacer.height = max(dp(20), Window.height * 0.03)
+        self.logo.height = min(dp(120), Window.height * 0.15)
+        horizontal = Window.width > 600
+        self.botones_layout.orientation = 'horizontal' if horizontal else 'vertical'
+        self.botones_layout.height = dp(50) if horizontal else dp(110)
 
     def update_background(self, instance, value):
         self.background_rect.size = instance.size
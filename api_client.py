@@ -1,21 +1,217 @@
-import json
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from dataclasses import dataclass
+from urllib.parse import urlsplit
 import requests
-from config import API_BASE_URL, DEFAULT_TIMEOUT
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from config import (
+    API_BASE_URL, DEFAULT_TIMEOUT, SHORT_TIMEOUT,
+    HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE,
+    HTTP_CACHE_TTLS, HTTP_CACHE_MAX_ENTRIES,
+    HTTP_RETRY_ATTEMPTS, HTTP_RETRY_BASE_DELAY, HTTP_RETRY_MAX_DELAY,
+    CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT,
+    LIST_PAGE_SIZE, STREAM_CHUNK_SIZE, METRICS_EXPORTER_PORT,
+    SCOREBOARD_AGGREGATE_MAX_TIMEOUTS,
+)
+from cancel_scope import current_scope, activate_scope
+from http_cache import ResponseCache
+from single_flight import SingleFlight
+from json_stream import iter_json_array
+import json_codec
+from transfer_stats import TransferStats
+from metrics import ApiMetrics, MetricsExporter
+from app_log import get_logger
+from resilience import RetryPolicy, BreakerRegistry, CircuitOpenError
 from typing import Optional
 
 
+log = get_logger("ApiClient")
+
+
+class PooledAdapter(HTTPAdapter):
+    """
+    HTTPAdapter con pool keep-alive que lleva la cuenta de cuántas
+    peticiones reutilizaron un socket ya abierto y cuántas abrieron uno nuevo.
+    Si tiene un BreakerRegistry, rechaza de inmediato las peticiones a un
+    host marcado como caído. También mide por endpoint la latencia, los
+    errores y los bytes recibidos en la red frente a los ya descomprimidos.
+    """
+
+    def __init__(self, *args, breakers=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.breakers = breakers
+        self.transfer = TransferStats()
+        self.metrics = ApiMetrics(self.transfer)
+        self._stats_lock = threading.Lock()
+        self.requests_sent = 0
+        self.connections_opened = 0
+        self.connections_reused = 0
+        self.recorder = None  # TrafficRecorder mientras se graba el tráfico
+
+    def send(self, request, **kwargs):
+        # Si la pantalla que pidió esto ya se cerró, no ocupar un socket
+        scope = current_scope()
+        if scope is not None:
+            scope.raise_if_closed()
+
+        breaker = None
+        if self.breakers is not None:
+            parts = urlsplit(request.url)
+            breaker = self.breakers.get(f"{parts.scheme}://{parts.netloc}")
+            try:
+                breaker.before_request()
+            except CircuitOpenError:
+                self.metrics.record_rejected(request.method, request.url)
+                raise
+
+        started = time.monotonic()
+        try:
+            response = self._transport_send(request, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            self.metrics.observe(
+                request.method, request.url, time.monotonic() - started,
+                timeout=isinstance(e, requests.exceptions.Timeout), error=True
+            )
+            if breaker is not None:
+                breaker.record_failure()
+            raise
+        reused = response.connection_reused
+
+        if breaker is not None:
+            if response.status_code in (502, 503, 504):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
+        with self._stats_lock:
+            self.requests_sent += 1
+            if reused:
+                self.connections_reused += 1
+            else:
+                self.connections_opened += 1
+
+        if not kwargs.get("stream"):
+            # Session leería el cuerpo justo después; leerlo aquí permite medirlo
+            self.record_transfer(response, len(response.content))
+        # Con stream=True la latencia medida es hasta recibir las cabeceras
+        elapsed = time.monotonic() - started
+        self.metrics.observe(request.method, request.url, elapsed, status=response.status_code)
+
+        recorder = self.recorder
+        if recorder is not None:
+            # Al grabar también se leen completas las respuestas en streaming
+            recorder.record_http(request, response, elapsed)
+
+        if scope is not None and scope.closed:
+            # Resultado obsoleto: devolver la conexión al pool y descartarlo
+            response.close()
+            scope.raise_if_closed()
+        return response
+
+    def _transport_send(self, request, **kwargs):
+        """
+        Envío real por la red. Marca en response.connection_reused si usó un
+        socket ya abierto. ReplayAdapter lo reemplaza para servir grabaciones.
+        """
+        pool = self._pool_for(request, kwargs)
+        opened_before = pool.num_connections
+        response = super().send(request, **kwargs)
+        response.connection_reused = pool.num_connections == opened_before
+        return response
+
+    def record_transfer(self, response, decoded_bytes):
+        """Registra una respuesta ya leída (raw.tell() = bytes tal como llegaron)."""
+        self.transfer.record(
+            response.url,
+            response.raw.tell() if response.raw is not None else decoded_bytes,
+            decoded_bytes,
+            response.headers.get("Content-Encoding"),
+        )
+
+    def _pool_for(self, request, kwargs):
+        """Devuelve el mismo pool de urllib3 que usará super().send()."""
+        get_pool = getattr(self, "get_connection_with_tls_context", None)
+        if get_pool is not None:
+            return get_pool(
+                request, kwargs.get("verify", True),
+                proxies=kwargs.get("proxies"), cert=kwargs.get("cert")
+            )
+        return self.get_connection(request.url, kwargs.get("proxies"))
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "requests": self.requests_sent,
+                "opened": self.connections_opened,
+                "reused": self.connections_reused,
+            }
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self.requests_sent = 0
+            self.connections_opened = 0
+            self.connections_reused = 0
+
+
+@dataclass
+class ScoreboardSnapshot:
+    """
+    Estado del marcador de un combate obtenido en una sola ronda.
+    Un campo en None indica que esa consulta falló y no debe pisar el valor actual.
+    """
+    combate_id: int
+    puntaje_rojo: Optional[int] = None
+    puntaje_azul: Optional[int] = None
+    gamjeom_rojo: Optional[int] = None
+    gamjeom_azul: Optional[int] = None
+    source: str = "parallel"
+    elapsed_ms: float = 0.0
+
+
 class ApiClient:
-    def __init__(self, base_url=API_BASE_URL):
+    # Endpoint agregado opcional; si el servidor no lo tiene se consultan los 4 contadores en paralelo
+    SCOREBOARD_PATH = "/apiCombates/combate/{combate_id}/marcador"
+
+    def __init__(self, base_url=API_BASE_URL, pool_size=HTTP_POOL_MAXSIZE):
         self.base_url = base_url.rstrip("/")
         self.session = requests.Session()
+        # gzip/deflate siempre; br y zstd si está instalado brotli / zstandard
+        self.session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        self.breakers = BreakerRegistry(
+            failure_threshold=CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=CIRCUIT_RESET_TIMEOUT,
+            probe=self._probe_host,
+        )
+        self.retry_policy = RetryPolicy(
+            max_attempts=HTTP_RETRY_ATTEMPTS,
+            base_delay=HTTP_RETRY_BASE_DELAY,
+            max_delay=HTTP_RETRY_MAX_DELAY,
+        )
+        self.retries = 0
+        self.adapter = PooledAdapter(
+            pool_connections=HTTP_POOL_CONNECTIONS,
+            pool_maxsize=pool_size,
+            breakers=self.breakers,
+        )
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
         self._access_token = None
         self.timeout = DEFAULT_TIMEOUT
+        self.cache = ResponseCache(HTTP_CACHE_TTLS, max_entries=HTTP_CACHE_MAX_ENTRIES)
+        self.inflight = SingleFlight()
+        self._scoreboard_aggregate = None  # None = aún no se sabe si el servidor lo ofrece
+        self._aggregate_timeouts = 0
+        self._snapshot_pool = None
+        self._exporter = None
 
     def _url(self, path: str) -> str:
         return f"{self.base_url}/{path.lstrip('/')}"
 
     def set_access_token(self, token: Optional[str]):
         self._access_token = token
+        self.cache.clear()
 
     def headers(self):
         h = {"Accept": "application/json"}
@@ -27,12 +223,31 @@ class ApiClient:
         h = {"Accept": "application/json"}
         if headers:
             h.update(headers)
-        return requests.get(
-            self._url(path),
-            params=params,
-            headers=h,
-            timeout=timeout or self.timeout,
+        url = self._url(path)
+
+        def _send():
+            return self._with_retry(lambda: self.session.get(
+                url,
+                params=params,
+                headers=h,
+                timeout=timeout or self.timeout,
+            ))
+
+        # GETs idénticos en curso se resuelven con una sola petición
+        key = (
+            url,
+            tuple(sorted(params.items())) if isinstance(params, dict) else params,
+            tuple(sorted(h.items())),
         )
+        try:
+            return self.inflight.do(key, _send)
+        except CancelledError:
+            # La petición compartida era de una pantalla ya cerrada; si la nuestra
+            # sigue abierta, la repetimos por nuestra cuenta
+            scope = current_scope()
+            if scope is not None and scope.closed:
+                raise
+            return _send()
 
     def put_json(self, path, payload: dict, headers=None, timeout=None):
         h = {
@@ -41,36 +256,284 @@ class ApiClient:
         }
         if headers:
             h.update(headers)
-        return requests.put(
+        return self._write(path, lambda: self._with_retry(lambda: self.session.put(
             self._url(path),
-            data=json.dumps(payload),
+            data=json_codec.dumps(payload),
             headers=h,
             timeout=timeout or self.timeout,
-        )
+        )))
 
-    def post_json(self, path, payload, timeout=None):
+    def post_json(self, path, payload, timeout=None, headers=None):
         url = f"{self.base_url}{path}"
         h = self.headers().copy()
         h["Content-Type"] = "application/json"
-        return self.session.post(
+        if headers:
+            h.update(headers)
+        return self._write(path, lambda: self.session.post(
             url, 
-            json=payload, 
+            data=json_codec.dumps(payload), 
             headers=h, 
             timeout=timeout or self.timeout
-        )
+        ))
+
+    def post(self, path, params=None, headers=None, timeout=None):
+        """POST sin cuerpo JSON (endpoints que reciben todo por query string)."""
+        h = self.headers().copy()
+        if headers:
+            h.update(headers)
+        return self._write(path, lambda: self.session.post(
+            self._url(path),
+            params=params,
+            headers=h,
+            timeout=timeout or self.timeout
+        ))
 
     def delete(self, path, headers=None, timeout=None):
         h = {"Accept": "application/json"}
         if headers:
             h.update(headers)
-        return requests.delete(
+        return self._write(path, lambda: self.session.delete(
             self._url(path),
             headers=h,
             timeout=timeout or self.timeout
+        ))
+
+    def _write(self, path, send):
+        """
+        Envía una escritura invalidando la caché del recurso antes y después.
+        Un GET que empiece mientras la escritura está en vuelo puede leer el
+        estado anterior; la segunda invalidación sube la generación y su
+        respuesta se descarta en vez de quedar en caché todo el TTL.
+        """
+        self.cache.invalidate_path(path)
+        try:
+            return send()
+        finally:
+            self.cache.invalidate_path(path)
+
+    def _with_retry(self, send):
+        """
+        Ejecuta una petición idempotente con reintentos y backoff exponencial
+        con jitter. Solo se usa para GET/HEAD/PUT: los POST y los DELETE de
+        ".../last" no se repiten porque duplicarían puntos o borrarían de más.
+        """
+        policy = self.retry_policy
+        for attempt in range(1, policy.max_attempts + 1):
+            try:
+                response = send()
+            except CircuitOpenError:
+                raise
+            except requests.exceptions.ConnectionError as e:
+                # Incluye ConnectTimeout; un ReadTimeout no se reintenta para no multiplicar la espera
+                if attempt == policy.max_attempts:
+                    raise
+                failed = e.request
+            else:
+                if response.status_code not in policy.retry_statuses or attempt == policy.max_attempts:
+                    return response
+                failed = response.request
+
+            self.retries += 1
+            if failed is not None:
+                self.adapter.metrics.record_retry(failed.method, failed.url)
+            time.sleep(policy.delay(attempt))
+            scope = current_scope()
+            if scope is not None:
+                scope.raise_if_closed()
+
+    def _probe_host(self, host):
+        """Sonda del circuit breaker: cualquier respuesta HTTP cierra el circuito."""
+        self.session.head(f"{host}/", timeout=SHORT_TIMEOUT)
+
+    def is_degraded(self) -> bool:
+        """True si algún backend está marcado como caído (circuito abierto)."""
+        return self.breakers.any_open()
+
+    def add_health_listener(self, callback):
+        """callback(host, state) se llama, desde un hilo de fondo, al abrir/cerrar un circuito."""
+        self.breakers.add_listener(callback)
+
+    def remove_health_listener(self, callback):
+        self.breakers.remove_listener(callback)
+
+    def _get_json_cached(self, path, default, not_found=None, timeout=None):
+        """
+        GET con caché: sirve la copia local mientras esté vigente y,
+        al vencer, revalida con If-None-Match / If-Modified-Since.
+        Si not_found se indica, un 404 lanza RuntimeError con ese mensaje.
+        """
+        data = self.cache.get_fresh(path)
+        if data is not None:
+            return data
+
+        generation = self.cache.generation(path)
+        entry = self.cache.lookup(path)
+        r = self.get_json(path, headers=entry.validators() if entry else None, timeout=timeout)
+
+        if r.status_code == 304:
+            data = self.cache.renew(path)
+            if data is not None:
+                return data
+            # La entrada fue invalidada mientras tanto: pedir el cuerpo completo
+            r = self.get_json(path, timeout=timeout)
+
+        if r.status_code == 404 and not_found:
+            raise RuntimeError(not_found)
+        r.raise_for_status()
+
+        data = json_codec.loads(r.content) if r.content else default
+        self.cache.store(
+            path, data,
+            etag=r.headers.get("ETag"),
+            last_modified=r.headers.get("Last-Modified"),
+            generation=generation,
         )
+        return data
+
+    def iter_pages(self, path, page_size=LIST_PAGE_SIZE, timeout=None):
+        """
+        Recorre un listado por páginas y va devolviendo (yield) listas de filas.
+        Pide ?page=N&size=M; si el servidor responde una página
+        ({"content": [...], "last": bool}) sigue con la siguiente. Si ignora la
+        paginación y manda el arreglo completo, lo lee en streaming y entrega
+        lotes de page_size conforme llegan.
+        """
+        cached = self.cache.get_fresh(path)
+        if cached is not None:
+            for i in range(0, len(cached), page_size):
+                yield cached[i:i + page_size]
+            return
+
+        # Solo se guarda el listado completo si el endpoint tiene caché
+        rows = [] if self.cache.ttl_for(path) > 0 else None
+        generation = self.cache.generation(path)
+        page = 0
+        while True:
+            params = {"page": page, "size": page_size}
+            r = self._with_retry(lambda: self.session.get(
+                self._url(path),
+                params=params,
+                headers={"Accept": "application/json"},
+                timeout=timeout or self.timeout,
+                stream=True,
+            ))
+            received = [0]
+            try:
+                r.raise_for_status()
+                chunks = self._counted(r.iter_content(chunk_size=STREAM_CHUNK_SIZE), received)
+                first = b""
+                for chunk in chunks:
+                    first += chunk
+                    if first.strip():
+                        break
+                body = first.lstrip()
+
+                if not body:
+                    return
+                if body[:1] == b"[":
+                    # Arreglo completo: leerlo en streaming
+                    batch = []
+                    for item in iter_json_array(self._prepend(first, chunks)):
+                        batch.append(item)
+                        if len(batch) >= page_size:
+                            self._raise_if_cancelled()
+                            yield from self._keep(rows, batch)
+                            batch = []
+                    if batch:
+                        yield from self._keep(rows, batch)
+                    break
+
+                data = json_codec.loads(b"".join(self._prepend(first, chunks)))
+            finally:
+                self.adapter.record_transfer(r, received[0])
+                r.close()
+
+            content = data.get("content", []) if isinstance(data, dict) else []
+            if content:
+                yield from self._keep(rows, content)
+            if not content or data.get("last", True):
+                break
+            page += 1
+            self._raise_if_cancelled()
+
+        if rows is not None:
+            self.cache.store(path, rows, generation=generation)
+
+    @staticmethod
+    def _raise_if_cancelled():
+        scope = current_scope()
+        if scope is not None:
+            scope.raise_if_closed()
+
+    @staticmethod
+    def _counted(chunks, received):
+        """Deja pasar los trozos ya descomprimidos sumando su tamaño en received[0]."""
+        for chunk in chunks:
+            received[0] += len(chunk)
+            yield chunk
+
+    @staticmethod
+    def _prepend(first, chunks):
+        yield first
+        yield from chunks
+
+    @staticmethod
+    def _keep(rows, batch):
+        if rows is not None:
+            rows.extend(batch)
+        yield batch
+
+    def warm_up(self, timeout=SHORT_TIMEOUT) -> bool:
+        """
+        Abre por adelantado una conexión keep-alive con el backend para que
+        la primera acción del usuario no pague el handshake TCP.
+        Devuelve True si el servidor respondió (con cualquier status).
+        """
+        try:
+            self.session.head(self._url("/"), timeout=timeout)
+            return True
+        except requests.exceptions.RequestException as e:
+            log.warning("Warm-up sin respuesta del servidor: %s", e)
+            return False
+
+    def coalescing_stats(self) -> dict:
+        """
+        GETs realmente enviados y GETs ahorrados por compartir
+        una petición idéntica que ya estaba en curso.
+        """
+        return self.inflight.stats()
+
+    def connection_stats(self) -> dict:
+        """
+        Contadores del pool: peticiones enviadas, sockets abiertos
+        y peticiones que reutilizaron un socket existente.
+        """
+        return self.adapter.stats()
+
+    def metrics_snapshot(self) -> dict:
+        """
+        Por "MÉTODO endpoint": peticiones, tasa de error, timeouts, reintentos,
+        latencias p50/p95/p99 (ms) y bytes recibidos.
+        """
+        return self.adapter.metrics.snapshot()
+
+    def start_metrics_exporter(self, port=METRICS_EXPORTER_PORT) -> MetricsExporter:
+        """Expone las métricas en http://127.0.0.1:{port}/metrics (formato Prometheus)."""
+        if self._exporter is None:
+            self._exporter = MetricsExporter(self.adapter.metrics, port)
+            self._exporter.start()
+        return self._exporter
+
+    def transfer_stats(self) -> dict:
+        """
+        Por endpoint: respuestas, cuántas llegaron comprimidas, bytes en la red,
+        bytes decodificados y la relación entre ambos.
+        """
+        return self.adapter.transfer.stats()
 
     def clear_token(self):
         self._access_token = None
+        self.cache.clear()
 
     def post_logout(self, path="/api/auth/admin/logout", timeout=6):
         url = f"{self.base_url}{path}"
@@ -85,7 +548,7 @@ class ApiClient:
         """
         r = self.post_json("/apiCombates/combate", payload, timeout=timeout)
         r.raise_for_status()
-        return r.json() if r.content else {}
+        return json_codec.loads(r.content) if r.content else {}
 
     def prepare_combate(self, combate_id: int, timeout=None) -> str:
         """
@@ -104,20 +567,21 @@ class ApiClient:
         GET /apiCombates/combates
         Devuelve la lista de todos los combates.
         """
-        r = self.get_json("/apiCombates/combates", timeout=timeout)
-        r.raise_for_status()
-        return r.json() if r.content else []
+        return self._get_json_cached("/apiCombates/combates", [], timeout=timeout)
 
     def get_combate_by_id(self, combate_id: int, timeout=None) -> dict:
         """
         GET /apiCombates/combate/{id}
-        Devuelve un combate específico por su ID.
+        Devuelve los datos completos de un combate por su ID.
         """
-        r = self.get_json(f"/apiCombates/combate/{combate_id}", timeout=timeout)
-        if r.status_code == 404:
-            raise RuntimeError(f"Combate {combate_id} no encontrado.")
-        r.raise_for_status()
-        return r.json() if r.content else {}
+        try:
+            r = self.get_json(f"/apiCombates/combate/{combate_id}", timeout=timeout or 10)
+            if r.status_code == 404:
+                raise RuntimeError(f"Combate {combate_id} no encontrado.")
+            r.raise_for_status()
+            return json_codec.loads(r.content) if r.content else {}
+        except requests.exceptions.RequestException as e:
+            raise RuntimeError(f"Error al obtener combate: {str(e)}")
 
     def get_combates_by_area(self, nombre_area: str, timeout=None) -> list:
         """
@@ -126,7 +590,7 @@ class ApiClient:
         """
         r = self.get_json(f"/apiCombates/combates/area/{nombre_area}", timeout=timeout)
         r.raise_for_status()
-        return r.json() if r.content else []
+        return json_codec.loads(r.content) if r.content else []
 
     def get_combates_by_estado(self, estado: str, timeout=None) -> list:
         """
@@ -136,7 +600,7 @@ class ApiClient:
         """
         r = self.get_json(f"/apiCombates/combates/estado/{estado}", timeout=timeout)
         r.raise_for_status()
-        return r.json() if r.content else []
+        return json_codec.loads(r.content) if r.content else []
 
     def update_combate(self, combate_id: int, payload: dict, timeout=None) -> dict:
         """
@@ -147,7 +611,7 @@ class ApiClient:
         if r.status_code == 404:
             raise RuntimeError(f"Combate {combate_id} no encontrado.")
         r.raise_for_status()
-        return r.json() if r.content else {}
+        return json_codec.loads(r.content) if r.content else {}
 
     def delete_combate(self, combate_id: int, timeout=None) -> bool:
         """
@@ -166,9 +630,15 @@ class ApiClient:
         GET /apiCombates/combates/torneo/{idTorneo}
         Devuelve combates de un torneo específico.
         """
-        r = self.get_json(f"/apiCombates/combates/torneo/{torneo_id}", timeout=timeout)
-        r.raise_for_status()
-        return r.json() if r.content else []
+        return self._get_json_cached(f"/apiCombates/combates/torneo/{torneo_id}", [], timeout=timeout)
+    
+    def iter_combates(self, torneo_id: int = None, page_size=LIST_PAGE_SIZE, timeout=None):
+        """
+        Versión paginada de get_all_combates / get_combates_by_torneo:
+        devuelve (yield) lotes de combates conforme llegan.
+        """
+        path = f"/apiCombates/combates/torneo/{torneo_id}" if torneo_id else "/apiCombates/combates"
+        return self.iter_pages(path, page_size, timeout=timeout)
     
     # ============ ENDPOINTS DE TORNEOS ============
     
@@ -177,29 +647,23 @@ class ApiClient:
         GET /apiTorneos/torneo
         Devuelve la lista de todos los torneos.
         """
-        r = self.get_json("/apiTorneos/torneo", timeout=timeout)
-        r.raise_for_status()
-        return r.json() if r.content else []
+        return self._get_json_cached("/apiTorneos/torneo", [], timeout=timeout)
+
+    def iter_torneos(self, page_size=LIST_PAGE_SIZE, timeout=None):
+        """Versión paginada de get_all_torneos: lotes de torneos conforme llegan."""
+        return self.iter_pages("/apiTorneos/torneo", page_size, timeout=timeout)
 
     def get_torneo_by_id(self, torneo_id: int, timeout=None) -> dict:
         """
         GET /apiTorneos/torneo/{id}
         Devuelve un torneo específico por su ID.
         """
-        print(f"[DEBUG API] Obteniendo torneo {torneo_id}")
-        
-        r = self.get_json(f"/apiTorneos/torneo/{torneo_id}", timeout=timeout)
-        
-        print(f"[DEBUG API] Status code: {r.status_code}")
-        
-        if r.status_code == 404:
-            raise RuntimeError(f"Torneo {torneo_id} no encontrado.")
-        
-        r.raise_for_status()
-        
-        result = r.json() if r.content else {}
-        print(f"[DEBUG API] Torneo obtenido: {result}")
-        
+        result = self._get_json_cached(
+            f"/apiTorneos/torneo/{torneo_id}", {},
+            not_found=f"Torneo {torneo_id} no encontrado.",
+            timeout=timeout
+        )
+        log.debug("Torneo %s obtenido: %s", torneo_id, result)
         return result
 
     def create_torneo(self, payload: dict, timeout=None) -> dict:
@@ -210,28 +674,24 @@ class ApiClient:
         """
         r = self.post_json("/apiTorneos/torneo", payload, timeout=timeout)
         r.raise_for_status()
-        return r.json() if r.content else {}
+        return json_codec.loads(r.content) if r.content else {}
 
     def update_torneo(self, torneo_id: int, payload: dict, timeout=None) -> dict:
         """
         PUT /apiTorneos/torneo/{id}
         Actualiza un torneo existente.
         """
-        print(f"[DEBUG API] Actualizando torneo {torneo_id} con payload: {payload}")
-        
+        log.debug("Actualizando torneo %s con payload: %s", torneo_id, payload)
         r = self.put_json(f"/apiTorneos/torneo/{torneo_id}", payload, timeout=timeout)
-        
-        print(f"[DEBUG API] Status code: {r.status_code}")
-        print(f"[DEBUG API] Response text: {r.text}")
-        
+        log.debug("PUT torneo %s -> %s", torneo_id, r.status_code)
+
         if r.status_code == 404:
             raise RuntimeError(f"Torneo {torneo_id} no encontrado.")
         
         r.raise_for_status()
         
-        result = r.json() if r.content else {}
-        print(f"[DEBUG API] Response JSON: {result}")
-        
+        result = json_codec.loads(r.content) if r.content else {}
+        log.debug("Torneo %s actualizado: %s", torneo_id, result)
         return result
 
     def delete_torneo(self, torneo_id: int, timeout=None) -> bool:
@@ -255,7 +715,7 @@ class ApiClient:
         if r.status_code == 404:
             return None
         r.raise_for_status()
-        return r.json() if r.content else None
+        return json_codec.loads(r.content) if r.content else None
 
     # ============ ENDPOINTS DE PUNTAJES ============
     
@@ -266,7 +726,15 @@ class ApiClient:
         """
         r = self.get_json("/apiPuntajes/puntaje", timeout=timeout)
         r.raise_for_status()
-        return r.json() if r.content else []
+        return json_codec.loads(r.content) if r.content else []
+
+    def iter_puntajes(self, page_size=LIST_PAGE_SIZE, timeout=None):
+        """
+        Versión paginada de get_all_puntajes (pueden ser decenas de miles):
+        devuelve (yield) los puntajes uno por uno sin cargar el listado completo.
+        """
+        for batch in self.iter_pages("/apiPuntajes/puntaje", page_size, timeout=timeout):
+            yield from batch
 
     def get_puntaje_by_id(self, puntaje_id: int, timeout=None) -> dict:
         """
@@ -277,7 +745,7 @@ class ApiClient:
         if r.status_code == 404:
             raise RuntimeError(f"Puntaje {puntaje_id} no encontrado.")
         r.raise_for_status()
-        return r.json() if r.content else {}
+        return json_codec.loads(r.content) if r.content else {}
 
     def create_puntaje(self, payload: dict, timeout=None) -> dict:
         """
@@ -286,7 +754,7 @@ class ApiClient:
         """
         r = self.post_json("/apiPuntajes/puntaje", payload, timeout=timeout)
         r.raise_for_status()
-        return r.json() if r.content else {}
+        return json_codec.loads(r.content) if r.content else {}
 
     def update_puntaje(self, puntaje_id: int, payload: dict, timeout=None) -> dict:
         """
@@ -297,7 +765,7 @@ class ApiClient:
         if r.status_code == 404:
             raise RuntimeError(f"Puntaje {puntaje_id} no encontrado.")
         r.raise_for_status()
-        return r.json() if r.content else {}
+        return json_codec.loads(r.content) if r.content else {}
 
     def delete_puntaje(self, puntaje_id: int, timeout=None) -> bool:
         """
@@ -322,13 +790,217 @@ class ApiClient:
             if r.status_code == 404:
                 return 0
             r.raise_for_status()
-            data = r.json() if r.content else {}
-            return int(data.get('count', 0))
+            return json_codec.read_int(r.content, 'count')
         except Exception as e:
-            print(f"[ApiClient] Error al obtener puntaje para alumno {alumno_id}: {e}")
+            log.warning("Error al obtener puntaje para alumno %s: %s", alumno_id, e)
             return 0
     
-    # Agregar estos métodos a la clase ApiClient en api_client.py
+    def _get_count(self, path, timeout=None) -> int:
+        """GET de un endpoint .../count. Un 404 cuenta como 0; otros errores se lanzan."""
+        r = self.get_json(path, timeout=timeout)
+        if r.status_code == 404:
+            return 0
+        r.raise_for_status()
+        return json_codec.read_int(r.content, 'count')
+
+    def count_puntajes(self, alumno_id: int, timeout=SHORT_TIMEOUT) -> int:
+        """
+        Como get_puntaje_count, pero un error se lanza en vez de contar 0:
+        la cola de mutaciones necesita distinguir "0 puntos" de "sin respuesta".
+        """
+        return self._get_count(f"/apiPuntajes/puntaje/alumno/{alumno_id}/count", timeout=timeout)
+
+    def get_gamjeom_count(self, alumno_id: int, combate_id: int, timeout=None) -> int:
+        """
+        GET /apiGamJeom/falta/alumno/{alumnoId}/combate/{combateId}/count
+        Devuelve el número de faltas GAM-JEOM del alumno en el combate.
+        """
+        return self._get_count(
+            f"/apiGamJeom/falta/alumno/{alumno_id}/combate/{combate_id}/count",
+            timeout=timeout
+        )
+
+    # ============ MUTACIONES DEL MARCADOR ============
+    # Las usa la cola de mutaciones: el Idempotency-Key se repite en cada
+    # reintento para que el servidor pueda descartar envíos duplicados.
+
+    @staticmethod
+    def _idempotency(key):
+        return {"Idempotency-Key": key} if key else None
+
+    def add_puntaje_simple(self, combate_id: int, alumno_id: int, valor: int = 1,
+                           idempotency_key=None, timeout=SHORT_TIMEOUT) -> dict:
+        """
+        POST /apiPuntajes/puntaje/simple
+        Registra un punto. Retorna: {"newCount": N, ...}
+        """
+        r = self.post(
+            "/apiPuntajes/puntaje/simple",
+            params={"combateId": combate_id, "alumnoId": alumno_id, "valorPuntaje": valor},
+            headers=self._idempotency(idempotency_key),
+            timeout=timeout
+        )
+        r.raise_for_status()
+        return json_codec.loads(r.content) if r.content else {}
+
+    def delete_last_puntaje(self, alumno_id: int, idempotency_key=None, timeout=SHORT_TIMEOUT) -> dict:
+        """
+        DELETE /apiPuntajes/puntaje/alumno/{alumnoId}/last
+        Elimina el último punto. Retorna {"newCount": N} o {} si el servidor responde 204.
+        """
+        r = self.delete(
+            f"/apiPuntajes/puntaje/alumno/{alumno_id}/last",
+            headers=self._idempotency(idempotency_key),
+            timeout=timeout
+        )
+        r.raise_for_status()
+        return json_codec.loads(r.content) if r.content else {}
+
+    def anular_puntajes(self, combate_id: int, puntaje_ids: list,
+                        idempotency_key=None, timeout=SHORT_TIMEOUT) -> dict:
+        """
+        POST /apiPuntajes/puntaje/anular  {"combateId": ..., "puntajeIds": [...]}
+        Anula varios puntos en una sola llamada (los marcados fuera de tiempo).
+        Retorna: {"removed": N, "counts": {alumnoId: N}}
+        """
+        r = self.post_json(
+            "/apiPuntajes/puntaje/anular",
+            {"combateId": combate_id, "puntajeIds": list(puntaje_ids)},
+            timeout=timeout,
+            headers=self._idempotency(idempotency_key)
+        )
+        r.raise_for_status()
+        return json_codec.loads(r.content) if r.content else {}
+
+    def add_gamjeom_simple(self, combate_id: int, alumno_id: int,
+                           idempotency_key=None, timeout=SHORT_TIMEOUT) -> dict:
+        """
+        POST /apiGamJeom/falta/simple
+        Registra una falta. Retorna: {"totalFaltas": N, "descalificado": bool, ...}
+        """
+        r = self.post(
+            "/apiGamJeom/falta/simple",
+            params={"combateId": combate_id, "alumnoId": alumno_id},
+            headers=self._idempotency(idempotency_key),
+            timeout=timeout
+        )
+        r.raise_for_status()
+        return json_codec.loads(r.content) if r.content else {}
+
+    def delete_last_gamjeom(self, alumno_id: int, combate_id: int,
+                            idempotency_key=None, timeout=SHORT_TIMEOUT) -> dict:
+        """
+        DELETE /apiGamJeom/falta/alumno/{alumnoId}/combate/{combateId}/last
+        Elimina la última falta. Retorna {"newCount": N} o {}.
+        """
+        r = self.delete(
+            f"/apiGamJeom/falta/alumno/{alumno_id}/combate/{combate_id}/last",
+            headers=self._idempotency(idempotency_key),
+            timeout=timeout
+        )
+        r.raise_for_status()
+        return json_codec.loads(r.content) if r.content else {}
+
+    # ============ MARCADOR ============
+
+    def get_scoreboard_snapshot(self, combate_id: int, rojo_id: int, azul_id: int,
+                                timeout=2) -> ScoreboardSnapshot:
+        """
+        Obtiene puntajes y GAM-JEOM de ambos competidores en una sola ronda:
+        usa el endpoint agregado si el servidor lo ofrece y, si no, lanza las
+        cuatro consultas en paralelo. El agregado se pide una sola vez, sin
+        reintentos: si no responde, el peor caso es un timeout más la consulta
+        paralela más lenta, y tras SCOREBOARD_AGGREGATE_MAX_TIMEOUTS seguidos
+        se deja de pedir.
+        """
+        started = time.monotonic()
+        snapshot = None
+        if combate_id and self._scoreboard_aggregate is not False:
+            snapshot = self._fetch_scoreboard_aggregate(combate_id, timeout)
+        if snapshot is None:
+            snapshot = self._fetch_scoreboard_parallel(combate_id, rojo_id, azul_id, timeout)
+        snapshot.elapsed_ms = (time.monotonic() - started) * 1000
+        return snapshot
+
+    def _fetch_scoreboard_aggregate(self, combate_id, timeout):
+        # Sin _with_retry: esperar reintentos de una sonda retrasaría todo el marcador
+        try:
+            r = self.session.get(
+                self._url(self.SCOREBOARD_PATH.format(combate_id=combate_id)),
+                headers={"Accept": "application/json"},
+                timeout=timeout,
+            )
+        except CancelledError:
+            raise
+        except CircuitOpenError:
+            # Host caído: no dice nada del endpoint; las consultas paralelas darán None
+            return None
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            self._aggregate_timeouts += 1
+            if self._aggregate_timeouts >= SCOREBOARD_AGGREGATE_MAX_TIMEOUTS:
+                self._scoreboard_aggregate = False
+                log.warning("Marcador agregado sin respuesta %s veces, se usan consultas en paralelo",
+                            self._aggregate_timeouts)
+            else:
+                log.info("Marcador agregado sin respuesta: %s", e)
+            return None
+        except requests.exceptions.RequestException as e:
+            log.info("Marcador agregado no disponible: %s", e)
+            return None
+        self._aggregate_timeouts = 0
+
+        if r.status_code in (404, 405, 501):
+            # El servidor no implementa el endpoint: no volver a intentarlo
+            self._scoreboard_aggregate = False
+            return None
+        if r.status_code != 200:
+            return None
+
+        data = json_codec.loads(r.content) if r.content else {}
+        if not isinstance(data, dict):
+            self._scoreboard_aggregate = False
+            return None
+        self._scoreboard_aggregate = True
+        return ScoreboardSnapshot(
+            combate_id=combate_id,
+            puntaje_rojo=data.get('puntajeRojo'),
+            puntaje_azul=data.get('puntajeAzul'),
+            gamjeom_rojo=data.get('faltasRojo'),
+            gamjeom_azul=data.get('faltasAzul'),
+            source="aggregate",
+        )
+
+    def _fetch_scoreboard_parallel(self, combate_id, rojo_id, azul_id, timeout):
+        if self._snapshot_pool is None:
+            self._snapshot_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="snapshot")
+
+        # Los hilos del pool heredan el scope de cancelación de quien pidió el marcador
+        scope = current_scope()
+
+        def _count(path):
+            with activate_scope(scope):
+                try:
+                    return self._get_count(path, timeout=timeout)
+                except Exception as e:
+                    log.warning("Error consultando %s: %s", path, e)
+                    return None
+
+        paths = {}
+        if rojo_id:
+            paths['puntaje_rojo'] = f"/apiPuntajes/puntaje/alumno/{rojo_id}/count"
+        if azul_id:
+            paths['puntaje_azul'] = f"/apiPuntajes/puntaje/alumno/{azul_id}/count"
+        if rojo_id and combate_id:
+            paths['gamjeom_rojo'] = f"/apiGamJeom/falta/alumno/{rojo_id}/combate/{combate_id}/count"
+        if azul_id and combate_id:
+            paths['gamjeom_azul'] = f"/apiGamJeom/falta/alumno/{azul_id}/combate/{combate_id}/count"
+
+        futures = {field: self._snapshot_pool.submit(_count, path) for field, path in paths.items()}
+        values = {field: f.result() for field, f in futures.items()}
+        if scope is not None:
+            scope.raise_if_closed()
+        return ScoreboardSnapshot(combate_id=combate_id, **values)
+
 
     # ============ ENDPOINTS DE ADMINISTRADOR ============
     
@@ -339,27 +1011,19 @@ class ApiClient:
         """
         r = self.get_json("/apiAdministradores/administrador", timeout=timeout)
         r.raise_for_status()
-        return r.json() if r.content else []
+        return json_codec.loads(r.content) if r.content else []
 
     def get_administrador_by_id(self, admin_id: int, timeout=None) -> dict:
         """
         GET /apiAdministradores/administrador/{id}
         Devuelve un administrador específico por su ID.
         """
-        print(f"[DEBUG API] Obteniendo administrador {admin_id}")
-        
-        r = self.get_json(f"/apiAdministradores/administrador/{admin_id}", timeout=timeout)
-        
-        print(f"[DEBUG API] Status code: {r.status_code}")
-        
-        if r.status_code == 404:
-            raise RuntimeError(f"Administrador {admin_id} no encontrado.")
-        
-        r.raise_for_status()
-        
-        result = r.json() if r.content else {}
-        print(f"[DEBUG API] Administrador obtenido: {result}")
-        
+        result = self._get_json_cached(
+            f"/apiAdministradores/administrador/{admin_id}", {},
+            not_found=f"Administrador {admin_id} no encontrado.",
+            timeout=timeout
+        )
+        log.debug("Administrador %s obtenido", admin_id)
         return result
 
     def create_administrador(self, payload: dict, timeout=None) -> dict:
@@ -369,29 +1033,24 @@ class ApiClient:
         """
         r = self.post_json("/apiAdministradores/administrador", payload, timeout=timeout)
         r.raise_for_status()
-        return r.json() if r.content else {}
+        return json_codec.loads(r.content) if r.content else {}
 
     def update_administrador(self, admin_id: int, payload: dict, timeout=None) -> dict:
         """
         PUT /apiAdministradores/administrador/{id}
         Actualiza un administrador existente.
         """
-        print(f"[DEBUG API] Actualizando administrador {admin_id} con payload: {payload}")
-        
+        # Solo los nombres de los campos: el payload puede traer la contraseña
+        log.debug("Actualizando administrador %s, campos: %s", admin_id, sorted(payload))
         r = self.put_json(f"/apiAdministradores/administrador/{admin_id}", payload, timeout=timeout)
-        
-        print(f"[DEBUG API] Status code: {r.status_code}")
-        print(f"[DEBUG API] Response text: {r.text}")
-        
+        log.debug("PUT administrador %s -> %s", admin_id, r.status_code)
+
         if r.status_code == 404:
             raise RuntimeError(f"Administrador {admin_id} no encontrado.")
         
         r.raise_for_status()
         
-        result = r.json() if r.content else {}
-        print(f"[DEBUG API] Response JSON: {result}")
-        
-        return result
+        return json_codec.loads(r.content) if r.content else {}
 
     def delete_administrador(self, admin_id: int, timeout=None) -> bool:
         """
@@ -416,7 +1075,7 @@ class ApiClient:
         }
         r = self.post_json("/api/auth/admin/login", payload, timeout=timeout)
         r.raise_for_status()
-        return r.json() if r.content else {}
+        return json_codec.loads(r.content) if r.content else {}
 
     def admin_logout(self, timeout=None):
         """
@@ -424,19 +1083,7 @@ class ApiClient:
         Cierra sesión del administrador.
         """
         return self.post_logout("/api/auth/admin/logout", timeout=timeout)
-    
-    def get_combate_by_id(self, combate_id):
-        """
-        Obtiene los datos completos de un combate por su ID
-        GET /apiCombates/combate/{id}
-        """
-        url = f"{self.base_url}/apiCombates/combate/{combate_id}"
-        try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            raise RuntimeError(f"Error al obtener combate: {str(e)}")
+
 
 # Instancia global del cliente
 api = ApiClient()
\ No newline at end of file
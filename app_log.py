@@ -0,0 +1,290 @@
+"""
+Logging estructurado y barato para los caminos calientes (websocket, marcador, API).
+
+    log = get_logger("WebSocket")
+    log.debug("Mensaje recibido: %s", data)              # formato diferido
+    log.info("Conectado", combate_id=combate_id)         # campos estructurados
+
+Cada registro se decide con una comparación de nivel; el texto solo se arma
+cuando algún destino lo va a mostrar. Destinos:
+
+- consola: print "[Nombre] mensaje" desde el nivel LOG_CONSOLE_LEVEL.
+- ring buffer: los últimos LOG_RING_SIZE registros sin formatear (una tupla
+  en un deque), para recuperarlos tras un incidente con dump_ring().
+- archivo: JSONL escrito por un hilo aparte, desde LOG_FILE_LEVEL.
+"""
+import atexit
+import itertools
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from config import (
+    LOG_CONSOLE_LEVEL, LOG_RING_LEVEL, LOG_RING_SIZE,
+    LOG_FILE_LEVEL, LOG_FILE_PATH, LOG_FILE_MAX_BYTES,
+)
+
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+OFF = 100
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+
+
+def parse_level(level) -> int:
+    if isinstance(level, int):
+        return level
+    name = str(level).strip().upper()
+    if name in ("", "OFF", "NONE"):
+        return OFF
+    for value, level_name in LEVEL_NAMES.items():
+        if level_name == name:
+            return value
+    raise ValueError(f"Nivel de log desconocido: {level}")
+
+
+# Estado compartido por todos los loggers. _threshold es el mínimo de los
+# tres destinos: por debajo de él un registro no cuesta más que la comparación.
+_console_level = parse_level(LOG_CONSOLE_LEVEL)
+_ring_level = parse_level(LOG_RING_LEVEL)
+_file_level = OFF
+_threshold = min(_console_level, _ring_level)
+_ring = deque(maxlen=LOG_RING_SIZE)
+_file_sink = None
+_loggers = {}
+
+
+def format_message(msg, args) -> str:
+    if not args:
+        return str(msg)
+    try:
+        return msg % args
+    except (TypeError, ValueError):
+        return f"{msg} {args!r}"
+
+
+def format_record(record) -> str:
+    """Línea legible de un registro: 2025-03-14 10:30:00.123 INFO [Nombre] mensaje k=v"""
+    ts, level, name, msg, args, fields = record
+    stamp = datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    line = f"{stamp} {LEVEL_NAMES.get(level, level)} [{name}] {format_message(msg, args)}"
+    if fields:
+        line += " " + " ".join(f"{k}={v!r}" for k, v in fields.items())
+    return line
+
+
+class Logger:
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+    def enabled_for(self, level) -> bool:
+        """Para envolver trabajo caro que solo sirve al log (p. ej. serializar un payload)."""
+        return level >= _threshold
+
+    def debug(self, msg, *args, **fields):
+        if DEBUG >= _threshold:
+            _emit(DEBUG, self.name, msg, args, fields)
+
+    def info(self, msg, *args, **fields):
+        if INFO >= _threshold:
+            _emit(INFO, self.name, msg, args, fields)
+
+    def warning(self, msg, *args, **fields):
+        if WARNING >= _threshold:
+            _emit(WARNING, self.name, msg, args, fields)
+
+    def error(self, msg, *args, **fields):
+        if ERROR >= _threshold:
+            _emit(ERROR, self.name, msg, args, fields)
+
+
+def get_logger(name) -> Logger:
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers[name] = Logger(name)
+    return logger
+
+
+def _emit(level, name, msg, args, fields):
+    record = (time.time(), level, name, msg, args, fields)
+    if level >= _ring_level:
+        _ring.append(record)
+    if level >= _console_level:
+        line = f"[{name}] {format_message(msg, args)}"
+        if fields:
+            line += " " + " ".join(f"{k}={v!r}" for k, v in fields.items())
+        print(line)
+    if level >= _file_level and _file_sink is not None:
+        _file_sink.put(record)
+
+
+class FileSink:
+    """
+    Escribe registros como JSONL en un hilo propio: en el hilo que registra
+    solo se encola la tupla. Al pasar de max_bytes rota a <archivo>.1.
+    """
+
+    def __init__(self, path, max_bytes=LOG_FILE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.written = 0
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=10000)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._run, name="log-file-sink", daemon=True)
+        self._thread.start()
+
+    def put(self, record):
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            # Nunca bloquear al que registra: si el disco no da abasto se descarta
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            record = self._queue.get()
+            if record is None:
+                break
+            batch = [record]
+            while len(batch) < 256:
+                try:
+                    record = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is None:
+                    self._write(batch)
+                    self._file.close()
+                    return
+                batch.append(record)
+            self._write(batch)
+        self._file.close()
+
+    def _write(self, batch):
+        lines = []
+        for ts, level, name, msg, args, fields in batch:
+            entry = {
+                "ts": round(ts, 3),
+                "level": LEVEL_NAMES.get(level, level),
+                "logger": name,
+                "msg": format_message(msg, args),
+            }
+            if fields:
+                entry["fields"] = fields
+            lines.append(json.dumps(entry, ensure_ascii=False, default=str))
+        try:
+            data = "\n".join(lines) + "\n"
+            self._file.write(data)
+            self._file.flush()
+            self.written += len(data)
+            if self.written > self.max_bytes:
+                self._rotate()
+        except OSError:
+            self.dropped += len(batch)
+
+    def _rotate(self):
+        self._file.close()
+        os.replace(self.path, self.path + ".1")
+        self._file = open(self.path, "a", encoding="utf-8")
+        self.written = 0
+
+    def close(self, timeout=2.0):
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+
+def configure(console_level=None, ring_level=None, file_level=None, file_path=None, ring_size=None):
+    """Cambia niveles y destinos en caliente; file_path="" desactiva el archivo."""
+    global _console_level, _ring_level, _file_level, _threshold, _ring, _file_sink
+    if console_level is not None:
+        _console_level = parse_level(console_level)
+    if ring_level is not None:
+        _ring_level = parse_level(ring_level)
+    if ring_size is not None and ring_size != _ring.maxlen:
+        _ring = deque(_ring, maxlen=ring_size)
+    if file_path is not None:
+        if _file_sink is not None:
+            _file_sink.close()
+            _file_sink = None
+        if file_path:
+            _file_sink = FileSink(file_path)
+    if file_level is not None:
+        _file_level = parse_level(file_level)
+    if _file_sink is None:
+        _file_level = OFF
+    _threshold = min(_console_level, _ring_level, _file_level)
+
+
+def start_file_sink():
+    """Abre el archivo de log de config (LOG_FILE_PATH/LOG_FILE_LEVEL) si está configurado."""
+    if LOG_FILE_PATH and _file_sink is None:
+        configure(file_path=LOG_FILE_PATH, file_level=LOG_FILE_LEVEL)
+
+
+def recent(n=None, level=DEBUG) -> list:
+    """Últimos n registros del ring buffer ya formateados."""
+    records = [r for r in list(_ring) if r[1] >= level]
+    if n is not None:
+        records = records[-n:]
+    return [format_record(r) for r in records]
+
+
+def dump_ring(path=None) -> str:
+    """Vuelca el ring buffer a un archivo de texto y devuelve su ruta."""
+    if path is None:
+        directory = os.path.dirname(LOG_FILE_PATH) or "."
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(directory, f"incidente-{stamp}.log")
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for line in recent():
+            f.write(line + "\n")
+    return path
+
+
+def install_crash_dump():
+    """Ante una excepción no capturada (hilo principal o de fondo) vuelca el ring buffer."""
+    previous_hook = sys.excepthook
+    previous_thread_hook = threading.excepthook
+    dumped = itertools.count()
+
+    def dump(exc):
+        if next(dumped) > 10:
+            return
+        get_logger("Crash").error("Excepción no capturada: %r", exc)
+        try:
+            print(f"[Crash] Últimos registros guardados en {dump_ring()}")
+        except OSError as e:
+            print(f"[Crash] No se pudo guardar el ring buffer: {e}")
+
+    def excepthook(exc_type, exc, tb):
+        dump(exc)
+        previous_hook(exc_type, exc, tb)
+
+    def thread_excepthook(args):
+        dump(args.exc_value)
+        previous_thread_hook(args)
+
+    sys.excepthook = excepthook
+    threading.excepthook = thread_excepthook
+
+
+@atexit.register
+def _close_file_sink():
+    if _file_sink is not None:
+        _file_sink.close()
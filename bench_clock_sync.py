@@ -0,0 +1,176 @@
+"""
+Mide cuánto difieren los relojes de varias pantallas del mismo combate.
+
+    python bench_clock_sync.py --followers 4 --skew-ms 5000 --jitter-ms 30 --duration 10
+
+Levanta el backend de prueba (fake_backend, que hace de relay del reloj) y
+conecta una pantalla dueña del cronómetro y N seguidoras, cada una con su
+propio time.monotonic() desplazado hasta --skew-ms y con un retardo de red
+aleatorio de hasta --jitter-ms en cada mensaje (ida y vuelta). El dueño
+inicia y pausa el round cada --toggle segundos; cada 20 ms se lee el tiempo
+restante de todas las pantallas en el mismo instante y se informa cuánto se
+separan del dueño (p50/p99/max), aparte de los --settle ms que tarda un
+cambio en llegar a las seguidoras. El objetivo es menos de 20 ms.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+
+from clock_sync import ClockLink, ClockSync, OWNER, FOLLOWER
+from fake_backend import FakeBackend
+from match_clock import MatchClock
+from websocket_manager import WebSocketManager
+
+
+def percentile(values, q):
+    """Percentil por rango más cercano; 0 si no hay datos."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+class Display:
+    """Una pantalla sin UI: MatchClock + ClockLink sobre su propio websocket."""
+
+    def __init__(self, name, role, url, skew, jitter, rng):
+        self.name = name
+        self.skew = skew
+        self.jitter = jitter
+        self.rng = rng
+        self.lock = threading.RLock()
+        self.connected = threading.Event()
+        now = self.now
+        self.clock = MatchClock(180, 60, 3, clock=now)
+        self.link = ClockLink(
+            role, send=self.send, deliver=self.deliver,
+            get_clock=lambda: self.clock, on_remote=self.apply, sync=ClockSync(clock=now),
+        )
+        if role == OWNER:
+            self.clock.on_change = lambda clock: self.link.publish()
+        self.manager = WebSocketManager(url, self.on_message, keepalive_interval=0)
+
+    def now(self):
+        return time.monotonic() + self.skew
+
+    def network_delay(self):
+        if self.jitter:
+            time.sleep(self.rng.uniform(0, self.jitter))
+
+    def send(self, text):
+        self.network_delay()
+        return self.manager.send(text)
+
+    def deliver(self, fn, *args):
+        with self.lock:
+            fn(*args)
+
+    def apply(self, state):
+        self.clock.apply_state(state, self.link.sync)
+
+    def on_message(self, message):
+        self.network_delay()
+        received = self.now()
+        data = json.loads(message)
+        if data.get("status") == "connected":
+            self.link.on_connected()
+            self.connected.set()
+        self.link.handle(data, received)
+
+    def remaining_at(self, instant):
+        with self.lock:
+            return self.clock.remaining(now=instant + self.skew)
+
+    def sync_loop(self, stop):
+        while not stop.is_set():
+            if self.manager.is_open():
+                self.link.send_sync()
+            stop.wait(self.link.next_sync_delay())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concordancia del reloj entre pantallas de un tatami")
+    parser.add_argument("--followers", type=int, default=4)
+    parser.add_argument("--skew-ms", type=float, default=5000, help="desfase máximo del reloj local de cada pantalla")
+    parser.add_argument("--jitter-ms", type=float, default=20, help="retardo de red aleatorio por mensaje")
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--toggle", type=float, default=1.5, help="segundos entre iniciar y pausar")
+    parser.add_argument("--settle", type=float, default=200, help="ms tras un cambio que no cuentan como régimen")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    backend = FakeBackend().seed(torneos=1, combates_por_torneo=1)
+    server = backend.serve(port=args.port)
+    combate_id = next(iter(backend.combates))
+    url = f"ws://127.0.0.1:{args.port}/ws/tablero/{combate_id}"
+    jitter = args.jitter_ms / 1000
+
+    # Cada pantalla es otro equipo: URL propia para que el manager no las trate como duplicadas
+    owner = Display("dueño", OWNER, f"{url}?pantalla=0", 0.0, jitter, random.Random(rng.random()))
+    followers = [
+        Display(f"seguidora {i + 1}", FOLLOWER, f"{url}?pantalla={i + 1}",
+                rng.uniform(-args.skew_ms, args.skew_ms) / 1000, jitter, random.Random(rng.random()))
+        for i in range(args.followers)
+    ]
+    displays = [owner] + followers
+
+    stop = threading.Event()
+    for d in displays:
+        d.manager.start()
+        d.connected.wait(10)
+        threading.Thread(target=d.sync_loop, args=(stop,), daemon=True).start()
+    deadline = time.monotonic() + 10
+    while not all(d.link.sync.full for d in displays) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    print(f"[Reloj] {len(followers)} seguidoras sincronizadas (jitter {args.jitter_ms:g} ms)")
+
+    changes = []
+    steady, transient = [], []
+
+    def sample():
+        while not stop.is_set():
+            instant = time.monotonic()
+            owner_remaining = owner.remaining_at(instant)
+            worst = max(abs(f.remaining_at(instant) - owner_remaining) for f in followers) * 1000
+            settling = changes and instant - changes[-1] < args.settle / 1000
+            (transient if settling else steady).append(worst)
+            time.sleep(0.02)
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+
+    started = time.monotonic()
+    while time.monotonic() - started < args.duration:
+        with owner.lock:
+            changes.append(time.monotonic())
+            if owner.clock.running:
+                owner.clock.pause()
+            else:
+                owner.clock.start()
+        time.sleep(args.toggle)
+
+    stop.set()
+    sampler.join()
+    for d in displays:
+        d.manager.stop()
+    server.shutdown()
+
+    print()
+    print(f"{'pantalla':<14}{'error desfase ms':>18}{'ida y vuelta ms':>17}{'estados':>9}")
+    for d in followers:
+        # Servidor y pantallas comparten el monotonic real: el desfase verdadero es -skew
+        error = (d.link.sync.offset + d.skew) * 1000
+        print(f"{d.name:<14}{error:>18.2f}{d.link.sync.round_trip * 1000:>17.2f}{d.link.applied:>9}")
+    print()
+    print(f"Diferencia con el dueño (ms)   p50 {percentile(steady, 0.5):.2f}   "
+          f"p99 {percentile(steady, 0.99):.2f}   max {max(steady, default=0):.2f}   ({len(steady)} muestras)")
+    print(f"Durante los cambios (ms)       max {max(transient, default=0):.2f}   ({len(transient)} muestras)")
+
+
+if __name__ == "__main__":
+    main()
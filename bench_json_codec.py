@@ -0,0 +1,105 @@
+"""
+Micro-benchmark del codec JSON con cargas como las del backend.
+
+    python bench_json_codec.py [archivo.json ...]
+
+Sin argumentos usa listados sintéticos de combates y torneos con la misma
+forma que devuelve la API; con argumentos mide además esos archivos
+(p. ej. respuestas guardadas de /apiCombates/combates).
+"""
+import json
+import sys
+import timeit
+
+import json_codec
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def combate(i):
+    alumno = lambda n: {
+        "id": n,
+        "nombres": f"Alumno {n}",
+        "apellidoPaterno": "Hernández",
+        "apellidoMaterno": "López",
+        "fechaNacimiento": "2009-04-17",
+        "pesoKg": 48.5,
+        "sexo": "M",
+    }
+    juez = lambda n: {"id": n, "nombres": f"Juez {n}", "apellidos": "Martínez Ruiz"}
+    return {
+        "idCombate": i,
+        "horaCombate": "2025-03-14T10:30:00",
+        "area": "Área 2",
+        "numeroRound": 3,
+        "duracionRound": "00:02:00",
+        "duracionDescanso": "00:01:00",
+        "estado": "FINALIZADO",
+        "contrasenaCombate": "a8F3kQ",
+        "competidorRojo": alumno(2 * i),
+        "competidorAzul": alumno(2 * i + 1),
+        "jueces": {
+            "arbitroCentral": juez(1),
+            "juez1": juez(2),
+            "juez2": juez(3),
+            "juez3": juez(4),
+        },
+    }
+
+
+def torneo(i):
+    return {
+        "idTorneo": i,
+        "nombre": f"Torneo Regional {i}",
+        "fechaHora": "2025-03-14T09:00:00Z",
+        "sede": "Deportivo Benito Juárez",
+        "estado": "ACTIVO",
+        "administrador": {"id": 1, "nombres": "Admin", "correo": "admin@example.com"},
+    }
+
+
+def payloads(paths):
+    cases = {
+        "combates x200": json.dumps([combate(i) for i in range(200)]).encode(),
+        "torneos x50": json.dumps([torneo(i) for i in range(50)]).encode(),
+        "score_update": json.dumps({"event": "score_update", "alumnoId": 17, "count": 12}).encode(),
+        "count": b'{"alumnoId": 17, "count": 12}',
+    }
+    for path in paths:
+        with open(path, "rb") as f:
+            cases[path] = f.read()
+    return cases
+
+
+def measure(fn, number):
+    best = min(timeit.repeat(fn, number=number, repeat=5))
+    return best / number * 1e6
+
+
+def main(paths):
+    print(f"Backend activo: {json_codec.BACKEND}")
+    print(f"{'carga':<16}{'bytes':>8}  {'operación':<14}{'json (µs)':>11}{'orjson (µs)':>13}")
+    for name, raw in payloads(paths).items():
+        obj = json.loads(raw)
+        number = max(10, 20000 // max(1, len(raw) // 100))
+        rows = [
+            ("loads", lambda: json.loads(raw), (lambda: orjson.loads(raw)) if orjson else None),
+            ("dumps", lambda: json.dumps(obj).encode(), (lambda: orjson.dumps(obj)) if orjson else None),
+        ]
+        if isinstance(obj, dict) and "count" in obj:
+            # Columna json: búsqueda directa en bytes (lo que usa read_int sin orjson)
+            rows.append((
+                "read_int",
+                lambda: json_codec._scan_int(raw, "count"),
+                (lambda: orjson.loads(raw)["count"]) if orjson else None,
+            ))
+        for op, std, fast in rows:
+            fast_us = f"{measure(fast, number):13.2f}" if fast else f"{'-':>13}"
+            print(f"{name:<16}{len(raw):>8}  {op:<14}{measure(std, number):11.2f}{fast_us}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
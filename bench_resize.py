@@ -0,0 +1,172 @@
+"""
+Costo de adaptar cada pantalla a un cambio de tamaño de ventana.
+
+    python bench_resize.py --events 30 --repeat 5
+
+Levanta el backend de prueba (fake_backend) en el puerto 8080, abre todas
+las pantallas en un ScreenManager y, una a una a la vista, mide:
+
+  build ms      un build_ui() completo (lo que antes costaba cada on_resize)
+  reflow ms     la pasada de responsive tras cambiar el ancho sin cruzar
+                ningún corte del ResponsiveHelper
+  corte ms      la misma pasada cruzando a la otra orientación (ancho
+                --narrow); se reconstruye solo si cambia su layout_key
+
+Después simula arrastrar el borde de la ventana con --events eventos: antes
+cada pantalla registrada, visible u oculta, hacía un build_ui() por evento;
+ahora hay una sola pasada cuando la ventana deja de moverse.
+"""
+import argparse
+import gc
+import logging
+import os
+import statistics
+import time
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+
+from fake_backend import FakeBackend
+
+
+def median_ms(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconstruir contra reacomodar pantallas al cambiar la ventana")
+    parser.add_argument("--events", type=int, default=30, help="eventos on_resize de un arrastre del borde")
+    parser.add_argument("--repeat", type=int, default=5, help="mediciones por pantalla (se toma la mediana)")
+    parser.add_argument("--wide", type=int, default=1300, help="ancho inicial de la ventana")
+    parser.add_argument("--narrow", type=int, default=560, help="ancho por debajo de los cortes de orientación")
+    parser.add_argument("--height", type=int, default=800)
+    parser.add_argument("--port", type=int, default=8080, help="debe coincidir con API_BASE_URL")
+    args = parser.parse_args()
+
+    backend = FakeBackend().seed(torneos=3, combates_por_torneo=10)
+    server = backend.serve(port=args.port)
+    torneo = next(iter(backend.torneos.values()))
+
+    from kivy.app import App
+    logging.getLogger("urllib3").setLevel(logging.WARNING)
+    from kivy.clock import Clock
+    from kivy.core.window import Window
+    from kivy.uix.screenmanager import ScreenManager, NoTransition
+
+    import responsive
+    from actualizar import ActualizarDatosScreen
+    from actualizar_torneos import ActualizarTorneoScreen
+    from combates_anteriore import CombatesScreen
+    from crear_combate import CrearCombateScreen
+    from crear_torneo import CrearTorneoScreen
+    from cuenta import VerInfoScreen
+    from ini import MainInAuthScreen
+    from ini_juez import InicioSesionJuezScreen
+    from inicio import InicioSesionScreen
+    from main import ConocenosScreen, MainInScreen
+    from registro import RegistroScreen
+    from tablero import MainScreentab
+    from tablero_central import MainScreentabc
+    from torneos_anteriores import TorneosAnterioresScreen
+
+    factories = [
+        ("inicio", InicioSesionScreen),
+        ("ini_juez", InicioSesionJuezScreen),
+        ("registro", RegistroScreen),
+        ("main_in", MainInScreen),
+        ("conocenos", ConocenosScreen),
+        ("main_in_auth", MainInAuthScreen),
+        ("cuenta", VerInfoScreen),
+        ("actualizar", ActualizarDatosScreen),
+        ("crear_torneo", CrearTorneoScreen),
+        ("actualizar_torneo", lambda **kw: ActualizarTorneoScreen(torneo, lambda *a: None, **kw)),
+        ("crear_combate", CrearCombateScreen),
+        ("combates", CombatesScreen),
+        ("torneos_anteriores", TorneosAnterioresScreen),
+        ("tablero", MainScreentab),
+        ("tablero_central", MainScreentabc),
+    ]
+    results = []
+    diagnostics = {}
+
+    def resize(width):
+        """Cambia el ancho y devuelve los ms de la pasada de responsive (sin contar SDL)."""
+        Window.size = (width, args.height)
+        # La pasada se lanza a mano: sin esperar el debounce de RESIZE_DEBOUNCE
+        responsive._resize_trigger.cancel()
+        gc.collect()
+        started = time.perf_counter()
+        responsive._apply()
+        return (time.perf_counter() - started) * 1000
+
+    def measure(sm, screens):
+        for name, screen in screens:
+            sm.current = name
+            layout = screen.responsive
+            resize(args.wide)
+            build_ms = median_ms(layout.build, args.repeat)
+
+            reflow_ms = statistics.median(
+                resize(args.wide - 10 * (i % 2 + 1)) for i in range(args.repeat)
+            )
+
+            rebuilds = layout.rebuilds
+            updated = layout.updated
+            cross_ms = resize(args.narrow)
+            results.append({
+                "screen": name,
+                "widgets": sum(1 for _ in screen.walk(restrict=True)),
+                "build_ms": build_ms,
+                "reflow_ms": reflow_ms,
+                "cross_ms": cross_ms,
+                "cross_rebuilt": layout.rebuilds > rebuilds,
+                "updated": layout.updated - updated,
+            })
+            resize(args.wide)
+
+    class ResizeApp(App):
+        def build(self):
+            Window.size = (args.wide, args.height)
+            sm = ScreenManager(transition=NoTransition())
+            self.screens = [(name, factory(name=name)) for name, factory in factories]
+            for _, screen in self.screens:
+                sm.add_widget(screen)
+            Clock.schedule_once(self.run_bench, 1)
+            return sm
+
+        def run_bench(self, dt):
+            try:
+                measure(self.root, self.screens)
+                gc.collect()
+                diagnostics.update(responsive.stats())
+            finally:
+                self.stop()
+
+    ResizeApp().run()
+    server.shutdown()
+
+    print()
+    print(f"{'pantalla':<20}{'widgets':>8}{'build ms':>10}{'reflow ms':>11}{'corte ms':>10}{'rehace':>8}{'cambios':>9}")
+    for r in results:
+        print(f"{r['screen']:<20}{r['widgets']:>8}{r['build_ms']:>10.2f}{r['reflow_ms']:>11.2f}"
+              f"{r['cross_ms']:>10.2f}{'sí' if r['cross_rebuilt'] else 'no':>8}{r['updated']:>9}")
+
+    # Antes: cada evento reconstruía todas las pantallas; ahora, una pasada (la visible, el resto al entrar)
+    before = args.events * sum(r["build_ms"] for r in results)
+    after = max((r["cross_ms"] for r in results), default=0.0)
+    print()
+    print(f"Arrastre de {args.events} eventos con {len(results)} pantallas: "
+          f"antes {before:.0f} ms ({args.events * len(results)} build_ui), "
+          f"ahora {after:.1f} ms (1 pasada)")
+    print(f"Suscriptores vivos: {diagnostics.get('subscribers', 0)} "
+          f"({diagnostics.get('pending', 0)} pendientes), "
+          f"callbacks en Window.on_resize: {diagnostics.get('window_handlers', 0)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+"""
+Generador de carga de jueces contra el tablero central (MainScreentabc).
+
+    python bench_tablero_load.py --judges 3 --rates 1,5,10,20 --duration 10
+
+Levanta el backend de prueba (fake_backend) en el puerto 8080, abre el
+tablero central en una ventana de Kivy conectado a un combate y simula N
+jueces que marcan puntos a la misma frecuencia (todos en el mismo instante,
+o repartidos con --spread) e incidencias confirmadas. Para cada frecuencia
+mide el tiempo desde que el juez envía el punto hasta que el número cambia
+en pantalla (p50/p99), cuánto de eso es red (envío -> mensaje del websocket)
+y cuánto es UI (mensaje -> etiqueta), los eventos que nunca se mostraron
+y el peor hueco entre frames.
+
+Con --json guarda los resultados para comparar entre versiones.
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import threading
+import time
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+
+import requests
+
+from fake_backend import FakeBackend
+
+
+def percentile(values, q):
+    """Percentil por rango más cercano (ms); 0 si no hay datos."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+class Probe:
+    """Marcas de tiempo (perf_counter) de lo que llega al websocket y a la pantalla."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.ws_scores = []      # (alumno_id, count, t)
+        self.shown = []          # (alumno_id, valor, t)
+        self.incidencias = []    # t en que se mostró el popup
+        self.frame_gaps = []     # (t, dt) de cada frame
+        self.connected = threading.Event()
+
+    def on_ws_message(self, message):
+        t = time.perf_counter()
+        try:
+            data = json.loads(message)
+        except ValueError:
+            return
+        if data.get("status") == "connected":
+            self.connected.set()
+        elif data.get("event") == "score_update":
+            with self.lock:
+                self.ws_scores.append((data.get("alumnoId"), data.get("count", 0), t))
+
+    def on_shown(self, alumno_id, value):
+        with self.lock:
+            self.shown.append((alumno_id, value, time.perf_counter()))
+
+    def on_incidencia(self):
+        with self.lock:
+            self.incidencias.append(time.perf_counter())
+
+    def on_frame(self, dt):
+        self.frame_gaps.append((time.perf_counter(), dt))
+
+
+class Judge(threading.Thread):
+    """Un juez: marca un punto en cada tic de la frecuencia pedida."""
+
+    def __init__(self, base_url, combate_id, alumnos, rate, duration, offset, sends, lock, t0):
+        super().__init__(daemon=True)
+        self.session = requests.Session()
+        self.url = f"{base_url}/apiPuntajes/puntaje/simple"
+        self.combate_id = combate_id
+        self.alumnos = alumnos
+        self.rate = rate
+        self.duration = duration
+        self.offset = offset
+        self.sends = sends
+        self.lock = lock
+        self.t0 = t0
+        self.errors = 0
+
+    def run(self):
+        period = 1.0 / self.rate
+        tick = 0
+        while tick * period < self.duration:
+            wait = self.t0 + self.offset + tick * period - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+            alumno_id = random.choice(self.alumnos)
+            sent = time.perf_counter()
+            try:
+                r = self.session.post(self.url, params={
+                    "combateId": self.combate_id, "alumnoId": alumno_id, "valorPuntaje": 1,
+                }, timeout=10)
+                r.raise_for_status()
+                with self.lock:
+                    self.sends.append((alumno_id, r.json()["newCount"], sent))
+            except (requests.RequestException, ValueError, KeyError):
+                self.errors += 1
+            tick += 1
+
+
+def run_step(args, base_url, combate, probe, rate):
+    """Una frecuencia: jueces durante args.duration s, luego espera a que se vacíe la pantalla."""
+    from ui_bus import ui_bus
+    bus_before = ui_bus.stats()
+    alumnos = [combate["competidorRojo"]["id"], combate["competidorAzul"]["id"]]
+    sends, lock = [], threading.Lock()
+    t0 = time.perf_counter() + 0.2
+    judges = [
+        Judge(base_url, combate["idCombate"], alumnos, rate, args.duration,
+              (i / (args.judges * rate)) if args.spread else 0.0, sends, lock, t0)
+        for i in range(args.judges)
+    ]
+    with probe.lock:
+        shown_from = len(probe.shown)
+        ws_from = len(probe.ws_scores)
+        inc_from = len(probe.incidencias)
+    frames_from = len(probe.frame_gaps)
+
+    for judge in judges:
+        judge.start()
+
+    incidencias_sent = []
+    if args.incidencias:
+        interval = args.duration / (args.incidencias + 1)
+        for n in range(args.incidencias):
+            time.sleep(max(0.0, t0 + interval * (n + 1) - time.perf_counter()))
+            incidencias_sent.append(time.perf_counter())
+            requests.post(f"{base_url}/fake/combate/{combate['idCombate']}/incidencia", timeout=10)
+
+    for judge in judges:
+        judge.join()
+    time.sleep(args.drain)
+
+    with probe.lock:
+        shown = probe.shown[shown_from:]
+        ws_scores = probe.ws_scores[ws_from:]
+        incidencias = probe.incidencias[inc_from:]
+    frames = probe.frame_gaps[frames_from:]
+    bus = ui_bus.stats()
+
+    def first_at_least(events, alumno_id, count, since):
+        for a, value, t in events:
+            if a == alumno_id and value >= count and t >= since:
+                return t
+        return None
+
+    total, network, ui = [], [], []
+    dropped = 0
+    for alumno_id, count, sent in sends:
+        t_shown = first_at_least(shown, alumno_id, count, sent)
+        if t_shown is None:
+            dropped += 1
+            continue
+        total.append((t_shown - sent) * 1000)
+        t_ws = first_at_least(ws_scores, alumno_id, count, sent)
+        if t_ws is not None:
+            network.append((t_ws - sent) * 1000)
+            ui.append((t_shown - t_ws) * 1000)
+
+    incidencia_ms = []
+    pending = sorted(incidencias)
+    for sent in incidencias_sent:
+        shown_at = next((t for t in pending if t >= sent), None)
+        if shown_at is not None:
+            pending.remove(shown_at)
+            incidencia_ms.append((shown_at - sent) * 1000)
+    return {
+        "rate_per_judge": rate,
+        "events_per_s": rate * args.judges,
+        "sent": len(sends),
+        "send_errors": sum(j.errors for j in judges),
+        "dropped": dropped,
+        "p50_ms": percentile(total, 0.50),
+        "p99_ms": percentile(total, 0.99),
+        "max_ms": max(total, default=0.0),
+        "network_p50_ms": percentile(network, 0.50),
+        "ui_p50_ms": percentile(ui, 0.50),
+        "ui_p99_ms": percentile(ui, 0.99),
+        "incidencias_sent": len(incidencias_sent),
+        "incidencias_shown": len(incidencia_ms),
+        "incidencias_dropped": len(incidencias_sent) - len(incidencia_ms),
+        "incidencia_p50_ms": percentile(incidencia_ms, 0.50),
+        "worst_frame_ms": max((dt for _, dt in frames), default=0.0) * 1000,
+        "ui_updates_posted": bus["posted"] - bus_before["posted"],
+        "ui_updates_coalesced": bus["coalesced"] - bus_before["coalesced"],
+    }
+
+
+def print_report(results):
+    print()
+    print(f"{'ev/s':>6}{'enviados':>10}{'perdidos':>10}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+          f"{'red p50':>9}{'UI p50':>9}{'UI p99':>9}{'incid ms':>10}{'incid perd':>11}{'frame ms':>10}{'UI coalesc':>11}")
+    for r in results:
+        print(f"{r['events_per_s']:>6g}{r['sent']:>10}{r['dropped']:>10}"
+              f"{r['p50_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['max_ms']:>9.1f}"
+              f"{r['network_p50_ms']:>9.1f}{r['ui_p50_ms']:>9.1f}{r['ui_p99_ms']:>9.1f}"
+              f"{r['incidencia_p50_ms']:>10.1f}{r['incidencias_dropped']:>11}{r['worst_frame_ms']:>10.1f}"
+              f"{r['ui_updates_coalesced']:>11}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Carga de jueces contra el tablero central")
+    parser.add_argument("--judges", type=int, default=3)
+    parser.add_argument("--rates", default="1,5,10,20", help="puntos por segundo de cada juez, separados por comas")
+    parser.add_argument("--duration", type=float, default=10, help="segundos por frecuencia")
+    parser.add_argument("--drain", type=float, default=2, help="espera tras cada frecuencia (s)")
+    parser.add_argument("--incidencias", type=int, default=1, help="incidencias confirmadas por frecuencia")
+    parser.add_argument("--spread", action="store_true", help="repartir a los jueces en el periodo en vez de pulsar a la vez")
+    parser.add_argument("--latency", type=float, default=0, help="latencia del backend de prueba (ms)")
+    parser.add_argument("--jitter", type=float, default=0, help="jitter del backend de prueba (ms)")
+    parser.add_argument("--port", type=int, default=8080, help="debe coincidir con el websocket del tablero")
+    parser.add_argument("--json", help="guardar los resultados en este archivo")
+    args = parser.parse_args()
+    rates = [float(r) for r in args.rates.split(",") if r.strip()]
+
+    backend = FakeBackend(args.latency, args.jitter).seed(torneos=1, combates_por_torneo=1)
+    server = backend.serve(port=args.port)
+    base_url = f"http://127.0.0.1:{args.port}"
+    combate = next(iter(backend.combates.values()))
+    print(f"[Carga] Backend de prueba en {base_url}, combate {combate['idCombate']}")
+
+    from kivy.app import App
+    # Kivy sube el logging a DEBUG: sin esto urllib3 escribe una línea por punto
+    logging.getLogger("urllib3").setLevel(logging.WARNING)
+    from kivy.clock import Clock
+    from kivy.core.window import Window
+    from kivy.uix.modalview import ModalView
+    from kivy.uix.screenmanager import ScreenManager
+    from tablero_central import MainScreentabc
+
+    probe = Probe()
+    results = []
+
+    def instrument(screen):
+        for panel in (screen.com1_panel, screen.com2_panel):
+            original = panel.show_score
+
+            def show_score(value, panel=panel, original=original):
+                original(value)
+                probe.on_shown(panel.alumno_id, value)
+            panel.show_score = show_score
+
+        original_popup = screen.mostrar_popup_incidencia
+
+        def mostrar_popup_incidencia():
+            original_popup()
+            probe.on_incidencia()
+            # Cerrar el popup y seguir: la carga no se detiene por la incidencia
+            Clock.schedule_once(lambda dt: dismiss_popups(screen), 0.2)
+        screen.mostrar_popup_incidencia = mostrar_popup_incidencia
+
+    def dismiss_popups(screen):
+        for child in list(Window.children):
+            if isinstance(child, ModalView):
+                child.dismiss()
+        screen.reanudar_tiempo()
+
+    def wait_for_websocket(screen):
+        deadline = time.monotonic() + 10
+        while screen.ws_manager is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+        if screen.ws_manager is not None:
+            original = screen.ws_manager.on_message
+
+            def on_message(message):
+                probe.on_ws_message(message)
+                original(message)
+            screen.ws_manager.on_message = on_message
+        return probe.connected.wait(10)
+
+    def load(app, screen):
+        try:
+            if not wait_for_websocket(screen):
+                print("[Carga] ✗ El tablero no se conectó al websocket")
+                return
+            time.sleep(1)
+            for rate in rates:
+                print(f"[Carga] {args.judges} jueces x {rate:g} puntos/s durante {args.duration:g}s...")
+                results.append(run_step(args, base_url, combate, probe, rate))
+        finally:
+            Clock.schedule_once(lambda dt: app.stop(), 0)
+
+    class LoadApp(App):
+        def build(self):
+            sm = ScreenManager()
+            screen = MainScreentabc(name="tablero_central")
+            sm.add_widget(screen)
+            Clock.schedule_once(lambda dt: self.start_combat(screen), 0.5)
+            Clock.schedule_interval(probe.on_frame, 0)
+            return sm
+
+        def start_combat(self, screen):
+            screen.set_competitors(
+                f"{combate['competidorRojo']['nombres']}", "MEX",
+                f"{combate['competidorAzul']['nombres']}", "KOR",
+                combate_data={
+                    "idCombate": combate["idCombate"],
+                    "idAlumnoRojo": combate["competidorRojo"]["id"],
+                    "idAlumnoAzul": combate["competidorAzul"]["id"],
+                    # Round largo: que no entre el descanso (en descanso se revierten los puntos)
+                    "duracionRound": "00:59:00",
+                    "duracionDescanso": "00:00:10",
+                    "numeroRounds": 1,
+                },
+            )
+            instrument(screen)
+            screen.center_panel.start_timer()
+            threading.Thread(target=load, args=(self, screen), daemon=True).start()
+
+    LoadApp().run()
+    server.shutdown()
+
+    print_report(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"judges": args.judges, "spread": args.spread, "latency_ms": args.latency,
+                       "jitter_ms": args.jitter, "results": results}, f, indent=2)
+        print(f"[Carga] Resultados guardados en {args.json}")
+
+
+if __name__ == "__main__":
+    main()
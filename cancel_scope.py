@@ -0,0 +1,93 @@
+import threading
+from concurrent.futures import CancelledError
+
+from app_log import get_logger
+
+
+log = get_logger("CancelScope")
+
+
+_local = threading.local()
+
+
+class CancelScope:
+    """
+    Agrupa las peticiones en segundo plano de una pantalla.
+    Al cerrarse cancela las tareas que aún no empezaron, hace que las que
+    están en curso descarten su respuesta y evita que sus callbacks
+    lleguen a la UI.
+    """
+
+    def __init__(self, name=""):
+        self.name = name
+        self._lock = threading.Lock()
+        self._futures = set()
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def track(self, future):
+        """Registra un Future para cancelarlo cuando se cierre el scope."""
+        with self._lock:
+            if self._closed:
+                future.cancel()
+                return future
+            self._futures.add(future)
+        future.add_done_callback(self._discard)
+        return future
+
+    def _discard(self, future):
+        with self._lock:
+            self._futures.discard(future)
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._futures)
+
+    def close(self) -> int:
+        """
+        Cierra el scope. Devuelve cuántas tareas pendientes se cancelaron
+        antes de empezar.
+        """
+        with self._lock:
+            self._closed = True
+            futures = list(self._futures)
+            self._futures.clear()
+        cancelled = sum(1 for f in futures if f.cancel())
+        if futures:
+            log.info("%s: %s canceladas, %s en curso descartadas",
+                     self.name, cancelled, len(futures) - cancelled)
+        return cancelled
+
+    def renew(self):
+        """Cierra este scope y devuelve uno nuevo con el mismo nombre."""
+        self.close()
+        return CancelScope(self.name)
+
+    def raise_if_closed(self):
+        if self._closed:
+            raise CancelledError(f"Scope '{self.name}' cerrado")
+
+
+def current_scope():
+    """Scope de la tarea que se ejecuta en el hilo actual (o None)."""
+    return getattr(_local, "scope", None)
+
+
+class activate_scope:
+    """Context manager que marca el scope activo en el hilo actual."""
+
+    def __init__(self, scope):
+        self.scope = scope
+        self._previous = None
+
+    def __enter__(self):
+        self._previous = current_scope()
+        _local.scope = self.scope
+        return self.scope
+
+    def __exit__(self, exc_type, exc, tb):
+        _local.scope = self._previous
+        return False
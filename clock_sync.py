@@ -0,0 +1,156 @@
+"""
+Sincronización del reloj del combate entre las pantallas de un tatami.
+
+Una sola pantalla es dueña del cronómetro (la consola del árbitro) y
+difunde su estado por el websocket del combate; las demás lo siguen. Cada
+una estima el desfase entre su time.monotonic() y el del servidor al estilo
+NTP, con un ping/pong por el mismo websocket:
+
+    t0 envío (cliente)   t1 llegada (servidor)   t2 respuesta (servidor)   t3 llegada (cliente)
+    desfase      = ((t1 - t0) + (t2 - t3)) / 2
+    ida y vuelta = (t3 - t0) - (t2 - t1)
+
+Se usa la muestra con menor ida y vuelta de las últimas CLOCK_SYNC_SAMPLES:
+su error es como mucho la mitad de esa ida y vuelta. El estado del dueño
+lleva "ref" en tiempo del servidor y cada seguidor lo pasa a su reloj local.
+"""
+import json
+import time
+from collections import deque
+
+from config import CLOCK_SYNC_SAMPLES, CLOCK_SYNC_BURST_INTERVAL, CLOCK_SYNC_INTERVAL
+
+
+OWNER = "owner"
+FOLLOWER = "follower"
+
+
+class ClockSync:
+    """Desfase (servidor - local) estimado con time_sync."""
+
+    def __init__(self, samples=CLOCK_SYNC_SAMPLES, clock=time.monotonic):
+        self._now = clock
+        self._samples = deque(maxlen=samples)
+        self.offset = None
+        self.round_trip = None
+        self.replies = 0
+
+    @property
+    def synced(self) -> bool:
+        return self.offset is not None
+
+    @property
+    def full(self) -> bool:
+        return len(self._samples) == self._samples.maxlen
+
+    def reset(self):
+        """Otro servidor u otra conexión: las muestras anteriores ya no valen."""
+        self._samples.clear()
+        self.offset = None
+        self.round_trip = None
+
+    def request(self) -> str:
+        return json.dumps({"action": "time_sync", "t0": self._now()})
+
+    def on_reply(self, data, received_at=None) -> bool:
+        """Registra una respuesta; True si es la primera (ya se puede traducir)."""
+        t3 = self._now() if received_at is None else received_at
+        t0, t1, t2 = data["t0"], data["t1"], data["t2"]
+        round_trip = (t3 - t0) - (t2 - t1)
+        if round_trip < 0:
+            return False
+        first = self.offset is None
+        self._samples.append((round_trip, ((t1 - t0) + (t2 - t3)) / 2))
+        self.round_trip, self.offset = min(self._samples)
+        self.replies += 1
+        return first
+
+    def to_server(self, local) -> float:
+        return local + (self.offset or 0.0)
+
+    def to_local(self, server) -> float:
+        return server - (self.offset or 0.0)
+
+    def stats(self) -> dict:
+        return {
+            "offset_ms": None if self.offset is None else self.offset * 1000,
+            "round_trip_ms": None if self.round_trip is None else self.round_trip * 1000,
+            "samples": len(self._samples),
+            "replies": self.replies,
+        }
+
+
+class ClockLink:
+    """
+    Une un MatchClock con el websocket del combate según el rol.
+
+    send(texto) -> bool envía por el socket. deliver(fn, *args) ejecuta en el
+    hilo dueño del reloj (en la app, ui_bus.post). get_clock() devuelve el
+    MatchClock a difundir (dueño); on_remote(state) adopta un estado del
+    dueño (seguidores).
+    """
+
+    def __init__(self, role, send, deliver, get_clock=None, on_remote=None, sync=None):
+        self.role = role
+        self.send = send
+        self.deliver = deliver
+        self.get_clock = get_clock
+        self.on_remote = on_remote
+        self.sync = sync or ClockSync()
+        self._pending = None    # estado recibido antes de tener desfase
+        self.published = 0
+        self.applied = 0
+
+    @property
+    def is_owner(self) -> bool:
+        return self.role == OWNER
+
+    def on_connected(self):
+        self.sync.reset()
+
+    def send_sync(self) -> bool:
+        return self.send(self.sync.request())
+
+    def next_sync_delay(self) -> float:
+        """Ráfaga hasta llenar las muestras; después, mantenimiento."""
+        return CLOCK_SYNC_INTERVAL if self.sync.full else CLOCK_SYNC_BURST_INTERVAL
+
+    def handle(self, data, received_at) -> bool:
+        """Procesa time_sync y clock_state (hilo del socket); True si el mensaje era del reloj."""
+        event = data.get("event")
+        if event == "time_sync":
+            if self.sync.on_reply(data, received_at):
+                if self.is_owner:
+                    self.deliver(self.publish)
+                elif self._pending is not None:
+                    state, self._pending = self._pending, None
+                    self._apply(state)
+            return True
+        if event == "clock_state":
+            if not self.is_owner and data.get("state"):
+                if self.sync.synced:
+                    self._apply(data["state"])
+                else:
+                    self._pending = data["state"]
+            return True
+        return False
+
+    def publish(self) -> bool:
+        """Dueño: difunde el estado del reloj (sin desfase todavía, se hará al sincronizar)."""
+        clock = self.get_clock() if self.get_clock else None
+        if not self.is_owner or clock is None or not self.sync.synced:
+            return False
+        if self.send(json.dumps({"action": "clock", "state": clock.to_state(self.sync)})):
+            self.published += 1
+            return True
+        return False
+
+    def _apply(self, state):
+        self.applied += 1
+        if self.on_remote is not None:
+            self.deliver(self.on_remote, state)
+
+    def stats(self) -> dict:
+        stats = self.sync.stats()
+        stats.update(role=self.role, published=self.published, applied=self.applied)
+        return stats
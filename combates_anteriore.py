@@ -15,10 +15,14 @@ from kivy.utils import platform
 from kivy.clock import Clock
 from kivy.animation import Animation
 from api_client import api
-from threading import Thread
+from task_executor import executor, PRIORITY_NORMAL, PRIORITY_LIST
+from cancel_scope import CancelScope
+import responsive
+from responsive import ResponsiveLayout
 
 
 # ------------------ UTILIDADES RESPONSIVE ------------------
+@responsive.tracked
 class ResponsiveHelper:
     @staticmethod
     def is_mobile():
@@ -87,14 +91,10 @@ class LightBlueButton(Button):
         self.bind(pos=self.update_rect, size=self.update_rect)
         self.bind(on_press=self.on_button_press)
         self.bind(on_release=self.on_button_release)
-        Window.bind(on_resize=self.on_window_resize)
 
     def update_rect(self, *args):
         self.rect.pos = self.pos
         self.rect.size = self.size
-    
-    def on_window_resize(self, instance, width, height):
-        self.font_size = ResponsiveHelper.get_font_size(16)
 
     def on_button_press(self, instance):
         anim = Animation(
@@ -420,11 +420,16 @@ class CombateCard(BoxLayout):
         self.on_delete_callback = on_delete
         self.on_edit_callback = on_edit
         
-        self.build_card()
-        Window.bind(on_resize=self.on_window_resize)
+        # Los botones cambian de disposición a 600 px y las filas de datos por debajo de 600
+        self.responsive = ResponsiveLayout(
+            self, build=self.rebuild_card, reflow=self.reflow_card,
+            layout_key=lambda: (Window.width > 600, Window.width < 600),
+        )
+        self.responsive.build()
 
     def build_card(self):
         self.clear_widgets()
+        self.value_labels = []
         
         button_rows_height = dp(110) if Window.width > 600 else dp(220)
         self.height = dp(180) + button_rows_height
@@ -557,8 +562,7 @@ class CombateCard(BoxLayout):
             bold=True
         )
         
-        card_width = Window.width * ResponsiveHelper.get_card_width() - dp(60)
-        value_width = card_width * (0.65 if Window.width < 600 else 0.7)
+        value_width = self.value_width()
         
         lbl_value = Label(
             text=value,
@@ -575,13 +579,20 @@ class CombateCard(BoxLayout):
         row.add_widget(lbl_label)
         row.add_widget(lbl_value)
         self.info_layout.add_widget(row)
+        self.value_labels.append(lbl_value)
+
+    def value_width(self):
+        card_width = Window.width * ResponsiveHelper.get_card_width() - dp(60)
+        return card_width * (0.65 if Window.width < 600 else 0.7)
 
     def update_graphics(self, *args):
         self.rect.pos = self.pos
         self.rect.size = self.size
 
-    def on_window_resize(self, instance, width, height):
-        Clock.schedule_once(lambda dt: self.rebuild_card(), 0.1)
+    def reflow_card(self):
+        value_width = self.value_width()
+        for lbl_value in self.value_labels:
+            lbl_value.text_size = (value_width, None)
 
     def rebuild_card(self):
         self.size_hint = (ResponsiveHelper.get_card_width(), None)
@@ -652,9 +663,7 @@ class CombateCard(BoxLayout):
                     lambda dt: self.show_error_popup(f"Error al obtener contraseña: {str(e)}")
                 )
         
-        thread = Thread(target=_fetch)
-        thread.daemon = True
-        thread.start()
+        executor.submit(_fetch, priority=PRIORITY_NORMAL)
 
     def show_error_popup(self, message):
         """Muestra un popup de error"""
@@ -720,8 +729,10 @@ class CombatesScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.combates = []
-        self.build_ui()
-        Window.bind(on_resize=self.on_window_resize)
+        self.scope = CancelScope('combates_anteriores')
+        self._load_seq = 0
+        self.responsive = ResponsiveLayout(self, build=self.build_ui)
+        self.responsive.build()
         print(f"[CombatesScreen] Inicializado para torneo: {self.torneo_nombre} (ID: {self.torneo_id})")
 
     def build_ui(self):
@@ -815,14 +826,16 @@ class CombatesScreen(Screen):
         self.rect.pos = self.layout.pos
         self.rect.size = self.layout.size
 
-    def on_window_resize(self, instance, width, height):
-        Clock.schedule_once(lambda dt: self.build_ui(), 0.1)
-    
     def on_enter(self):
         """Se ejecuta cada vez que se entra a la pantalla"""
         # Recargar combates para mostrar cambios
         self.load_combates()
 
+    def on_pre_leave(self, *args):
+        """Cancela las cargas pendientes para no actualizar una pantalla que ya no se ve"""
+        self.scope = self.scope.renew()
+        return super().on_pre_leave(*args)
+
     def load_combates(self):
         """Carga los combates desde la API"""
         print("[CombatesScreen] Iniciando carga de combates...")
@@ -834,34 +847,60 @@ class CombatesScreen(Screen):
             color=(0.2, 0.6, 1, 1)
         )
         self.grid.add_widget(loading_label)
-        
-        thread = Thread(target=self._fetch_combates)
-        thread.daemon = True
-        thread.start()
+        self.combates = []
+        self._load_seq += 1
+        
+        executor.submit(
+            self._fetch_combates,
+            self._load_seq,
+            self.scope,
+            priority=PRIORITY_LIST,
+            on_result=self._on_combates_loaded,
+            on_error=self._on_combates_error,
+            scope=self.scope
+        )
 
-    def _fetch_combates(self):
-        """Obtiene los combates de la API en segundo plano"""
+    def _fetch_combates(self, seq, scope):
+        """
+        Obtiene los combates de la API en segundo plano, página por página:
+        cada lote se pinta en cuanto llega. Devuelve el total recibido.
+        """
         print("[CombatesScreen] Fetching combates from API...")
-        try:
-            if self.torneo_id:
-                combates_data = api.get_combates_by_torneo(self.torneo_id)
-                print(f"[CombatesScreen] Recibidos {len(combates_data)} combates del torneo {self.torneo_id}")
-            else:
-                combates_data = api.get_all_combates()
-                print(f"[CombatesScreen] Recibidos {len(combates_data)} combates de la API")
-            
-            self.combates = [self._transform_combate(c) for c in combates_data]
-            print(f"[CombatesScreen] Combates transformados: {len(self.combates)}")
-            
-            Clock.schedule_once(lambda dt: self._display_combates())
-                
-        except RuntimeError as e:
+        total = 0
+        for batch in api.iter_combates(self.torneo_id):
+            combates = [self._transform_combate(c) for c in batch]
+            total += len(combates)
+            executor.deliver(self._on_combates_page, (seq, combates), scope=scope)
+        print(f"[CombatesScreen] Recibidos {total} combates" +
+              (f" del torneo {self.torneo_id}" if self.torneo_id else " de la API"))
+        return seq
+
+    def _on_combates_page(self, page):
+        """Agrega al grid un lote de combates (hilo principal)"""
+        seq, combates = page
+        if seq != self._load_seq:
+            return
+        if not self.combates:
+            # Primer lote: quitar el "Cargando..."
+            self.grid.clear_widgets()
+        self.combates.extend(combates)
+        for combate in combates:
+            self._add_combate_card(combate)
+
+    def _on_combates_loaded(self, seq):
+        """Se ejecuta en el hilo principal al terminar de recibir todas las páginas"""
+        if seq == self._load_seq and not self.combates:
+            self._display_combates()
+
+    def _on_combates_error(self, e):
+        """Se ejecuta en el hilo principal si falla la carga"""
+        if isinstance(e, RuntimeError):
             print(f"[CombatesScreen] RuntimeError: {e}")
-            Clock.schedule_once(lambda dt: self._show_error(str(e)))
-        except Exception as e:
+            self._show_error(str(e))
+        else:
             print(f"[CombatesScreen] Exception: {type(e).__name__}: {e}")
             error_msg = "No se pudo conectar al servidor" if "Connection" in str(e) else f"Error: {str(e)}"
-            Clock.schedule_once(lambda dt: self._show_error(error_msg))
+            self._show_error(error_msg)
 
     def _transform_combate(self, api_data):
         """Transforma los datos de la API al formato que espera la UI"""
@@ -981,12 +1020,15 @@ class CombatesScreen(Screen):
             return
         
         for combate in self.combates:
-            card = CombateCard(
-                combate_data=combate,
-                on_delete=self.delete_combate,
-                on_edit=self.edit_combate
-            )
-            self.grid.add_widget(card)
+            self._add_combate_card(combate)
+
+    def _add_combate_card(self, combate):
+        card = CombateCard(
+            combate_data=combate,
+            on_delete=self.delete_combate,
+            on_edit=self.edit_combate
+        )
+        self.grid.add_widget(card)
 
     def _show_error(self, message):
         """Muestra un mensaje de error en la UI"""
@@ -1048,9 +1090,7 @@ class CombatesScreen(Screen):
                     lambda dt: self.show_message("Error", f"Error al eliminar: {str(e)}")
                 )
         
-        thread = Thread(target=_do_delete)
-        thread.daemon = True
-        thread.start()
+        executor.submit(_do_delete, priority=PRIORITY_NORMAL)
 
     def _on_delete_success(self, combate_data):
         """Callback cuando se elimina exitosamente"""
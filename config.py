@@ -1,3 +1,4 @@
+import os
 
 API_BASE_URL = "http://localhost:8080"
 
@@ -5,10 +6,93 @@ DEFAULT_TIMEOUT = 15
 SHORT_TIMEOUT = 5
 LONG_TIMEOUT = 30
 
+# Pool de conexiones HTTP (keep-alive) compartido por toda la app
+HTTP_POOL_CONNECTIONS = 4
+HTTP_POOL_MAXSIZE = 10
+
+# Hilos de trabajo en segundo plano (peticiones de red)
+BACKGROUND_MAX_WORKERS = 4
+
+# Caché de respuestas GET (segundos de vigencia por prefijo de endpoint)
+HTTP_CACHE_MAX_ENTRIES = 128
+HTTP_CACHE_TTLS = {
+    "/apiTorneos/": 30,
+    "/apiCombates/": 15,
+    "/apiAdministradores/": 60,
+}
+
+# Listados largos: filas por página y tamaño de lectura al recibir en streaming
+LIST_PAGE_SIZE = 50
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# Reintentos de peticiones idempotentes (GET/HEAD/PUT) y circuit breaker por host
+HTTP_RETRY_ATTEMPTS = 3
+HTTP_RETRY_BASE_DELAY = 0.2
+HTTP_RETRY_MAX_DELAY = 2.0
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_RESET_TIMEOUT = 5
+
+# Marcador agregado (/marcador): timeouts seguidos tras los que se deja de consultar
+# y se usan directo las cuatro consultas en paralelo
+SCOREBOARD_AGGREGATE_MAX_TIMEOUTS = 2
+
+# Diario en disco de puntos/faltas pendientes de enviar (se reenvían al volver la conexión)
+MUTATION_JOURNAL_PATH = os.path.join(os.path.expanduser("~"), ".tt_escritorio", "mutaciones.jsonl")
+MUTATION_RETRY_MAX_DELAY = 5.0
+# Si el conteo que devuelve un toque trae más puntos de los esperados, segundos que se espera
+# a que el websocket confirme esos puntos de los jueces antes de avisar de una corrección
+SCORE_RECONCILE_GRACE = 1.5
+
+# Exportador local de métricas en formato Prometheus (0 = desactivado)
+METRICS_EXPORTER_PORT = 0
+
+# Grabar ("record") o reproducir ("replay") el tráfico con el backend desde un JSONL
+TRAFFIC_MODE = os.environ.get("TT_TRAFFIC_MODE", "")
+TRAFFIC_FILE = os.environ.get("TT_TRAFFIC_FILE", "trafico.jsonl")
+TRAFFIC_REPLAY_SPEED = float(os.environ.get("TT_TRAFFIC_SPEED", "1"))
+
+# Logging (app_log): nivel en consola (TT_LOG_LEVEL=DEBUG para ver payloads),
+# ring buffer en memoria para recuperar tras un incidente y archivo JSONL asíncrono
+LOG_CONSOLE_LEVEL = os.environ.get("TT_LOG_LEVEL", "INFO")
+LOG_RING_LEVEL = "DEBUG"
+LOG_RING_SIZE = 2000
+LOG_FILE_LEVEL = "INFO"
+LOG_FILE_PATH = os.path.join(os.path.expanduser("~"), ".tt_escritorio", "tt_escritorio.log.jsonl")
+LOG_FILE_MAX_BYTES = 5 * 1024 * 1024
+
+# Reloj del combate: cada cuánto se repinta (s) y por debajo de cuántos segundos muestra décimas
+MATCH_CLOCK_TICK = 0.1
+MATCH_CLOCK_TENTHS_BELOW = 10
+# Varias pantallas por tatami: "owner" (consola del árbitro, difunde su reloj) o "follower"
+# (solo lo muestra). El desfase con el servidor se estima con ráfagas de ping cada
+# CLOCK_SYNC_BURST_INTERVAL hasta tener CLOCK_SYNC_SAMPLES muestras y luego cada CLOCK_SYNC_INTERVAL
+MATCH_CLOCK_ROLE = os.environ.get("TT_CLOCK_ROLE", "owner")
+CLOCK_SYNC_SAMPLES = 8
+CLOCK_SYNC_BURST_INTERVAL = 0.1
+CLOCK_SYNC_INTERVAL = 5.0
+# Validación de puntos por la hora del evento: cuántos tramos de round corriendo se recuerdan,
+# margen (s) tras una pausa para un punto que el servidor recibió justo después, y cuánto se
+# espera (s) para anular en una sola llamada los puntos rechazados que lleguen juntos
+MATCH_CLOCK_HISTORY = 64
+SCORE_VALIDATION_GRACE = 0.15
+SCORE_CORRECTION_BATCH_DELAY = 0.3
+
+# Cambio de tamaño de ventana: segundos sin eventos on_resize antes de reacomodar las pantallas,
+# y cuántas medidas del ResponsiveHelper se recuerdan antes de limpiar las que ya no se usan
+RESIZE_DEBOUNCE = 0.25
+RESPONSIVE_TRACK_LIMIT = 20000
+
 
 WEBSOCKET_PORT = 8080
 WEBSOCKET_RECONNECT_DELAY = 5
+# Reconexión del websocket del tablero: espera creciente (desde WEBSOCKET_RECONNECT_DELAY)
+# con tope, y cuántos reintentos seguidos antes de rendirse; ping de keepalive en segundos
+WEBSOCKET_MAX_RECONNECT_DELAY = 30
+WEBSOCKET_MAX_RECONNECTS = 8
+WEBSOCKET_KEEPALIVE_INTERVAL = 30
+# Al reconectar se piden solo los eventos perdidos; con más de este hueco se recarga el marcador
+WEBSOCKET_RESUME_MAX_GAP = 200
 
 
 APP_NAME = "Sistema de Combates"
-APP_VERSION = "1.0.0"
\ No newline at end of file
+APP_VERSION = "1.0.0"
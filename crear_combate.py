@@ -18,9 +18,11 @@ from kivy.utils import platform
 from datetime import datetime, date
 import calendar
 from datetime import datetime
-from threading import Thread
-from kivy.clock import mainthread
+from task_executor import executor, PRIORITY_NORMAL
+from ui_bus import ui_thread
 from api_client import api
+import responsive
+from responsive import ResponsiveLayout
 
 from datetime import datetime
 
@@ -78,6 +80,7 @@ def dividir_nombre_completo(nombre_completo: str) -> dict:
 
 
 # ------------------ UTILIDADES RESPONSIVE ------------------
+@responsive.tracked
 class ResponsiveHelper:
     @staticmethod
     def is_mobile():
@@ -174,11 +177,6 @@ class DateSelector(BoxLayout):
         self.update_days()
         self.month_spinner.bind(text=self.update_days_on_change)
         self.year_spinner.bind(text=self.update_days_on_change)
-        Window.bind(on_resize=self.on_window_resize)
-        
-    def on_window_resize(self, instance, width, height):
-        for spinner in [self.year_spinner, self.month_spinner, self.day_spinner]:
-            spinner.font_size = ResponsiveHelper.get_font_size(18)
         
     def update_days_on_change(self, *args):
         self.update_days()
@@ -265,11 +263,6 @@ class TimeSelector(BoxLayout):
         self.get_selected_time()
         self.hour_spinner.bind(text=self.update_time)
         self.minute_spinner.bind(text=self.update_time)
-        Window.bind(on_resize=self.on_window_resize)
-        
-    def on_window_resize(self, instance, width, height):
-        self.hour_spinner.font_size = ResponsiveHelper.get_font_size(18)
-        self.minute_spinner.font_size = ResponsiveHelper.get_font_size(18)
         
     def update_time(self, *args):
         self.get_selected_time()
@@ -309,10 +302,6 @@ class RoundsSelector(BoxLayout):
         self.add_widget(self.rounds_spinner)
         self.get_selected_rounds()
         self.rounds_spinner.bind(text=self.update_rounds)
-        Window.bind(on_resize=self.on_window_resize)
-        
-    def on_window_resize(self, instance, width, height):
-        self.rounds_spinner.font_size = ResponsiveHelper.get_font_size(18)
         
     def update_rounds(self, *args):
         self.get_selected_rounds()
@@ -365,11 +354,6 @@ class DurationSelector(BoxLayout):
         self.get_selected_duration()
         self.minutes_spinner.bind(text=self.update_duration)
         self.seconds_spinner.bind(text=self.update_duration)
-        Window.bind(on_resize=self.on_window_resize)
-        
-    def on_window_resize(self, instance, width, height):
-        self.minutes_spinner.font_size = ResponsiveHelper.get_font_size(18)
-        self.seconds_spinner.font_size = ResponsiveHelper.get_font_size(18)
         
     def update_duration(self, *args):
         self.get_selected_duration()
@@ -409,10 +393,6 @@ class CategoriaPesoSelector(BoxLayout):
         self.add_widget(self.category_spinner)
         self.get_selected_category()
         self.category_spinner.bind(text=self.update_category)
-        Window.bind(on_resize=self.on_window_resize)
-        
-    def on_window_resize(self, instance, width, height):
-        self.category_spinner.font_size = ResponsiveHelper.get_font_size(18)
         
     def update_category(self, *args):
         self.get_selected_category()
@@ -449,16 +429,12 @@ class RoundedTextInput(TextInput):
                 radius=[dp(10)])
 
         self.bind(pos=self._update_rects, size=self._update_rects)
-        Window.bind(on_resize=self.on_window_resize)
 
     def _update_rects(self, *args):
         self.bg_rect.pos = self.pos
         self.bg_rect.size = self.size
         self.border_rect.pos = (self.pos[0]+dp(2), self.pos[1]+dp(2))
         self.border_rect.size = (self.size[0]-dp(4), self.size[1]-dp(4))
-    
-    def on_window_resize(self, instance, width, height):
-        self.font_size = ResponsiveHelper.get_font_size(18)
 
     def on_focus(self, instance, value):
         self.canvas.before.clear()
@@ -496,21 +472,17 @@ class HoverButton(Button):
             self.rect = RoundedRectangle(pos=self.pos, size=self.size, radius=[self.border_radius])
 
         self.bind(pos=self.update_rect, size=self.update_rect)
-        Window.bind(on_resize=self.on_window_resize)
 
     def update_rect(self, *args):
         self.rect.pos = self.pos
         self.rect.size = self.size
-    
-    def on_window_resize(self, instance, width, height):
-        self.font_size = ResponsiveHelper.get_font_size(18)
 
 
 class CrearCombateScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.build_ui()
-        Window.bind(on_resize=self.on_window_resize)
+        self.responsive = ResponsiveLayout(self, build=self.build_ui, reflow=self.reflow_layout)
+        self.responsive.build()
 
     def build_ui(self):
         self.clear_widgets()
@@ -526,15 +498,16 @@ class CrearCombateScreen(Screen):
             self.background_rect = Rectangle(size=main_layout.size, pos=main_layout.pos)
         main_layout.bind(size=self.update_background, pos=self.update_background)
 
-        main_layout.add_widget(Widget(size_hint_y=None, height=max(dp(15), Window.height * 0.02)))
+        self.top_spacer = Widget(size_hint_y=None, height=max(dp(15), Window.height * 0.02))
+        main_layout.add_widget(self.top_spacer)
 
         form_container = BoxLayout(orientation='vertical', size_hint=(ResponsiveHelper.get_form_width(), None),
                                   pos_hint={'center_x': 0.5}, spacing=dp(12))
         form_container.bind(minimum_height=form_container.setter('height'))
 
-        logo = Image(source="Imagen5-Photoroom.png", size_hint=(1, None), 
+        self.logo = Image(source="Imagen5-Photoroom.png", size_hint=(1, None), 
                     height=min(dp(100), Window.height * 0.12), allow_stretch=True, keep_ratio=True)
-        form_container.add_widget(logo)
+        form_container.add_widget(self.logo)
 
         titulo = Label(text='CREAR COMBATE', font_size=ResponsiveHelper.get_font_size(32),
                       color=(0.1, 0.4, 0.7, 1), bold=True, size_hint_y=None, height=dp(60))
@@ -692,7 +665,7 @@ class CrearCombateScreen(Screen):
         form_container.add_widget(Widget(size_hint_y=None, height=dp(15)))
 
         # BOTONES
-        botones_layout = BoxLayout(
+        self.botones_layout = botones_layout = BoxLayout(
             orientation='horizontal' if Window.width > 600 else 'vertical',
             spacing=dp(15),
             size_hint_y=None,
@@ -727,8 +700,13 @@ class CrearCombateScreen(Screen):
         self.background_rect.size = instance.size
         self.background_rect.pos = instance.pos
 
-    def on_window_resize(self, instance, width, height):
-        Clock.schedule_once(lambda dt: self.build_ui(), 0.1)
+    def reflow_layout(self):
+        """Lo que build_ui calcula a mano; el resto lo actualiza ResponsiveLayout"""
+        self.top_spacer.height = max(dp(15), Window.height * 0.02)
+        self.logo.height = min(dp(100), Window.height * 0.12)
+        horizontal = Window.width > 600
+        self.botones_layout.orientation = 'horizontal' if horizontal else 'vertical'
+        self.botones_layout.height = dp(50) if horizontal else dp(110)
 
     def mostrar_mensaje(self, titulo, mensaje):
         content = BoxLayout(orientation='vertical', spacing=dp(15), padding=dp(20))
@@ -1024,16 +1002,16 @@ class CrearCombateScreen(Screen):
             finally:
                 self._close_loading(loading)
 
-        Thread(target=work, daemon=True).start()
+        executor.submit(work, priority=PRIORITY_NORMAL)
 
-    @mainthread
+    @ui_thread
     def _close_loading(self, popup):
         try:
             popup.dismiss()
         except:
             pass
 
-    @mainthread
+    @ui_thread
     def _on_success(self, creado, fecha_dmy, hora_hm):
         """Callback cuando el combate se crea exitosamente"""
         c1 = self.competidor1_input.text
@@ -1074,7 +1052,7 @@ class CrearCombateScreen(Screen):
         except Exception as e:
             print(f"[CrearCombate] ✗ Error al volver: {e}")
 
-    @mainthread
+    @ui_thread
     def _on_error(self, msg):
         self.mostrar_mensaje("Error", f"Ocurrió un problema al crear el combate:\n{msg}")
 
@@ -18,11 +18,14 @@ from kivy.properties import StringProperty, ObjectProperty
 from kivy.utils import platform
 from datetime import datetime, date
 import calendar
-from threading import Thread
+from task_executor import executor, PRIORITY_NORMAL
 from api_client import api
+import responsive
+from responsive import ResponsiveLayout
 
 
 # ------------------ UTILIDADES RESPONSIVE ------------------
+@responsive.tracked
 class ResponsiveHelper:
     @staticmethod
     def is_mobile():
@@ -120,13 +123,6 @@ class DateSelector(BoxLayout):
         # Bind para actualizar días cuando cambia mes o año
         self.month_spinner.bind(text=self.update_days_on_change)
         self.year_spinner.bind(text=self.update_days_on_change)
-        Window.bind(on_resize=self.on_window_resize)
-        
-    def on_window_resize(self, instance, width, height):
-        self.year_spinner.font_size = ResponsiveHelper.get_font_size(18)
-        self.month_spinner.font_size = ResponsiveHelper.get_font_size(18)
-        self.day_spinner.font_size = ResponsiveHelper.get_font_size(18)
-        self.height = dp(55)
         
     def update_days_on_change(self, *args):
         self.update_days()
@@ -217,12 +213,6 @@ class TimeSelector(BoxLayout):
         # Bind para actualizar cuando cambia
         self.hour_spinner.bind(text=self.update_time)
         self.minute_spinner.bind(text=self.update_time)
-        Window.bind(on_resize=self.on_window_resize)
-        
-    def on_window_resize(self, instance, width, height):
-        self.hour_spinner.font_size = ResponsiveHelper.get_font_size(18)
-        self.minute_spinner.font_size = ResponsiveHelper.get_font_size(18)
-        self.height = dp(55)
         
     def update_time(self, *args):
         self.get_selected_time()
@@ -270,17 +260,12 @@ class RoundedTextInput(TextInput):
             )
 
         self.bind(pos=self._update_rects, size=self._update_rects)
-        Window.bind(on_resize=self.on_window_resize)
 
     def _update_rects(self, *args):
         self.bg_rect.pos = self.pos
         self.bg_rect.size = self.size
         self.border_rect.pos = (self.pos[0]+dp(2), self.pos[1]+dp(2))
         self.border_rect.size = (self.size[0]-dp(4), self.size[1]-dp(4))
-    
-    def on_window_resize(self, instance, width, height):
-        self.font_size = ResponsiveHelper.get_font_size(18)
-        self.height = dp(55)
 
     def on_focus(self, instance, value):
         if value:
@@ -338,15 +323,10 @@ class HoverButton(Button):
             )
 
         self.bind(pos=self.update_rect, size=self.update_rect)
-        Window.bind(on_resize=self.on_window_resize)
 
     def update_rect(self, *args):
         self.rect.pos = self.pos
         self.rect.size = self.size
-    
-    def on_window_resize(self, instance, width, height):
-        self.font_size = ResponsiveHelper.get_font_size(18)
-        self.height = dp(50)
 
 
 # ------------------ PANTALLA CREAR TORNEO RESPONSIVE ------------------
@@ -354,8 +334,8 @@ class CrearTorneoScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self._submitting = False
-        self.build_ui()
-        Window.bind(on_resize=self.on_window_resize)
+        self.responsive = ResponsiveLayout(self, build=self.build_ui, reflow=self.reflow_layout)
+        self.responsive.build()
 
     def build_ui(self):
         self.clear_widgets()
@@ -385,7 +365,8 @@ class CrearTorneoScreen(Screen):
 
         # Espaciador superior
         top_spacer_height = max(dp(20), Window.height * 0.03)
-        main_layout.add_widget(Widget(size_hint_y=None, height=top_spacer_height))
+        self.top_spacer = Widget(size_hint_y=None, height=top_spacer_height)
+        main_layout.add_widget(self.top_spacer)
 
         # Contenedor del formulario centrado
         form_container = BoxLayout(
@@ -398,14 +379,14 @@ class CrearTorneoScreen(Screen):
 
         # Logo responsive
         logo_height = min(dp(120), Window.height * 0.15)
-        logo = Image(
+        self.logo = Image(
             source="Imagen5-Photoroom.png",
             size_hint=(1, None),
             height=logo_height,
             allow_stretch=True,
             keep_ratio=True
         )
-        form_container.add_widget(logo)
+        form_container.add_widget(self.logo)
 
         # Título
         titulo = Label(
@@ -478,7 +459,7 @@ class CrearTorneoScreen(Screen):
         form_container.add_widget(Widget(size_hint_y=None, height=dp(15)))
 
         # Botones responsive
-        botones_layout = BoxLayout(
+        self.botones_layout = botones_layout = BoxLayout(
             orientation='horizontal' if Window.width > 600 else 'vertical',
             spacing=dp(15),
             size_hint_y=None,
@@ -515,8 +496,13 @@ class CrearTorneoScreen(Screen):
         self.background_rect.size = instance.size
         self.background_rect.pos = instance.pos
 
-    def on_window_resize(self, instance, width, height):
-        Clock.schedule_once(lambda dt: self.build_ui(), 0.1)
+    def reflow_layout(self):
+        """Lo que build_ui calcula a mano; el resto lo actualiza ResponsiveLayout"""
+        self.top_spacer.height = max(dp(20), Window.height * 0.03)
+        self.logo.height = min(dp(120), Window.height * 0.15)
+        horizontal = Window.width > 600
+        self.botones_layout.orientation = 'horizontal' if horizontal else 'vertical'
+        self.botones_layout.height = dp(50) if horizontal else dp(110)
 
     def mostrar_mensaje(self, titulo, mensaje, on_close=None):
         content = BoxLayout(
@@ -763,14 +749,11 @@ class CrearTorneoScreen(Screen):
                     instance.text = original_text
                 Clock.schedule_once(_reset, 0)
 
-        Thread(target=_task, daemon=True).start()
+        executor.submit(_task, priority=PRIORITY_NORMAL)
 
     def volver(self, instance):
         App.get_running_app().root.current = 'ini'
 
     def update_background(self, instance, value):
         self.background_rect.size = instance.size
-        self.background_rect.pos = instance.pos
-
-    def on_window_resize(self, instance, width, height):
-        Clock.schedule_once(lambda dt: self.build_ui(), 0.1)
\ No newline at end of file
+        self.background_rect.pos = instance.pos
\ No newline at end of file
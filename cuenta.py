@@ -15,9 +15,12 @@ from kivy.clock import Clock
 from kivy.app import App
 from api_client import api
 from session_manager import session
+import responsive
+from responsive import ResponsiveLayout
 
 
 # ------------------ UTILIDADES RESPONSIVE ------------------
+@responsive.tracked
 class ResponsiveHelper:
     @staticmethod
     def is_mobile():
@@ -135,8 +138,6 @@ class ResponsiveDataDisplay(BoxLayout):
             pos=self._update_rect,
             text=self._update_text
         )
-        
-        Window.bind(on_resize=self.on_window_resize)
     
     def _update_label_text_size(self, instance, value):
         """Actualiza el text_size del label para mantener el centrado"""
@@ -152,9 +153,6 @@ class ResponsiveDataDisplay(BoxLayout):
     
     def _update_text(self, instance, value):
         self.label.text = value
-    
-    def on_window_resize(self, instance, width, height):
-        self.label.font_size = ResponsiveHelper.get_font_size(18)
 
 
 # ------------------ BOTÓN HOVER RESPONSIVE ------------------
@@ -180,15 +178,10 @@ class HoverButton(Button):
             )
 
         self.bind(pos=self.update_rect, size=self.update_rect)
-        Window.bind(on_resize=self.on_window_resize)
 
     def update_rect(self, *args):
         self.rect.pos = self.pos
         self.rect.size = self.size
-    
-    def on_window_resize(self, instance, width, height):
-        self.font_size = ResponsiveHelper.get_font_size(18)
-        self.height = ResponsiveHelper.get_button_height()
 
 
 # ------------------ PANTALLA VER INFORMACIÓN ------------------
@@ -196,8 +189,8 @@ class VerInfoScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.admin_data = None
-        self.build_ui()
-        Window.bind(on_resize=self.on_window_resize)
+        self.responsive = ResponsiveLayout(self, build=self.build_ui, reflow=self.reflow_layout)
+        self.responsive.build()
 
     def on_pre_enter(self):
         """Se ejecuta antes de mostrar la pantalla"""
@@ -386,7 +379,7 @@ class VerInfoScreen(Screen):
         form_container.add_widget(Widget(size_hint_y=None, height=dp(10)))
 
         # Botones responsive
-        botones_layout = BoxLayout(
+        self.botones_layout = botones_layout = BoxLayout(
             orientation='horizontal' if Window.width > 800 else 'vertical',
             spacing=dp(15),
             size_hint_y=None,
@@ -417,8 +410,12 @@ class VerInfoScreen(Screen):
         main_layout.add_widget(scroll_view)
         self.add_widget(main_layout)
 
-    def on_window_resize(self, instance, width, height):
-        Clock.schedule_once(lambda dt: self.build_ui(), 0.1)
+    def reflow_layout(self):
+        """Lo que build_ui calcula a mano; el resto lo actualiza ResponsiveLayout"""
+        horizontal = Window.width > 800
+        self.botones_layout.orientation = 'horizontal' if horizontal else 'vertical'
+        button_height = ResponsiveHelper.get_button_height()
+        self.botones_layout.height = button_height if horizontal else button_height * 2 + dp(15)
 
     def actualizar_datos(self, instance):
         """Navega a la pantalla de actualización"""
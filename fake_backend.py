@@ -0,0 +1,806 @@
+"""
+Backend de prueba en memoria (solo biblioteca estándar).
+
+Implementa los endpoints que usan ApiClient y los tableros
+(/apiCombates, /apiTorneos, /apiPuntajes, /apiGamJeom, /apiAdministradores,
+/api/auth) y el websocket /ws/tablero/{combateId}, con latencia y jitter
+configurables. Sirve para pruebas de carga y benchmarks sin el backend Java.
+
+    python fake_backend.py --port 8080 --latency 40 --jitter 20 --combates 200
+
+Usuario de prueba: admin / admin. La contraseña de juez de cada combate es
+"combate{id}".
+
+Websocket: cada evento lleva "seq" (consecutivo por combate) y el saludo
+{"status": "connected", "seq": n} trae el último emitido. Tras reconectar,
+el cliente manda {"action": "resume", "lastSeq": n} y recibe los eventos
+perdidos (con "replay": true) seguidos de {"status": "resumed"}, o
+{"status": "resume_failed"} si el hueco ya salió del buffer.
+
+Reloj del combate (relay): {"action": "time_sync", "t0": x} se responde al
+momento con {"event": "time_sync", "t0", "t1", "t2"} en el reloj monotónico
+del servidor; {"action": "clock", "state": {...}} del dueño del cronómetro
+se reenvía a todos como {"event": "clock_state"} y se guarda para mandarlo
+a quien se conecte después. Cada score_update de un punto nuevo lleva
+"puntajeId" y "serverTime" (ese mismo reloj) para validarlo por su hora.
+"""
+import argparse
+import base64
+import gzip
+import hashlib
+import itertools
+import json
+import random
+import re
+import secrets
+import socket
+import struct
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs, unquote
+
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+class ApiError(Exception):
+    def __init__(self, status, message=""):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class WebSocketConnection:
+    """Lado servidor de un websocket (RFC 6455, solo frames de texto sin extensiones)."""
+
+    def __init__(self, rfile, wfile, sock=None):
+        self.rfile = rfile
+        self.wfile = wfile
+        self.sock = sock
+        self._send_lock = threading.Lock()
+        self.open = True
+
+    def send_text(self, text: str):
+        self._send_frame(0x1, text.encode("utf-8"))
+
+    def _send_frame(self, opcode, payload: bytes):
+        header = bytes([0x80 | opcode])
+        n = len(payload)
+        if n < 126:
+            header += bytes([n])
+        elif n < 1 << 16:
+            header += bytes([126]) + struct.pack("!H", n)
+        else:
+            header += bytes([127]) + struct.pack("!Q", n)
+        with self._send_lock:
+            if not self.open:
+                return
+            try:
+                self.wfile.write(header + payload)
+                self.wfile.flush()
+            except OSError:
+                self.open = False
+
+    def drop(self):
+        """Corta la conexión sin handshake de cierre (simula una caída de red)."""
+        self.open = False
+        if self.sock is not None:
+            try:
+                self.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def _read_exact(self, n):
+        data = self.rfile.read(n)
+        if len(data) < n:
+            raise ConnectionError("websocket cerrado")
+        return data
+
+    def receive(self):
+        """Devuelve (opcode, payload) del siguiente frame del cliente."""
+        b1, b2 = self._read_exact(2)
+        opcode = b1 & 0x0F
+        n = b2 & 0x7F
+        if n == 126:
+            n = struct.unpack("!H", self._read_exact(2))[0]
+        elif n == 127:
+            n = struct.unpack("!Q", self._read_exact(8))[0]
+        mask = self._read_exact(4) if b2 & 0x80 else None
+        payload = self._read_exact(n)
+        if mask:
+            payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        return opcode, payload
+
+    def serve(self, on_text=None):
+        """Atiende frames de control hasta que el cliente cierre."""
+        try:
+            while self.open:
+                opcode, payload = self.receive()
+                if opcode == 0x8:
+                    self._send_frame(0x8, payload[:2])
+                    break
+                if opcode == 0x9:
+                    self._send_frame(0xA, payload)
+                elif opcode == 0x1 and on_text:
+                    on_text(payload.decode("utf-8", errors="replace"))
+        except (ConnectionError, OSError, ValueError):
+            pass
+        finally:
+            self.open = False
+
+
+class FakeBackend:
+    """
+    Estado en memoria y rutas del backend. handle() es independiente de HTTP
+    para poder llamarse directo desde pruebas. Con honor_idempotency=False
+    ignora Idempotency-Key, como el backend Java.
+    """
+
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, paginate=True, seed=0, resume_buffer=256,
+                 honor_idempotency=True):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.paginate = paginate
+        self.random = random.Random(seed)
+        self.lock = threading.RLock()
+        self.ids = itertools.count(1)
+        self.alumnos = {}
+        self.combates = {}
+        self.torneos = {}
+        self.puntajes = []
+        self.faltas = []
+        self.administradores = {}
+        self.tokens = set()
+        self.idempotent = {}           # Idempotency-Key -> (status, respuesta)
+        self.honor_idempotency = honor_idempotency
+        self.subscribers = {}          # combateId -> set(WebSocketConnection)
+        self.sequences = {}            # combateId -> último seq emitido
+        self.history = {}              # combateId -> deque de eventos recientes (para resume)
+        self.resume_buffer = resume_buffer
+        self.clock_states = {}         # combateId -> último estado del reloj del dueño
+        self.resumes = 0
+        self.resume_failures = 0
+        self.requests_served = 0
+        self.idempotent_hits = 0
+        self.routes = [
+            ("POST", r"/api/auth/admin/login", self.admin_login),
+            ("POST", r"/api/auth/admin/logout", self.admin_logout),
+            ("POST", r"/api/auth/juez/login", self.juez_login),
+
+            ("GET", r"/apiCombates/combates", self.list_combates),
+            ("GET", r"/apiCombates/combates/torneo/(\d+)", self.combates_by_torneo),
+            ("GET", r"/apiCombates/combates/area/([^/]+)", self.combates_by_area),
+            ("GET", r"/apiCombates/combates/estado/([^/]+)", self.combates_by_estado),
+            ("POST", r"/apiCombates/combate", self.create_combate),
+            ("GET", r"/apiCombates/combate/(\d+)", self.get_combate),
+            ("PUT", r"/apiCombates/combate/(\d+)", self.update_combate),
+            ("DELETE", r"/apiCombates/combate/(\d+)", self.delete_combate),
+            ("POST", r"/apiCombates/combate/(\d+)/prepare", self.prepare_combate),
+            ("GET", r"/apiCombates/combate/(\d+)/marcador", self.marcador),
+
+            ("GET", r"/apiTorneos/torneo", self.list_torneos),
+            ("GET", r"/apiTorneos/torneo/ultimo", self.ultimo_torneo),
+            ("POST", r"/apiTorneos/torneo", self.create_torneo),
+            ("GET", r"/apiTorneos/torneo/(\d+)", self.get_torneo),
+            ("PUT", r"/apiTorneos/torneo/(\d+)", self.update_torneo),
+            ("DELETE", r"/apiTorneos/torneo/(\d+)", self.delete_torneo),
+
+            ("GET", r"/apiPuntajes/puntaje", self.list_puntajes),
+            ("POST", r"/apiPuntajes/puntaje", self.create_puntaje),
+            ("POST", r"/apiPuntajes/puntaje/simple", self.add_puntaje_simple),
+            ("GET", r"/apiPuntajes/puntaje/alumno/(\d+)/count", self.puntaje_count),
+            ("DELETE", r"/apiPuntajes/puntaje/alumno/(\d+)/last", self.delete_last_puntaje),
+            ("POST", r"/apiPuntajes/puntaje/anular", self.anular_puntajes),
+            ("GET", r"/apiPuntajes/puntaje/(\d+)", self.get_puntaje),
+            ("PUT", r"/apiPuntajes/puntaje/(\d+)", self.update_puntaje),
+            ("DELETE", r"/apiPuntajes/puntaje/(\d+)", self.delete_puntaje),
+
+            ("POST", r"/apiGamJeom/falta/simple", self.add_falta_simple),
+            ("GET", r"/apiGamJeom/falta/alumno/(\d+)/combate/(\d+)/count", self.falta_count),
+            ("DELETE", r"/apiGamJeom/falta/alumno/(\d+)/combate/(\d+)/last", self.delete_last_falta),
+
+            ("GET", r"/apiAdministradores/administrador", self.list_admins),
+            ("POST", r"/apiAdministradores/administrador", self.create_admin),
+            ("GET", r"/apiAdministradores/administrador/(\d+)", self.get_admin),
+            ("PUT", r"/apiAdministradores/administrador/(\d+)", self.update_admin),
+            ("DELETE", r"/apiAdministradores/administrador/(\d+)", self.delete_admin),
+
+            # Solo del backend de prueba: simular eventos de los jueces y caídas de red
+            ("POST", r"/fake/combate/(\d+)/incidencia", self.fake_incidencia),
+            ("POST", r"/fake/combate/(\d+)/drop", self.fake_drop),
+        ]
+        self.routes = [(m, re.compile(p + "$"), fn) for m, p, fn in self.routes]
+
+    # ------------------------------------------------------------------ datos
+
+    def seed(self, torneos=3, combates_por_torneo=10):
+        """Carga datos de ejemplo: un administrador, torneos y combates."""
+        with self.lock:
+            admin = {
+                "idAdministrador": next(self.ids), "nombres": "Admin", "apellidos": "Prueba",
+                "correo": "admin@example.com", "login": "admin", "password": "admin",
+            }
+            self.administradores[admin["idAdministrador"]] = admin
+            for t in range(torneos):
+                torneo = self.create_torneo(payload={
+                    "nombre": f"Torneo {t + 1}",
+                    "fechaHora": (datetime(2025, 3, 1, 9) + timedelta(days=7 * t)).isoformat(),
+                    "sede": "Deportivo Benito Juárez",
+                    "estado": "PROGRAMADO",
+                    "administrador": {"idAdministrador": admin["idAdministrador"]},
+                })
+                for c in range(combates_por_torneo):
+                    self.create_combate(payload=self._sample_combate(torneo["idTorneo"], c))
+        return self
+
+    def _sample_combate(self, torneo_id, n):
+        def competidor(color):
+            return {
+                "nombreAlumno": f"Alumno {color} {n}", "paternoAlumno": "Hernández",
+                "maternoAlumno": "López", "fechaNacimiento": "2009-04-17",
+                "pesoKg": 45 + n % 20, "alturaCm": 150, "sexo": "M", "nacionalidad": "MX",
+            }
+        juez = lambda i: {"nombres": f"Juez {i}", "apellidos": "Martínez"}
+        return {
+            "competidorRojo": competidor("Rojo"),
+            "competidorAzul": competidor("Azul"),
+            "horaCombate": f"2025-03-14T{9 + n % 8:02d}:30:00",
+            "area": f"Área {1 + n % 4}",
+            "categoria": "Juvenil",
+            "estado": "PENDIENTE",
+            "numeroRound": 3,
+            "duracionRound": "00:02:00",
+            "duracionDescanso": "00:01:00",
+            "torneo": {"idTorneo": torneo_id},
+            "jueces": {"arbitroCentral": juez(0), "juez1": juez(1), "juez2": juez(2), "juez3": juez(3)},
+        }
+
+    def _alumno_from(self, data):
+        alumno = {
+            "id": data.get("id") or next(self.ids),
+            "nombres": data.get("nombres") or data.get("nombreAlumno", ""),
+            "apellidoPaterno": data.get("apellidoPaterno") or data.get("paternoAlumno", ""),
+            "apellidoMaterno": data.get("apellidoMaterno") or data.get("maternoAlumno", ""),
+            "fechaNacimiento": data.get("fechaNacimiento"),
+            "pesoKg": data.get("pesoKg"),
+            "alturaCm": data.get("alturaCm"),
+            "sexo": data.get("sexo"),
+            "nacionalidad": data.get("nacionalidad"),
+        }
+        self.alumnos[alumno["id"]] = alumno
+        return alumno
+
+    # ------------------------------------------------------------------ HTTP
+
+    def handle(self, method, path, query=None, payload=None, headers=None):
+        """Devuelve (status, cuerpo) para una petición ya decodificada."""
+        headers = headers or {}
+        for route_method, pattern, fn in self.routes:
+            if route_method != method:
+                continue
+            match = pattern.match(path)
+            if not match:
+                continue
+            key = headers.get("Idempotency-Key") if self.honor_idempotency else None
+            with self.lock:
+                self.requests_served += 1
+                if key and key in self.idempotent:
+                    # Reenvío de una mutación ya aplicada: misma respuesta, sin repetirla
+                    self.idempotent_hits += 1
+                    return self.idempotent[key]
+                try:
+                    args = [int(g) if g.isdigit() else unquote(g) for g in match.groups()]
+                    result = (200, fn(*args, query=query or {}, payload=payload))
+                except ApiError as e:
+                    result = (e.status, {"error": e.message})
+                if key and result[0] < 500:
+                    self.idempotent[key] = result
+                return result
+        return 404, {"error": f"Ruta no encontrada: {method} {path}"}
+
+    def delay(self):
+        if self.latency_ms or self.jitter_ms:
+            ms = self.latency_ms + self.random.uniform(-self.jitter_ms, self.jitter_ms)
+            time.sleep(max(0.0, ms) / 1000)
+
+    def _page(self, rows, query):
+        """Pagina como Spring ({content, last, ...}) si se pide ?page=; si no, arreglo plano."""
+        if not self.paginate or "page" not in query:
+            return rows
+        page = int(query["page"][0])
+        size = int(query.get("size", ["20"])[0])
+        content = rows[page * size:(page + 1) * size]
+        total_pages = max(1, -(-len(rows) // size))
+        return {
+            "content": content, "number": page, "size": size,
+            "totalElements": len(rows), "totalPages": total_pages,
+            "first": page == 0, "last": page >= total_pages - 1,
+        }
+
+    @staticmethod
+    def _get(collection, key, what):
+        if key not in collection:
+            raise ApiError(404, f"{what} {key} no encontrado")
+        return collection[key]
+
+    @staticmethod
+    def _param(query, name):
+        values = query.get(name)
+        if not values:
+            raise ApiError(400, f"Falta el parámetro {name}")
+        return int(values[0])
+
+    # ------------------------------------------------------------------ auth
+
+    def admin_login(self, query, payload):
+        payload = payload or {}
+        for admin in self.administradores.values():
+            if admin.get("login") == payload.get("login") and admin.get("password") == payload.get("password"):
+                token = secrets.token_hex(16)
+                self.tokens.add(token)
+                public = {k: v for k, v in admin.items() if k != "password"}
+                return {"accessToken": token, "tokenType": "Bearer", "expiresIn": 7200, "admin": public}
+        raise ApiError(401, "Credenciales inválidas")
+
+    def admin_logout(self, query, payload):
+        return {"message": "Sesión cerrada"}
+
+    def juez_login(self, query, payload):
+        password = (payload or {}).get("password")
+        for combate in self.combates.values():
+            if password and combate.get("contrasenaCombate") == password:
+                return {"combateId": combate["idCombate"]}
+        raise ApiError(401, "Contraseña de combate inválida")
+
+    # ------------------------------------------------------------------ combates
+
+    def list_combates(self, query, payload):
+        return self._page(list(self.combates.values()), query)
+
+    def combates_by_torneo(self, torneo_id, query, payload):
+        rows = [c for c in self.combates.values() if c.get("idTorneo") == torneo_id]
+        return self._page(rows, query)
+
+    def combates_by_area(self, area, query, payload):
+        return [c for c in self.combates.values() if c.get("area") == area]
+
+    def combates_by_estado(self, estado, query, payload):
+        return [c for c in self.combates.values() if c.get("estado") == estado]
+
+    def create_combate(self, query=None, payload=None):
+        payload = dict(payload or {})
+        combate_id = next(self.ids)
+        torneo_id = payload.pop("idTorneo", None) or (payload.get("torneo") or {}).get("idTorneo")
+        payload["competidorRojo"] = self._alumno_from(payload.get("competidorRojo") or {})
+        payload["competidorAzul"] = self._alumno_from(payload.get("competidorAzul") or {})
+        payload.setdefault("contrasenaCombate", f"combate{combate_id}")
+        payload.setdefault("estado", "PENDIENTE")
+        payload.update(idCombate=combate_id, idTorneo=torneo_id)
+        self.combates[combate_id] = payload
+        return payload
+
+    def get_combate(self, combate_id, query, payload):
+        return self._get(self.combates, combate_id, "Combate")
+
+    def update_combate(self, combate_id, query, payload):
+        combate = self._get(self.combates, combate_id, "Combate")
+        combate.update({k: v for k, v in (payload or {}).items() if k != "idCombate"})
+        return combate
+
+    def delete_combate(self, combate_id, query, payload):
+        self._get(self.combates, combate_id, "Combate")
+        del self.combates[combate_id]
+        return {"message": "Combate eliminado"}
+
+    def prepare_combate(self, combate_id, query, payload):
+        self._get(self.combates, combate_id, "Combate")
+        self.subscribers.setdefault(combate_id, set())
+        return "OK"
+
+    def marcador(self, combate_id, query, payload):
+        combate = self._get(self.combates, combate_id, "Combate")
+        rojo = combate["competidorRojo"]["id"]
+        azul = combate["competidorAzul"]["id"]
+        return {
+            "combateId": combate_id,
+            "puntajeRojo": self._count_puntajes(rojo),
+            "puntajeAzul": self._count_puntajes(azul),
+            "faltasRojo": self._count_faltas(rojo, combate_id),
+            "faltasAzul": self._count_faltas(azul, combate_id),
+        }
+
+    # ------------------------------------------------------------------ torneos
+
+    def list_torneos(self, query, payload):
+        return self._page(list(self.torneos.values()), query)
+
+    def ultimo_torneo(self, query, payload):
+        if not self.torneos:
+            raise ApiError(404, "No hay torneos")
+        return self.torneos[max(self.torneos)]
+
+    def create_torneo(self, query=None, payload=None):
+        torneo = dict(payload or {}, idTorneo=next(self.ids))
+        self.torneos[torneo["idTorneo"]] = torneo
+        return torneo
+
+    def get_torneo(self, torneo_id, query, payload):
+        return self._get(self.torneos, torneo_id, "Torneo")
+
+    def update_torneo(self, torneo_id, query, payload):
+        torneo = self._get(self.torneos, torneo_id, "Torneo")
+        torneo.update({k: v for k, v in (payload or {}).items() if k != "idTorneo"})
+        return torneo
+
+    def delete_torneo(self, torneo_id, query, payload):
+        self._get(self.torneos, torneo_id, "Torneo")
+        del self.torneos[torneo_id]
+        for cid in [c for c, data in self.combates.items() if data.get("idTorneo") == torneo_id]:
+            del self.combates[cid]
+        return {"message": "Torneo eliminado"}
+
+    # ------------------------------------------------------------------ puntajes
+
+    def _count_puntajes(self, alumno_id):
+        return sum(1 for p in self.puntajes if p["alumnoId"] == alumno_id)
+
+    def _new_puntaje(self, combate_id, alumno_id, valor=1):
+        puntaje = {
+            "idPuntaje": next(self.ids), "combateId": combate_id, "alumnoId": alumno_id,
+            "valorPuntaje": valor, "fechaHora": _now(),
+        }
+        self.puntajes.append(puntaje)
+        self._broadcast_score(combate_id, alumno_id, puntaje)
+        return puntaje
+
+    def _broadcast_score(self, combate_id, alumno_id, puntaje=None):
+        """Un punto nuevo lleva su id y la hora de llegada (mismo reloj que time_sync)."""
+        message = {
+            "event": "score_update", "combateId": combate_id,
+            "alumnoId": alumno_id, "count": self._count_puntajes(alumno_id),
+        }
+        if puntaje is not None:
+            message.update(puntajeId=puntaje["idPuntaje"], serverTime=time.monotonic())
+        self.broadcast(combate_id, message)
+
+    def list_puntajes(self, query, payload):
+        return self._page(list(self.puntajes), query)
+
+    def create_puntaje(self, query, payload):
+        payload = payload or {}
+        combate_id = payload.get("combateId") or (payload.get("combate") or {}).get("idCombate")
+        alumno_id = payload.get("alumnoId") or (payload.get("alumno") or {}).get("id")
+        if not combate_id or not alumno_id:
+            raise ApiError(400, "Faltan combateId / alumnoId")
+        return self._new_puntaje(combate_id, alumno_id, payload.get("valorPuntaje", 1))
+
+    def add_puntaje_simple(self, query, payload):
+        combate_id = self._param(query, "combateId")
+        alumno_id = self._param(query, "alumnoId")
+        valor = int(query.get("valorPuntaje", ["1"])[0])
+        puntaje = self._new_puntaje(combate_id, alumno_id, valor)
+        return {"newCount": self._count_puntajes(alumno_id), "puntaje": puntaje}
+
+    def puntaje_count(self, alumno_id, query, payload):
+        return {"alumnoId": alumno_id, "count": self._count_puntajes(alumno_id)}
+
+    def delete_last_puntaje(self, alumno_id, query, payload):
+        for i in range(len(self.puntajes) - 1, -1, -1):
+            if self.puntajes[i]["alumnoId"] == alumno_id:
+                puntaje = self.puntajes.pop(i)
+                self._broadcast_score(puntaje["combateId"], alumno_id)
+                return {"newCount": self._count_puntajes(alumno_id)}
+        raise ApiError(404, "El alumno no tiene puntos")
+
+    def anular_puntajes(self, query, payload):
+        payload = payload or {}
+        combate_id = payload.get("combateId")
+        ids = set(payload.get("puntajeIds") or ())
+        removed = [p for p in self.puntajes if p["idPuntaje"] in ids]
+        self.puntajes = [p for p in self.puntajes if p["idPuntaje"] not in ids]
+        counts = {}
+        for alumno_id in sorted({p["alumnoId"] for p in removed}):
+            counts[alumno_id] = self._count_puntajes(alumno_id)
+            # Un solo aviso por alumno, no uno por punto anulado
+            self._broadcast_score(combate_id or removed[0]["combateId"], alumno_id)
+        return {"removed": len(removed), "counts": counts}
+
+    def get_puntaje(self, puntaje_id, query, payload):
+        for p in self.puntajes:
+            if p["idPuntaje"] == puntaje_id:
+                return p
+        raise ApiError(404, f"Puntaje {puntaje_id} no encontrado")
+
+    def update_puntaje(self, puntaje_id, query, payload):
+        puntaje = self.get_puntaje(puntaje_id, query, payload)
+        puntaje.update({k: v for k, v in (payload or {}).items() if k != "idPuntaje"})
+        return puntaje
+
+    def delete_puntaje(self, puntaje_id, query, payload):
+        puntaje = self.get_puntaje(puntaje_id, query, payload)
+        self.puntajes.remove(puntaje)
+        self._broadcast_score(puntaje["combateId"], puntaje["alumnoId"])
+        return {"message": "Puntaje eliminado"}
+
+    # ------------------------------------------------------------------ GAM-JEOM
+
+    def _count_faltas(self, alumno_id, combate_id):
+        return sum(1 for f in self.faltas if f["alumnoId"] == alumno_id and f["combateId"] == combate_id)
+
+    def add_falta_simple(self, query, payload):
+        combate_id = self._param(query, "combateId")
+        alumno_id = self._param(query, "alumnoId")
+        self.faltas.append({
+            "idFalta": next(self.ids), "combateId": combate_id,
+            "alumnoId": alumno_id, "fechaHora": _now(),
+        })
+        total = self._count_faltas(alumno_id, combate_id)
+        return {"totalFaltas": total, "descalificado": total >= 3}
+
+    def falta_count(self, alumno_id, combate_id, query, payload):
+        return {"alumnoId": alumno_id, "combateId": combate_id,
+                "count": self._count_faltas(alumno_id, combate_id)}
+
+    def delete_last_falta(self, alumno_id, combate_id, query, payload):
+        for i in range(len(self.faltas) - 1, -1, -1):
+            f = self.faltas[i]
+            if f["alumnoId"] == alumno_id and f["combateId"] == combate_id:
+                del self.faltas[i]
+                return {"newCount": self._count_faltas(alumno_id, combate_id)}
+        raise ApiError(404, "El alumno no tiene faltas")
+
+    # ------------------------------------------------------------------ administradores
+
+    def list_admins(self, query, payload):
+        return [{k: v for k, v in a.items() if k != "password"} for a in self.administradores.values()]
+
+    def create_admin(self, query, payload):
+        admin = dict(payload or {}, idAdministrador=next(self.ids))
+        self.administradores[admin["idAdministrador"]] = admin
+        return admin
+
+    def get_admin(self, admin_id, query, payload):
+        admin = self._get(self.administradores, admin_id, "Administrador")
+        return {k: v for k, v in admin.items() if k != "password"}
+
+    def update_admin(self, admin_id, query, payload):
+        admin = self._get(self.administradores, admin_id, "Administrador")
+        admin.update({k: v for k, v in (payload or {}).items() if k != "idAdministrador"})
+        return self.get_admin(admin_id, query, payload)
+
+    def delete_admin(self, admin_id, query, payload):
+        self._get(self.administradores, admin_id, "Administrador")
+        del self.administradores[admin_id]
+        return {"message": "Administrador eliminado"}
+
+    # ------------------------------------------------------------------ websocket
+
+    def fake_incidencia(self, combate_id, query, payload):
+        self.broadcast(combate_id, {"event": "incidencia_confirmada", "combateId": combate_id})
+        return {"message": "Incidencia enviada"}
+
+    def fake_drop(self, combate_id, query, payload):
+        with self.lock:
+            targets = list(self.subscribers.get(combate_id, ()))
+        for conn in targets:
+            conn.drop()
+        return {"dropped": len(targets)}
+
+    def subscribe(self, combate_id, conn):
+        """Registra la conexión y le envía el saludo con el seq actual (atómico frente a broadcast)."""
+        with self.lock:
+            self.subscribers.setdefault(combate_id, set()).add(conn)
+            conn.send_text(json.dumps({
+                "status": "connected", "combateId": combate_id,
+                "seq": self.sequences.get(combate_id, 0),
+            }))
+            if combate_id in self.clock_states:
+                # Sin seq: no es un evento nuevo, solo el estado vigente para el que llega
+                conn.send_text(json.dumps({"event": "clock_state", "state": self.clock_states[combate_id]}))
+
+    def unsubscribe(self, combate_id, conn):
+        with self.lock:
+            self.subscribers.get(combate_id, set()).discard(conn)
+
+    def broadcast(self, combate_id, message: dict):
+        """
+        Numera el evento (seq por combate), lo guarda para resume y lo envía.
+        Todo bajo el lock para que cada cliente reciba los seq en orden,
+        también frente a un resume en curso.
+        """
+        with self.lock:
+            seq = self.sequences.get(combate_id, 0) + 1
+            self.sequences[combate_id] = seq
+            message = dict(message, seq=seq)
+            history = self.history.get(combate_id)
+            if history is None:
+                history = self.history[combate_id] = deque(maxlen=self.resume_buffer)
+            history.append(message)
+            text = json.dumps(message)
+            for conn in list(self.subscribers.get(combate_id, ())):
+                conn.send_text(text)
+
+    def on_ws_text(self, combate_id, conn, text):
+        """Mensajes del cliente: 'ping', resume, time_sync o clock."""
+        received = time.monotonic()
+        if not text.startswith("{"):
+            return
+        try:
+            request = json.loads(text)
+        except ValueError:
+            return
+        action = request.get("action")
+        if action == "time_sync":
+            conn.send_text(json.dumps({
+                "event": "time_sync", "t0": request.get("t0"),
+                "t1": received, "t2": time.monotonic(),
+            }))
+            return
+        if action == "clock":
+            with self.lock:
+                self.clock_states[combate_id] = request.get("state")
+                self.broadcast(combate_id, {"event": "clock_state", "state": request.get("state")})
+            return
+        if action != "resume":
+            return
+        last = int(request.get("lastSeq") or 0)
+        with self.lock:
+            current = self.sequences.get(combate_id, 0)
+            history = self.history.get(combate_id) or ()
+            oldest = history[0]["seq"] if history else current + 1
+            if last > current or last + 1 < oldest:
+                # El hueco ya no está en el buffer (o el cliente viene de otro servidor)
+                self.resume_failures += 1
+                conn.send_text(json.dumps({"status": "resume_failed", "combateId": combate_id, "seq": current}))
+                return
+            missed = [m for m in history if m["seq"] > last]
+            for message in missed:
+                conn.send_text(json.dumps(dict(message, replay=True)))
+            self.resumes += 1
+            conn.send_text(json.dumps({
+                "status": "resumed", "combateId": combate_id,
+                "from": last, "seq": current, "count": len(missed),
+            }))
+
+    # ------------------------------------------------------------------ servidor
+
+    def serve(self, host="127.0.0.1", port=8080, compress=True):
+        """Arranca el servidor HTTP/websocket en un hilo; devuelve el ThreadingHTTPServer."""
+        server = ThreadingHTTPServer((host, port), _make_handler(self, compress))
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="fake-backend", daemon=True).start()
+        return server
+
+
+def _make_handler(backend: FakeBackend, compress: bool):
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.headers.get("Upgrade", "").lower() == "websocket":
+                self._websocket()
+            else:
+                self._dispatch("GET")
+
+        def do_POST(self):
+            self._dispatch("POST")
+
+        def do_PUT(self):
+            self._dispatch("PUT")
+
+        def do_DELETE(self):
+            self._dispatch("DELETE")
+
+        def do_HEAD(self):
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def _dispatch(self, method):
+            parts = urlsplit(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            try:
+                payload = json.loads(raw) if raw else None
+            except ValueError:
+                self._reply(400, {"error": "JSON inválido"})
+                return
+            backend.delay()
+            status, body = backend.handle(
+                method, parts.path, parse_qs(parts.query), payload, dict(self.headers)
+            )
+            self._reply(status, body)
+
+        def _reply(self, status, body):
+            if isinstance(body, str):
+                data, content_type = body.encode("utf-8"), "text/plain; charset=utf-8"
+            else:
+                data, content_type = json.dumps(body).encode("utf-8"), "application/json"
+
+            etag = None
+            if self.command == "GET" and status == 200:
+                etag = '"%s"' % hashlib.md5(data).hexdigest()
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            if etag:
+                self.send_header("ETag", etag)
+            if compress and len(data) > 1024 and "gzip" in self.headers.get("Accept-Encoding", ""):
+                data = gzip.compress(data, compresslevel=5)
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _websocket(self):
+            match = re.match(r"/ws/tablero/(\d+)$", urlsplit(self.path).path)
+            key = self.headers.get("Sec-WebSocket-Key")
+            if not match or not key:
+                self._reply(404, {"error": "Websocket no encontrado"})
+                return
+            combate_id = int(match.group(1))
+            accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+            self.send_response(101)
+            self.send_header("Upgrade", "websocket")
+            self.send_header("Connection", "Upgrade")
+            self.send_header("Sec-WebSocket-Accept", accept)
+            self.end_headers()
+            self.wfile.flush()
+
+            conn = WebSocketConnection(self.rfile, self.wfile, self.connection)
+            backend.subscribe(combate_id, conn)
+            try:
+                conn.serve(on_text=lambda text: backend.on_ws_text(combate_id, conn, text))
+            finally:
+                backend.unsubscribe(combate_id, conn)
+                self.close_connection = True
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backend de prueba en memoria")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0, help="latencia media por petición (ms)")
+    parser.add_argument("--jitter", type=float, default=0, help="variación ± de la latencia (ms)")
+    parser.add_argument("--torneos", type=int, default=3)
+    parser.add_argument("--combates", type=int, default=10, help="combates por torneo")
+    parser.add_argument("--no-paging", action="store_true", help="ignorar ?page= y devolver arreglos completos")
+    parser.add_argument("--no-gzip", action="store_true")
+    parser.add_argument("--ignore-idempotency", action="store_true",
+                        help="no deduplicar por Idempotency-Key (como el backend real)")
+    args = parser.parse_args()
+
+    backend = FakeBackend(args.latency, args.jitter, paginate=not args.no_paging,
+                          honor_idempotency=not args.ignore_idempotency)
+    backend.seed(args.torneos, args.combates)
+    server = backend.serve(args.host, args.port, compress=not args.no_gzip)
+    print(f"[FakeBackend] Escuchando en http://{args.host}:{server.server_address[1]} "
+          f"(latencia {args.latency}±{args.jitter} ms, {len(backend.combates)} combates)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+
+# Recursos cuyo cambio invalida también otros (borrar un torneo borra sus combates)
+RELATED_PREFIXES = {
+    "/apiTorneos/": ("/apiCombates/",),
+}
+
+
+class CacheEntry:
+    __slots__ = ("data", "etag", "last_modified", "expires_at")
+
+    def __init__(self, data, etag, last_modified, expires_at):
+        self.data = data
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+
+    def is_fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+    def validators(self) -> dict:
+        """Cabeceras para una petición condicional (revalidación)."""
+        h = {}
+        if self.etag:
+            h["If-None-Match"] = self.etag
+        if self.last_modified:
+            h["If-Modified-Since"] = self.last_modified
+        return h
+
+
+class ResponseCache:
+    """
+    Caché LRU de respuestas JSON con TTL por endpoint.
+    Al vencer el TTL la entrada se conserva para revalidarla con
+    If-None-Match / If-Modified-Since; un 304 la renueva sin descargar el cuerpo.
+
+    Cada invalidación sube la generación del recurso: un GET que empezó antes
+    pasa generation() a store() y su respuesta (anterior a la escritura) se
+    descarta en vez de volver a la caché.
+    """
+
+    def __init__(self, ttls: dict, max_entries: int = 128, default_ttl: float = 0):
+        # Prefijos más largos primero para que gane la coincidencia más específica
+        self.ttls = sorted(ttls.items(), key=lambda kv: len(kv[0]), reverse=True)
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # prefijo -> número de invalidaciones; _epoch sube con clear()
+        self._generations = {}
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.discarded = 0
+
+    def ttl_for(self, path: str) -> float:
+        for prefix, ttl in self.ttls:
+            if path.startswith(prefix):
+                return ttl
+        return self.default_ttl
+
+    def lookup(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def get_fresh(self, key: str):
+        """Devuelve una copia de los datos si la entrada sigue vigente, o None."""
+        entry = self.lookup(key)
+        if entry is not None and entry.is_fresh():
+            self.hits += 1
+            return copy.deepcopy(entry.data)
+        self.misses += 1
+        return None
+
+    @staticmethod
+    def _resource(path: str) -> str:
+        first = path.strip("/").split("/", 1)[0]
+        return f"/{first}/"
+
+    def generation(self, key: str):
+        """Marca a capturar antes de pedir key; cambia si el recurso se invalida."""
+        with self._lock:
+            return self._epoch, self._generations.get(self._resource(key), 0)
+
+    def store(self, key: str, data, etag=None, last_modified=None, generation=None):
+        ttl = self.ttl_for(key)
+        if ttl <= 0 and not (etag or last_modified):
+            return
+        entry = CacheEntry(copy.deepcopy(data), etag, last_modified, time.monotonic() + ttl)
+        with self._lock:
+            current = (self._epoch, self._generations.get(self._resource(key), 0))
+            if generation is not None and generation != current:
+                # Hubo una escritura mientras la petición estaba en vuelo
+                self.discarded += 1
+                return
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def renew(self, key: str):
+        """Marca como vigente una entrada tras un 304 y devuelve copia de sus datos."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry.expires_at = time.monotonic() + self.ttl_for(key)
+            self.revalidated += 1
+            return copy.deepcopy(entry.data)
+
+    def invalidate_prefix(self, prefix: str) -> int:
+        prefixes = (prefix,) + RELATED_PREFIXES.get(prefix, ())
+        with self._lock:
+            for p in prefixes:
+                resource = self._resource(p)
+                self._generations[resource] = self._generations.get(resource, 0) + 1
+            stale = [k for k in self._entries if k.startswith(prefixes)]
+            for k in stale:
+                del self._entries[k]
+        return len(stale)
+
+    def invalidate_path(self, path: str) -> int:
+        """Invalida todo el recurso al que pertenece path (primer segmento)."""
+        return self.invalidate_prefix(self._resource(path))
+
+    def clear(self):
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = len(self._entries)
+        return {
+            "entries": size,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "discarded": self.discarded,
+        }
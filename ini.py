@@ -14,9 +14,12 @@ from kivy.clock import Clock
 from kivy.utils import platform
 from api_client import api
 from session_manager import session
+import responsive
+from responsive import ResponsiveLayout
 from cuenta import VerInfoScreen
 
 # ------------------ UTILIDADES RESPONSIVE ------------------
+@responsive.tracked
 class ResponsiveHelper:
     @staticmethod
     def is_mobile():
@@ -112,17 +115,12 @@ class HoverButton(Button):
             )
         
         self.bind(size=self.update_rect, pos=self.update_rect)
-        Window.bind(on_resize=self.on_window_resize)
 
     def update_rect(self, *args):
         self.rect.pos = self.pos
         self.rect.size = self.size
         self.rect.radius = [self.border_radius]
 
-    def on_window_resize(self, instance, width, height):
-        self.font_size = ResponsiveHelper.get_font_size(18)
-        self.height = ResponsiveHelper.get_button_height()
-
 
 # ------------------ NAVBAR RESPONSIVE ------------------
 class NavbarAuth(BoxLayout):
@@ -139,9 +137,13 @@ class NavbarAuth(BoxLayout):
             self.rect = Rectangle(size=self.size, pos=self.pos)
 
         self.bind(size=self.update_rect, pos=self.update_rect)
-        Window.bind(on_resize=self.on_window_resize)
-        
-        self.build_navbar()
+
+        # Por debajo de 600 px los botones llevan textos cortos: se reconstruye
+        self.responsive = ResponsiveLayout(
+            self, build=self.rebuild_navbar, reflow=self.update_dimensions,
+            layout_key=ResponsiveHelper.should_show_text,
+        )
+        self.responsive.build()
 
     def build_navbar(self):
         self.clear_widgets()
@@ -158,7 +160,8 @@ class NavbarAuth(BoxLayout):
 
         # Espaciador después del logo
         spacer_height = dp(50) if Window.width >= 900 else dp(30)
-        self.add_widget(Widget(size_hint_y=None, height=spacer_height))
+        self.logo_spacer = Widget(size_hint_y=None, height=spacer_height)
+        self.add_widget(self.logo_spacer)
 
         # Contenedor de botones
         self.botones_navbar = BoxLayout(
@@ -177,6 +180,8 @@ class NavbarAuth(BoxLayout):
         self.width = ResponsiveHelper.get_navbar_width()
         padding_size = dp(20) if Window.width >= 600 else dp(10)
         self.padding = [padding_size, padding_size]
+        if hasattr(self, 'logo_spacer'):
+            self.logo_spacer.height = dp(50) if Window.width >= 900 else dp(30)
 
     def agregar_botones(self):
         menu_items = [
@@ -212,9 +217,6 @@ class NavbarAuth(BoxLayout):
         self.rect.size = self.size
         self.rect.pos = self.pos
 
-    def on_window_resize(self, instance, width, height):
-        Clock.schedule_once(lambda dt: self.rebuild_navbar(), 0.1)
-
     def rebuild_navbar(self):
         self.update_dimensions()
         self.build_navbar()
@@ -380,8 +382,12 @@ class NavbarAuth(BoxLayout):
 class MainInAuthScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.build_ui()
-        Window.bind(on_resize=self.on_window_resize)
+        # Las imágenes van en columna (con separador) por debajo de 600 px
+        self.responsive = ResponsiveLayout(
+            self, build=self.build_ui, reflow=self.reflow_layout,
+            layout_key=lambda: Window.width > 600,
+        )
+        self.responsive.build()
 
     def on_pre_enter(self):
         """Verifica la sesión antes de entrar a la pantalla"""
@@ -501,7 +507,8 @@ class MainInAuthScreen(Screen):
 
         # Espaciador superior
         top_spacer = max(dp(20), Window.height * 0.05)
-        self.content_layout.add_widget(Widget(size_hint_y=None, height=top_spacer))
+        self.top_spacer = Widget(size_hint_y=None, height=top_spacer)
+        self.content_layout.add_widget(self.top_spacer)
 
         # Título
         self.titulo = Label(
@@ -601,8 +608,18 @@ class MainInAuthScreen(Screen):
         else:
             return min(dp(300), Window.height * 0.35)
 
-    def on_window_resize(self, instance, width, height):
-        Clock.schedule_once(lambda dt: self.build_ui(), 0.1)
+    def reflow_layout(self):
+        """Lo que build_ui calcula a mano; el resto lo actualiza ResponsiveLayout"""
+        padding_h = max(dp(30), Window.width * 0.05)
+        padding_v = max(dp(20), Window.height * 0.03)
+        self.content_layout.padding = [padding_h, padding_v, padding_h, padding_v]
+        self.top_spacer.height = max(dp(20), Window.height * 0.05)
+        img_height = self.calculate_image_height()
+        self.imagenes_layout.height = img_height
+        for img in (self.img1, self.img2):
+            img.height = img_height
+            if Window.width <= 600:
+                img.width = Window.width * 0.8
 
 
 # ------------------ APP PRINCIPAL ------------------
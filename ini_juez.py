@@ -12,11 +12,14 @@ from kivy.app import App
 from kivy.metrics import dp, sp
 from kivy.uix.widget import Widget
 from kivy.utils import platform
-from threading import Thread
+from task_executor import executor, PRIORITY_NORMAL
 from api_client import api  
+import responsive
+from responsive import ResponsiveLayout
 
 
 # ------------------ UTILIDADES RESPONSIVE ------------------
+@responsive.tracked
 class ResponsiveHelper:
     @staticmethod
     def is_mobile():
@@ -104,17 +107,12 @@ class RoundedTextInput(TextInput):
             )
 
         self.bind(pos=self._update_rects, size=self._update_rects)
-        Window.bind(on_resize=self.on_window_resize)
 
     def _update_rects(self, *args):
         self.bg_rect.pos = self.pos
         self.bg_rect.size = self.size
         self.border_rect.pos = (self.pos[0]+dp(2), self.pos[1]+dp(2))
         self.border_rect.size = (self.size[0]-dp(4), self.size[1]-dp(4))
-    
-    def on_window_resize(self, instance, width, height):
-        self.font_size = ResponsiveHelper.get_font_size(18)
-        self.height = dp(55)
 
     def on_focus(self, instance, value):
         if value:
@@ -177,15 +175,10 @@ class HoverButton(Button):
             )
         
         self.bind(pos=self.update_rect, size=self.update_rect)
-        Window.bind(on_resize=self.on_window_resize)
 
     def update_rect(self, *args):
         self.rect.pos = self.pos
         self.rect.size = self.size
-    
-    def on_window_resize(self, instance, width, height):
-        self.font_size = ResponsiveHelper.get_font_size(18)
-        self.height = dp(50)
 
 
 # ------------------ PANTALLA INICIO SESIÓN JUEZ RESPONSIVE ------------------
@@ -199,8 +192,8 @@ class InicioSesionJuezScreen(Screen):
             self.screen_bg = Rectangle(size=self.size, pos=self.pos)
         self.bind(size=self._update_screen_bg, pos=self._update_screen_bg)
         
-        self.build_ui()
-        Window.bind(on_resize=self.on_window_resize)
+        self.responsive = ResponsiveLayout(self, build=self.build_ui, reflow=self.reflow_layout)
+        self.responsive.build()
     
     def _update_screen_bg(self, *args):
         self.screen_bg.size = self.size
@@ -289,7 +282,7 @@ class InicioSesionJuezScreen(Screen):
         form_container.add_widget(campos_layout)
         form_container.add_widget(Widget(size_hint_y=None, height=dp(12)))
 
-        botones_layout = BoxLayout(
+        self.botones_layout = botones_layout = BoxLayout(
             orientation='horizontal' if Window.width > 600 else 'vertical',
             spacing=dp(15),
             size_hint_y=None,
@@ -326,8 +319,11 @@ class InicioSesionJuezScreen(Screen):
 
         self.add_widget(main_layout)
 
-    def on_window_resize(self, instance, width, height):
-        Clock.schedule_once(lambda dt: self.build_ui(), 0.1)
+    def reflow_layout(self):
+        """Lo que build_ui calcula a mano; el resto lo actualiza ResponsiveLayout"""
+        horizontal = Window.width > 600
+        self.botones_layout.orientation = 'horizontal' if horizontal else 'vertical'
+        self.botones_layout.height = dp(50) if horizontal else dp(110)
 
     def on_enter(self, *args):
         Clock.schedule_once(self.establecer_foco, 0.1)
@@ -438,9 +434,7 @@ class InicioSesionJuezScreen(Screen):
             finally:
                 Clock.schedule_once(lambda dt: self.cerrar_loading(), 0)
     
-        login_thread = Thread(target=hacer_login)
-        login_thread.daemon = True
-        login_thread.start()
+        executor.submit(hacer_login, priority=PRIORITY_NORMAL)
 
     def ir_a_tablero(self, nombre_rojo, nat_rojo, nombre_azul, nat_azul, combate_data):
         """Navega al tablero central con los datos del combate"""
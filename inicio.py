@@ -15,12 +15,15 @@ from kivy.uix.widget import Widget
 from kivy.uix.behaviors import ButtonBehavior
 from kivy.utils import platform
 import requests, json
-from threading import Thread
+from task_executor import executor, PRIORITY_NORMAL
 from kivy.app import App
 from kivy.clock import Clock
 from api_client import api
+import responsive
+from responsive import ResponsiveLayout
 
 # ------------------ UTILIDADES RESPONSIVE ------------------
+@responsive.tracked
 class ResponsiveHelper:
     @staticmethod
     def is_mobile():
@@ -98,17 +101,12 @@ class RoundedTextInput(TextInput):
             )
 
         self.bind(pos=self._update_rects, size=self._update_rects)
-        Window.bind(on_resize=self.on_window_resize)
 
     def _update_rects(self, *args):
         self.bg_rect.pos = self.pos
         self.bg_rect.size = self.size
         self.border_rect.pos = (self.pos[0]+dp(2), self.pos[1]+dp(2))
         self.border_rect.size = (self.size[0]-dp(4), self.size[1]-dp(4))
-    
-    def on_window_resize(self, instance, width, height):
-        self.font_size = ResponsiveHelper.get_font_size(18)
-        self.height = dp(55)
 
     def on_focus(self, instance, value):
         if value:
@@ -168,35 +166,25 @@ class HoverButton(Button):
             )
 
         self.bind(pos=self.update_rect, size=self.update_rect)
-        Window.bind(on_resize=self.on_window_resize)
 
     def update_rect(self, *args):
         self.rect.pos = self.pos
         self.rect.size = self.size
-    
-    def on_window_resize(self, instance, width, height):
-        self.font_size = ResponsiveHelper.get_font_size(18)
-        self.height = dp(50)
 
 
 # ------------------ ENLACE RECUPERAR ------------------
 class EnlaceRecuperar(ButtonBehavior, Label):
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        Window.bind(on_resize=self.on_window_resize)
-    
-    def on_window_resize(self, instance, width, height):
-        self.font_size = ResponsiveHelper.get_font_size(16)
+    pass
 
 
 # ------------------ PANTALLA INICIO SESIÓN RESPONSIVE ------------------
 class InicioSesionScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.build_ui()
+        self.responsive = ResponsiveLayout(self, build=self.build_ui, reflow=self.reflow_layout)
+        self.responsive.build()
         self.popup_usuario = None
         self.popup_correo = None
-        Window.bind(on_resize=self.on_window_resize)
 
     def build_ui(self):
         self.clear_widgets()
@@ -224,7 +212,8 @@ class InicioSesionScreen(Screen):
 
         # Espaciador superior responsive
         top_spacer_height = max(dp(20), Window.height * 0.05)
-        main_layout.add_widget(Widget(size_hint_y=None, height=top_spacer_height))
+        self.top_spacer = Widget(size_hint_y=None, height=top_spacer_height)
+        main_layout.add_widget(self.top_spacer)
 
         # Contenedor del formulario centrado
         form_container = BoxLayout(
@@ -237,7 +226,7 @@ class InicioSesionScreen(Screen):
 
         # Logo responsive
         logo_height = min(dp(150), Window.height * 0.2)
-        logo = Image(
+        self.logo = logo = Image(
             source="Imagen5-Photoroom.png",
             size_hint=(1, None),
             height=logo_height,
@@ -320,7 +309,7 @@ class InicioSesionScreen(Screen):
         form_container.add_widget(Widget(size_hint_y=None, height=dp(15)))
 
         # Botones responsive
-        botones_layout = BoxLayout(
+        self.botones_layout = botones_layout = BoxLayout(
             orientation='horizontal' if Window.width > 600 else 'vertical',
             spacing=dp(15),
             size_hint_y=None,
@@ -373,8 +362,13 @@ class InicioSesionScreen(Screen):
         self.background_rect.size = instance.size
         self.background_rect.pos = instance.pos
 
-    def on_window_resize(self, instance, width, height):
-        Clock.schedule_once(lambda dt: self.build_ui(), 0.1)
+    def reflow_layout(self):
+        """Lo que build_ui calcula a mano; el resto lo actualiza ResponsiveLayout"""
+        self.top_spacer.height = max(dp(20), Window.height * 0.05)
+        self.logo.height = min(dp(150), Window.height * 0.2)
+        horizontal = Window.width > 600
+        self.botones_layout.orientation = 'horizontal' if horizontal else 'vertical'
+        self.botones_layout.height = dp(50) if horizontal else dp(110)
 
     def on_enter(self, *args):
         Clock.schedule_once(self.establecer_foco, 0.1)
@@ -454,7 +448,7 @@ class InicioSesionScreen(Screen):
         if hasattr(self, "show_loading"): 
             self.show_loading("Verificando...")
         
-        Thread(target=_task, daemon=True).start()
+        executor.submit(_task, priority=PRIORITY_NORMAL)
 
     def mostrar_mensaje(self, titulo, mensaje):
         content = BoxLayout(
@@ -0,0 +1,89 @@
+import enum
+import json
+import re
+import uuid
+
+try:
+    import orjson
+    BACKEND = "orjson"
+except ImportError:
+    orjson = None
+    BACKEND = "json"
+
+if orjson is not None:
+    # Claves no-str como la stdlib; datetime, dataclasses y subclases pasan por _default
+    _ORJSON_OPTIONS = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_PASSTHROUGH_SUBCLASS
+    )
+
+
+def loads(data):
+    """Decodifica JSON desde bytes o str con el backend más rápido disponible."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _default(obj):
+    """
+    Tipos fuera de JSON que los dos backends convierten igual: Enum por su
+    valor y UUID como texto. Cualquier otro (datetime, dataclass, set...) es
+    TypeError con ambos, aunque orjson sabría serializarlo.
+    """
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    # Subclases que orjson deja pasar; la stdlib las serializa como su tipo base
+    for base in (str, int, float, dict, list):
+        if isinstance(obj, base):
+            return base(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj) -> bytes:
+    """
+    Serializa a bytes UTF-8 (listos para enviarse como cuerpo de la petición).
+    Acepta y rechaza lo mismo con orjson que con la stdlib: claves int, float,
+    bool o None se convierten a texto y los tipos no JSON pasan por _default.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+_int_fields = {}
+
+
+def read_int(raw, field, default=0) -> int:
+    """
+    Lee un campo entero de primer nivel ({"count": 7}). Con orjson decodificar
+    es lo más rápido; con la stdlib se busca el campo directo en los bytes sin
+    construir el diccionario.
+    """
+    if not raw:
+        return default
+    if orjson is None:
+        value = _scan_int(raw, field)
+        if value is not None:
+            return value
+    data = loads(raw)
+    return int(data.get(field, default)) if isinstance(data, dict) else default
+
+
+def _scan_int(raw, field):
+    """Busca "field": N en un objeto plano; None si el cuerpo no tiene esa forma."""
+    pattern = _int_fields.get(field)
+    if pattern is None:
+        pattern = _int_fields[field] = re.compile(
+            rb'"' + re.escape(field.encode()) + rb'"\s*:\s*(-?\d+)\s*[,}]'
+        )
+    if isinstance(raw, str):
+        raw = raw.encode("utf-8")
+    matches = pattern.findall(raw)
+    if len(matches) == 1 and raw.count(b"{") == 1:
+        return int(matches[0])
+    return None
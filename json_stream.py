@@ -0,0 +1,66 @@
+import codecs
+import json
+
+
+_decoder = json.JSONDecoder()
+# Separadores entre elementos del arreglo
+_SKIP = " \t\r\n,"
+# Lo que puede seguir a un número ya decodificado si el trozo lo cortó ("-500." + "0")
+_NUMBER_TAIL = frozenset("0123456789.eE+-")
+
+
+def _skip(buf, pos):
+    while pos < len(buf) and buf[pos] in _SKIP:
+        pos += 1
+    return pos
+
+
+def _number_may_continue(item, buf, end):
+    """True si item es un número y lo que sigue en buf solo puede ser su continuación."""
+    if isinstance(item, bool) or not isinstance(item, (int, float)):
+        return False
+    return all(c in _NUMBER_TAIL for c in buf[end:])
+
+
+def iter_json_array(chunks, encoding="utf-8"):
+    """
+    Recorre un arreglo JSON que llega en trozos (p. ej. response.iter_content)
+    y devuelve cada elemento en cuanto está completo, sin cargar todo el
+    arreglo en memoria.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    buf = ""
+    pos = 0
+    started = False
+
+    for chunk in chunks:
+        buf = buf[pos:] + decoder.decode(chunk)
+        pos = 0
+
+        if not started:
+            pos = _skip(buf, pos)
+            if pos == len(buf):
+                continue
+            if buf[pos] != "[":
+                raise ValueError("Se esperaba un arreglo JSON")
+            pos += 1
+            started = True
+
+        while True:
+            pos = _skip(buf, pos)
+            if pos >= len(buf):
+                break
+            if buf[pos] == "]":
+                return
+            try:
+                item, end = _decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # Elemento incompleto: esperar el siguiente trozo
+                break
+            if end >= len(buf) or _number_may_continue(item, buf, end):
+                # Un número al final del trozo podría seguir en el siguiente
+                break
+            yield item
+            pos = end
+
+    raise ValueError("Arreglo JSON incompleto")
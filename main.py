@@ -29,6 +29,8 @@ from kivy.utils import platform
 from kivy.clock import Clock
 import webbrowser
 import os
+from task_executor import executor, PRIORITY_NORMAL
+from mutation_queue import mutation_queue, MutationJournal
 
 # Importaciones de tus pantallas
 from registro import RegistroScreen
@@ -45,8 +47,14 @@ from cuenta import VerInfoScreen
 from actualizar_torneos import ActualizarTorneoScreen
 from actualizar import ActualizarDatosScreen
 from api_client import api
+from config import METRICS_EXPORTER_PORT, TRAFFIC_MODE, TRAFFIC_FILE, TRAFFIC_REPLAY_SPEED
+import traffic_replay
+import app_log
+import responsive
+from responsive import ResponsiveLayout
 
 # ------------------ UTILIDADES MULTIPLATAFORMA ------------------
+@responsive.tracked
 class ResponsiveHelper:
     """Clase helper para manejar dimensiones responsive"""
     
@@ -205,18 +213,11 @@ class HoverButton(Button):
             Color(*self.original_background_color)
             self.rect = RoundedRectangle(size=self.size, pos=self.pos, radius=[self.border_radius])
         self.bind(size=self.update_rect, pos=self.update_rect)
-        
-        # Actualizar tamaño de fuente cuando cambie la ventana
-        Window.bind(on_resize=self.on_window_resize)
 
     def update_rect(self, *args):
         self.rect.pos = self.pos
         self.rect.size = self.size
         self.rect.radius = [self.border_radius]
-    
-    def on_window_resize(self, instance, width, height):
-        self.font_size = ResponsiveHelper.get_font_size(16)
-        self.height = dp(50)
 
 
 # ------------------ NAVBAR RESPONSIVE ------------------
@@ -265,19 +266,10 @@ class Navbar(BoxLayout):
 
         scroll.add_widget(scroll_content)
         self.add_widget(scroll)
-        
-        # Actualizar cuando cambie el tamaño de ventana
-        Window.bind(on_resize=self.on_window_resize)
 
     def update_rect(self, *args):
         self.rect.size = self.size
         self.rect.pos = self.pos
-    
-    def on_window_resize(self, instance, width, height):
-        self.size_hint = (ResponsiveHelper.get_navbar_width(), 1)
-        self.logo.height = dp(120)
-        self.spacing = ResponsiveHelper.get_spacing()
-        self.padding = ResponsiveHelper.get_padding()
 
     def descargar_manual(self, instance):
         # Manejo multiplataforma de rutas
@@ -327,8 +319,8 @@ class ResponsiveLabel(Label):
 class ConocenosScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.build_ui()
-        Window.bind(on_resize=self.on_window_resize)
+        self.responsive = ResponsiveLayout(self, build=self.build_ui, reflow=self.reflow_layout)
+        self.responsive.build()
 
     def build_ui(self):
         self.clear_widgets()
@@ -340,7 +332,7 @@ class ConocenosScreen(Screen):
         self.navbar = Navbar()
         main_layout.add_widget(self.navbar)
 
-        content_layout = BoxLayout(
+        self.content_layout = content_layout = BoxLayout(
             orientation='vertical', 
             spacing=0, 
             size_hint=(1 - ResponsiveHelper.get_navbar_width(), 1)
@@ -435,7 +427,7 @@ class ConocenosScreen(Screen):
             return box
 
         # Contenedor para Misión y Visión lado a lado
-        mision_vision_container = BoxLayout(
+        self.mision_vision_container = mision_vision_container = BoxLayout(
             orientation='horizontal' if Window.width > 800 else 'vertical',
             spacing=dp(15),
             size_hint_y=None,
@@ -479,7 +471,7 @@ class ConocenosScreen(Screen):
         )
         
         # Contenedor de galería con scroll horizontal
-        gallery_scroll = ScrollView(
+        self.gallery_scroll = gallery_scroll = ScrollView(
             size_hint=(None, None),
             size=(min(Window.width * 0.9, dp(600)), dp(280)),
             do_scroll_y=False,
@@ -576,17 +568,19 @@ class ConocenosScreen(Screen):
         self.main_content_rect.size = instance.size
         self.main_content_rect.pos = instance.pos
     
-    def on_window_resize(self, instance, width, height):
-        # Reconstruir UI al cambiar tamaño
-        Clock.schedule_once(lambda dt: self.build_ui(), 0.1)
+    def reflow_layout(self):
+        """Lo que build_ui calcula a mano; el resto lo actualiza ResponsiveLayout"""
+        self.content_layout.size_hint_x = 1 - ResponsiveHelper.get_navbar_width()
+        self.mision_vision_container.orientation = 'horizontal' if Window.width > 800 else 'vertical'
+        self.gallery_scroll.width = min(Window.width * 0.9, dp(600))
 
 
 # ------------------ PANTALLA PRINCIPAL RESPONSIVE ------------------
 class MainInScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.build_ui()
-        Window.bind(on_resize=self.on_window_resize)
+        self.responsive = ResponsiveLayout(self, build=self.build_ui, reflow=self.reflow_layout)
+        self.responsive.build()
 
     def build_ui(self):
         self.clear_widgets()
@@ -599,7 +593,7 @@ class MainInScreen(Screen):
         main_layout.add_widget(self.navbar)
 
         # ScrollView para contenido principal
-        scroll_view = ScrollView(
+        self.scroll_view = scroll_view = ScrollView(
             size_hint=(1 - ResponsiveHelper.get_navbar_width(), 1),
             do_scroll_x=False,
             bar_width=dp(10),
@@ -655,7 +649,7 @@ class MainInScreen(Screen):
         botones.add_widget(btn_login)
         botones.add_widget(btn_reg)
 
-        btn_juez = HoverButton(
+        self.btn_juez = btn_juez = HoverButton(
             text="ACCESO JUEZ", 
             size_hint=(None, None), 
             size=(min(dp(400), Window.width * 0.5), dp(45))
@@ -732,8 +726,10 @@ class MainInScreen(Screen):
         self.scroll_background.size = instance.size
         self.scroll_background.pos = instance.pos
     
-    def on_window_resize(self, instance, width, height):
-        Clock.schedule_once(lambda dt: self.build_ui(), 0.1)
+    def reflow_layout(self):
+        """Lo que build_ui calcula a mano; el resto lo actualiza ResponsiveLayout"""
+        self.scroll_view.size_hint_x = 1 - ResponsiveHelper.get_navbar_width()
+        self.btn_juez.width = min(dp(400), Window.width * 0.5)
 
 
 # ------------------ APLICACIÓN ------------------
@@ -743,6 +739,17 @@ class MyApp(App):
     auth = None
 
     def build(self):
+        # Log a archivo en segundo plano y volcado del ring buffer si algo revienta
+        app_log.start_file_sink()
+        app_log.install_crash_dump()
+
+        if TRAFFIC_MODE == "replay":
+            traffic_replay.start_replay(api, TRAFFIC_FILE, speed=TRAFFIC_REPLAY_SPEED)
+            # Los puntos marcados durante la reproducción no van al diario real
+            mutation_queue.journal = MutationJournal(f"{TRAFFIC_FILE}.mutaciones")
+        elif TRAFFIC_MODE == "record":
+            traffic_replay.start_recording(api, TRAFFIC_FILE)
+
         # Configuración de ventana inicial multiplataforma
         if ResponsiveHelper.is_desktop():
             Window.size = (1280, 720)
@@ -766,6 +773,14 @@ class MyApp(App):
         sm.add_widget(CombatesScreen(name='combates_anteriores'))
         # ActualizarTorneoScreen se agregará dinámicamente cuando se necesite
         return sm
+
+    def on_start(self):
+        # Abrir el socket keep-alive con el backend antes del primer clic
+        executor.submit(api.warm_up, priority=PRIORITY_NORMAL)
+        # Reenviar puntos/faltas que quedaron sin confirmar en la sesión anterior
+        mutation_queue.start()
+        if METRICS_EXPORTER_PORT:
+            api.start_metrics_exporter(METRICS_EXPORTER_PORT)
     
     def agregar_pantalla_actualizar_torneo(self, torneo_data, on_save_callback):
         """
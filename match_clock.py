@@ -0,0 +1,201 @@
+"""
+Reloj de combate sin deriva, compartido por los dos tableros.
+
+El tiempo restante se calcula a partir de time.monotonic(), no contando
+callbacks: un frame lento, una pausa de GC o un pausar/reanudar no alargan
+el round. Los tableros solo llaman a tick() con la frecuencia que quieran y
+pintan display(); las transiciones las decide siempre el reloj:
+
+    round 1 -> descanso -> round 2 -> ... -> último round -> fin
+
+Al terminar cada fase el reloj queda en pausa con la siguiente ya cargada;
+cada tablero decide si continúa solo o espera al operador.
+
+Para varias pantallas en el mismo tatami, to_state() / apply_state()
+expresan el reloj en el tiempo del servidor (ver clock_sync).
+"""
+import math
+import time
+from collections import deque
+
+from config import MATCH_CLOCK_TENTHS_BELOW, MATCH_CLOCK_HISTORY
+
+
+ROUND = "round"
+REST = "rest"
+ENDED = "ended"
+
+# Lo que devuelve tick() al agotarse una fase
+ROUND_OVER = "round_over"    # empieza el descanso
+REST_OVER = "rest_over"      # siguiente round listo
+MATCH_OVER = "match_over"    # era el último round
+
+
+def format_remaining(seconds) -> str:
+    """MM:SS redondeando hacia arriba; en los últimos segundos, SS.d truncado."""
+    if seconds < MATCH_CLOCK_TENTHS_BELOW:
+        tenths = max(0, math.floor(seconds * 10))
+        return f"{tenths // 10:02}.{tenths % 10}"
+    whole = math.ceil(seconds)
+    return f"{whole // 60:02}:{whole % 60:02}"
+
+
+class MatchClock:
+    """
+    Estado de un combate: fase, round y tiempo consumido de la fase.
+    clock es inyectable (por defecto time.monotonic).
+    """
+
+    def __init__(self, round_duration=180, rest_duration=60, rounds=3, clock=time.monotonic):
+        self._now = clock
+        self.on_change = None      # se llama tras cada cambio local (start, pausa, fase)
+        self.configure(round_duration, rest_duration, rounds)
+
+    def configure(self, round_duration, rest_duration, rounds):
+        """Nuevos parámetros; vuelve al inicio del round 1, en pausa."""
+        self.round_duration = round_duration
+        self.rest_duration = rest_duration
+        self.rounds = rounds
+        self.round_number = 1
+        self.phase = ROUND
+        self.running = False
+        self._elapsed = 0.0        # consumido antes del último start()
+        self._started_at = None
+        # Tramos (inicio, fin) en que corrió un round, para validar eventos por su hora
+        self._active = deque(maxlen=MATCH_CLOCK_HISTORY)
+        self._active_since = None
+
+    # ------------------------------------------------------------------ consulta
+
+    @property
+    def is_rest(self) -> bool:
+        return self.phase == REST
+
+    @property
+    def round_running(self) -> bool:
+        """Corre un round ahora mismo: lo que was_active registra para validar eventos."""
+        return self.running and self.phase == ROUND
+
+    @property
+    def is_ended(self) -> bool:
+        return self.phase == ENDED
+
+    def duration(self) -> float:
+        if self.phase == REST:
+            return self.rest_duration
+        if self.phase == ENDED:
+            return 0
+        return self.round_duration
+
+    def elapsed(self, now=None) -> float:
+        if self.running:
+            return self._elapsed + ((self._now() if now is None else now) - self._started_at)
+        return self._elapsed
+
+    def remaining(self, now=None) -> float:
+        return max(0.0, self.duration() - self.elapsed(now))
+
+    def display(self) -> str:
+        return format_remaining(self.remaining())
+
+    def was_active(self, t) -> bool:
+        """¿Estaba corriendo un round en el instante t (reloj local)?"""
+        since = self._active_since
+        if since is not None and t >= since:
+            return True
+        return any(start <= t <= end for start, end in list(self._active))
+
+    # ------------------------------------------------------------------ control
+
+    def start(self) -> bool:
+        if self.running or self.phase == ENDED:
+            return False
+        self._started_at = self._now()
+        self.running = True
+        if self.phase == ROUND:
+            self._active_since = self._started_at
+        self._changed()
+        return True
+
+    def pause(self):
+        if self.running:
+            self._pause()
+            self._changed()
+
+    def reset_phase(self):
+        """Vuelve al inicio de la fase actual, en pausa."""
+        self._pause()
+        self._elapsed = 0.0
+        self._changed()
+
+    def tick(self):
+        """Si la fase se agotó, pasa a la siguiente y devuelve el evento; si no, None."""
+        if not self.running or self.remaining() > 0:
+            return None
+        self._pause()
+        if self.phase == REST:
+            self.round_number += 1
+            self._enter(ROUND)
+            return REST_OVER
+        if self.round_number >= self.rounds:
+            self._enter(ENDED)
+            return MATCH_OVER
+        self._enter(REST)
+        return ROUND_OVER
+
+    def next_round(self):
+        """Salta al siguiente round (decisión del operador), en pausa."""
+        self._pause()
+        self.round_number += 1
+        self._enter(ROUND)
+
+    def finish(self):
+        self._pause()
+        self._enter(ENDED)
+
+    # ------------------------------------------------------------------ pantallas remotas
+
+    def to_state(self, sync) -> dict:
+        """Estado para difundir: restante medido en el instante ref (tiempo del servidor)."""
+        now = self._now()
+        return {
+            "phase": self.phase,
+            "round": self.round_number,
+            "rounds": self.rounds,
+            "round_duration": self.round_duration,
+            "rest_duration": self.rest_duration,
+            "running": self.running,
+            "remaining": self.remaining(now),
+            "ref": sync.to_server(now),
+        }
+
+    def apply_state(self, state, sync):
+        """Adopta el estado del dueño del cronómetro (no dispara on_change)."""
+        self.round_duration = state["round_duration"]
+        self.rest_duration = state["rest_duration"]
+        self.rounds = state["rounds"]
+        self.round_number = state["round"]
+        self.phase = state["phase"]
+        self._elapsed = self.duration() - state["remaining"]
+        self.running = bool(state["running"]) and self.phase != ENDED
+        # Corriendo: el restante se midió en ref, que en el reloj local es to_local(ref)
+        self._started_at = sync.to_local(state["ref"]) if self.running else None
+
+    def _pause(self):
+        if self.running:
+            now = self._now()
+            self._elapsed += now - self._started_at
+            self.running = False
+            self._started_at = None
+            if self._active_since is not None:
+                self._active.append((self._active_since, now))
+                self._active_since = None
+
+    def _enter(self, phase):
+        self.phase = phase
+        self._elapsed = 0.0
+        self._changed()
+
+    def _changed(self):
+        if self.on_change is not None:
+            self.on_change(self)
@@ -0,0 +1,247 @@
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from transfer_stats import endpoint_key
+from app_log import get_logger
+
+
+log = get_logger("Metrics")
+
+
+# Límites superiores de los buckets de latencia, en segundos
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class LatencyHistogram:
+    """
+    Histograma de latencias con buckets fijos (memoria constante).
+    Los percentiles se interpolan dentro del bucket, igual que
+    histogram_quantile() de Prometheus.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # el último es +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        i = 0
+        while i < len(self.buckets) and seconds > self.buckets[i]:
+            i += 1
+        self.counts[i] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q) -> float:
+        """Latencia (segundos) bajo la cual queda la fracción q de las peticiones."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for i, n in enumerate(self.counts):
+            upper = self.buckets[i] if i < len(self.buckets) else self.max
+            if n and seen + n >= rank:
+                return min(lower + (upper - lower) * (rank - seen) / n, self.max)
+            seen += n
+            lower = upper
+        return self.max
+
+    def cumulative(self):
+        """[(le, conteo acumulado)] incluyendo +Inf, para el formato Prometheus."""
+        total = 0
+        result = []
+        for i, n in enumerate(self.counts):
+            total += n
+            le = self.buckets[i] if i < len(self.buckets) else float("inf")
+            result.append((le, total))
+        return result
+
+
+class _EndpointStats:
+    __slots__ = ("latency", "requests", "errors", "client_errors", "timeouts",
+                 "rejected", "retries")
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.requests = 0
+        self.errors = 0          # excepción de red o 5xx
+        self.client_errors = 0   # 4xx
+        self.timeouts = 0
+        self.rejected = 0        # circuito abierto, no llegó a enviarse
+        self.retries = 0
+
+
+class ApiMetrics:
+    """
+    Métricas por (método, endpoint) de las peticiones al backend:
+    latencias, errores, timeouts, reintentos y, vía TransferStats, bytes.
+    """
+
+    def __init__(self, transfer=None):
+        self.transfer = transfer
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def _entry(self, method, url):
+        key = (method, endpoint_key(url))
+        entry = self._endpoints.get(key)
+        if entry is None:
+            entry = self._endpoints[key] = _EndpointStats()
+        return entry
+
+    def observe(self, method, url, seconds, status=None, timeout=False, error=False):
+        """Registra una petición terminada (status=None si falló sin respuesta)."""
+        with self._lock:
+            entry = self._entry(method, url)
+            entry.requests += 1
+            entry.latency.observe(seconds)
+            if timeout:
+                entry.timeouts += 1
+            if error or (status is not None and status >= 500):
+                entry.errors += 1
+            elif status is not None and status >= 400:
+                entry.client_errors += 1
+
+    def record_rejected(self, method, url):
+        with self._lock:
+            self._entry(method, url).rejected += 1
+
+    def record_retry(self, method, url):
+        with self._lock:
+            self._entry(method, url).retries += 1
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+        if self.transfer is not None:
+            self.transfer.reset()
+
+    def snapshot(self) -> dict:
+        """
+        {"GET /apiCombates/combates": {requests, error_rate, timeouts, retries,
+        p50_ms, p95_ms, p99_ms, max_ms, wire_bytes, decoded_bytes, ...}}
+        """
+        transfer = self.transfer.stats() if self.transfer is not None else {}
+        result = {}
+        with self._lock:
+            for (method, endpoint), e in self._endpoints.items():
+                h = e.latency
+                bytes_ = transfer.get(endpoint, {}) if method == "GET" else {}
+                result[f"{method} {endpoint}"] = {
+                    "requests": e.requests,
+                    "errors": e.errors,
+                    "client_errors": e.client_errors,
+                    "error_rate": e.errors / e.requests if e.requests else 0.0,
+                    "timeouts": e.timeouts,
+                    "rejected": e.rejected,
+                    "retries": e.retries,
+                    "p50_ms": h.percentile(0.50) * 1000,
+                    "p95_ms": h.percentile(0.95) * 1000,
+                    "p99_ms": h.percentile(0.99) * 1000,
+                    "max_ms": h.max * 1000,
+                    "wire_bytes": bytes_.get("wire_bytes", 0),
+                    "decoded_bytes": bytes_.get("decoded_bytes", 0),
+                }
+        return result
+
+    def slowest(self, n=5, q=0.95):
+        """Los n endpoints con mayor percentil q: los que más frenan el marcador."""
+        snap = self.snapshot()
+        key = f"p{int(q * 100)}_ms"
+        return sorted(snap.items(), key=lambda kv: kv[1].get(key, 0), reverse=True)[:n]
+
+    def render_prometheus(self) -> str:
+        """Métricas en formato de texto de Prometheus (exposition format 0.0.4)."""
+        lines = []
+
+        def header(name, kind, help_text):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            items = sorted(self._endpoints.items())
+            header("tt_api_request_duration_seconds", "histogram",
+                   "Latencia de las peticiones HTTP al backend")
+            for (method, endpoint), e in items:
+                labels = _labels(method=method, endpoint=endpoint)
+                for le, total in e.latency.cumulative():
+                    le_text = "+Inf" if le == float("inf") else repr(le)
+                    lines.append(f'tt_api_request_duration_seconds_bucket{{{labels},le="{le_text}"}} {total}')
+                lines.append(f"tt_api_request_duration_seconds_sum{{{labels}}} {e.latency.sum}")
+                lines.append(f"tt_api_request_duration_seconds_count{{{labels}}} {e.latency.count}")
+
+            for name, attr, help_text in (
+                ("tt_api_errors_total", "errors", "Peticiones fallidas (error de red o 5xx)"),
+                ("tt_api_client_errors_total", "client_errors", "Respuestas 4xx"),
+                ("tt_api_timeouts_total", "timeouts", "Peticiones que agotaron el timeout"),
+                ("tt_api_rejected_total", "rejected", "Peticiones rechazadas por circuito abierto"),
+                ("tt_api_retries_total", "retries", "Reintentos"),
+            ):
+                header(name, "counter", help_text)
+                for (method, endpoint), e in items:
+                    lines.append(f"{name}{{{_labels(method=method, endpoint=endpoint)}}} {getattr(e, attr)}")
+
+        if self.transfer is not None:
+            header("tt_api_response_bytes_total", "counter",
+                   "Bytes de respuesta recibidos (wire = en la red, decoded = descomprimidos)")
+            for endpoint, t in sorted(self.transfer.stats().items()):
+                for kind in ("wire", "decoded"):
+                    labels = _labels(endpoint=endpoint, kind=kind)
+                    lines.append(f"tt_api_response_bytes_total{{{labels}}} {t[kind + '_bytes']}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _labels(**values):
+    def esc(v):
+        return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+    return ",".join(f'{k}="{esc(v)}"' for k, v in values.items())
+
+
+class MetricsExporter:
+    """
+    Servidor HTTP local (solo 127.0.0.1 por defecto) que expone
+    GET /metrics en formato Prometheus.
+    """
+
+    def __init__(self, metrics: ApiMetrics, port: int, host: str = "127.0.0.1"):
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self._server = None
+
+    def start(self):
+        if self._server is not None:
+            return
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name="metrics-exporter", daemon=True).start()
+        log.info("Exportando métricas en http://%s:%s/metrics", self.host, self.port)
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
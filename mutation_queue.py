@@ -0,0 +1,343 @@
+import json
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field, asdict
+from typing import Optional
+
+import requests
+
+from config import MUTATION_JOURNAL_PATH, MUTATION_RETRY_MAX_DELAY
+from api_client import api
+from app_log import get_logger
+
+
+# Tipos de mutación del marcador
+SCORE_ADD = "score_add"
+SCORE_SUB = "score_sub"
+SCORE_VOID = "score_void"      # anula varios puntos por id en una sola llamada
+GAMJEOM_ADD = "gamjeom_add"
+GAMJEOM_SUB = "gamjeom_sub"
+
+# Cambio esperado en el contador del servidor; estas mutaciones no se
+# reenvían a ciegas tras un fallo ambiguo (ver MutationQueue._resolve)
+COUNT_DELTAS = {SCORE_ADD: +1, SCORE_SUB: -1, GAMJEOM_ADD: +1, GAMJEOM_SUB: -1}
+
+log = get_logger("MutationQueue")
+
+
+class UncertainMutationError(Exception):
+    """
+    Un envío falló sin respuesta y el contador del servidor no permite saber
+    si se aplicó: otra mutación lo movió mientras tanto. No se reenvía.
+    """
+
+
+@dataclass
+class Mutation:
+    kind: str
+    combate_id: int
+    alumno_id: int
+    key: str = field(default_factory=lambda: uuid.uuid4().hex)
+    created_at: float = field(default_factory=time.time)
+    puntaje_ids: list = field(default_factory=list)
+    # Contador del servidor leído justo antes del primer envío (None = aún no se envió)
+    before: Optional[int] = None
+
+    @property
+    def family(self) -> str:
+        """'score' o 'gamjeom'"""
+        return self.kind.split("_", 1)[0]
+
+
+class MutationJournal:
+    """
+    Diario en disco (JSONL, solo se agrega al final) de las mutaciones del marcador.
+    Cada mutación se escribe como {"op": "append", ...} y, al confirmarse o
+    rechazarse, se agrega {"op": "ack", "key": ...}. Las que no tienen ack
+    se vuelven a enviar al reiniciar la app. Antes del primer envío se anota
+    {"op": "sent", "key": ..., "before": n} con el contador leído; así, al
+    recargarla, se sabe que pudo haber llegado al servidor.
+    """
+
+    def __init__(self, path=MUTATION_JOURNAL_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def _open(self):
+        if self._file is None:
+            folder = os.path.dirname(self.path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        return self._file
+
+    def load(self) -> list:
+        """Devuelve, en orden, las mutaciones que quedaron sin confirmar."""
+        if not os.path.exists(self.path):
+            return []
+        pending = {}
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Línea truncada por un cierre abrupto: se ignora
+                    continue
+                if record.get("op") == "append":
+                    data = {k: v for k, v in record.items() if k != "op"}
+                    pending[record["key"]] = Mutation(**data)
+                elif record.get("op") == "sent":
+                    mutation = pending.get(record.get("key"))
+                    if mutation is not None:
+                        mutation.before = record.get("before")
+                elif record.get("op") == "ack":
+                    pending.pop(record.get("key"), None)
+        return list(pending.values())
+
+    def _write(self, record: dict):
+        with self._lock:
+            f = self._open()
+            f.write(json.dumps(record) + "\n")
+            # flush: sobrevive a un cierre de la app; fsync se hace desde el hilo de envío
+            f.flush()
+
+    def append(self, mutation: Mutation):
+        self._write({"op": "append", **asdict(mutation)})
+
+    def mark_sent(self, mutation: Mutation):
+        self._write({"op": "sent", "key": mutation.key, "before": mutation.before})
+
+    def ack(self, key: str, status: str = "ok"):
+        self._write({"op": "ack", "key": key, "status": status})
+
+    def sync(self):
+        with self._lock:
+            if self._file is not None:
+                os.fsync(self._file.fileno())
+
+    def compact(self):
+        """Vacía el diario cuando ya no queda nada pendiente."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            open(self.path, "w", encoding="utf-8").close()
+
+
+class MutationQueue:
+    """
+    Cola write-ahead de mutaciones de puntaje y GAM-JEOM.
+    Cada toque se anota primero en el diario y un único hilo las envía en
+    orden con su Idempotency-Key. Si el backend no responde se reintenta con
+    backoff sin perder el orden; un rechazo 4xx se descarta para no bloquear
+    la cola. El reenvío conserva la misma clave, así que el servidor puede
+    descartar duplicados si la respuesta original se perdió.
+
+    El backend real no respeta Idempotency-Key, así que la cola no depende
+    de ella para las mutaciones de COUNT_DELTAS: antes del primer envío lee
+    el contador y, si el envío falla sin respuesta (timeout, conexión
+    cortada, 5xx), lo vuelve a leer antes de decidir. Si ya cambió en lo
+    esperado se da por aplicada; si sigue igual se reenvía; si cambió de
+    otra forma no se reenvía y se informa con UncertainMutationError.
+    """
+
+    def __init__(self, client, journal: MutationJournal):
+        self.client = client
+        self.journal = journal
+        self._pending = []
+        self._callbacks = {}
+        self._cond = threading.Condition()
+        self._listeners = []
+        self._thread = None
+        self._started = False
+        self.stalled = False
+        self.confirmed = 0
+        self.rejected = 0
+
+    def start(self):
+        """Carga lo pendiente del diario y arranca el hilo de envío."""
+        with self._cond:
+            if self._started:
+                return
+            self._started = True
+            leftovers = self.journal.load()
+            self._pending = leftovers
+        if leftovers:
+            log.info("Reenviando %s mutaciones pendientes del diario", len(leftovers))
+        self._thread = threading.Thread(target=self._drain_loop, name="mutation-queue", daemon=True)
+        self._thread.start()
+        self._notify()
+
+    def enqueue(self, kind, combate_id, alumno_id, on_done=None, on_failed=None, puntaje_ids=None) -> Mutation:
+        """
+        Anota la mutación en el diario y la encola.
+        on_done(mutation, data) / on_failed(mutation, error) se llaman desde el hilo de envío.
+        """
+        if not self._started:
+            # Primero recuperar lo del diario para no duplicar esta mutación al cargarlo
+            self.start()
+        mutation = Mutation(kind=kind, combate_id=combate_id, alumno_id=alumno_id,
+                            puntaje_ids=list(puntaje_ids or ()))
+        with self._cond:
+            self.journal.append(mutation)
+            self._pending.append(mutation)
+            self._callbacks[mutation.key] = (on_done, on_failed)
+            self._cond.notify()
+        self._notify()
+        return mutation
+
+    def pending_count(self, alumno_id=None, family=None) -> int:
+        with self._cond:
+            return sum(
+                1 for m in self._pending
+                if (alumno_id is None or m.alumno_id == alumno_id)
+                and (family is None or m.family == family)
+            )
+
+    def add_listener(self, callback):
+        """callback() se llama (desde cualquier hilo) cuando cambia la cola."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self):
+        for callback in list(self._listeners):
+            try:
+                callback()
+            except Exception as e:
+                log.warning("Error en listener: %s", e)
+
+    def _drain_loop(self):
+        failures = 0
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                mutation = self._pending[0]
+
+            self.journal.sync()
+            try:
+                if mutation.kind in COUNT_DELTAS:
+                    if mutation.before is not None:
+                        # Un envío anterior pudo haber llegado: ver el contador
+                        outcome = self._resolve(mutation)
+                        if outcome is not None:
+                            status, data, error = outcome
+                            self._finish(mutation, status, data=data, error=error)
+                            failures = 0
+                            self._set_stalled(False)
+                            continue
+                    else:
+                        mutation.before = self._read_count(mutation)
+                        self.journal.mark_sent(mutation)
+                        self.journal.sync()
+                data = self._send(mutation)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                failures += 1
+                self._set_stalled(True)
+                delay = min(MUTATION_RETRY_MAX_DELAY, 0.5 * (2 ** (failures - 1)))
+                log.info("Sin conexión (%s), reintento en %.1fs", type(e).__name__, delay)
+                time.sleep(delay)
+                continue
+            except requests.exceptions.HTTPError as e:
+                status = e.response.status_code if e.response is not None else 0
+                if status >= 500:
+                    failures += 1
+                    self._set_stalled(True)
+                    time.sleep(min(MUTATION_RETRY_MAX_DELAY, 0.5 * (2 ** (failures - 1))))
+                    continue
+                self._finish(mutation, "rejected", error=e)
+            except Exception as e:
+                self._finish(mutation, "rejected", error=e)
+            else:
+                self._finish(mutation, "ok", data=data)
+            failures = 0
+            self._set_stalled(False)
+
+    def _read_count(self, mutation: Mutation) -> int:
+        """Contador del servidor que mueve la mutación; los errores se lanzan."""
+        if mutation.family == "score":
+            return self.client.count_puntajes(mutation.alumno_id)
+        return self.client.get_gamjeom_count(mutation.alumno_id, mutation.combate_id)
+
+    def _resolve(self, mutation: Mutation):
+        """
+        Decide qué hacer con una mutación cuyo envío anterior pudo haberse
+        aplicado. Devuelve (status, data, error) para darla por terminada, o
+        None si el contador no se movió y hay que reenviarla.
+        """
+        count = self._read_count(mutation)
+        expected = mutation.before + COUNT_DELTAS[mutation.kind]
+        if count == expected:
+            log.info("%s %s ya estaba aplicada en el servidor, no se reenvía", mutation.kind, mutation.key)
+            field_name = "totalFaltas" if mutation.kind == GAMJEOM_ADD else "newCount"
+            return "ok", {field_name: count}, None
+        if count == mutation.before:
+            return None
+        error = UncertainMutationError(
+            f"{mutation.kind}: contador {mutation.before} -> {count}, se esperaba {expected}"
+        )
+        return "uncertain", None, error
+
+    def _send(self, mutation: Mutation) -> dict:
+        c = self.client
+        key = mutation.key
+        if mutation.kind == SCORE_ADD:
+            return c.add_puntaje_simple(mutation.combate_id, mutation.alumno_id, idempotency_key=key)
+        if mutation.kind == SCORE_SUB:
+            return c.delete_last_puntaje(mutation.alumno_id, idempotency_key=key)
+        if mutation.kind == SCORE_VOID:
+            return c.anular_puntajes(mutation.combate_id, mutation.puntaje_ids, idempotency_key=key)
+        if mutation.kind == GAMJEOM_ADD:
+            return c.add_gamjeom_simple(mutation.combate_id, mutation.alumno_id, idempotency_key=key)
+        if mutation.kind == GAMJEOM_SUB:
+            return c.delete_last_gamjeom(mutation.alumno_id, mutation.combate_id, idempotency_key=key)
+        raise ValueError(f"Tipo de mutación desconocido: {mutation.kind}")
+
+    def _finish(self, mutation, status, data=None, error=None):
+        with self._cond:
+            self.journal.ack(mutation.key, status)
+            if self._pending and self._pending[0].key == mutation.key:
+                self._pending.pop(0)
+            on_done, on_failed = self._callbacks.pop(mutation.key, (None, None))
+            if status == "ok":
+                self.confirmed += 1
+            else:
+                self.rejected += 1
+            if not self._pending:
+                self.journal.compact()
+
+        if status == "ok" and on_done:
+            on_done(mutation, data or {})
+        elif status != "ok":
+            log.warning("Mutación %s %s: %s", mutation.kind,
+                        "rechazada" if status == "rejected" else "sin confirmar", error)
+            if on_failed:
+                on_failed(mutation, error)
+        self._notify()
+
+    def _set_stalled(self, stalled):
+        if self.stalled != stalled:
+            self.stalled = stalled
+            self._notify()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "pending": len(self._pending),
+                "confirmed": self.confirmed,
+                "rejected": self.rejected,
+                "stalled": self.stalled,
+            }
+
+
+# Instancia global
+mutation_queue = MutationQueue(api, MutationJournal())
@@ -13,27 +13,14 @@ from kivy.metrics import dp, sp
 from kivy.uix.widget import Widget
 from kivy.uix.scrollview import ScrollView
 from kivy.utils import platform
-import requests, json
-from threading import Thread
-
-API_BASE_URL = "http://localhost:8080"
-
-class ApiClient:
-    def __init__(self, base_url):
-        self.base_url = base_url.strip("/")
-        self.session = requests.Session()
-
-    def post_json(self, path, payload):
-        url = f"{self.base_url}{path}"
-        return self.session.post(
-            url,
-            data=json.dumps(payload),
-            headers={"Content-Type":"application/json","Accept":"application/json"},
-            timeout=10
-        )
-api = ApiClient(API_BASE_URL)
+import requests
+from task_executor import executor, PRIORITY_NORMAL
+from api_client import api
+import responsive
+from responsive import ResponsiveLayout
 
 # ------------------ UTILIDADES RESPONSIVE ------------------
+@responsive.tracked
 class ResponsiveHelper:
     @staticmethod
     def is_mobile():
@@ -131,17 +118,12 @@ class RoundedTextInput(TextInput):
             )
 
         self.bind(pos=self._update_rects, size=self._update_rects)
-        Window.bind(on_resize=self.on_window_resize)
 
     def _update_rects(self, *args):
         self.bg_rect.pos = self.pos
         self.bg_rect.size = self.size
         self.border_rect.pos = (self.pos[0]+dp(2), self.pos[1]+dp(2))
         self.border_rect.size = (self.size[0]-dp(4), self.size[1]-dp(4))
-    
-    def on_window_resize(self, instance, width, height):
-        self.font_size = ResponsiveHelper.get_font_size(18)
-        self.height = dp(55)
 
     def on_focus(self, instance, value):
         if value:
@@ -207,15 +189,10 @@ class HoverButton(Button):
             )
         
         self.bind(pos=self.update_rect, size=self.update_rect)
-        Window.bind(on_resize=self.on_window_resize)
 
     def update_rect(self, *args):
         self.rect.pos = self.pos
         self.rect.size = self.size
-    
-    def on_window_resize(self, instance, width, height):
-        self.font_size = ResponsiveHelper.get_font_size(18)
-        self.height = dp(50)
 
 
 # ------------------ PANTALLA REGISTRO RESPONSIVE ------------------
@@ -223,8 +200,8 @@ class RegistroScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.loading_popup = None
-        self.build_ui()
-        Window.bind(on_resize=self.on_window_resize)
+        self.responsive = ResponsiveLayout(self, build=self.build_ui, reflow=self.reflow_layout)
+        self.responsive.build()
 
     def build_ui(self):
         self.clear_widgets()
@@ -245,7 +222,7 @@ class RegistroScreen(Screen):
         # Logo responsive centrado
         logo_height = ResponsiveHelper.get_logo_height()
         logo_container = BoxLayout(size_hint=(1, None), height=logo_height)
-        logo = Image(
+        self.logo = logo = Image(
             source="Imagen5-Photoroom.png",
             size_hint=(None, None),
             width=logo_height * 1.2,
@@ -354,7 +331,7 @@ class RegistroScreen(Screen):
         form_container.add_widget(Widget(size_hint_y=None, height=dp(15)))
 
         # Contenedor de botones responsive y centrado
-        botones_layout = BoxLayout(
+        self.botones_layout = botones_layout = BoxLayout(
             orientation=ResponsiveHelper.get_button_layout_orientation(),
             spacing=dp(15),
             size_hint_y=None,
@@ -403,8 +380,10 @@ class RegistroScreen(Screen):
         self.background_rect.size = instance.size
         self.background_rect.pos = instance.pos
 
-    def on_window_resize(self, instance, width, height):
-        Clock.schedule_once(lambda dt: self.build_ui(), 0.1)
+    def reflow_layout(self):
+        """Lo que build_ui calcula a mano; el resto lo actualiza ResponsiveLayout"""
+        self.logo.width = self.logo.height * 1.2
+        self.botones_layout.orientation = ResponsiveHelper.get_button_layout_orientation()
 
     def on_enter(self, *args):
         Clock.schedule_once(self.establecer_foco, 0.1)
@@ -644,7 +623,7 @@ class RegistroScreen(Screen):
 
         def _task():
             try:
-                resp = api.post_json("/apiAdministradores/administrador", payload)
+                resp = api.post_json("/apiAdministradores/administrador", payload, timeout=10)
                 if resp.status_code in (200, 201):
                     # Éxito
                     def _ok(dt):
@@ -688,7 +667,7 @@ class RegistroScreen(Screen):
                 Clock.schedule_once(_ex, 0)
 
         self.show_loading("Creando cuenta...")
-        Thread(target=_task, daemon=True).start()
+        executor.submit(_task, priority=PRIORITY_NORMAL)
 
     def volver(self, instance):
         self.manager.current = 'main'
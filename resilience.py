@@ -0,0 +1,167 @@
+import random
+import threading
+import time
+
+import requests
+
+from app_log import get_logger
+
+
+log = get_logger("CircuitBreaker")
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """
+    El backend se considera caído y la petición se rechaza sin esperar el timeout.
+    Hereda de ConnectionError para que las pantallas la traten como
+    "no se pudo conectar".
+    """
+
+
+class RetryPolicy:
+    """Reintentos con backoff exponencial y jitter completo."""
+
+    def __init__(self, max_attempts=3, base_delay=0.2, max_delay=2.0,
+                 retry_statuses=(502, 503, 504)):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = retry_statuses
+
+    def delay(self, attempt: int) -> float:
+        """Espera antes del reintento número `attempt` (1 = primer reintento)."""
+        cap = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, cap)
+
+
+class CircuitBreaker:
+    """
+    Breaker por host con estados closed / open.
+    Tras `failure_threshold` fallos seguidos se abre y rechaza peticiones;
+    un hilo en segundo plano prueba el backend cada `reset_timeout` segundos
+    y lo vuelve a cerrar en cuanto responde.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+
+    def __init__(self, host, failure_threshold=3, reset_timeout=5.0, probe=None, on_change=None):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.probe = probe
+        self.on_change = on_change
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._probe_thread = None
+
+    def before_request(self):
+        if self.state == self.OPEN and not getattr(self._local, "probing", False):
+            with self._lock:
+                self.rejected += 1
+            raise CircuitOpenError(f"Backend {self.host} no disponible (circuito abierto)")
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            changed = self.state != self.CLOSED
+            self.state = self.CLOSED
+            self.opened_at = None
+        if changed:
+            log.info("%s recuperado", self.host)
+            self._notify()
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            opening = self.state == self.CLOSED and self.failures >= self.failure_threshold
+            if opening:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+        if opening:
+            log.warning("%s marcado como caído tras %s fallos", self.host, self.failures)
+            self._notify()
+            self._start_probe()
+
+    def _notify(self):
+        if self.on_change:
+            try:
+                self.on_change(self.host, self.state)
+            except Exception as e:
+                log.warning("Error notificando cambio de estado: %s", e)
+
+    def _start_probe(self):
+        if self.probe is None or (self._probe_thread and self._probe_thread.is_alive()):
+            return
+        self._probe_thread = threading.Thread(target=self._probe_loop, daemon=True)
+        self._probe_thread.start()
+
+    def _probe_loop(self):
+        while self.state == self.OPEN:
+            time.sleep(self.reset_timeout)
+            self._local.probing = True
+            try:
+                self.probe(self.host)
+            except Exception:
+                pass
+            finally:
+                self._local.probing = False
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "failures": self.failures,
+                "rejected": self.rejected,
+                "open_for_s": (time.monotonic() - self.opened_at) if self.opened_at else 0.0,
+            }
+
+
+class BreakerRegistry:
+    """Un CircuitBreaker por host (scheme://host:port)."""
+
+    def __init__(self, failure_threshold=3, reset_timeout=5.0, probe=None):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.probe = probe
+        self._breakers = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def get(self, host) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    host,
+                    failure_threshold=self.failure_threshold,
+                    reset_timeout=self.reset_timeout,
+                    probe=self.probe,
+                    on_change=self._on_change,
+                )
+                self._breakers[host] = breaker
+            return breaker
+
+    def add_listener(self, callback):
+        """callback(host, state) se llama desde el hilo que detectó el cambio."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _on_change(self, host, state):
+        for callback in list(self._listeners):
+            callback(host, state)
+
+    def any_open(self) -> bool:
+        with self._lock:
+            return any(b.state == CircuitBreaker.OPEN for b in self._breakers.values())
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {host: b.stats() for host, b in self._breakers.items()}
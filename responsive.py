@@ -0,0 +1,365 @@
+"""
+Reacomodo de pantallas al cambiar el tamaño de la ventana, sin reconstruirlas.
+
+Antes cada pantalla respondía a Window.on_resize con un build_ui() completo
+por evento: arrastrar el borde de la ventana eran decenas de reconstrucciones
+(árbol de widgets, canvas y texturas de texto) por pantalla, visible o no.
+
+Ahora hay un único enlace a on_resize con debounce (RESIZE_DEBOUNCE): cuando
+la ventana deja de moverse se recorre una vez cada pantalla registrada y se
+actualizan en su sitio los valores que salieron del ResponsiveHelper de su
+módulo (font_size, height, spacing, padding...). Para saber cuáles son, el
+helper se decora con @tracked: cada float que devuelven sus get_* queda
+anotado por identidad (Kivy guarda el mismo objeto en la propiedad), así que
+un dp(50) escrito a mano nunca se confunde con get_button_height().
+
+    @responsive.tracked
+    class ResponsiveHelper: ...
+
+    self.responsive = ResponsiveLayout(
+        self, build=self.build_ui,
+        layout_key=lambda: Window.width > 600,   # qué cambia la estructura
+        reflow=self.reflow_layout,                # lo calculado a mano en build_ui
+    )
+    self.responsive.build()
+
+Solo se reconstruye cuando cambia layout_key (otra orientación o ramas
+distintas de build_ui), y si la pantalla no está a la vista se deja para
+su on_pre_enter.
+
+Es el único suscriptor de on_resize: los widgets (botones, campos,
+selectores) no se enlazan a Window, su pantalla los pone al día. Las
+pantallas se registran por referencia débil, así que un árbol descartado
+deja de recibir avisos en cuanto se libera, y cada get_* se calcula una
+sola vez por tamaño de ventana aunque lo usen cientos de widgets.
+"""
+import functools
+import time
+import weakref
+
+from kivy.clock import Clock
+from kivy.core.window import Window
+from kivy.uix.modalview import ModalView
+from kivy.uix.screenmanager import Screen
+
+from app_log import get_logger
+from config import RESIZE_DEBOUNCE, RESPONSIVE_TRACK_LIMIT
+
+
+log = get_logger("Responsive")
+
+# Métodos del helper que no son medidas de un widget
+_UNTRACKED = {"get_popup_size", "get_window_width", "get_window_height"}
+
+# Propiedades que se revisan en cada widget
+_PROPS = ("font_size", "height", "width", "spacing", "padding", "size_hint_x", "size_hint_y")
+
+# id(valor) -> (valor, método, args, índice en la lista devuelta o None).
+# Guardar el valor mantiene vivo el objeto para que su id no se reutilice;
+# lo que ya no usa ningún widget se descarta en _prune.
+_outputs = {}
+
+_layouts = weakref.WeakSet()
+# (método, args) -> resultado, válido mientras la ventana tenga _breakpoints_size
+_breakpoints = {}
+_breakpoints_size = None
+_bound = False
+_resize_trigger = None
+_prune_trigger = None
+
+passes = 0
+prunes = 0
+popups = 0
+
+
+def tracked(helper):
+    """Decorador de clase: anota lo que devuelven los get_* estáticos del helper."""
+    for name, attr in list(vars(helper).items()):
+        if isinstance(attr, staticmethod) and name.startswith("get_") and name not in _UNTRACKED:
+            setattr(helper, name, staticmethod(_recorder(attr.__func__)))
+    return helper
+
+
+def _recorder(fn):
+    @functools.wraps(fn)
+    def wrapper(*args):
+        value = fn(*args)
+        _remember(value, wrapper, args)
+        return value
+    return wrapper
+
+
+def _remember(value, method, args):
+    if type(value) is float:
+        _outputs[id(value)] = (value, method, args, None)
+    elif isinstance(value, (list, tuple)):
+        for i, item in enumerate(value):
+            if type(item) is float:
+                _outputs[id(item)] = (item, method, args, i)
+    else:
+        return
+    if len(_outputs) > RESPONSIVE_TRACK_LIMIT and _prune_trigger is not None:
+        _prune_trigger()
+
+
+def _lookup(table, value):
+    entry = table.get(id(value))
+    if entry is not None and entry[0] is value:
+        return entry
+    return None
+
+
+def _breakpoint(entry):
+    """Valor actual de una medida anotada; cada get_* se evalúa una vez por tamaño de ventana."""
+    global _breakpoints_size
+    size = tuple(Window.size)
+    if size != _breakpoints_size:
+        _breakpoints.clear()
+        _breakpoints_size = size
+    _, method, args, index = entry
+    spec = (method, args)
+    if spec not in _breakpoints:
+        _breakpoints[spec] = method(*args)
+    result = _breakpoints[spec]
+    return result if index is None else result[index]
+
+
+def _reflow_tree(root):
+    """Actualiza en su sitio las medidas anotadas de todo el árbol; devuelve cuántas cambiaron."""
+    updated = 0
+    for widget, prop, value in _widget_values(root):
+        if isinstance(value, list):
+            new_list = None
+            for i, item in enumerate(value):
+                entry = _lookup(_outputs, item)
+                if entry is None:
+                    continue
+                new_item = _breakpoint(entry)
+                if new_item != item:
+                    new_list = new_list or list(value)
+                    new_list[i] = new_item
+            if new_list is not None:
+                setattr(widget, prop, new_list)
+                updated += 1
+            continue
+        entry = _lookup(_outputs, value)
+        if entry is None:
+            continue
+        new_value = _breakpoint(entry)
+        if new_value != value:
+            setattr(widget, prop, new_value)
+            updated += 1
+    return updated
+
+
+def _widget_values(root):
+    """(widget, propiedad, valor) de las propiedades medibles de todo el árbol."""
+    for widget in root.walk(restrict=True):
+        for prop in _PROPS:
+            if widget.property(prop, quiet=True) is None:
+                continue
+            yield widget, prop, getattr(widget, prop)
+
+
+def _screen_of(widget):
+    """Screen que contiene a widget, o None."""
+    while widget is not None and not isinstance(widget, Screen):
+        parent = widget.parent
+        widget = parent if parent is not widget else None
+    return widget
+
+
+def _bind():
+    global _bound, _resize_trigger, _prune_trigger
+    if _bound:
+        return
+    _bound = True
+    _resize_trigger = Clock.create_trigger(_apply, RESIZE_DEBOUNCE)
+    _prune_trigger = Clock.create_trigger(_prune, 0)
+    Window.bind(on_resize=_on_resize)
+
+
+def _on_resize(window, width, height):
+    # Debounce: cada evento reinicia la espera, se aplica al soltar el borde
+    _resize_trigger.cancel()
+    _resize_trigger()
+
+
+def _apply(dt=None):
+    """Una pasada por todas las pantallas registradas tras un cambio de tamaño."""
+    global passes, popups
+    passes += 1
+    for layout in list(_layouts):
+        try:
+            layout._on_resize()
+        except Exception as e:
+            log.error("Error reacomodando %s: %r", layout.name, e)
+    # Los popups abiertos cuelgan de Window, fuera de cualquier pantalla
+    for child in list(Window.children):
+        if isinstance(child, ModalView):
+            popups += 1
+            _reflow_tree(child)
+
+
+def _prune(dt=None):
+    """Olvida los valores que ya no están en ninguna pantalla (popups cerrados, árboles descartados)."""
+    global _outputs, prunes
+    prunes += 1
+    old, _outputs = _outputs, {}
+    for layout in list(_layouts):
+        layout._retain(old)
+    log.debug("Valores anotados: %s -> %s", len(old), len(_outputs))
+
+
+class ResponsiveLayout:
+    """
+    Cómo se adapta owner (una Screen o un panel) al tamaño de la ventana.
+    build reconstruye todo; layout_key devuelve lo que decide la estructura
+    de build (si cambia, se reconstruye) y reflow ajusta en su sitio lo que
+    build calculó a mano a partir de Window.
+    """
+
+    def __init__(self, owner, build=None, layout_key=None, reflow=None):
+        self._owner = weakref.ref(owner)
+        self.name = type(owner).__name__
+        self._build = build
+        self._layout_key = layout_key
+        self._reflow = reflow
+        self.key = None
+        self.pending = False
+
+        self.builds = 0
+        self.rebuilds = 0
+        self.reflows = 0
+        self.deferred = 0
+        self.updated = 0
+        self.build_ms = 0.0
+        self.reflow_ms = 0.0
+
+        if isinstance(owner, Screen):
+            owner.fbind("on_pre_enter", self._on_enter)
+        _layouts.add(self)
+        _bind()
+
+    @property
+    def owner(self):
+        return self._owner()
+
+    def build(self):
+        """Construye (o reconstruye) owner y recuerda la estructura con la que se hizo."""
+        owner = self.owner
+        if owner is None:
+            return
+        started = time.perf_counter()
+        if self._build is not None:
+            self._build()
+        self.key = self.current_key()
+        self.pending = False
+        self.builds += 1
+        self.build_ms = (time.perf_counter() - started) * 1000
+
+    def current_key(self):
+        return self._layout_key() if self._layout_key is not None else None
+
+    def reflow(self):
+        """Pone al día en su sitio las medidas del helper y lo que calcule el hook reflow."""
+        owner = self.owner
+        if owner is None:
+            return 0
+        started = time.perf_counter()
+        updated = _reflow_tree(owner)
+        if self._reflow is not None:
+            self._reflow()
+        self.reflows += 1
+        self.updated += updated
+        self.reflow_ms = (time.perf_counter() - started) * 1000
+        return updated
+
+    def _on_resize(self):
+        owner = self.owner
+        if owner is None:
+            return
+        if owner.get_parent_window() is None:
+            # Pantalla oculta (o panel dentro de una): se pone al día al volver a entrar
+            if not self.pending:
+                self.deferred += 1
+            self.pending = True
+            return
+        self._refresh()
+
+    def _on_enter(self, *args):
+        if self.pending:
+            self.pending = False
+            self._refresh()
+        # Paneles propios (tarjetas, marcadores) que también quedaron pendientes
+        screen = self.owner
+        for layout in list(_layouts):
+            if layout.pending and _screen_of(layout.owner) is screen:
+                layout.pending = False
+                layout._refresh()
+
+    def _refresh(self):
+        if self._build is not None and self.current_key() != self.key:
+            log.debug("%s: cambia la estructura, se reconstruye", self.name)
+            self.rebuilds += 1
+            self.build()
+        else:
+            self.reflow()
+
+    def _retain(self, old):
+        owner = self.owner
+        if owner is None:
+            return
+        for _, _, value in _widget_values(owner):
+            for item in (value if isinstance(value, list) else (value,)):
+                entry = _lookup(old, item)
+                if entry is not None:
+                    _outputs[id(item)] = entry
+
+    def stats(self) -> dict:
+        return {
+            "builds": self.builds,
+            "rebuilds": self.rebuilds,
+            "reflows": self.reflows,
+            "deferred": self.deferred,
+            "updated": self.updated,
+            "pending": self.pending,
+            "build_ms": self.build_ms,
+            "reflow_ms": self.reflow_ms,
+        }
+
+
+def subscribers() -> dict:
+    """Pantallas y paneles vivos suscritos al cambio de tamaño, por clase."""
+    counts = {}
+    for layout in list(_layouts):
+        if layout.owner is not None:
+            counts[layout.name] = counts.get(layout.name, 0) + 1
+    return counts
+
+
+def window_handlers() -> int:
+    """Callbacks vivos enlazados directamente a Window.on_resize (este módulo y los de Kivy)."""
+    alive = 0
+    for observer in Window.get_property_observers("on_resize"):
+        is_dead = getattr(observer, "is_dead", None)
+        if is_dead is None or not is_dead():
+            alive += 1
+    return alive
+
+
+def stats() -> dict:
+    """Resumen para diagnóstico: pasadas de resize, suscriptores y contadores por pantalla viva."""
+    live = subscribers()
+    return {
+        "passes": passes,
+        "prunes": prunes,
+        "popups": popups,
+        "tracked_values": len(_outputs),
+        "breakpoints": len(_breakpoints),
+        "subscribers": sum(live.values()),
+        "subscribers_by_type": live,
+        "pending": sum(1 for l in list(_layouts) if l.pending and l.owner is not None),
+        "window_handlers": window_handlers(),
+        "layouts": {f"{l.name}@{id(l):x}": l.stats() for l in list(_layouts) if l.owner is not None},
+    }
@@ -9,9 +9,15 @@ from kivy.core.window import Window
 from kivy.metrics import dp, sp
 from kivy.utils import platform
 from kivy.clock import Clock
-from threading import Thread
-from threading import Thread
+from task_executor import executor, PRIORITY_NORMAL
 from kivy.clock import Clock
+import json_codec
+from app_log import get_logger
+from ui_bus import ui_bus
+from match_clock import MatchClock, MATCH_OVER
+from config import MATCH_CLOCK_TICK
+import responsive
+from responsive import ResponsiveLayout
 
 # Importar cliente API si está disponible
 try:
@@ -23,7 +29,12 @@ except ImportError:
     print("[Tablero] Warning: api_client not found, using local scores only")
 
 
+log = get_logger("Tablero")
+log_panel = get_logger("CompetitorPanel")
+
+
 # ------------------ UTILIDADES RESPONSIVE ------------------
+@responsive.tracked
 class ResponsiveHelper:
     @staticmethod
     def is_mobile():
@@ -98,8 +109,8 @@ class CompetitorPanel(BoxLayout):
         self.alumno_id = alumno_id
         self.score_refresh_event = None
         
+        # Al cambiar la ventana lo reacomoda MainScreentab en su sitio (ver reflow_layout)
         self.update_layout()
-        Window.bind(on_resize=self.on_window_resize)
         
         self.bind(score=self.update_score_label)
         self.bind(penalty_score=self.update_penalty_label)
@@ -253,8 +264,9 @@ class CompetitorPanel(BoxLayout):
         self.rect.pos = self.pos
         self.rect.size = self.size
     
-    def on_window_resize(self, instance, width, height):
-        Clock.schedule_once(lambda dt: self.update_layout(), 0.1)
+    def reflow_layout(self):
+        """Lo que update_layout calcula a mano a partir de la ventana"""
+        self.name_label.text_size = (Window.width * 0.3, None)
 
     def add_score(self, points=1):
         """Añade puntos al marcador"""
@@ -284,13 +296,11 @@ class CompetitorPanel(BoxLayout):
         def _fetch_score():
             try:
                 count = api.get_puntaje_count(self.alumno_id)
-                Clock.schedule_once(lambda dt: self._update_score_from_api(count))
+                ui_bus.post_latest((self, "score"), self._update_score_from_api, count)
             except Exception as e:
-                print(f"[CompetitorPanel] Error al obtener puntaje: {e}")
+                log_panel.warning("Error al obtener puntaje: %s", e)
         
-        thread = Thread(target=_fetch_score)
-        thread.daemon = True
-        thread.start()
+        executor.submit(_fetch_score, priority=PRIORITY_NORMAL)
 
     def load_gamjeom_from_api(self, combate_id):
         """Carga las faltas GAM-JEOM desde la API"""
@@ -299,19 +309,17 @@ class CompetitorPanel(BoxLayout):
         
         def _fetch_gamjeom():
             try:
-                import requests
-                url = f"http://localhost:8080/apiGamJeom/falta/alumno/{self.alumno_id}/combate/{combate_id}/count"
-                response = requests.get(url, timeout=2)
+                response = api.get_json(
+                    f"/apiGamJeom/falta/alumno/{self.alumno_id}/combate/{combate_id}/count",
+                    timeout=2
+                )
                 if response.status_code == 200:
-                    data = response.json()
-                    count = data.get('count', 0)
-                    Clock.schedule_once(lambda dt: self._update_gamjeom_from_api(count))
+                    count = json_codec.read_int(response.content, 'count')
+                    ui_bus.post_latest((self, "gamjeom"), self._update_gamjeom_from_api, count)
             except Exception as e:
-                print(f"[CompetitorPanel] Error al obtener GAM-JEOM: {e}")
+                log_panel.warning("Error al obtener GAM-JEOM: %s", e)
     
-        thread = Thread(target=_fetch_gamjeom)
-        thread.daemon = True
-        thread.start()
+        executor.submit(_fetch_gamjeom, priority=PRIORITY_NORMAL)
 
     def _update_gamjeom_from_api(self, count):
         """Actualiza las faltas GAM-JEOM en el hilo principal"""
@@ -365,15 +373,12 @@ class CenterPanel(BoxLayout):
         self.orientation = 'vertical'
         
         # Timer variables
-        self.time_seconds = 0
         self.round_duration = 120  # 2 minutos por defecto
         self.rest_duration = 60    # 1 minuto de descanso
-        self.is_running = False
-        self.is_rest = False
+        self.clock = MatchClock(self.round_duration, self.rest_duration, self.total_rounds)
         self.timer_event = None
         
         self.update_layout()
-        Window.bind(on_resize=self.on_window_resize)
 
     def update_layout(self):
         self.clear_widgets()
@@ -527,6 +532,14 @@ class CenterPanel(BoxLayout):
         self.rect.pos = self.pos
         self.rect.size = self.size
 
+    @property
+    def is_running(self):
+        return self.clock.running
+
+    @property
+    def is_rest(self):
+        return self.clock.is_rest
+
     def toggle_timer(self, instance):
         """Inicia o pausa el timer"""
         if self.is_running:
@@ -536,18 +549,19 @@ class CenterPanel(BoxLayout):
 
     def start_timer(self):
         """Inicia el timer"""
-        self.is_running = True
+        if not self.clock.start():
+            return
         self.match_status = "EN CURSO"
         
         if self.timer_event:
             self.timer_event.cancel()
         
-        self.timer_event = Clock.schedule_interval(self.update_timer, 1)
+        self.timer_event = Clock.schedule_interval(self.update_timer, MATCH_CLOCK_TICK)
         self.update_status_label()
 
     def pause_timer(self):
         """Pausa el timer"""
-        self.is_running = False
+        self.clock.pause()
         self.match_status = "PAUSADO"
         
         if self.timer_event:
@@ -557,48 +571,38 @@ class CenterPanel(BoxLayout):
 
     def reset_timer(self, instance=None):
         """Reinicia el timer del round actual"""
-        self.time_seconds = self.round_duration if not self.is_rest else self.rest_duration
-        self.update_time_display()
-        
         if self.is_running:
             self.pause_timer()
+        self.clock.reset_phase()
+        self.update_time_display()
 
     def update_timer(self, dt):
-        """Actualiza el timer cada segundo"""
-        if self.time_seconds > 0:
-            self.time_seconds -= 1
-            self.update_time_display()
-        else:
-            # Tiempo agotado
-            if self.is_rest:
-                # Fin del descanso, siguiente round
-                self.is_rest = False
-                self.round_num += 1
-                if self.round_num > self.total_rounds:
-                    self.end_match()
-                else:
-                    self.time_seconds = self.round_duration
-                    self.update_layout()
-            else:
-                # Fin del round
-                if self.round_num < self.total_rounds:
-                    self.is_rest = True
-                    self.time_seconds = self.rest_duration
-                    self.update_layout()
-                else:
-                    self.end_match()
+        """Repinta el tiempo; las transiciones de round/descanso las decide el reloj"""
+        event = self.clock.tick()
+        self.update_time_display()
+        if event is None:
+            return
+        if event == MATCH_OVER:
+            self.end_match()
+            return
+        # Fin del round o del descanso: este tablero sigue corriendo solo
+        self.round_num = self.clock.round_number
+        self.clock.start()
+        self.update_layout()
 
     def end_match(self):
         """Finaliza el combate"""
         self.pause_timer()
+        self.clock.finish()
         self.match_status = "FINALIZADO"
         self.update_status_label()
 
     def update_time_display(self):
         """Actualiza la visualización del tiempo"""
-        minutes = self.time_seconds // 60
-        seconds = self.time_seconds % 60
-        self.time_str = f"{minutes:02d}:{seconds:02d}"
+        text = self.clock.display()
+        if text == self.time_str:
+            return
+        self.time_str = text
         if hasattr(self, 'time_label'):
             self.time_label.text = self.time_str
 
@@ -627,15 +631,14 @@ class CenterPanel(BoxLayout):
         else:
             app.root.current = 'ini'
     
-    def on_window_resize(self, instance, width, height):
-        Clock.schedule_once(lambda dt: self.update_layout(), 0.1)
-
     def set_round_config(self, num_rounds, round_duration, rest_duration):
         """Configura los parámetros de rounds"""
         self.total_rounds = num_rounds
         self.round_duration = round_duration
         self.rest_duration = rest_duration
-        self.time_seconds = round_duration
+        if self.timer_event:
+            self.timer_event.cancel()
+        self.clock.configure(round_duration, rest_duration, num_rounds)
         self.update_time_display()
         self.update_layout()
 
@@ -647,15 +650,16 @@ class MainScreentab(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.combate_data = None
-        self.build_ui()
-        Window.bind(on_resize=self.on_window_resize)
+        # Cambiar de orientación solo gira main_layout: los paneles (y el cronómetro) siguen vivos
+        self.responsive = ResponsiveLayout(self, build=self.build_ui, reflow=self.reflow_layout)
+        self.responsive.build()
 
     def build_ui(self):
         self.clear_widgets()
         
         orientation = ResponsiveHelper.get_layout_orientation()
         
-        main_layout = BoxLayout(
+        self.main_layout = main_layout = BoxLayout(
             orientation=orientation,
             spacing=0
         )
@@ -693,7 +697,7 @@ class MainScreentab(Screen):
         if not data:
             return
         
-        print(f"[Tablero] Cargando datos del combate: {data}")
+        log.debug("Cargando datos del combate: %s", data)
         
         # Detener actualizaciones previas
         self.com1_panel.stop_score_refresh()
@@ -736,28 +740,37 @@ class MainScreentab(Screen):
         # Obtener ID del combate
         combate_id = data.get('idCombate') or data.get('id') or data.get('combate_id')
 
-        # Cargar puntajes y GAM-JEOM UNA SOLA VEZ
-        self.com1_panel.load_score_from_api()
-        self.com2_panel.load_score_from_api()
-
-        if combate_id:
-            self.com1_panel.load_gamjeom_from_api(combate_id)
-            self.com2_panel.load_gamjeom_from_api(combate_id)
-        else:
-            print("[Tablero] ⚠️ No se proporcionó ID de combate, no se cargarán GAM-JEOM")
+        # Cargar puntajes y GAM-JEOM UNA SOLA VEZ (las 4 consultas en paralelo)
+        if not combate_id:
+            log.warning("No se proporcionó ID de combate, no se cargarán GAM-JEOM")
+        if API_AVAILABLE and api:
+            executor.submit(
+                api.get_scoreboard_snapshot,
+                combate_id, self.com2_panel.alumno_id, self.com1_panel.alumno_id,
+                priority=PRIORITY_NORMAL,
+                on_result=self._apply_snapshot
+            )
 
         # NO llamar a start_score_refresh() - así no hay polling
 
+    def _apply_snapshot(self, snapshot):
+        """Aplica el marcador a ambos paneles en una sola actualización (hilo principal)"""
+        # com2 = ROJO, com1 = AZUL
+        self.com2_panel._update_score_from_api(snapshot.puntaje_rojo)
+        self.com1_panel._update_score_from_api(snapshot.puntaje_azul)
+        self.com2_panel._update_gamjeom_from_api(snapshot.gamjeom_rojo)
+        self.com1_panel._update_gamjeom_from_api(snapshot.gamjeom_azul)
+
     def set_combate_data(self, data):
         """Establece los datos del combate"""
         self.combate_data = data
         self.load_combate_data(data)
     
-    def on_window_resize(self, instance, width, height):
-        Clock.schedule_once(lambda dt: self.build_ui(), 0.1)
-        # Recargar datos después de reconstruir UI
-        if self.combate_data:
-            Clock.schedule_once(lambda dt: self.load_combate_data(self.combate_data), 0.2)
+    def reflow_layout(self):
+        """Lo que build_ui calcula a mano; el resto lo actualiza ResponsiveLayout"""
+        self.main_layout.orientation = ResponsiveHelper.get_layout_orientation()
+        self.com1_panel.reflow_layout()
+        self.com2_panel.reflow_layout()
 
 
 # ------------------ APLICACIÓN STANDALONE ------------------
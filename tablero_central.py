@@ -10,16 +10,35 @@ from kivy.uix.screenmanager import Screen, ScreenManager
 from kivy.uix.popup import Popup
 from kivy.metrics import dp, sp
 from kivy.core.window import Window
-from threading import Thread
-from kivy.clock import mainthread
-import requests
-import json
-
-try:
-    import websocket
-    WEBSOCKET_AVAILABLE = True
-except ImportError:
-    WEBSOCKET_AVAILABLE = False
+from task_executor import executor, PRIORITY_NORMAL
+from cancel_scope import CancelScope
+import importlib.util
+import json_codec
+import threading
+import time
+from api_client import api
+from mutation_queue import (
+    mutation_queue, UncertainMutationError,
+    SCORE_ADD, SCORE_SUB, SCORE_VOID, GAMJEOM_ADD, GAMJEOM_SUB,
+)
+from app_log import get_logger
+from ui_bus import ui_bus, ui_thread, ui_latest
+from match_clock import MatchClock, ROUND, REST, ENDED, ROUND_OVER, REST_OVER
+from clock_sync import ClockLink, OWNER
+import responsive
+from responsive import ResponsiveLayout
+from config import (
+    MATCH_CLOCK_TICK, MATCH_CLOCK_ROLE, SCORE_VALIDATION_GRACE, SCORE_CORRECTION_BATCH_DELAY,
+    SCORE_RECONCILE_GRACE,
+)
+from websocket_manager import (
+    WebSocketManager, SequenceTracker, tablero_url,
+    CONNECTING, OPEN, DUPLICATE, GAP, RESUME, UP_TO_DATE,
+)
+
+# La conexión la abre WebSocketManager; aquí solo se comprueba que la librería exista
+WEBSOCKET_AVAILABLE = importlib.util.find_spec("websocket") is not None
+if not WEBSOCKET_AVAILABLE:
     print("=" * 60)
     print("  ADVERTENCIA: websocket-client no instalado")
     print("  Ejecuta: pip install websocket-client")
@@ -27,7 +46,14 @@ except ImportError:
     print("=" * 60)
 
 
+log = get_logger("MainScreentabc")
+log_ws = get_logger("WebSocket")
+log_panel = get_logger("CompetitorPanel")
+log_center = get_logger("CenterPanel")
+
+
 # ------------------ UTILIDADES RESPONSIVE ------------------
+@responsive.tracked
 class ResponsiveHelper:
     @staticmethod
     def is_mobile():
@@ -88,9 +114,15 @@ class CompetitorPanel(BoxLayout):
         self.combate_id = combate_id
         self.parent_screen = None  # Referencia a MainScreentabc
         self.max_gamjeom = 3  # Máximo de faltas antes de descalificación
+        # Puntos mostrados antes de que el servidor los confirme: key de mutación -> puntaje esperado
+        self.provisional = {}
+        # Último conteo publicado por el servidor (websocket, REST o snapshot) y cuántas veces llegó
+        self.server_score = 0
+        self.server_updates = 0
+        # key de mutación -> (delta del toque, server_updates al tocar)
+        self.taps = {}
         
         self.build_ui()
-        # Window.bind(on_resize=self.on_window_resize)
 
     def build_ui(self):
         self.clear_widgets()
@@ -148,7 +180,7 @@ class CompetitorPanel(BoxLayout):
         score_layout.add_widget(btn_minus_score)
         
         self.score_label = Label(
-            text="0",
+            text=str(self.score),
             font_size=ResponsiveHelper.get_font_size(50),
             color=(1, 1, 1, 1),
             bold=True
@@ -177,6 +209,17 @@ class CompetitorPanel(BoxLayout):
         )
         self.add_widget(self.status_indicator)
 
+        # Pendientes de enviar vs confirmados por el servidor
+        self.sync_indicator = Label(
+            text="",
+            font_size=ResponsiveHelper.get_font_size(11),
+            color=(0.8, 0.8, 1, 1),
+            size_hint_y=None,
+            height=dp(18)
+        )
+        self.add_widget(self.sync_indicator)
+        self.refresh_pending()
+
         # Espaciador
         self.add_widget(BoxLayout(size_hint_y=0.05))
 
@@ -245,90 +288,170 @@ class CompetitorPanel(BoxLayout):
         self.rect.pos = self.pos
         self.rect.size = self.size
 
-    def on_window_resize(self, instance, width, height):
-        Clock.schedule_once(lambda dt: self.build_ui(), 0.1)
+    def read_scope(self):
+        """Scope de cancelación de la pantalla para lecturas (las mutaciones no se cancelan)"""
+        return self.parent_screen.scope if self.parent_screen else None
 
     # ==================== MÉTODOS DE PUNTAJE ====================
 
     def add_score_api(self):
         """ Suma 1 punto directamente en la BD (tiempo real) """
         if not self.alumno_id or not self.combate_id:
-            print("[CompetitorPanel] No hay alumno_id o combate_id")
+            log_panel.warning("No hay alumno_id o combate_id")
             return
     
-        # Verificar si el timer está activo
-        if self.parent_screen and not self.parent_screen.is_timer_active():
-            self.show_status("Inicia el timer primero")
-            print("[CompetitorPanel] Timer no activo, no se puede sumar")
+        # Solo con el round corriendo: en pausa el punto se anularía al validarlo por su hora
+        if self.parent_screen and not self.parent_screen.is_scoring_open():
+            paused = self.parent_screen.is_timer_active()
+            self.show_status("Combate en pausa" if paused else "Inicia el timer primero")
+            log_panel.info("Round sin correr, no se puede sumar")
             return
     
-        self.show_status("Guardando...")
-    
-        def work():
-            try:
-                url = f"http://localhost:8080/apiPuntajes/puntaje/simple?combateId={self.combate_id}&alumnoId={self.alumno_id}&valorPuntaje=1"
-                response = requests.post(url, timeout=5)
-                
-                if response.status_code in [200, 201]:
-                    data = response.json()
-                    print(f"[CompetitorPanel] +1 punto guardado para alumno {self.alumno_id}")
-                    new_count = data.get('newCount', 0)
-                    self.update_api_score(new_count)
-                    self.show_status("+1")
-                    Clock.schedule_once(lambda dt: self.clear_status(), 1)
-                else:
-                    print(f"[CompetitorPanel] ✗ Error al guardar: {response.status_code}")
-                    self.show_status(f"✗ Error {response.status_code}")
-            except Exception as e:
-                print(f"[CompetitorPanel] ✗ Excepción: {e}")
-                self.show_status("✗ Error conexión")
-        
-        Thread(target=work, daemon=True).start()
+        # Se muestra en este mismo frame; el servidor lo confirma después
+        mutation = mutation_queue.enqueue(
+            SCORE_ADD, self.combate_id, self.alumno_id,
+            on_done=self._on_score_added, on_failed=self._on_score_failed
+        )
+        self.apply_provisional(mutation.key, +1)
+
+    def _on_score_added(self, mutation, data):
+        new_count = data.get('newCount', 0)
+        log_panel.debug("+1 punto guardado para alumno %s", self.alumno_id)
+        self.reconcile_score(mutation.key, new_count)
 
     def subtract_score_api(self):
         """Resta 1 punto (elimina el último registro de la BD)"""
         if not self.alumno_id:
-            print("[CompetitorPanel] No hay alumno_id")
+            log_panel.warning("No hay alumno_id")
             return
         
         # Verificar si el timer está activo
         if self.parent_screen and not self.parent_screen.is_timer_active():
             self.show_status("Inicia el timer primero")
-            print("[CompetitorPanel] Timer no activo, no se puede restar")
+            log_panel.info("Timer no activo, no se puede restar")
             return
         
-        # No permitir restar si ya está en 0
-        if self.api_score <= 0:
+        # No permitir restar si ya está en 0 (contando lo que aún no se confirma)
+        if self.score <= 0:
             self.show_status("Ya está en 0")
             return
         
-        self.show_status("Eliminando...")
-        
-        def work():
-            try:
-                url = f"http://localhost:8080/apiPuntajes/puntaje/alumno/{self.alumno_id}/last"
-                response = requests.delete(url, timeout=5)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    new_count = data.get('newCount', 0)
-                    print(f"[CompetitorPanel] ✓ -1 punto eliminado para alumno {self.alumno_id}, nuevo total: {new_count}")
-                    self.update_api_score(new_count)
-                    self.show_status("-1")
-                    Clock.schedule_once(lambda dt: self.clear_status(), 1)
-                elif response.status_code == 204:
-                    print(f"[CompetitorPanel] ✓ Punto eliminado")
-                    self.refresh_score()
-                    self.show_status("✓ -1")
-                    Clock.schedule_once(lambda dt: self.clear_status(), 1)
+        mutation = mutation_queue.enqueue(
+            SCORE_SUB, self.combate_id, self.alumno_id,
+            on_done=self._on_score_removed, on_failed=self._on_score_failed
+        )
+        self.apply_provisional(mutation.key, -1)
+
+    def _on_score_removed(self, mutation, data):
+        if 'newCount' in data:
+            new_count = data['newCount']
+            log_panel.debug("-1 punto eliminado para alumno %s, nuevo total: %s", self.alumno_id, new_count)
+            self.reconcile_score(mutation.key, new_count)
+        else:
+            # 204 sin cuerpo: pedir el conteo actualizado
+            log_panel.debug("Punto eliminado")
+            self.reconcile_score(mutation.key, None)
+            self.refresh_score()
+
+    def _on_score_failed(self, mutation, error):
+        response = getattr(error, 'response', None)
+        if response is not None:
+            log_panel.warning("Error al guardar: %s", response.status_code)
+        else:
+            log_panel.warning("Excepción: %s", error)
+        self.rollback_score(mutation.key)
+        if isinstance(error, UncertainMutationError):
+            # No se sabe si el servidor la aplicó: mostrar su conteo real
+            self.refresh_score()
+
+    # ---- Puntaje optimista ----
+
+    def apply_provisional(self, key, delta):
+        """Aplica un toque en pantalla de inmediato y lo marca como provisional"""
+        self.provisional[key] = self.score + delta
+        self.taps[key] = (delta, self.server_updates)
+        self.show_score(self.score + delta)
+        self.show_status("+1" if delta > 0 else "-1")
+        Clock.schedule_once(lambda dt: self.clear_status(), 1)
+
+    @ui_thread
+    def reconcile_score(self, key, server_count):
+        """
+        El servidor confirmó la mutación `key`. Si su conteo no coincide con el
+        esperado se corrige el marcador (y los provisionales siguientes).
+        Los jueces suman a la vez, así que solo se avisa de una corrección si
+        el conteo no lo explica lo que ya publicó el servidor más este toque.
+        server_count=None: respuesta sin conteo, solo se retira el provisional.
+        """
+        expected = self.provisional.pop(key, None)
+        delta, updates = self.taps.pop(key, (0, self.server_updates))
+        if server_count is None:
+            self.refresh_pending()
+            return
+        self.api_score = server_count
+        if expected is not None and expected != server_count:
+            self._shift_provisional(server_count - expected)
+            explained = {self.server_score + delta}
+            if self.server_updates != updates:
+                # El websocket publicó algo después del toque: puede incluirlo ya
+                explained.add(self.server_score)
+            if server_count not in explained:
+                if server_count > expected:
+                    # Más puntos de los esperados: probablemente de un juez, falta su aviso
+                    self.check_correction(expected, server_count)
                 else:
-                    print(f"[CompetitorPanel] ✗ Error al eliminar: {response.status_code}")
-                    self.show_status(f"✗ Error {response.status_code}")
-            except Exception as e:
-                print(f"[CompetitorPanel] ✗ Excepción: {e}")
-                self.show_status("✗ Error conexión")
-        
-        Thread(target=work, daemon=True).start()
+                    self.flag_correction(expected, server_count)
+        self.show_score(self.expected_score())
+
+    def check_correction(self, expected, server_count):
+        """Avisa de la corrección solo si el servidor no publica esos puntos en SCORE_RECONCILE_GRACE"""
+        seen = self.server_updates
+
+        def check(dt):
+            if self.server_updates != seen and self.server_score >= server_count:
+                log_panel.debug("Conteo de %s explicado por puntos de los jueces: %s → %s",
+                                self.name, expected, server_count)
+                return
+            self.flag_correction(expected, server_count)
+        Clock.schedule_once(check, SCORE_RECONCILE_GRACE)
+
+    @ui_thread
+    def rollback_score(self, key):
+        """El servidor rechazó la mutación: deshacerla en pantalla"""
+        keys = list(self.provisional)
+        if key not in keys:
+            return
+        index = keys.index(key)
+        previous = self.provisional[keys[index - 1]] if index > 0 else self.api_score
+        delta = self.provisional.pop(key) - previous
+        self.taps.pop(key, None)
+        self._shift_provisional(-delta, after=index)
+        self.flag_correction(self.score, self.expected_score())
+        self.show_score(self.expected_score())
+
+    def _shift_provisional(self, delta, after=0):
+        for k in list(self.provisional)[after:]:
+            self.provisional[k] += delta
+
+    def expected_score(self):
+        """Último puntaje esperado: el del provisional más reciente o el confirmado"""
+        if self.provisional:
+            return next(reversed(self.provisional.values()))
+        return self.api_score
+
+    def show_score(self, value):
+        self.score = value
+        self.score_label.text = str(value)
+        # Atenuado mientras haya puntos sin confirmar
+        self.score_label.color = (1, 1, 1, 0.6) if self.provisional else (1, 1, 1, 1)
+        self.refresh_pending()
+
+    def flag_correction(self, shown, server_count):
+        log_panel.warning("Marcador corregido para %s: %s → %s", self.name, shown, server_count)
+        self.status_indicator.text = f"⚠ Corregido por el servidor ({shown} → {server_count})"
+        self.score_label.color = (1, 0.85, 0.2, 1)
+        Clock.schedule_once(lambda dt: self.show_score(self.score), 1.5)
+        Clock.schedule_once(lambda dt: self.clear_status(), 2.5)
 
     def refresh_score(self):
         """Refresca el puntaje desde la API"""
@@ -337,29 +460,55 @@ class CompetitorPanel(BoxLayout):
         
         def work():
             try:
-                url = f"http://localhost:8080/apiPuntajes/puntaje/alumno/{self.alumno_id}/count"
-                response = requests.get(url, timeout=2)
+                response = api.get_json(f"/apiPuntajes/puntaje/alumno/{self.alumno_id}/count", timeout=2)
                 if response.status_code == 200:
-                    new_count = response.json().get('count', 0)
+                    new_count = json_codec.read_int(response.content, 'count')
                     self.update_api_score(new_count)
             except Exception as e:
-                print(f"[CompetitorPanel] ✗ Error refrescando: {e}")
+                log_panel.warning("Error refrescando: %s", e)
         
-        Thread(target=work, daemon=True).start()
+        executor.submit(work, priority=PRIORITY_NORMAL, scope=self.read_scope())
 
-    @mainthread
+    @ui_latest
     def update_api_score(self, new_score):
         """Actualiza el puntaje desde el WebSocket en tiempo real"""
+        self.set_api_score(new_score)
+
+    def set_api_score(self, new_score):
+        """
+        Aplica el puntaje del servidor (llamar desde el hilo principal).
+        Con toques propios sin confirmar no se toca la pantalla: la respuesta
+        HTTP de cada uno trae el conteo con el que se reconcilia.
+        """
         self.api_score = new_score
-        self.score_label.text = str(self.api_score)
-        print(f"[CompetitorPanel] 📊 Score actualizado: {self.name} = {self.api_score}")
+        self.server_score = new_score
+        self.server_updates += 1
+        log_panel.debug("Score actualizado: %s = %s", self.name, self.api_score)
+        if self.provisional:
+            self.refresh_pending()
+            return
+        self.show_score(new_score)
 
-    @mainthread
+    def refresh_pending(self):
+        """Muestra cuántos toques faltan por confirmar frente a lo que ya confirmó el servidor"""
+        if not self.alumno_id:
+            return
+        points = mutation_queue.pending_count(self.alumno_id, "score")
+        faltas = mutation_queue.pending_count(self.alumno_id, "gamjeom")
+        if not points and not faltas:
+            self.sync_indicator.text = ""
+            return
+        text = f"✓ {self.api_score} confirmados · ⏳ {points + faltas} pendientes"
+        if mutation_queue.stalled:
+            text += " (sin conexión)"
+        self.sync_indicator.text = text
+
+    @ui_thread
     def show_status(self, text):
         """Muestra un mensaje de estado temporal"""
         self.status_indicator.text = text
     
-    @mainthread
+    @ui_thread
     def clear_status(self):
         """Limpia el mensaje de estado"""
         self.status_indicator.text = ""
@@ -369,51 +518,41 @@ class CompetitorPanel(BoxLayout):
     def add_gamjeom_api(self):
         """Suma 1 falta GAM-JEOM directamente en la BD"""
         if not self.alumno_id or not self.combate_id:
-            print("[CompetitorPanel] No hay alumno_id o combate_id")
+            log_panel.warning("No hay alumno_id o combate_id")
             return
         
         # Verificar si el timer está activo
         if self.parent_screen and not self.parent_screen.is_timer_active():
             self.show_gamjeom_status("Inicia el timer primero")
-            print("[CompetitorPanel] Timer no activo, no se puede agregar falta")
+            log_panel.info("Timer no activo, no se puede agregar falta")
             return
         
         self.show_gamjeom_status("Registrando falta...")
-        
-        def work():
-            try:
-                url = f"http://localhost:8080/apiGamJeom/falta/simple?combateId={self.combate_id}&alumnoId={self.alumno_id}"
-                response = requests.post(url, timeout=5)
-                
-                if response.status_code in [200, 201]:
-                    data = response.json()
-                    total_faltas = data.get('totalFaltas', 0)
-                    descalificado = data.get('descalificado', False)
-                    
-                    print(f"[CompetitorPanel] ⚠️ +1 falta registrada para alumno {self.alumno_id}, total: {total_faltas}")
-                    self.update_gamjeom_count(total_faltas)
-                    
-                    if descalificado:
-                        self.show_gamjeom_status("❌ DESCALIFICADO")
-                        # Notificar al parent_screen para terminar el combate
-                        if self.parent_screen:
-                            self.parent_screen.on_player_disqualified(self.alumno_id, self.name)
-                    else:
-                        self.show_gamjeom_status(f"Falta {total_faltas}/3")
-                        Clock.schedule_once(lambda dt: self.clear_gamjeom_status(), 2)
-                else:
-                    print(f"[CompetitorPanel] ✗ Error al registrar falta: {response.status_code}")
-                    self.show_gamjeom_status(f"✗ Error {response.status_code}")
-            except Exception as e:
-                print(f"[CompetitorPanel] ✗ Excepción: {e}")
-                self.show_gamjeom_status("✗ Error conexión")
-        
-        Thread(target=work, daemon=True).start()
+        mutation_queue.enqueue(
+            GAMJEOM_ADD, self.combate_id, self.alumno_id,
+            on_done=self._on_gamjeom_added, on_failed=self._on_gamjeom_failed
+        )
+
+    def _on_gamjeom_added(self, mutation, data):
+        total_faltas = data.get('totalFaltas', 0)
+        descalificado = data.get('descalificado', False)
+
+        log_panel.debug("+1 falta registrada para alumno %s, total: %s", self.alumno_id, total_faltas)
+        self.update_gamjeom_count(total_faltas)
+
+        if descalificado:
+            self.show_gamjeom_status("❌ DESCALIFICADO")
+            # Notificar al parent_screen para terminar el combate
+            if self.parent_screen:
+                self.parent_screen.on_player_disqualified(self.alumno_id, self.name)
+        else:
+            self.show_gamjeom_status(f"Falta {total_faltas}/3")
+            Clock.schedule_once(lambda dt: self.clear_gamjeom_status(), 2)
 
     def subtract_gamjeom_api(self):
         """Resta 1 falta GAM-JEOM (elimina la última)"""
         if not self.alumno_id or not self.combate_id:
-            print("[CompetitorPanel] No hay alumno_id o combate_id")
+            log_panel.warning("No hay alumno_id o combate_id")
             return
         
         # Verificar si el timer está activo
@@ -427,27 +566,30 @@ class CompetitorPanel(BoxLayout):
             return
         
         self.show_gamjeom_status("Eliminando falta...")
-        
-        def work():
-            try:
-                url = f"http://localhost:8080/apiGamJeom/falta/alumno/{self.alumno_id}/combate/{self.combate_id}/last"
-                response = requests.delete(url, timeout=5)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    new_count = data.get('newCount', 0)
-                    print(f"[CompetitorPanel] ✓ -1 falta eliminada para alumno {self.alumno_id}, nuevo total: {new_count}")
-                    self.update_gamjeom_count(new_count)
-                    self.show_gamjeom_status("Falta eliminada")
-                    Clock.schedule_once(lambda dt: self.clear_gamjeom_status(), 1)
-                else:
-                    print(f"[CompetitorPanel] ✗ Error al eliminar falta: {response.status_code}")
-                    self.show_gamjeom_status(f"✗ Error {response.status_code}")
-            except Exception as e:
-                print(f"[CompetitorPanel] ✗ Excepción: {e}")
-                self.show_gamjeom_status("✗ Error conexión")
-        
-        Thread(target=work, daemon=True).start()
+        mutation_queue.enqueue(
+            GAMJEOM_SUB, self.combate_id, self.alumno_id,
+            on_done=self._on_gamjeom_removed, on_failed=self._on_gamjeom_failed
+        )
+
+    def _on_gamjeom_removed(self, mutation, data):
+        if 'newCount' in data:
+            new_count = data['newCount']
+            log_panel.debug("-1 falta eliminada para alumno %s, nuevo total: %s", self.alumno_id, new_count)
+            self.update_gamjeom_count(new_count)
+        else:
+            self.refresh_gamjeom()
+        self.show_gamjeom_status("Falta eliminada")
+        Clock.schedule_once(lambda dt: self.clear_gamjeom_status(), 1)
+
+    def _on_gamjeom_failed(self, mutation, error):
+        response = getattr(error, 'response', None)
+        if response is not None:
+            log_panel.warning("Error en falta: %s", response.status_code)
+            self.show_gamjeom_status(f"✗ Error {response.status_code}")
+        else:
+            log_panel.warning("Excepción: %s", error)
+            self.show_gamjeom_status("✗ Error")
+        self.refresh_gamjeom()
 
     def refresh_gamjeom(self):
         """Refresca el conteo de faltas desde la API"""
@@ -456,20 +598,25 @@ class CompetitorPanel(BoxLayout):
         
         def work():
             try:
-                url = f"http://localhost:8080/apiGamJeom/falta/alumno/{self.alumno_id}/combate/{self.combate_id}/count"
-                response = requests.get(url, timeout=2)
+                response = api.get_json(
+                    f"/apiGamJeom/falta/alumno/{self.alumno_id}/combate/{self.combate_id}/count",
+                    timeout=2
+                )
                 if response.status_code == 200:
-                    data = response.json()
-                    new_count = data.get('count', 0)
+                    new_count = json_codec.read_int(response.content, 'count')
                     self.update_gamjeom_count(new_count)
             except Exception as e:
-                print(f"[CompetitorPanel] ✗ Error refrescando faltas: {e}")
+                log_panel.warning("Error refrescando faltas: %s", e)
         
-        Thread(target=work, daemon=True).start()
+        executor.submit(work, priority=PRIORITY_NORMAL, scope=self.read_scope())
 
-    @mainthread
+    @ui_latest
     def update_gamjeom_count(self, count):
         """Actualiza el contador visual de faltas"""
+        self.set_gamjeom_count(count)
+
+    def set_gamjeom_count(self, count):
+        """Aplica el conteo de faltas (llamar desde el hilo principal)"""
         self.penalty_score = count
         self.penalty_label.text = str(count)
         
@@ -481,14 +628,14 @@ class CompetitorPanel(BoxLayout):
         else:
             self.penalty_label.color = (1, 1, 1, 1)  # Blanco
         
-        print(f"[CompetitorPanel] ⚠️ GAM-JEOM actualizado: {self.name} = {count}")
+        log_panel.debug("GAM-JEOM actualizado: %s = %s", self.name, count)
 
-    @mainthread
+    @ui_thread
     def show_gamjeom_status(self, text):
         """Muestra un mensaje de estado para GAM-JEOM"""
         self.gamjeom_status.text = text
     
-    @mainthread
+    @ui_thread
     def clear_gamjeom_status(self):
         """Limpia el mensaje de estado de GAM-JEOM"""
         self.gamjeom_status.text = ""
@@ -505,18 +652,20 @@ class CenterPanel(BoxLayout):
     round_str = StringProperty("Round 1")
     combat_started = BooleanProperty(False)
 
-    def __init__(self, duracion_round=180, duracion_descanso=60, numero_rounds=3, **kwargs):
+    def __init__(self, duracion_round=180, duracion_descanso=60, numero_rounds=3, follower=False, **kwargs):
         super().__init__(**kwargs)
-        self.timer_running = False
-        self.round_number = 1
+        # Seguidor: el reloj lo manda la consola del árbitro, aquí solo se muestra
+        self.follower = follower
         self.numero_rounds = numero_rounds
         self.duracion_round = duracion_round
         self.duracion_descanso = duracion_descanso
-        self.remaining_time = duracion_round
-        self.is_rest_time = False
+        self.clock = MatchClock(duracion_round, duracion_descanso, numero_rounds)
+        self.timer_event = None
+        self.time_str = self.clock.display()
+        # Backend sin puntajeId/serverTime: los puntos se juzgan por su hora de llegada
+        self.legacy_validation = False
         
         self.build_ui()
-        # Window.bind(on_resize=self.on_window_resize)
 
     def build_ui(self):
         self.clear_widgets()
@@ -540,6 +689,29 @@ class CenterPanel(BoxLayout):
         )
         self.add_widget(self.combat_status_label)
 
+        # Indicador de backend degradado (circuito abierto)
+        self.backend_label = Label(
+            text="",
+            font_size=ResponsiveHelper.get_font_size(12),
+            color=(0.9, 0.4, 0, 1),
+            bold=True,
+            size_hint_y=None,
+            height=dp(20)
+        )
+        self.add_widget(self.backend_label)
+        self.set_backend_degraded(api.is_degraded())
+
+        # Aviso de que la validación por hora del evento no está disponible
+        self.validation_label = Label(
+            text="",
+            font_size=ResponsiveHelper.get_font_size(11),
+            color=(0.9, 0.7, 0.2, 1),
+            size_hint_y=None,
+            height=dp(18)
+        )
+        self.add_widget(self.validation_label)
+        self.show_legacy_validation(self.legacy_validation)
+
         # Ronda actual
         round_title = Label(
             text="RONDA ACTUAL",
@@ -624,6 +796,7 @@ class CenterPanel(BoxLayout):
             bold=True
         )
         btn_layout.add_widget(btn_play)
+        btn_layout.disabled = self.follower
         
         self.add_widget(btn_layout)
 
@@ -641,6 +814,7 @@ class CenterPanel(BoxLayout):
             bold=True,
             on_press=self.show_next_round_confirmation
         )
+        self.next_round_button.disabled = self.follower
         self.add_widget(self.next_round_button)
 
         # Botón finalizar combate
@@ -654,6 +828,7 @@ class CenterPanel(BoxLayout):
             bold=True,
             on_press=self.show_end_combat_confirmation
         )
+        self.end_button.disabled = self.follower
         self.add_widget(self.end_button)
         
         # Botón salir
@@ -676,30 +851,51 @@ class CenterPanel(BoxLayout):
         self.rect.pos = self.pos
         self.rect.size = self.size
 
-    def on_window_resize(self, instance, width, height):
-        Clock.schedule_once(lambda dt: self.build_ui(), 0.1)
+    @property
+    def round_number(self):
+        return self.clock.round_number
+
+    @property
+    def is_rest_time(self):
+        return self.clock.is_rest
+
+    @property
+    def timer_running(self):
+        return self.clock.running
+
+    def set_backend_degraded(self, degraded):
+        """Muestra u oculta el aviso de backend degradado"""
+        self.backend_label.text = "⚠ BACKEND DEGRADADO - reintentando..." if degraded else ""
+
+    @ui_thread
+    def show_legacy_validation(self, legacy):
+        """Muestra que los puntos se validan por llegada y no por la hora del evento"""
+        self.legacy_validation = legacy
+        self.validation_label.text = "Validación por hora del evento INACTIVA (backend sin serverTime)" if legacy else ""
 
     def start_timer(self):
         """Inicia el timer y marca el combate como activo"""
-        if not self.timer_running:
-            self.timer_running = True
+        if self.clock.start():
             self.combat_started = True  
             self.combat_status_label.text = "COMBATE EN CURSO"
             self.combat_status_label.color = (0.2, 0.7, 0.2, 1)
-            Clock.schedule_interval(self.update_time, 1)
-            print("[CenterPanel] ⏱️ Timer iniciado - Combate ACTIVO")
+            self.timer_event = Clock.schedule_interval(self.update_time, MATCH_CLOCK_TICK)
+            log_center.info("Timer iniciado - Combate ACTIVO")
             
             if hasattr(self, 'parent_screen') and self.parent_screen:
                 self.parent_screen.on_combat_started()
 
     def pause_timer(self):
         """Pausa el timer pero el combate sigue activo"""
-        self.timer_running = False
-        Clock.unschedule(self.update_time)
+        self.clock.pause()
+        if self.timer_event:
+            self.timer_event.cancel()
+            self.timer_event = None
+        self.time_str = self.clock.display()
         if self.combat_started:
             self.combat_status_label.text = "COMBATE PAUSADO"
             self.combat_status_label.color = (0.8, 0.6, 0, 1)
-        print("[CenterPanel] ⏸️ Timer pausado")
+        log_center.info("Timer pausado")
 
     def is_combat_active(self):
         """Retorna True si el combate ha iniciado (aunque esté pausado)"""
@@ -710,52 +906,66 @@ class CenterPanel(BoxLayout):
         return self.timer_running
 
     def update_time(self, dt):
-        """Cuenta regresiva"""
-        if self.remaining_time > 0:
-            self.remaining_time -= 1
-            minutes = self.remaining_time // 60
-            seconds = self.remaining_time % 60
-            self.time_str = f"{minutes:02}:{seconds:02}"
+        """Cuenta regresiva: el tiempo sale del reloj monotónico, dt no se usa"""
+        event = self.clock.tick()
+        self.time_str = self.clock.display()
+        if event is None:
+            return
+        self.pause_timer()
+        if event == ROUND_OVER:
+            self.start_rest_period()
+        elif event == REST_OVER:
+            self.start_new_round()
         else:
-            self.pause_timer()
-            if self.is_rest_time:
-                self.start_new_round()
-            else:
+            self.end_combat_automatically()
+
+    def apply_remote_clock(self, state, sync):
+        """Seguidor: adopta el estado del reloj del dueño y repinta desde él"""
+        before = (self.clock.phase, self.clock.round_number)
+        self.clock.apply_state(state, sync)
+        if (self.clock.phase, self.clock.round_number) != before:
+            if self.clock.phase == REST:
                 self.start_rest_period()
+            elif self.clock.phase == ROUND:
+                self.round_str = f"Round {self.round_number}"
+                self.round_label.text = self.round_str
+                self.rest_indicator.text = ""
+            elif self.clock.phase == ENDED:
+                self.round_label.text = "Combate Finalizado"
+                self.combat_status_label.text = "COMBATE FINALIZADO"
+                self.combat_status_label.color = (0.5, 0.5, 0.5, 1)
+
+        if self.clock.running:
+            self.combat_started = True
+            self.combat_status_label.text = "COMBATE EN CURSO"
+            self.combat_status_label.color = (0.2, 0.7, 0.2, 1)
+            if self.timer_event is None:
+                self.timer_event = Clock.schedule_interval(self.update_time, MATCH_CLOCK_TICK)
+        elif self.timer_event is not None:
+            self.timer_event.cancel()
+            self.timer_event = None
+            if self.combat_started and self.clock.phase != ENDED:
+                self.combat_status_label.text = "COMBATE PAUSADO"
+                self.combat_status_label.color = (0.8, 0.6, 0, 1)
+        self.time_str = "FIN" if self.clock.phase == ENDED else self.clock.display()
 
     def start_rest_period(self):
-        """Inicia el período de descanso"""
-        self.is_rest_time = True
+        """Inicia el período de descanso (el reloj ya está en la fase de descanso)"""
         self.combat_started = False
-        self.remaining_time = self.duracion_descanso
-        minutes = self.remaining_time // 60
-        seconds = self.remaining_time % 60
-        self.time_str = f"{minutes:02}:{seconds:02}"
+        self.time_str = self.clock.display()
         self.rest_indicator.text = "☕ DESCANSO"
         self.combat_status_label.text = "DESCANSO"
         self.combat_status_label.color = (0.8, 0.6, 0, 1)
 
     def start_new_round(self):
-        """Inicia un nuevo round después del descanso"""
-
-        if self.round_number >= self.numero_rounds:
-            print(f"[CenterPanel] Todos los rounds completados ({self.numero_rounds})")
-            self.end_combat_automatically()
-            return
-        
-        # Incrementar el número de round
-        self.round_number += 1
+        """Inicia un nuevo round después del descanso (el reloj ya avanzó el round)"""
         self.round_str = f"Round {self.round_number}"
         self.round_label.text = self.round_str
-        print(f"[CenterPanel] 🔄 Avanzando a Round {self.round_number}")
+        log_center.info("Avanzando a Round %s", self.round_number)
         
         # Resetear el estado del combate
-        self.is_rest_time = False
         self.combat_started = False
-        self.remaining_time = self.duracion_round
-        minutes = self.remaining_time // 60
-        seconds = self.remaining_time % 60
-        self.time_str = f"{minutes:02}:{seconds:02}"
+        self.time_str = self.clock.display()
         self.rest_indicator.text = ""
         
         # Actualizar estado visual
@@ -768,7 +978,7 @@ class CenterPanel(BoxLayout):
         
         
         # ✅ MANTENER PAUSADO: El usuario debe presionar INICIAR
-        print(f"[CenterPanel] ⏸ Round {self.round_number} listo - Presiona INICIAR para comenzar")
+        log_center.info("Round %s listo - Presiona INICIAR para comenzar", self.round_number)
 
 
 
@@ -776,8 +986,8 @@ class CenterPanel(BoxLayout):
     def end_combat_automatically(self):
         """Finaliza el combate automáticamente cuando se terminan todos los rounds"""
         self.pause_timer()
+        self.clock.finish()
         self.combat_started = False
-        self.is_rest_time = False
         self.time_str = "FIN"
         self.time_label.text = self.time_str
         self.round_label.text = "Combate Finalizado"
@@ -785,7 +995,7 @@ class CenterPanel(BoxLayout):
         self.combat_status_label.text = "COMBATE FINALIZADO"
         self.combat_status_label.color = (0.5, 0.5, 0.5, 1)
         
-        print(f"[CenterPanel] 🏁 Combate finalizado automáticamente - {self.numero_rounds} rounds completados")
+        log_center.info("Combate finalizado automáticamente - %s rounds completados", self.numero_rounds)
         
         # Mostrar mensaje al usuario
         self.mostrar_mensaje(
@@ -796,6 +1006,7 @@ class CenterPanel(BoxLayout):
     def end_combat_by_disqualification(self, player_name):
         """Termina el combate por descalificación (3 GAM-JEOM)"""
         self.pause_timer()
+        self.clock.finish()
         self.combat_started = False
         self.time_str = "FIN"
         self.time_label.text = self.time_str
@@ -899,14 +1110,9 @@ class CenterPanel(BoxLayout):
         )
 
     def next_round(self, instance):
-        self.round_number += 1
+        self.clock.next_round()
         self.round_str = f"Round {self.round_number}"
         self.round_label.text = self.round_str
-        self.remaining_time = self.duracion_round
-        minutes = self.remaining_time // 60
-        seconds = self.remaining_time % 60
-        self.time_str = f"{minutes:02}:{seconds:02}"
-        self.is_rest_time = False
         self.rest_indicator.text = ""
         self.pause_timer()
         
@@ -920,6 +1126,7 @@ class CenterPanel(BoxLayout):
 
     def end_combat(self, instance):
         self.pause_timer()
+        self.clock.finish()
         self.combat_started = False
         self.time_str = "FIN"
         self.time_label.text = self.time_str
@@ -951,18 +1158,35 @@ class MainScreentabc(Screen):
         self.combate_id = None
         self.id_alumno_rojo = None
         self.id_alumno_azul = None
-        self.ws = None
-        self.ws_thread = None
-        self.ws_keepalive = None
-        
-        self.build_ui()
+        self.ws_manager = None
+        self.ws_seq = SequenceTracker()
+        self.clock_role = MATCH_CLOCK_ROLE
+        self.clock_link = None
+        self.clock_sync_event = None
+        # Puntos marcados fuera de tiempo: {puntajeId: alumnoId} hasta que el servidor confirma la anulación
+        self.rejected_points = {}
+        self.unsent_voids = []
+        self.server_counts = {}
+        self.voids_lock = threading.Lock()
+        self.score_events_have_ids = False
+        self.legacy_validation = False
+        self.void_trigger = Clock.create_trigger(self.flush_score_voids, SCORE_CORRECTION_BATCH_DELAY)
+        self.scope = CancelScope('tablero_central')
+        self.coalesced_baseline = 0
+        
+        # Al cambiar la ventana solo se gira main_layout y se ajustan las fuentes en su sitio:
+        # los paneles, el cronómetro y los marcadores siguen siendo los mismos objetos
+        self.responsive = ResponsiveLayout(self, build=self.build_ui, reflow=self.reflow_layout)
+        self.responsive.build()
+        api.add_health_listener(self.on_backend_health)
+        mutation_queue.add_listener(self.on_mutations_changed)
     
     def set_competitors(self, name1, nat1, name2, nat2, combate_data=None):
         """Configura los competidores y datos del combate"""
-        print("\n" + "=" * 60)
-        print("[MainScreentabc] 🥋 CONFIGURANDO COMPETIDORES")
-        print(f"  🔵 Azul: {name2} ({nat2})")
-        print(f"  🔴 Rojo: {name1} ({nat1})")
+        log.info("Configurando competidores", azul=f"{name2} ({nat2})", rojo=f"{name1} ({nat1})")
+        
+        # Punto de partida para contar los GETs ahorrados durante este combate
+        self.coalesced_baseline = api.coalescing_stats()["saved"]
         
         if combate_data:
             self.combate_id = combate_data.get('idCombate') or combate_data.get('id')
@@ -977,14 +1201,12 @@ class MainScreentabc(Screen):
             )
             numero_rounds = combate_data.get('numeroRounds', 3)
             
-            print(f"\n[MainScreentabc] 📋 DATOS DEL COMBATE:")
-            print(f"  ID Combate: {self.combate_id}")
-            print(f"  ID Alumno Rojo: {self.id_alumno_rojo}")
-            print(f"  ID Alumno Azul: {self.id_alumno_azul}")
-            print(f"  Duración Round: {duracion_round}s")
-            print(f"  Duración Descanso: {duracion_descanso}s")
-            print(f"  Número Rounds: {numero_rounds}")
-            print("=" * 60 + "\n")
+            log.info(
+                "Datos del combate", combate_id=self.combate_id,
+                alumno_rojo=self.id_alumno_rojo, alumno_azul=self.id_alumno_azul,
+                duracion_round=duracion_round, duracion_descanso=duracion_descanso,
+                numero_rounds=numero_rounds
+            )
         else:
             duracion_round = 180
             duracion_descanso = 60
@@ -999,7 +1221,7 @@ class MainScreentabc(Screen):
         if self.combate_id and WEBSOCKET_AVAILABLE:
             self.connect_websocket()
         elif not WEBSOCKET_AVAILABLE:
-            print("⚠️ WebSocket no disponible - instala websocket-client")
+            log.warning("WebSocket no disponible - instala websocket-client")
     
     def parse_time_to_seconds(self, time_str):
         """Convierte HH:MM:SS a segundos totales"""
@@ -1010,7 +1232,7 @@ class MainScreentabc(Screen):
             seconds = int(parts[2]) if len(parts) > 2 else 0
             return hours * 3600 + minutes * 60 + seconds
         except Exception as e:
-            print(f"[MainScreentabc] ✗ Error parseando tiempo '{time_str}': {e}")
+            log.warning("Error parseando tiempo '%s': %s", time_str, e)
             return 180
     
     def rebuild_with_data(self, name1, nat1, name2, nat2, 
@@ -1019,7 +1241,7 @@ class MainScreentabc(Screen):
         self.clear_widgets()
         
         orientation = ResponsiveHelper.get_layout_orientation()
-        main_layout = BoxLayout(orientation=orientation, spacing=0)
+        self.main_layout = main_layout = BoxLayout(orientation=orientation, spacing=0)
         
         # Panel Competidor Azul (IZQUIERDA)
         self.com2_panel = CompetitorPanel(
@@ -1036,9 +1258,13 @@ class MainScreentabc(Screen):
         self.center_panel = CenterPanel(
             duracion_round=duracion_round,
             duracion_descanso=duracion_descanso,
-            numero_rounds=numero_rounds
+            numero_rounds=numero_rounds,
+            follower=self.clock_role != OWNER
         )
         self.center_panel.parent_screen = self
+        self.center_panel.show_legacy_validation(self.legacy_validation)
+        if self.clock_role == OWNER:
+            self.center_panel.clock.on_change = self.publish_clock
         main_layout.add_widget(self.center_panel)
 
         # Panel Competidor Rojo (DERECHA)
@@ -1054,23 +1280,48 @@ class MainScreentabc(Screen):
 
         self.add_widget(main_layout)
     
+    @ui_latest
+    def on_backend_health(self, host, state):
+        """Se llama cuando el circuit breaker abre o cierra el circuito del backend"""
+        if hasattr(self, 'center_panel') and self.center_panel:
+            self.center_panel.set_backend_degraded(api.is_degraded())
+
+    @ui_latest
+    def on_mutations_changed(self):
+        """La cola de puntos/faltas cambió: actualizar pendientes de cada panel"""
+        for panel in (getattr(self, 'com1_panel', None), getattr(self, 'com2_panel', None)):
+            if panel:
+                panel.refresh_pending()
+
+    def coalesced_requests(self):
+        """GETs idénticos que se resolvieron con una petición ya en curso desde que inició el combate"""
+        return api.coalescing_stats()["saved"] - self.coalesced_baseline
+
     def is_timer_active(self):
         """Verifica si el combate ha iniciado (timer activo) y NO está en descanso"""
         if hasattr(self, 'center_panel') and self.center_panel:
             return self.center_panel.is_combat_active() and not self.center_panel.is_rest_time
         return False
+
+    def is_scoring_open(self):
+        """
+        ¿Se puede marcar un punto ahora? Solo con un round corriendo: es la
+        misma regla (MatchClock.was_active) con la que accept_score_event
+        anula puntos, así un toque aceptado aquí no se anula después.
+        Las faltas y las restas siguen permitidas en pausa (is_timer_active).
+        """
+        if hasattr(self, 'center_panel') and self.center_panel:
+            return self.center_panel.clock.round_running
+        return False
     
     def on_combat_started(self):
         """Callback cuando el combate inicia"""
-        print("[MainScreentabc] 🟢 Combate iniciado - Puntos y faltas ahora serán aceptados")
-        self.fetch_initial_gamjeom()
+        log.info("Combate iniciado - Puntos y faltas ahora serán aceptados")
+        self.fetch_initial_snapshot()
 
     def on_player_disqualified(self, alumno_id, player_name):
         """Callback cuando un jugador es descalificado por 3 GAM-JEOM"""
-        print(f"\n{'='*60}")
-        print(f"❌ DESCALIFICACIÓN: {player_name} (ID: {alumno_id})")
-        print(f"   Ha acumulado 3 GAM-JEOM")
-        print(f"{'='*60}\n")
+        log.warning("Descalificación: %s (ID: %s) acumuló 3 GAM-JEOM", player_name, alumno_id)
         
         # Determinar el ganador
         if alumno_id == self.id_alumno_rojo:
@@ -1090,206 +1341,287 @@ class MainScreentabc(Screen):
     def connect_websocket(self):
         """Conecta al WebSocket del tablero para recibir actualizaciones en tiempo real"""
         if not WEBSOCKET_AVAILABLE:
-            print("[MainScreentabc] ✗ WebSocket no disponible")
+            log.warning("WebSocket no disponible")
             return
     
-        def on_message(ws, message):
+        def on_message(message):
+            received_at = time.monotonic()
             try:
-                data = json.loads(message)
-                print(f"[WebSocket] 📨 Mensaje recibido: {data}")
+                data = json_codec.loads(message)
+                log_ws.debug("Mensaje recibido: %s", data)
+
+                if 'seq' in data and 'event' in data:
+                    verdict = self.ws_seq.accept(data['seq'])
+                    if verdict == DUPLICATE:
+                        return
+                    if verdict == GAP:
+                        # Se perdió algo: se descarta y se pide desde el último aplicado
+                        if not self.ws_seq.resuming:
+                            log_ws.warning("Hueco de seq (último %s, llegó %s)", self.ws_seq.last, data['seq'])
+                            self.ws_manager.send(self.ws_seq.resume_message())
+                        return
+
+                if self.clock_link.handle(data, received_at):
+                    return
                 
                 if data.get('event') == 'score_update':
                     alumno_id = data.get('alumnoId')
-                    new_count = data.get('count', 0)
                     
-                    if not self.is_timer_active():
-                        print(f"[WebSocket] ⚠️ Timer NO activo - Eliminando punto de alumno {alumno_id}")
-                        self.revert_score(alumno_id)
+                    # Solo la consola dueña del reloj valida: las pantallas seguidoras no duplican la corrección
+                    if self.clock_link.is_owner and not self.accept_score_event(data, received_at):
                         return
+                    # Los puntos rechazados siguen contando en el servidor hasta que se anulen
+                    self.server_counts[alumno_id] = data.get('count', 0)
+                    new_count = data.get('count', 0) - self.rejected_count(alumno_id)
                 
                     if alumno_id == self.id_alumno_rojo:
-                        print(f"[WebSocket] 🔴 Actualizando ROJO: {new_count}")
+                        log_ws.debug("Actualizando ROJO: %s", new_count)
                         self.com1_panel.update_api_score(new_count)
                     elif alumno_id == self.id_alumno_azul:
-                        print(f"[WebSocket] 🔵 Actualizando AZUL: {new_count}")
+                        log_ws.debug("Actualizando AZUL: %s", new_count)
                         self.com2_panel.update_api_score(new_count)
                 
                 elif data.get('event') == 'incidencia_confirmada':
-                    print(f"[WebSocket] 🚨 INCIDENCIA CONFIRMADA - Pausando combate")
-                    self.pausar_tiempo()
-                    self.mostrar_popup_incidencia()
+                    log_ws.info("INCIDENCIA CONFIRMADA - Pausando combate")
+                    ui_bus.post(self.pausar_tiempo)
+                    ui_bus.post(self.mostrar_popup_incidencia)
                 
                 elif data.get('status') == 'connected':
-                    print(f"[WebSocket] ✓ Conectado al combate {data.get('combateId')}")
-                    self.fetch_initial_scores()
+                    log_ws.info("Conectado al combate %s (seq %s)", data.get('combateId'), data.get('seq'))
+                    self.clock_link.on_connected()
+                    ui_bus.post(self.start_clock_sync)
+                    action = self.ws_seq.on_connected(data.get('seq'))
+                    if action == RESUME and self.ws_manager.send(self.ws_seq.resume_message()):
+                        log_ws.info("Reanudando desde seq %s", self.ws_seq.last)
+                    elif action != UP_TO_DATE:
+                        self.fetch_initial_snapshot()
+
+                elif data.get('status') == 'resumed':
+                    self.ws_seq.on_resumed(data.get('seq'))
+                    log_ws.info("Reanudado: %s eventos recuperados", data.get('count', 0))
+
+                elif data.get('status') == 'resume_failed':
+                    # El hueco ya no está en el buffer del servidor: marcador completo por REST
+                    log_ws.warning("No se pudo reanudar, recargando marcador")
+                    self.ws_seq.on_resume_failed(data.get('seq'))
+                    self.fetch_initial_snapshot()
                     
             except Exception as e:
-                print(f"[WebSocket] ✗ Error procesando mensaje: {e}")
+                log_ws.error("Error procesando mensaje: %s", e)
     
-        def on_error(ws, error):
-            print(f"[WebSocket] ✗ Error: {error}")
-        
-        def on_close(ws, close_status_code, close_msg):
-            print(f"[WebSocket] ✗ Conexión cerrada: {close_status_code} - {close_msg}")
-            if self.ws_keepalive:
-                Clock.schedule_once(lambda dt: self.reconnect_websocket(), 3)
-        
-        def on_open(ws):
-            print(f"[WebSocket] ✓ Conexión establecida al combate {self.combate_id}")
-            self.start_keepalive()
-        
-        ws_url = f"ws://localhost:8080/ws/tablero/{self.combate_id}"
-        print(f"\n[MainScreentabc] 🔌 Conectando a WebSocket: {ws_url}")
-        
-        self.ws = websocket.WebSocketApp(
-            ws_url,
-            on_message=on_message,
-            on_error=on_error,
-            on_close=on_close,
-            on_open=on_open
+        url = tablero_url(self.combate_id)
+        if self.ws_manager is not None:
+            if self.ws_manager.url == url and self.ws_manager.state in (CONNECTING, OPEN):
+                return
+            self.ws_manager.stop()
+
+        # Seq propio de cada combate: al cambiar de canal se empieza con snapshot
+        self.ws_seq = SequenceTracker()
+        self.clock_link = ClockLink(
+            self.clock_role,
+            send=lambda text: self.ws_manager.send(text),
+            deliver=ui_bus.post,
+            get_clock=lambda: self.center_panel.clock if hasattr(self, 'center_panel') else None,
+            on_remote=self.apply_remote_clock,
         )
-        
-        self.ws_thread = Thread(target=self.ws.run_forever, daemon=True)
-        self.ws_thread.start()
+        log.info("Conectando a WebSocket: %s", url)
+        self.ws_manager = WebSocketManager(url, on_message)
+        self.ws_manager.start()
+
+    def accept_score_event(self, data, received_at):
+        """
+        ¿El punto se marcó con el round corriendo? Se decide por la hora del
+        evento y no por cuándo llega el mensaje: serverTime (pasado al reloj
+        local con el desfase de time_sync) o, si no viene, la llegada menos
+        media ida y vuelta. Los rechazados se anulan en lote.
+        """
+        puntaje_id = data.get('puntajeId')
+        if puntaje_id is None:
+            return self.accept_legacy_score_event(data)
+        self.score_events_have_ids = True
+        if self.legacy_validation:
+            self.legacy_validation = False
+            if hasattr(self, 'center_panel'):
+                self.center_panel.show_legacy_validation(False)
+        if not hasattr(self, 'center_panel'):
+            return True
+
+        sync = self.clock_link.sync
+        if data.get('serverTime') is not None and sync.synced:
+            event_time = sync.to_local(data['serverTime'])
+        elif data.get('replay'):
+            # Sin hora propia, un evento repetido tras reconectar no se puede juzgar
+            return True
+        else:
+            event_time = received_at - (sync.round_trip or 0) / 2
 
-        def on_error(ws, error):
-            print(f"[WebSocket] ✗ Error: {error}")
-        
-        def on_close(ws, close_status_code, close_msg):
-            print(f"[WebSocket] ✗ Conexión cerrada: {close_status_code} - {close_msg}")
-            if self.ws_keepalive:
-                Clock.schedule_once(lambda dt: self.reconnect_websocket(), 3)
-        
-        def on_open(ws):
-            print(f"[WebSocket] ✓ Conexión establecida al combate {self.combate_id}")
-            self.start_keepalive()
-        
-        ws_url = f"ws://localhost:8080/ws/tablero/{self.combate_id}"
-        print(f"\n[MainScreentabc] 🔌 Conectando a WebSocket: {ws_url}")
-        
-        self.ws = websocket.WebSocketApp(
-            ws_url,
-            on_message=on_message,
-            on_error=on_error,
-            on_close=on_close,
-            on_open=on_open
+        clock = self.center_panel.clock
+        if clock.was_active(event_time) or clock.was_active(event_time - SCORE_VALIDATION_GRACE):
+            return True
+
+        log_ws.info("Punto %s de alumno %s fuera de tiempo - se anulará", puntaje_id, data.get('alumnoId'))
+        with self.voids_lock:
+            self.rejected_points[puntaje_id] = data.get('alumnoId')
+            self.unsent_voids.append(puntaje_id)
+        self.void_trigger()
+        return False
+
+    def accept_legacy_score_event(self, data):
+        """
+        Backend sin puntajeId: comportamiento anterior. Se juzga por la hora de
+        llegada del mensaje y se revierte el último punto, así que un punto
+        marcado justo antes de una pausa puede perderse (y revertir otro).
+        """
+        if self.score_events_have_ids:
+            # Con ids, un evento sin id es solo el conteo tras una anulación
+            return True
+        if not self.legacy_validation:
+            self.legacy_validation = True
+            log_ws.warning("El backend no manda puntajeId/serverTime: validación por hora del evento "
+                           "INACTIVA, se usa la hora de llegada y se revierte el último punto")
+            if hasattr(self, 'center_panel'):
+                self.center_panel.show_legacy_validation(True)
+        if data.get('replay') or self.is_scoring_open():
+            return True
+        alumno_id = data.get('alumnoId')
+        panel = self.com1_panel if alumno_id == self.id_alumno_rojo else self.com2_panel
+        if data.get('count', 0) <= panel.api_score:
+            # No es un punto nuevo (p. ej. el aviso de la propia reversión)
+            return True
+        log_ws.info("Timer NO activo - Eliminando punto de alumno %s", alumno_id)
+        self.revert_score(alumno_id)
+        return False
+
+    def rejected_count(self, alumno_id):
+        with self.voids_lock:
+            return sum(1 for a in self.rejected_points.values() if a == alumno_id)
+
+    def flush_score_voids(self, dt=None):
+        """Anula en una sola llamada los puntos rechazados acumulados"""
+        with self.voids_lock:
+            puntaje_ids, self.unsent_voids = self.unsent_voids, []
+        if not puntaje_ids:
+            return
+
+        def settle():
+            with self.voids_lock:
+                return {self.rejected_points.pop(pid, None) for pid in puntaje_ids} - {None}
+
+        def done(mutation, data):
+            alumnos = settle()
+            log.info("Anulados %s puntos fuera de tiempo", data.get('removed', len(puntaje_ids)))
+            counts = {int(k): v for k, v in (data.get('counts') or {}).items()}
+            for alumno_id in alumnos | set(counts):
+                # Sin conteo en la respuesta (ya estaban anulados): el último que mandó el servidor
+                count = counts.get(alumno_id, self.server_counts.get(alumno_id, 0))
+                self.server_counts[alumno_id] = count
+                count -= self.rejected_count(alumno_id)
+                if alumno_id == self.id_alumno_rojo:
+                    self.com1_panel.update_api_score(count)
+                elif alumno_id == self.id_alumno_azul:
+                    self.com2_panel.update_api_score(count)
+
+        def failed(mutation, error):
+            settle()
+            log.warning("No se pudieron anular los puntos %s: %s", puntaje_ids, error)
+            self.fetch_initial_snapshot()
+
+        mutation_queue.enqueue(
+            SCORE_VOID, self.combate_id, None,
+            on_done=done, on_failed=failed, puntaje_ids=puntaje_ids
         )
-        
-        self.ws_thread = Thread(target=self.ws.run_forever, daemon=True)
-        self.ws_thread.start()
-    
+
     def revert_score(self, alumno_id):
         """Revierte (elimina) el último punto de un alumno cuando el timer no está activo"""
-        def work():
-            try:
-                url = f"http://localhost:8080/apiPuntajes/puntaje/alumno/{alumno_id}/last"
-                response = requests.delete(url, timeout=5)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    print(f"[MainScreentabc] ✓ Punto revertido para alumno {alumno_id}, nuevo count: {data.get('newCount', 0)}")
-                elif response.status_code == 204:
-                    print(f"[MainScreentabc] ✓ Punto revertido para alumno {alumno_id}")
-                else:
-                    print(f"[MainScreentabc] ⚠️ No se pudo revertir: {response.status_code}")
-            except Exception as e:
-                print(f"[MainScreentabc] ✗ Error revirtiendo punto: {e}")
-        
-        Thread(target=work, daemon=True).start()
-    
-    def start_keepalive(self):
-        """Envía ping cada 30 segundos para mantener vivo el WebSocket"""
-        def send_ping(dt):
-            if self.ws and self.ws.sock and self.ws.sock.connected:
-                try:
-                    self.ws.send('ping')
-                    print("[WebSocket] 💓 Keepalive ping enviado")
-                except Exception as e:
-                    print(f"[WebSocket] ✗ Error en keepalive: {e}")
-        
-        if self.ws_keepalive:
-            self.ws_keepalive.cancel()
-        
-        self.ws_keepalive = Clock.schedule_interval(send_ping, 30)
-        print("[WebSocket] ✓ Keepalive iniciado (ping cada 30s)")
+        def done(mutation, data):
+            log.debug("Punto revertido para alumno %s, nuevo count: %s", alumno_id, data.get('newCount', '?'))
+
+        def failed(mutation, error):
+            log.warning("No se pudo revertir: %s", error)
+
+        mutation_queue.enqueue(SCORE_SUB, self.combate_id, alumno_id, on_done=done, on_failed=failed)
     
-    def reconnect_websocket(self):
-        """Intenta reconectar el WebSocket"""
-        if self.combate_id and WEBSOCKET_AVAILABLE:
-            print("[WebSocket] 🔄 Intentando reconectar...")
-            self.connect_websocket()
+    def ws_stats(self):
+        """Métricas de la conexión websocket del combate (None si no hay)"""
+        if not self.ws_manager:
+            return None
+        stats = self.ws_manager.stats()
+        stats.update(self.ws_seq.stats())
+        stats["clock"] = self.clock_link.stats()
+        return stats
+
+    def start_clock_sync(self):
+        """Tras conectar: ráfaga de time_sync para estimar el desfase y luego mantenimiento"""
+        if self.clock_sync_event is not None:
+            self.clock_sync_event.cancel()
+        self.send_clock_sync()
+
+    def send_clock_sync(self, dt=None):
+        if self.ws_manager is None or self.clock_link is None:
+            return
+        self.clock_link.send_sync()
+        self.clock_sync_event = Clock.schedule_once(self.send_clock_sync, self.clock_link.next_sync_delay())
+
+    def publish_clock(self, clock=None):
+        """Dueño: difunde el reloj a las demás pantallas del tatami (on_change del MatchClock)"""
+        if self.clock_link is not None:
+            self.clock_link.publish()
+
+    def apply_remote_clock(self, state):
+        """Seguidor: estado del reloj recibido de la consola del árbitro (hilo principal)"""
+        if hasattr(self, 'center_panel') and self.center_panel:
+            self.center_panel.apply_remote_clock(state, self.clock_link.sync)
 
-    @mainthread
+    @ui_thread
     def update_judges_status(self, text):
         """Actualiza el estado de los jueces en el centro del tablero"""
         if hasattr(self, 'center_panel') and self.center_panel:
-            print(f"[MainScreentabc] 👨‍⚖️ {text}")
+            log.info("Estado de jueces: %s", text)
             # Mostrar popup temporal con el estado de los jueces
             self.center_panel.mostrar_mensaje(
                 titulo="Estado de Jueces",
                 mensaje=text
             )
     
-    def fetch_initial_scores(self):
-        """Obtiene los puntajes iniciales al conectarse"""
-        def work():
-            try:
-                if self.id_alumno_rojo:
-                    url_rojo = f"http://localhost:8080/apiPuntajes/puntaje/alumno/{self.id_alumno_rojo}/count"
-                    response_rojo = requests.get(url_rojo, timeout=2)
-                    if response_rojo.status_code == 200:
-                        count_rojo = response_rojo.json().get('count', 0)
-                        self.com1_panel.update_api_score(count_rojo)
-                        print(f"[MainScreentabc] 🔴 Puntaje inicial ROJO: {count_rojo}")
-                
-                if self.id_alumno_azul:
-                    url_azul = f"http://localhost:8080/apiPuntajes/puntaje/alumno/{self.id_alumno_azul}/count"
-                    response_azul = requests.get(url_azul, timeout=2)
-                    if response_azul.status_code == 200:
-                        count_azul = response_azul.json().get('count', 0)
-                        self.com2_panel.update_api_score(count_azul)
-                        print(f"[MainScreentabc] 🔵 Puntaje inicial AZUL: {count_azul}")
-                
-                print("[MainScreentabc] ✅ Puntajes iniciales cargados\n")
-                
-            except Exception as e:
-                print(f"[MainScreentabc] ✗ Error obteniendo puntajes iniciales: {e}")
-        
-        Thread(target=work, daemon=True).start()
+    def fetch_initial_snapshot(self):
+        """Obtiene puntajes y GAM-JEOM de ambos competidores en una sola ronda"""
+        if not self.combate_id:
+            return
+
+        def on_error(e):
+            log.warning("Error obteniendo marcador inicial: %s", e)
+
+        executor.submit(
+            api.get_scoreboard_snapshot,
+            self.combate_id, self.id_alumno_rojo, self.id_alumno_azul,
+            priority=PRIORITY_NORMAL,
+            on_result=self.apply_snapshot,
+            on_error=on_error,
+            scope=self.scope
+        )
+
+    def apply_snapshot(self, snapshot):
+        """Aplica el marcador a ambos paneles en una sola actualización (hilo principal)"""
+        if snapshot.combate_id != self.combate_id:
+            return
+
+        if snapshot.puntaje_rojo is not None:
+            self.com1_panel.set_api_score(snapshot.puntaje_rojo)
+        if snapshot.puntaje_azul is not None:
+            self.com2_panel.set_api_score(snapshot.puntaje_azul)
+        if snapshot.gamjeom_rojo is not None:
+            self.com1_panel.set_gamjeom_count(snapshot.gamjeom_rojo)
+        if snapshot.gamjeom_azul is not None:
+            self.com2_panel.set_gamjeom_count(snapshot.gamjeom_azul)
+
+        log.info("Marcador inicial cargado (%s, %.0f ms)", snapshot.source, snapshot.elapsed_ms)
 
-    def fetch_initial_gamjeom(self):
-        """Obtiene las faltas GAM-JEOM iniciales al conectarse"""
-        def work():
-            try:
-                if self.id_alumno_rojo and self.combate_id:
-                    url_rojo = f"http://localhost:8080/apiGamJeom/falta/alumno/{self.id_alumno_rojo}/combate/{self.combate_id}/count"
-                    response_rojo = requests.get(url_rojo, timeout=2)
-                    if response_rojo.status_code == 200:
-                        count_rojo = response_rojo.json().get('count', 0)
-                        self.com1_panel.update_gamjeom_count(count_rojo)
-                        print(f"[MainScreentabc] 🔴 GAM-JEOM inicial ROJO: {count_rojo}")
-                
-                if self.id_alumno_azul and self.combate_id:
-                    url_azul = f"http://localhost:8080/apiGamJeom/falta/alumno/{self.id_alumno_azul}/combate/{self.combate_id}/count"
-                    response_azul = requests.get(url_azul, timeout=2)
-                    if response_azul.status_code == 200:
-                        count_azul = response_azul.json().get('count', 0)
-                        self.com2_panel.update_gamjeom_count(count_azul)
-                        print(f"[MainScreentabc] 🔵 GAM-JEOM inicial AZUL: {count_azul}")
-                
-                print("[MainScreentabc] ✅ GAM-JEOM iniciales cargados\n")
-                
-            except Exception as e:
-                print(f"[MainScreentabc] ✗ Error obteniendo GAM-JEOM iniciales: {e}")
-        
-        Thread(target=work, daemon=True).start()
-    
     # ✅ NUEVO: Métodos para manejo de incidencias
     def pausar_tiempo(self):
         """Pausa el cronómetro cuando hay incidencia confirmada"""
         if hasattr(self, 'center_panel') and self.center_panel:
             self.center_panel.pause_timer()
-            print("[MainScreentabc] ⏸️ Tiempo pausado por incidencia confirmada")
+            log.info("Tiempo pausado por incidencia confirmada")
 
     def mostrar_popup_incidencia(self):
         """Muestra popup de incidencia confirmada"""
@@ -1358,26 +1690,22 @@ class MainScreentabc(Screen):
         btn_continuar.bind(on_press=continuar_combate)
         popup.open()
         
-        print("[MainScreentabc] 🚨 Popup de incidencia mostrado")
+        log.info("Popup de incidencia mostrado")
 
     def reanudar_tiempo(self):
         """Reanuda el cronómetro (opcional)"""
         if hasattr(self, 'center_panel') and self.center_panel:
             self.center_panel.start_timer()
-            print("[MainScreentabc] ▶️ Tiempo reanudado")
+            log.info("Tiempo reanudado")
     
     def disconnect_websocket(self):
-        """Desconecta el WebSocket"""
-        if self.ws_keepalive:
-            self.ws_keepalive.cancel()
-            self.ws_keepalive = None
-        
-        if self.ws:
-            try:
-                self.ws.close()
-                print("[MainScreentabc] ✓ WebSocket desconectado")
-            except Exception as e:
-                print(f"[MainScreentabc] ✗ Error al desconectar WebSocket: {e}")
+        """Desconecta el WebSocket (sin reconexión automática)"""
+        if self.clock_sync_event is not None:
+            self.clock_sync_event.cancel()
+            self.clock_sync_event = None
+        if self.ws_manager is not None:
+            self.ws_manager.stop()
+            log.info("WebSocket desconectado: %s", self.ws_manager.stats())
     
     def reset_competitor_scores(self):
         """Reinicia los contadores visuales para nuevo round"""
@@ -1389,7 +1717,7 @@ class MainScreentabc(Screen):
         self.clear_widgets()
         
         orientation = ResponsiveHelper.get_layout_orientation()
-        main_layout = BoxLayout(orientation=orientation, spacing=0)
+        self.main_layout = main_layout = BoxLayout(orientation=orientation, spacing=0)
         
         # Panel Azul a la IZQUIERDA
         self.com2_panel = CompetitorPanel(
@@ -1415,14 +1743,15 @@ class MainScreentabc(Screen):
 
         self.add_widget(main_layout)
 
-    def on_window_resize(self, instance, width, height):
-        Clock.schedule_once(lambda dt: self.build_ui(), 0.1)
+    def reflow_layout(self):
+        """Lo que build_ui calcula a mano; el resto lo actualiza ResponsiveLayout"""
+        self.main_layout.orientation = ResponsiveHelper.get_layout_orientation()
 
     def pausar_tiempo(self):
         """Pausa el cronómetro cuando hay incidencia confirmada"""
         if hasattr(self, 'center_panel') and self.center_panel:
             self.center_panel.pause_timer()
-            print("[MainScreentabc] ⏸️ Tiempo pausado por incidencia confirmada")
+            log.info("Tiempo pausado por incidencia confirmada")
 
     def mostrar_popup_incidencia(self):
         """Muestra popup de incidencia confirmada"""
@@ -1519,19 +1848,21 @@ class MainScreentabc(Screen):
         btn_continuar.bind(on_press=continuar_combate)
         popup.open()
         
-        print("[MainScreentabc] Popup de incidencia mostrado")
+        log.info("Popup de incidencia mostrado")
 
     def reanudar_tiempo(self):
         """Reanuda el cronómetro (opcional)"""
         if hasattr(self, 'center_panel') and self.center_panel:
             self.center_panel.start_timer()
-            print("[MainScreentabc] Tiempo reanudado")
+            log.info("Tiempo reanudado")
 
     
     def on_pre_leave(self, *args):
         """Se ejecuta cuando se sale de esta pantalla"""
-        print("[MainScreentabc] Saliendo del tablero, desconectando WebSocket...")
+        log.info("Saliendo del tablero, desconectando WebSocket...")
         self.disconnect_websocket()
+        self.scope = self.scope.renew()
+        log.info("GETs ahorrados por coalescencia en este combate: %s", self.coalesced_requests())
         return super().on_pre_leave(*args)
 
 
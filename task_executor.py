@@ -0,0 +1,200 @@
+import itertools
+import queue
+import threading
+import time
+from concurrent.futures import Future, CancelledError
+
+from config import BACKGROUND_MAX_WORKERS
+from cancel_scope import activate_scope
+from ui_bus import ui_bus
+from app_log import get_logger
+
+
+log = get_logger("BackgroundExecutor")
+
+# Prioridades: número menor = se atiende antes
+PRIORITY_SCORE = 0    # mutaciones de puntaje y GAM-JEOM
+PRIORITY_NORMAL = 5   # lecturas puntuales, login, guardados
+PRIORITY_LIST = 10    # cargas de listas (torneos, combates)
+
+
+class _Task:
+    __slots__ = ("fn", "args", "kwargs", "future", "on_result", "on_error", "scope", "enqueued_at")
+
+    def __init__(self, fn, args, kwargs, future, on_result, on_error, scope):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.future = future
+        self.on_result = on_result
+        self.on_error = on_error
+        self.scope = scope
+        self.enqueued_at = time.monotonic()
+
+
+class BackgroundExecutor:
+    """
+    Pool acotado de hilos de trabajo con cola por prioridad.
+    Reemplaza el patrón Thread(target=work).start() por petición:
+    los resultados se entregan en el hilo principal de Kivy mediante
+    on_result / on_error, y la cola expone métricas de profundidad y tiempos.
+    """
+
+    def __init__(self, max_workers=BACKGROUND_MAX_WORKERS):
+        self.max_workers = max_workers
+        self._queue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._workers = []
+        self._lock = threading.Lock()
+        self._shutdown = False
+
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._cancelled = 0
+        self._running = 0
+        self._finished = 0
+        self._max_queue_depth = 0
+        self._total_wait = 0.0
+        self._total_run = 0.0
+        self._max_run = 0.0
+
+    def submit(self, fn, *args, priority=PRIORITY_NORMAL, on_result=None, on_error=None,
+               scope=None, **kwargs) -> Future:
+        """
+        Encola fn(*args, **kwargs) y devuelve un Future.
+        on_result(valor) / on_error(excepcion) se ejecutan en el hilo principal.
+        Si se pasa un CancelScope, cerrarlo cancela la tarea y descarta su resultado.
+        """
+        if self._shutdown:
+            raise RuntimeError("BackgroundExecutor ya fue detenido.")
+
+        future = Future()
+        task = _Task(fn, args, kwargs, future, on_result, on_error, scope)
+        if scope is not None:
+            scope.track(future)
+        with self._lock:
+            self._submitted += 1
+            self._queue.put((priority, next(self._seq), task))
+            self._max_queue_depth = max(self._max_queue_depth, self._queue.qsize())
+            self._ensure_workers()
+        return future
+
+    def _ensure_workers(self):
+        # Se llama con self._lock tomado
+        if len(self._workers) >= self.max_workers:
+            return
+        if self._queue.qsize() <= len(self._workers) - self._running:
+            return
+        worker = threading.Thread(
+            target=self._worker_loop,
+            name=f"bg-worker-{len(self._workers) + 1}",
+            daemon=True
+        )
+        self._workers.append(worker)
+        worker.start()
+
+    def _worker_loop(self):
+        while True:
+            _, _, task = self._queue.get()
+            if task is None:
+                return
+
+            if not task.future.set_running_or_notify_cancel():
+                with self._lock:
+                    self._cancelled += 1
+                continue
+
+            started = time.monotonic()
+            with self._lock:
+                self._running += 1
+                self._total_wait += started - task.enqueued_at
+
+            try:
+                with activate_scope(task.scope):
+                    result = task.fn(*task.args, **task.kwargs)
+            except CancelledError as e:
+                self._finish(started, failed=False, cancelled=True)
+                task.future.set_exception(e)
+            except Exception as e:
+                self._finish(started, failed=True)
+                task.future.set_exception(e)
+                if task.on_error:
+                    self._dispatch(task.scope, task.on_error, e)
+                else:
+                    log.error("Error en tarea %s: %r", getattr(task.fn, '__name__', task.fn), e)
+            else:
+                self._finish(started, failed=False)
+                task.future.set_result(result)
+                if task.on_result:
+                    self._dispatch(task.scope, task.on_result, result)
+
+    def _finish(self, started, failed, cancelled=False):
+        elapsed = time.monotonic() - started
+        with self._lock:
+            self._running -= 1
+            self._finished += 1
+            self._total_run += elapsed
+            self._max_run = max(self._max_run, elapsed)
+            if cancelled:
+                self._cancelled += 1
+            elif failed:
+                self._failed += 1
+            else:
+                self._completed += 1
+
+    def deliver(self, callback, value, scope=None):
+        """
+        Entrega un resultado parcial al hilo principal desde una tarea en curso
+        (p. ej. cada página de un listado). Se descarta si el scope se cerró.
+        """
+        self._dispatch(scope, callback, value)
+
+    def _dispatch(self, scope, callback, value):
+        """
+        Entrega el resultado en el hilo principal de Kivy (si el scope sigue
+        abierto), en el lote de actualizaciones del siguiente frame.
+        """
+        if scope is not None and scope.closed:
+            return
+
+        def _deliver():
+            if scope is not None and scope.closed:
+                return
+            callback(value)
+
+        ui_bus.post(_deliver)
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def stats(self) -> dict:
+        """Métricas acumuladas de la cola (tiempos en milisegundos)."""
+        with self._lock:
+            started = self._finished
+            return {
+                "workers": len(self._workers),
+                "max_workers": self.max_workers,
+                "queue_depth": self._queue.qsize(),
+                "max_queue_depth": self._max_queue_depth,
+                "running": self._running,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "cancelled": self._cancelled,
+                "avg_wait_ms": (self._total_wait / started * 1000) if started else 0.0,
+                "avg_run_ms": (self._total_run / started * 1000) if started else 0.0,
+                "max_run_ms": self._max_run * 1000,
+            }
+
+    def shutdown(self):
+        """Detiene los hilos de trabajo cuando terminen lo que tienen en curso."""
+        with self._lock:
+            self._shutdown = True
+            for _ in self._workers:
+                # Prioridad infinita: se procesan después de las tareas pendientes
+                self._queue.put((float("inf"), next(self._seq), None))
+
+
+# Instancia global del executor
+executor = BackgroundExecutor()
@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pytest
+
+# Los módulos de la app viven en la raíz del repositorio
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_backend import FakeBackend  # noqa: E402
+
+
+def serve_backend(**kwargs):
+    backend = FakeBackend(**kwargs).seed(torneos=1, combates_por_torneo=1)
+    server = backend.serve(port=0)
+    backend.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    return backend, server
+
+
+@pytest.fixture
+def backend():
+    """fake_backend sirviendo en un puerto libre; base_url apunta a él."""
+    backend, server = serve_backend()
+    yield backend
+    server.shutdown()
+
+
+@pytest.fixture
+def java_backend():
+    """Igual que backend, pero ignora Idempotency-Key como el backend real."""
+    backend, server = serve_backend(honor_idempotency=False)
+    yield backend
+    server.shutdown()
@@ -0,0 +1,123 @@
+"""
+ClockSync: desfase e ida y vuelta al estilo NTP, elección de la muestra con
+menor ida y vuelta y descarte de respuestas imposibles; ClockLink retiene
+el estado del dueño hasta tener desfase.
+"""
+import json
+
+import pytest
+
+from clock_sync import ClockLink, ClockSync, FOLLOWER, OWNER
+from match_clock import MatchClock
+
+
+def reply(t0, t1, t2):
+    return {"event": "time_sync", "t0": t0, "t1": t1, "t2": t2}
+
+
+def exchange(offset, up, down, server_time=0.001, t0=10.0):
+    """Marcas de un ping/pong con el servidor offset s adelante y latencias up/down."""
+    t1 = t0 + offset + up
+    t2 = t1 + server_time
+    t3 = t2 - offset + down
+    return reply(t0, t1, t2), t3
+
+
+def test_symmetric_path_gives_exact_offset_and_round_trip():
+    sync = ClockSync()
+    data, t3 = exchange(offset=250.0, up=0.02, down=0.02)
+    assert sync.on_reply(data, received_at=t3) is True
+    assert sync.offset == pytest.approx(250.0)
+    assert sync.round_trip == pytest.approx(0.04)
+    assert sync.to_server(1.0) == pytest.approx(251.0)
+    assert sync.to_local(sync.to_server(7.5)) == pytest.approx(7.5)
+
+
+def test_asymmetric_path_error_is_at_most_half_the_round_trip():
+    sync = ClockSync()
+    data, t3 = exchange(offset=-40.0, up=0.09, down=0.01)
+    sync.on_reply(data, received_at=t3)
+    assert sync.round_trip == pytest.approx(0.10)
+    assert abs(sync.offset - (-40.0)) <= sync.round_trip / 2 + 1e-9
+
+
+def test_best_sample_wins_and_only_first_reply_reports_first():
+    sync = ClockSync(samples=4)
+    slow, t3 = exchange(offset=5.0, up=0.3, down=0.05)
+    assert sync.on_reply(slow, received_at=t3) is True
+    fast, t3 = exchange(offset=5.0, up=0.01, down=0.01, t0=20.0)
+    assert sync.on_reply(fast, received_at=t3) is False
+    assert sync.round_trip == pytest.approx(0.02)
+    assert sync.offset == pytest.approx(5.0)
+    assert sync.replies == 2
+
+
+def test_best_sample_ages_out_of_the_window():
+    sync = ClockSync(samples=2)
+    for t0, up in ((0.0, 0.001), (1.0, 0.05), (2.0, 0.08)):
+        data, t3 = exchange(offset=1.0, up=up, down=up, t0=t0)
+        sync.on_reply(data, received_at=t3)
+    assert sync.round_trip == pytest.approx(0.10)
+    assert sync.full
+
+
+def test_negative_round_trip_is_discarded():
+    sync = ClockSync()
+    # t3 antes de lo posible: respuesta de otro intercambio o reloj que retrocedió
+    assert sync.on_reply(reply(10.0, 500.0, 500.5), received_at=10.1) is False
+    assert not sync.synced
+    assert sync.replies == 0
+    assert sync.to_server(3.0) == 3.0
+
+
+def test_reset_forgets_samples():
+    sync = ClockSync()
+    data, t3 = exchange(offset=1.0, up=0.01, down=0.01)
+    sync.on_reply(data, received_at=t3)
+    sync.reset()
+    assert not sync.synced and sync.stats()["samples"] == 0
+
+
+def test_request_carries_local_send_time():
+    sync = ClockSync(clock=lambda: 42.5)
+    assert json.loads(sync.request()) == {"action": "time_sync", "t0": 42.5}
+
+
+# ------------------------------------------------------------------ ClockLink
+
+def immediate(fn, *args):
+    fn(*args)
+
+
+def test_follower_holds_owner_state_until_synced():
+    applied = []
+    link = ClockLink(FOLLOWER, send=lambda text: True, deliver=immediate, on_remote=applied.append)
+    state = {"phase": "round", "running": True}
+
+    assert link.handle({"event": "clock_state", "state": state}, received_at=1.0)
+    assert applied == []
+    data, t3 = exchange(offset=3.0, up=0.01, down=0.01)
+    assert link.handle(data, received_at=t3)
+    assert applied == [state]
+    # Ya sincronizado, los siguientes se aplican al llegar
+    link.handle({"event": "clock_state", "state": state}, received_at=2.0)
+    assert applied == [state, state]
+    assert not link.handle({"event": "score_update"}, received_at=2.0)
+
+
+def test_owner_publishes_once_synced_with_ref_in_server_time():
+    now = [100.0]
+    clock = MatchClock(round_duration=10, rest_duration=5, rounds=1, clock=lambda: now[0])
+    sent = []
+    sync = ClockSync(clock=lambda: now[0])
+    link = ClockLink(OWNER, send=lambda text: sent.append(json.loads(text)) or True,
+                     deliver=immediate, get_clock=lambda: clock, sync=sync)
+
+    assert not link.publish()
+    data, t3 = exchange(offset=1000.0, up=0.01, down=0.01, t0=99.0)
+    link.handle(data, received_at=t3)
+    assert link.published == 1
+    state = sent[-1]["state"]
+    assert sent[-1]["action"] == "clock"
+    assert state["ref"] == pytest.approx(1100.0)
+    assert state["remaining"] == 10
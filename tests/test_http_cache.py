@@ -0,0 +1,125 @@
+"""
+ResponseCache (TTL, LRU, revalidación, generaciones) y su uso desde
+ApiClient: ninguna respuesta leída antes de que el servidor aplique una
+escritura puede quedar en caché después de ella.
+"""
+import types
+
+import pytest
+
+import http_cache
+from api_client import ApiClient
+from http_cache import ResponseCache
+
+
+def test_get_started_inside_write_window_is_not_cached(backend):
+    client = ApiClient(base_url=backend.base_url)
+    torneo_id = next(iter(backend.torneos))
+    assert client.get_torneo_by_id(torneo_id)["nombre"] == "Torneo 1"
+
+    put = client.session.put
+    seen = []
+
+    def slow_put(*args, **kwargs):
+        # La caché ya se invalidó, pero el servidor aún no aplica la escritura
+        seen.append(client.get_torneo_by_id(torneo_id)["nombre"])
+        return put(*args, **kwargs)
+
+    client.session.put = slow_put
+    client.update_torneo(torneo_id, {"nombre": "Renombrado"})
+
+    assert seen == ["Torneo 1"]
+    assert client.get_torneo_by_id(torneo_id)["nombre"] == "Renombrado"
+
+
+# ------------------------------------------------------------------ ResponseCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(http_cache, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def make_cache(**kwargs):
+    return ResponseCache({"/apiTorneos/": 30, "/apiCombates/": 15, "/apiCombates/combate/": 5}, **kwargs)
+
+
+def test_ttl_by_longest_prefix_and_expiry(clock):
+    cache = make_cache()
+    assert cache.ttl_for("/apiCombates/combate/3") == 5
+    assert cache.ttl_for("/apiCombates/estado/X") == 15
+    assert cache.ttl_for("/apiPuntajes/puntaje") == 0
+
+    cache.store("/apiTorneos/torneo", [1])
+    clock[0] += 29.9
+    assert cache.get_fresh("/apiTorneos/torneo") == [1]
+    clock[0] += 0.2
+    assert cache.get_fresh("/apiTorneos/torneo") is None
+    # Vencida pero conservada para revalidar con un 304
+    assert cache.lookup("/apiTorneos/torneo") is not None
+    assert cache.renew("/apiTorneos/torneo") == [1]
+    assert cache.get_fresh("/apiTorneos/torneo") == [1]
+    assert (cache.hits, cache.misses, cache.revalidated) == (2, 1, 1)
+
+
+def test_uncached_endpoint_is_kept_only_with_validators(clock):
+    cache = make_cache()
+    cache.store("/apiPuntajes/puntaje", [1])
+    assert cache.lookup("/apiPuntajes/puntaje") is None
+    cache.store("/apiPuntajes/puntaje", [1], etag='"v1"')
+    entry = cache.lookup("/apiPuntajes/puntaje")
+    assert entry.validators() == {"If-None-Match": '"v1"'}
+    assert cache.get_fresh("/apiPuntajes/puntaje") is None
+
+
+def test_lru_evicts_least_recently_used(clock):
+    cache = make_cache(max_entries=2)
+    cache.store("/apiTorneos/torneo/1", 1)
+    cache.store("/apiTorneos/torneo/2", 2)
+    cache.get_fresh("/apiTorneos/torneo/1")
+    cache.store("/apiTorneos/torneo/3", 3)
+    assert cache.lookup("/apiTorneos/torneo/2") is None
+    assert cache.get_fresh("/apiTorneos/torneo/1") == 1
+    assert cache.get_fresh("/apiTorneos/torneo/3") == 3
+
+
+def test_returned_data_is_a_copy(clock):
+    cache = make_cache()
+    rows = [{"id": 1}]
+    cache.store("/apiTorneos/torneo", rows)
+    rows[0]["id"] = 99
+    cache.get_fresh("/apiTorneos/torneo")[0]["id"] = 42
+    assert cache.get_fresh("/apiTorneos/torneo") == [{"id": 1}]
+
+
+def test_store_with_stale_generation_is_discarded(clock):
+    cache = make_cache()
+    generation = cache.generation("/apiCombates/combate/1")
+    # Una escritura al mismo recurso mientras el GET estaba en vuelo
+    cache.invalidate_path("/apiCombates/combate/1")
+    cache.store("/apiCombates/combate/1", {"old": True}, generation=generation)
+    assert cache.lookup("/apiCombates/combate/1") is None
+    assert cache.stats()["discarded"] == 1
+
+    # Una escritura a otro recurso no afecta
+    generation = cache.generation("/apiCombates/combate/1")
+    cache.invalidate_path("/apiAdministradores/administrador/1")
+    cache.store("/apiCombates/combate/1", {"new": True}, generation=generation)
+    assert cache.get_fresh("/apiCombates/combate/1") == {"new": True}
+
+
+def test_related_prefixes_and_clear_bump_generation(clock):
+    cache = make_cache()
+    cache.store("/apiCombates/combate/1", 1)
+    generation = cache.generation("/apiCombates/combate/1")
+    # Borrar un torneo invalida también sus combates
+    assert cache.invalidate_path("/apiTorneos/torneo/4") == 1
+    cache.store("/apiCombates/combate/1", 2, generation=generation)
+    assert cache.lookup("/apiCombates/combate/1") is None
+
+    generation = cache.generation("/apiTorneos/torneo")
+    cache.clear()
+    cache.store("/apiTorneos/torneo", [1], generation=generation)
+    assert cache.stats()["entries"] == 0
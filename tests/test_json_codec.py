@@ -0,0 +1,89 @@
+"""
+json_codec da el mismo resultado con orjson que con la stdlib: los mismos
+payloads se serializan (o fallan con TypeError) igual con los dos backends.
+"""
+import dataclasses
+import datetime
+import enum
+import json
+import uuid
+
+import pytest
+
+import json_codec
+
+
+class Estado(enum.Enum):
+    PROGRAMADO = "PROGRAMADO"
+
+
+class Area(enum.IntEnum):
+    UNO = 1
+
+
+class Nombre(str):
+    pass
+
+
+@dataclasses.dataclass
+class Punto:
+    valor: int
+
+
+ID = uuid.UUID("12345678-1234-5678-1234-567812345678")
+
+SERIALIZABLE = [
+    {"combateId": 7, "puntajeIds": [1, 2, 3]},
+    {"nombre": "Torneo Ñandú", "sede": "Benito Juárez", "activo": True, "nota": None},
+    {1: "rojo", 2: "azul"},
+    {1.5: "x", True: "y", None: "z"},
+    {"counts": {10: 3, 11: 0}},
+    {"estado": Estado.PROGRAMADO, "area": Area.UNO},
+    {"id": ID},
+    {"login": Nombre("ana")},
+    [0.1, -2, 10 ** 12, "", []],
+]
+
+UNSERIALIZABLE = [
+    {"fechaHora": datetime.datetime(2025, 3, 1, 9)},
+    {"dia": datetime.date(2025, 3, 1)},
+    {"punto": Punto(1)},
+    {"ids": {1, 2}},
+    {"raw": b"bytes"},
+    {(1, 2): "tupla"},
+]
+
+
+@pytest.fixture(params=["orjson", "json"])
+def codec(request, monkeypatch):
+    if request.param == "orjson":
+        if json_codec.orjson is None:
+            pytest.skip("orjson no está instalado")
+    else:
+        monkeypatch.setattr(json_codec, "orjson", None)
+    return json_codec
+
+
+def stdlib(payload):
+    return json.loads(json.dumps(payload, default=json_codec._default))
+
+
+@pytest.mark.parametrize("payload", SERIALIZABLE)
+def test_serializable_payloads_decode_the_same(codec, payload):
+    assert json.loads(codec.dumps(payload)) == stdlib(payload)
+
+
+@pytest.mark.parametrize("payload", UNSERIALIZABLE)
+def test_unsupported_types_fail_with_both(codec, payload):
+    with pytest.raises(TypeError):
+        codec.dumps(payload)
+
+
+def test_non_ascii_is_written_as_utf8(codec):
+    assert codec.dumps({"sede": "Juárez"}) == '{"sede":"Juárez"}'.encode("utf-8")
+
+
+@pytest.mark.parametrize("raw", [b'{"count": 7}', b'{"alumnoId":3,"count":-2}', b'{"a":{"count":1},"count":4}', b""])
+def test_read_int_matches_full_decode(codec, raw):
+    expected = json.loads(raw).get("count", 0) if raw else 0
+    assert codec.read_int(raw, "count") == expected
@@ -0,0 +1,70 @@
+"""
+iter_json_array con el arreglo partido en cualquier punto: cada elemento
+sale completo y en orden, aunque un corte caiga dentro de un string, un
+número o un carácter UTF-8 de varios bytes.
+"""
+import json
+
+import pytest
+
+from json_stream import iter_json_array
+
+
+PAYLOAD = json.dumps([
+    {"idCombate": 1, "nombre": "Final ], [ rojo, azul", "area": "Área 1"},
+    {"nota": "comillas \"]\" y comas , y llaves }{", "vacio": []},
+    12345,
+    -0.5e3,
+    "solo ]",
+    True,
+    None,
+    [1, [2, [3]]],
+    {"ñandú": "ü€😀"},
+], ensure_ascii=False).encode("utf-8")
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def test_every_split_point_yields_the_same_items():
+    expected = json.loads(PAYLOAD)
+    for cut in range(1, len(PAYLOAD)):
+        assert list(iter_json_array([PAYLOAD[:cut], PAYLOAD[cut:]])) == expected, cut
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 10_000])
+def test_fixed_chunk_sizes(size):
+    assert list(iter_json_array(chunked(PAYLOAD, size))) == json.loads(PAYLOAD)
+
+
+def test_items_are_yielded_before_the_array_ends():
+    def chunks():
+        yield b'[{"a": 1}, {"b": 2}, '
+        raise AssertionError("se pidió el siguiente trozo antes de entregar lo completo")
+
+    items = iter_json_array(chunks())
+    assert next(items) == {"a": 1}
+    assert next(items) == {"b": 2}
+
+
+def test_number_at_chunk_end_waits_for_the_rest():
+    assert list(iter_json_array([b"[12", b"34, 5", b"6]"])) == [1234, 56]
+    # Cortes tras el punto decimal o el exponente
+    assert list(iter_json_array([b"[-500.", b"5, 1e", b"3, 2E-", b"1]"])) == [-500.5, 1000.0, 0.2]
+
+
+@pytest.mark.parametrize("chunks", [[b"[]"], [b"  \n", b" [ ", b" ] "], [b"[", b"]"]])
+def test_empty_arrays(chunks):
+    assert list(iter_json_array(chunks)) == []
+
+
+@pytest.mark.parametrize("chunks", [[b"[1, 2"], [b'[{"a": '], []])
+def test_truncated_array_raises(chunks):
+    with pytest.raises(ValueError):
+        list(iter_json_array(chunks))
+
+
+def test_non_array_raises():
+    with pytest.raises(ValueError):
+        list(iter_json_array([b'{"content": []}']))
@@ -0,0 +1,169 @@
+"""
+MatchClock con un reloj simulado: sin deriva entre ticks, transiciones
+round -> descanso -> round -> fin, was_active solo durante rounds en
+marcha y apply_state entre dos pantallas con relojes desfasados.
+"""
+import pytest
+
+from match_clock import (
+    MatchClock, format_remaining,
+    ROUND, REST, ENDED, ROUND_OVER, REST_OVER, MATCH_OVER,
+)
+
+
+class FakeTime:
+    def __init__(self, now=100.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class OffsetSync:
+    """Sustituto de ClockSync con un desfase fijo (servidor - local)."""
+
+    def __init__(self, offset):
+        self.offset = offset
+
+    def to_server(self, local):
+        return local + self.offset
+
+    def to_local(self, server):
+        return server - self.offset
+
+
+@pytest.fixture
+def now():
+    return FakeTime()
+
+
+def make_clock(now, rounds=2):
+    return MatchClock(round_duration=10, rest_duration=5, rounds=rounds, clock=now)
+
+
+def test_remaining_comes_from_the_clock_not_from_ticks(now):
+    clock = make_clock(now)
+    assert clock.start()
+    assert not clock.start()
+    now.advance(3.25)
+    assert clock.remaining() == pytest.approx(6.75)
+    clock.pause()
+    now.advance(100)
+    assert clock.remaining() == pytest.approx(6.75)
+    clock.start()
+    now.advance(1)
+    assert clock.remaining() == pytest.approx(5.75)
+
+
+def test_full_match_transitions(now):
+    clock = make_clock(now, rounds=2)
+    changes = []
+    clock.on_change = lambda c: changes.append((c.phase, c.round_number, c.running))
+
+    clock.start()
+    now.advance(9.9)
+    assert clock.tick() is None
+    now.advance(0.5)
+    assert clock.tick() == ROUND_OVER
+    assert (clock.phase, clock.running, clock.remaining()) == (REST, False, 5)
+
+    clock.start()
+    now.advance(5)
+    assert clock.tick() == REST_OVER
+    assert (clock.phase, clock.round_number, clock.running) == (ROUND, 2, False)
+
+    clock.start()
+    now.advance(10)
+    assert clock.tick() == MATCH_OVER
+    assert clock.is_ended and clock.remaining() == 0
+    assert not clock.start()
+    assert clock.tick() is None
+    assert changes[-1] == (ENDED, 2, False)
+
+
+def test_next_round_reset_and_finish(now):
+    clock = make_clock(now, rounds=3)
+    clock.start()
+    now.advance(4)
+    clock.reset_phase()
+    assert (clock.running, clock.remaining()) == (False, 10)
+    clock.next_round()
+    assert (clock.phase, clock.round_number) == (ROUND, 2)
+    clock.finish()
+    assert clock.phase == ENDED
+
+
+def test_was_active_only_while_a_round_runs(now):
+    clock = make_clock(now)
+    assert not clock.was_active(now())
+    clock.start()                # 100 -> 104 corriendo
+    assert clock.round_running
+    now.advance(4)
+    clock.pause()                # 104 -> 106 en pausa
+    assert not clock.round_running
+    now.advance(2)
+    clock.start()                # 106 -> 112 corriendo, se agota en 112
+    now.advance(6)
+    assert clock.tick() == ROUND_OVER
+    clock.start()                # descanso 112 -> 117: no cuenta
+    assert not clock.round_running
+
+    assert clock.was_active(100) and clock.was_active(102) and clock.was_active(104)
+    assert not clock.was_active(105)
+    assert clock.was_active(106) and clock.was_active(111.9)
+    assert not clock.was_active(99.9)
+    assert not clock.was_active(114)
+
+
+def test_was_active_counts_an_open_round_up_to_now(now):
+    clock = make_clock(now)
+    clock.start()
+    now.advance(2)
+    assert clock.was_active(now())
+    assert clock.was_active(now() + 1)  # llegada tardía de un evento del round en curso
+
+
+def test_apply_state_follows_the_owner_across_offsets(now):
+    owner_time = now
+    follower_time = FakeTime(now=5000.0)
+    # El servidor va 1000 s por delante del dueño y 3900 s por detrás del seguidor
+    owner_sync, follower_sync = OffsetSync(1000.0), OffsetSync(-3900.0)
+
+    owner = make_clock(owner_time)
+    follower = make_clock(follower_time)
+    owner.start()
+    owner_time.advance(3)
+    follower_time.advance(3)
+    follower.apply_state(owner.to_state(owner_sync), follower_sync)
+
+    assert follower.running and follower.round_running
+    for _ in range(3):
+        owner_time.advance(1.5)
+        follower_time.advance(1.5)
+        assert follower.remaining() == pytest.approx(owner.remaining())
+
+    owner.pause()
+    follower.apply_state(owner.to_state(owner_sync), follower_sync)
+    follower_time.advance(10)
+    assert not follower.running
+    assert follower.remaining() == pytest.approx(owner.remaining())
+
+
+def test_apply_state_of_an_ended_match_is_not_running(now):
+    follower = make_clock(now)
+    follower.apply_state({
+        "phase": ENDED, "round": 3, "rounds": 3, "round_duration": 10,
+        "rest_duration": 5, "running": True, "remaining": 0, "ref": 0,
+    }, OffsetSync(0))
+    assert follower.is_ended and not follower.running
+
+
+@pytest.mark.parametrize("seconds, text", [
+    (180, "03:00"), (179.01, "03:00"), (60.5, "01:01"), (10, "00:10"),
+    (9.99, "09.9"), (0.05, "00.0"), (-1, "00.0"),
+])
+def test_format_remaining(seconds, text):
+    assert format_remaining(seconds) == text
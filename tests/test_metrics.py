@@ -0,0 +1,79 @@
+"""
+LatencyHistogram: buckets "le" inclusivos y percentiles interpolados dentro
+del bucket como histogram_quantile() de Prometheus; ApiMetrics agrupa por
+endpoint y clasifica los errores.
+"""
+import pytest
+
+from metrics import ApiMetrics, LatencyHistogram
+
+
+def histogram(*values, buckets=(0.1, 0.2, 0.5, 1.0)):
+    h = LatencyHistogram(buckets)
+    for v in values:
+        h.observe(v)
+    return h
+
+
+def test_empty_histogram_reports_zero():
+    assert LatencyHistogram().percentile(0.99) == 0.0
+
+
+def test_bounds_are_inclusive_and_cumulative_ends_with_inf():
+    h = histogram(0.1, 0.1000001, 0.5, 3.0)
+    assert h.counts == [1, 1, 1, 0, 1]
+    assert h.cumulative() == [(0.1, 1), (0.2, 2), (0.5, 3), (1.0, 3), (float("inf"), 4)]
+    assert h.count == 4 and h.sum == pytest.approx(3.7000001) and h.max == 3.0
+
+
+def test_percentile_interpolates_inside_the_bucket():
+    # 10 observaciones en (0.2, 0.5]: la mediana cae a mitad del bucket
+    h = histogram(*[0.45] * 10)
+    assert h.percentile(0.5) == pytest.approx(0.35)
+    assert h.percentile(0.1) == pytest.approx(0.23)
+    # Nunca por encima de la mayor latencia vista
+    assert h.percentile(1.0) == pytest.approx(0.45)
+
+
+def test_percentile_walks_buckets_in_rank_order():
+    h = histogram(*([0.05] * 90 + [0.15] * 9 + [0.9]))
+    assert h.percentile(0.5) == pytest.approx(0.1 * 50 / 90)
+    assert h.percentile(0.95) == pytest.approx(0.1 + 0.1 * 5 / 9)
+    assert h.percentile(0.99) == pytest.approx(0.2)
+    assert h.percentile(1.0) == pytest.approx(0.9)
+
+
+def test_percentile_in_overflow_bucket_is_capped_by_max():
+    h = histogram(0.05, 4.0)
+    assert h.percentile(0.5) == pytest.approx(0.1)
+    assert 1.0 < h.percentile(0.75) < 4.0
+    assert h.percentile(1.0) == 4.0
+
+
+def test_percentiles_are_monotonic():
+    h = histogram(*[i / 100 for i in range(1, 150)])
+    values = [h.percentile(q / 100) for q in range(0, 101)]
+    assert values == sorted(values)
+
+
+def test_api_metrics_groups_by_endpoint_and_classifies_errors():
+    m = ApiMetrics()
+    m.observe("GET", "http://h/apiCombates/combate/15?x=1", 0.02, status=200)
+    m.observe("GET", "http://h/apiCombates/combate/16", 0.04, status=404)
+    m.observe("GET", "http://h/apiCombates/combate/17", 0.08, status=503)
+    m.observe("GET", "http://h/apiCombates/combate/18", 2.0, timeout=True, error=True)
+    m.record_retry("GET", "http://h/apiCombates/combate/18")
+    m.record_rejected("POST", "http://h/apiPuntajes/puntaje/simple")
+
+    snap = m.snapshot()
+    combate = snap["GET /apiCombates/combate/{id}"]
+    assert combate["requests"] == 4
+    assert (combate["errors"], combate["client_errors"], combate["timeouts"]) == (2, 1, 1)
+    assert combate["error_rate"] == 0.5
+    assert combate["retries"] == 1
+    assert combate["max_ms"] == 2000.0
+    assert snap["POST /apiPuntajes/puntaje/simple"]["rejected"] == 1
+
+    text = m.render_prometheus()
+    assert 'tt_api_request_duration_seconds_bucket{method="GET",endpoint="/apiCombates/combate/{id}",le="+Inf"} 4' in text
+    assert 'tt_api_timeouts_total{method="GET",endpoint="/apiCombates/combate/{id}"} 1' in text
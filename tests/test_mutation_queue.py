@@ -0,0 +1,251 @@
+"""
+Garantía de la cola de mutaciones: un reenvío nunca cuenta dos veces, aun
+contra un backend que ignora Idempotency-Key (como el real). Diario
+(load / ack / compact), compactación con encolados en paralelo y fallos
+ambiguos contra fake_backend.
+"""
+import threading
+import time
+
+import pytest
+import requests
+
+from api_client import ApiClient
+from mutation_queue import (
+    Mutation, MutationJournal, MutationQueue, UncertainMutationError,
+    SCORE_ADD, SCORE_SUB, GAMJEOM_ADD, GAMJEOM_SUB,
+)
+
+MUTATIONS = ("add_puntaje_simple", "delete_last_puntaje", "add_gamjeom_simple", "delete_last_gamjeom")
+
+
+def wait_until(predicate, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return MutationJournal(str(tmp_path / "mutaciones.jsonl"))
+
+
+def first_combate(backend):
+    c = next(iter(backend.combates.values()))
+    return c["idCombate"], c["competidorRojo"]["id"]
+
+
+def count(backend, alumno_id, combate_id=None, kind=SCORE_ADD):
+    if kind in (GAMJEOM_ADD, GAMJEOM_SUB):
+        path = f"/apiGamJeom/falta/alumno/{alumno_id}/combate/{combate_id}/count"
+    else:
+        path = f"/apiPuntajes/puntaje/alumno/{alumno_id}/count"
+    return backend.handle("GET", path)[1]["count"]
+
+
+def add_point(backend, combate_id, alumno_id, kind=SCORE_ADD, headers=None):
+    """Un punto (o falta) que llega al servidor por otro lado, p. ej. otro juez."""
+    route = "/apiGamJeom/falta/simple" if kind in (GAMJEOM_ADD, GAMJEOM_SUB) else "/apiPuntajes/puntaje/simple"
+    backend.handle("POST", route, query={"combateId": [str(combate_id)], "alumnoId": [str(alumno_id)]},
+                   headers=headers)
+
+
+class LosingClient:
+    """
+    ApiClient cuya primera mutación falla sin respuesta. Con applied=True el
+    servidor ya la aplicó (ReadTimeout); con False nunca llegó. before_loss
+    se ejecuta justo antes de perderla (p. ej. el punto de otro juez).
+    """
+
+    def __init__(self, client, applied=True, before_loss=None):
+        self.client = client
+        self.applied = applied
+        self.before_loss = before_loss
+        self.lose = 1
+        self.keys = []
+
+    def __getattr__(self, name):
+        method = getattr(self.client, name)
+        if name not in MUTATIONS:
+            return method
+
+        def call(*args, **kwargs):
+            self.keys.append(kwargs.get("idempotency_key"))
+            if self.lose:
+                self.lose -= 1
+                if self.applied:
+                    method(*args, **kwargs)
+                if self.before_loss:
+                    self.before_loss()
+                raise requests.exceptions.ReadTimeout("respuesta perdida")
+            return method(*args, **kwargs)
+        return call
+
+
+# ------------------------------------------------------------------ diario
+
+def test_load_returns_unacked_in_order_and_skips_truncated_line(journal):
+    first = Mutation(SCORE_ADD, 1, 10)
+    second = Mutation(SCORE_SUB, 1, 10)
+    third = Mutation(SCORE_ADD, 1, 11)
+    for m in (first, second, third):
+        journal.append(m)
+    journal.ack(second.key)
+    journal._file.write('{"op": "append", "kind": "score_a')   # cierre abrupto a mitad de línea
+    journal._file.flush()
+
+    assert [m.key for m in MutationJournal(journal.path).load()] == [first.key, third.key]
+
+
+def test_ack_of_unknown_key_and_blank_lines_are_ignored(journal):
+    m = Mutation(SCORE_ADD, 1, 10)
+    journal.append(m)
+    journal.ack("no-existe")
+    journal._file.write("\n\n")
+    journal._file.flush()
+
+    loaded = journal.load()
+    assert [x.key for x in loaded] == [m.key]
+    assert loaded[0].kind == SCORE_ADD and loaded[0].alumno_id == 10
+
+
+def test_compact_empties_journal_and_appends_keep_working(journal):
+    journal.append(Mutation(SCORE_ADD, 1, 10))
+    journal.compact()
+    assert journal.load() == []
+
+    again = Mutation(SCORE_ADD, 1, 10)
+    journal.append(again)
+    assert [m.key for m in journal.load()] == [again.key]
+
+
+def test_missing_journal_loads_empty(tmp_path):
+    assert MutationJournal(str(tmp_path / "no-existe.jsonl")).load() == []
+
+
+# ------------------------------------------------------------------ cola
+
+class RecordingClient:
+    """Cliente instantáneo que cuenta cada clave enviada."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sent = []
+
+    def add_puntaje_simple(self, combate_id, alumno_id, idempotency_key=None):
+        with self.lock:
+            self.sent.append(idempotency_key)
+            return {"newCount": len(self.sent)}
+
+    def count_puntajes(self, alumno_id):
+        with self.lock:
+            return len(self.sent)
+
+
+def test_compaction_racing_enqueues_loses_nothing(journal):
+    client = RecordingClient()
+    queue = MutationQueue(client, journal)
+    enqueued = []
+    lock = threading.Lock()
+
+    def producer():
+        for _ in range(200):
+            m = queue.enqueue(SCORE_ADD, 1, 10)
+            with lock:
+                enqueued.append(m.key)
+
+    threads = [threading.Thread(target=producer) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert wait_until(lambda: queue.pending_count() == 0)
+    # Cada mutación se envió exactamente una vez y el diario quedó sin pendientes
+    assert sorted(client.sent) == sorted(enqueued)
+    assert MutationJournal(journal.path).load() == []
+
+
+# ------------------------------------------------------------------ fallos ambiguos contra fake_backend
+
+KINDS = [SCORE_ADD, SCORE_SUB, GAMJEOM_ADD, GAMJEOM_SUB]
+DELTA = {SCORE_ADD: 1, SCORE_SUB: -1, GAMJEOM_ADD: 1, GAMJEOM_SUB: -1}
+
+
+def run_one(backend, journal, kind, client):
+    combate_id, alumno_id = first_combate(backend)
+    if kind in (SCORE_SUB, GAMJEOM_SUB):
+        for _ in range(2):
+            add_point(backend, combate_id, alumno_id, kind)
+    before = count(backend, alumno_id, combate_id, kind)
+
+    queue = MutationQueue(client, journal)
+    outcome = []
+    finished = threading.Event()
+    queue.enqueue(kind, combate_id, alumno_id,
+                  on_done=lambda m, data: (outcome.append(("ok", data)), finished.set()),
+                  on_failed=lambda m, error: (outcome.append(("failed", error)), finished.set()))
+    assert finished.wait(10)
+    assert MutationJournal(journal.path).load() == []
+    return before, count(backend, alumno_id, combate_id, kind), outcome[0]
+
+
+@pytest.mark.parametrize("kind", KINDS)
+def test_applied_but_lost_is_not_resent_without_idempotency(java_backend, journal, kind):
+    client = LosingClient(ApiClient(base_url=java_backend.base_url), applied=True)
+    before, after, (status, data) = run_one(java_backend, journal, kind, client)
+
+    assert len(client.keys) == 1
+    assert after == before + DELTA[kind]
+    assert status == "ok"
+    assert after in data.values()
+
+
+@pytest.mark.parametrize("kind", KINDS)
+def test_never_applied_is_resent_with_same_key(java_backend, journal, kind):
+    client = LosingClient(ApiClient(base_url=java_backend.base_url), applied=False)
+    before, after, (status, _) = run_one(java_backend, journal, kind, client)
+
+    assert len(client.keys) == 2 and client.keys[0] == client.keys[1]
+    assert after == before + DELTA[kind]
+    assert status == "ok"
+
+
+@pytest.mark.parametrize("kind", [SCORE_SUB, GAMJEOM_SUB])
+def test_subtraction_is_not_resent_when_count_moved_otherwise(java_backend, journal, kind):
+    combate_id, alumno_id = first_combate(java_backend)
+    # Se aplicó la resta pero otro juez sumó antes de poder releer el contador
+    client = LosingClient(
+        ApiClient(base_url=java_backend.base_url), applied=True,
+        before_loss=lambda: [add_point(java_backend, combate_id, alumno_id, kind) for _ in range(2)],
+    )
+    before, after, (status, error) = run_one(java_backend, journal, kind, client)
+
+    assert len(client.keys) == 1
+    assert status == "failed" and isinstance(error, UncertainMutationError)
+    assert after == before - 1 + 2
+
+
+def test_replay_from_journal_after_crash_counts_once(java_backend, journal):
+    backend = java_backend
+    combate_id, alumno_id = first_combate(backend)
+    before = count(backend, alumno_id)
+    # La app leyó el contador, envió el punto y se cerró antes de anotar el ack
+    m = Mutation(SCORE_ADD, combate_id, alumno_id)
+    journal.append(m)
+    m.before = before
+    journal.mark_sent(m)
+    add_point(backend, combate_id, alumno_id)
+    # Y este otro quedó anotado pero nunca se envió
+    unsent = Mutation(SCORE_ADD, combate_id, alumno_id)
+    journal.append(unsent)
+
+    queue = MutationQueue(ApiClient(base_url=backend.base_url), MutationJournal(journal.path))
+    queue.start()
+
+    assert wait_until(lambda: queue.stats()["confirmed"] == 2)
+    assert count(backend, alumno_id) == before + 2
+    assert MutationJournal(journal.path).load() == []
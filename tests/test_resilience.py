@@ -0,0 +1,156 @@
+"""
+RetryPolicy (backoff exponencial con jitter completo), CircuitBreaker
+(se abre tras N fallos seguidos, rechaza sin esperar y la sonda lo cierra)
+y cómo los usa ApiClient._with_retry.
+"""
+import threading
+import time
+
+import pytest
+import requests
+
+from api_client import ApiClient
+from resilience import BreakerRegistry, CircuitBreaker, CircuitOpenError, RetryPolicy
+
+
+def test_retry_delay_is_full_jitter_under_exponential_cap(monkeypatch):
+    caps = []
+    monkeypatch.setattr("resilience.random.uniform", lambda low, high: caps.append((low, high)) or high)
+    policy = RetryPolicy(base_delay=0.2, max_delay=1.0)
+    assert [policy.delay(n) for n in (1, 2, 3, 4, 5)] == [0.2, 0.4, 0.8, 1.0, 1.0]
+    assert all(low == 0 for low, _ in caps)
+
+
+def test_retry_delay_samples_stay_in_range():
+    policy = RetryPolicy(base_delay=0.1, max_delay=2.0)
+    samples = [policy.delay(3) for _ in range(500)]
+    assert all(0 <= s <= 0.4 for s in samples)
+    assert max(samples) - min(samples) > 0.1
+
+
+def test_breaker_opens_after_consecutive_failures_and_rejects():
+    changes = []
+    breaker = CircuitBreaker("http://h", failure_threshold=3, on_change=lambda h, s: changes.append(s))
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()  # un éxito reinicia la cuenta
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.before_request()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    assert breaker.stats()["rejected"] == 1
+    assert changes == [CircuitBreaker.OPEN]
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert changes == [CircuitBreaker.OPEN, CircuitBreaker.CLOSED]
+
+
+def test_probe_runs_while_open_and_closes_on_answer():
+    attempts = []
+    closed = threading.Event()
+
+    def probe(host):
+        # La sonda sí puede pasar con el circuito abierto
+        breaker.before_request()
+        attempts.append(host)
+        if len(attempts) < 2:
+            raise requests.exceptions.ConnectionError("sigue caído")
+        breaker.record_success()
+        closed.set()
+
+    breaker = CircuitBreaker("http://h", failure_threshold=1, reset_timeout=0.01, probe=probe)
+    breaker.record_failure()
+    assert closed.wait(5)
+    assert attempts == ["http://h", "http://h"]
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_listener_error_does_not_break_the_breaker():
+    def broken(host, state):
+        raise RuntimeError("listener roto")
+
+    breaker = CircuitBreaker("http://h", failure_threshold=1, on_change=broken)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_registry_has_one_breaker_per_host_and_reports_changes():
+    registry = BreakerRegistry(failure_threshold=1)
+    seen = []
+    registry.add_listener(lambda host, state: seen.append((host, state)))
+    a = registry.get("http://a:8080")
+    assert registry.get("http://a:8080") is a
+    assert registry.get("http://b:8080") is not a
+
+    a.record_failure()
+    assert registry.any_open()
+    assert seen == [("http://a:8080", CircuitBreaker.OPEN)]
+    assert registry.stats()["http://b:8080"]["state"] == CircuitBreaker.CLOSED
+
+
+# ------------------------------------------------------------------ ApiClient._with_retry
+
+class Reply:
+    def __init__(self, status):
+        self.status_code = status
+        self.request = None
+
+
+@pytest.fixture
+def client():
+    client = ApiClient(base_url="http://127.0.0.1:9")
+    client.retry_policy = RetryPolicy(max_attempts=3, base_delay=0, max_delay=0)
+    return client
+
+
+def test_with_retry_retries_gateway_errors_up_to_max(client):
+    replies = iter([Reply(503), Reply(502), Reply(200)])
+    assert client._with_retry(lambda: next(replies)).status_code == 200
+    assert client.retries == 2
+
+    always = [0]
+
+    def unavailable():
+        always[0] += 1
+        return Reply(503)
+    assert client._with_retry(unavailable).status_code == 503
+    assert always[0] == 3
+
+
+def test_with_retry_retries_connection_errors_but_not_read_timeouts(client):
+    calls = []
+
+    def refused():
+        calls.append(1)
+        raise requests.exceptions.ConnectionError("refused")
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client._with_retry(refused)
+    assert len(calls) == 3
+
+    calls.clear()
+
+    def slow():
+        calls.append(1)
+        raise requests.exceptions.ReadTimeout("lento")
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        client._with_retry(slow)
+    assert len(calls) == 1
+
+
+def test_with_retry_does_not_retry_an_open_circuit(client):
+    calls = []
+
+    def rejected():
+        calls.append(1)
+        raise CircuitOpenError("abierto")
+    started = time.monotonic()
+    with pytest.raises(CircuitOpenError):
+        client._with_retry(rejected)
+    assert calls == [1]
+    assert time.monotonic() - started < 0.5
@@ -0,0 +1,47 @@
+"""
+get_scoreboard_snapshot contra un /marcador que no responde: la sonda no
+se reintenta y tras SCOREBOARD_AGGREGATE_MAX_TIMEOUTS deja de pedirse.
+"""
+import requests
+
+from api_client import ApiClient
+from config import SCOREBOARD_AGGREGATE_MAX_TIMEOUTS
+
+
+def hanging_marcador(client):
+    calls = []
+    get = client.session.get
+
+    def session_get(url, *args, **kwargs):
+        if url.endswith("/marcador"):
+            calls.append(url)
+            raise requests.exceptions.ReadTimeout("sin respuesta")
+        return get(url, *args, **kwargs)
+
+    client.session.get = session_get
+    return calls
+
+
+def test_hanging_aggregate_is_probed_once_per_snapshot_then_dropped(backend):
+    combate = next(iter(backend.combates.values()))
+    rojo, azul = combate["competidorRojo"]["id"], combate["competidorAzul"]["id"]
+    backend.handle("POST", "/apiPuntajes/puntaje/simple",
+                   query={"combateId": [str(combate["idCombate"])], "alumnoId": [str(rojo)]})
+    client = ApiClient(base_url=backend.base_url)
+    calls = hanging_marcador(client)
+
+    for n in range(1, SCOREBOARD_AGGREGATE_MAX_TIMEOUTS + 2):
+        snapshot = client.get_scoreboard_snapshot(combate["idCombate"], rojo, azul)
+        assert snapshot.source == "parallel"
+        assert (snapshot.puntaje_rojo, snapshot.puntaje_azul) == (1, 0)
+        assert len(calls) == min(n, SCOREBOARD_AGGREGATE_MAX_TIMEOUTS)
+    assert client.retries == 0
+
+
+def test_aggregate_is_used_when_available(backend):
+    combate = next(iter(backend.combates.values()))
+    client = ApiClient(base_url=backend.base_url)
+    snapshot = client.get_scoreboard_snapshot(
+        combate["idCombate"], combate["competidorRojo"]["id"], combate["competidorAzul"]["id"])
+    assert snapshot.source == "aggregate"
+    assert (snapshot.puntaje_rojo, snapshot.gamjeom_azul) == (0, 0)
@@ -0,0 +1,123 @@
+"""
+SequenceTracker: al reconectar elige resume o snapshot, descarta eventos
+repetidos, detecta huecos y, contra el resume de fake_backend, recupera
+los eventos perdidos en orden o cae a snapshot si ya no están en el buffer.
+"""
+import json
+
+import pytest
+
+from fake_backend import FakeBackend
+from websocket_manager import (
+    SequenceTracker, APPLY, DUPLICATE, GAP, RESUME, SNAPSHOT, UP_TO_DATE,
+)
+
+
+def test_first_connection_and_seqless_server_load_a_snapshot():
+    tracker = SequenceTracker()
+    assert tracker.on_connected(None) == SNAPSHOT
+    assert tracker.last is None
+    assert tracker.accept(None) == APPLY
+
+    assert tracker.on_connected(7) == SNAPSHOT
+    assert tracker.last == 7
+    assert tracker.snapshots == 2
+
+
+@pytest.mark.parametrize("server_seq, expected", [
+    (10, UP_TO_DATE),
+    (11, RESUME),
+    (10 + 50, RESUME),
+    (10 + 51, SNAPSHOT),   # hueco mayor que max_gap
+    (3, SNAPSHOT),         # servidor reiniciado
+])
+def test_reconnect_decision(server_seq, expected):
+    tracker = SequenceTracker(max_gap=50)
+    tracker.on_connected(10)
+    assert tracker.on_connected(server_seq) == expected
+
+
+def test_accept_applies_in_order_and_flags_duplicates_and_gaps():
+    tracker = SequenceTracker()
+    tracker.on_connected(0)
+    assert [tracker.accept(s) for s in (1, 2, 2, 1, 4, 3, 4)] == [
+        APPLY, APPLY, DUPLICATE, DUPLICATE, GAP, APPLY, APPLY,
+    ]
+    assert tracker.stats() == {
+        "last_seq": 4, "resumes": 0, "snapshots": 1, "duplicates": 2, "gaps": 1,
+    }
+
+
+def test_resume_message_and_failure_fallback():
+    tracker = SequenceTracker()
+    tracker.on_connected(5)
+    assert json.loads(tracker.resume_message()) == {"action": "resume", "lastSeq": 5}
+    assert tracker.resuming
+    tracker.on_resume_failed(40)
+    assert (tracker.last, tracker.resuming, tracker.snapshots) == (40, False, 2)
+    assert tracker.accept(41) == APPLY
+
+
+# ------------------------------------------------------------------ contra fake_backend
+
+class Conn:
+    def __init__(self):
+        self.sent = []
+
+    def send_text(self, text):
+        self.sent.append(json.loads(text))
+
+
+def play(tracker, messages):
+    """Aplica como el tablero: devuelve los puntos aplicados y el status final."""
+    applied, status = [], None
+    for m in messages:
+        if "seq" in m and "event" in m:
+            if tracker.accept(m["seq"]) == APPLY:
+                applied.append(m["seq"])
+        elif m.get("status") == "resumed":
+            tracker.on_resumed(m["seq"])
+            status = "resumed"
+        elif m.get("status") == "resume_failed":
+            tracker.on_resume_failed(m["seq"])
+            status = "resume_failed"
+    return applied, status
+
+
+def connect(backend, combate_id):
+    conn = Conn()
+    backend.subscribe(combate_id, conn)
+    return conn, conn.sent[0]["seq"]
+
+
+@pytest.mark.parametrize("buffer, missed, expected", [(16, 4, "resumed"), (3, 6, "resume_failed")])
+def test_reconnect_against_fake_backend(buffer, missed, expected):
+    backend = FakeBackend(resume_buffer=buffer)
+    tracker = SequenceTracker()
+    combate_id = 1
+
+    conn, seq = connect(backend, combate_id)
+    assert tracker.on_connected(seq) == SNAPSHOT
+    for n in range(2):
+        backend.broadcast(combate_id, {"event": "score_update", "n": n})
+    assert play(tracker, conn.sent[1:]) == ([1, 2], None)
+
+    # Se cae la conexión y mientras tanto llegan más eventos
+    backend.unsubscribe(combate_id, conn)
+    for n in range(missed):
+        backend.broadcast(combate_id, {"event": "score_update", "n": n})
+
+    conn, seq = connect(backend, combate_id)
+    assert tracker.on_connected(seq) == RESUME
+    backend.on_ws_text(combate_id, conn, tracker.resume_message())
+    applied, status = play(tracker, conn.sent[1:])
+
+    assert status == expected
+    if expected == "resumed":
+        assert applied == list(range(3, 3 + missed))
+    else:
+        # El tablero recarga el marcador por REST y sigue desde el seq actual
+        assert applied == []
+    assert tracker.last == 2 + missed
+    backend.broadcast(combate_id, {"event": "score_update"})
+    assert play(tracker, conn.sent[-1:]) == ([3 + missed], None)
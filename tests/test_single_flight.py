@@ -0,0 +1,102 @@
+"""
+SingleFlight: llamadas idénticas simultáneas comparten una sola ejecución,
+su resultado y su error; las de otra clave o posteriores no se agrupan.
+"""
+import threading
+import time
+
+import pytest
+
+from single_flight import SingleFlight
+
+
+def run_concurrently(flight, key, fn, n):
+    """Lanza n llamadas con la misma clave; devuelve (resultados, errores)."""
+    results, errors = [], []
+    lock = threading.Lock()
+
+    def worker():
+        try:
+            value = flight.do(key, fn)
+        except Exception as e:
+            with lock:
+                errors.append(e)
+        else:
+            with lock:
+                results.append(value)
+
+    threads = [threading.Thread(target=worker) for _ in range(n)]
+    for t in threads:
+        t.start()
+    return threads, results, errors
+
+
+def wait_for_waiters(flight, key, n, timeout=5):
+    """Espera a que n llamadas estén esperando a la que ejecuta key."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with flight._lock:
+            call = flight._calls.get(key)
+            if call is not None and call.waiters == n:
+                return True
+        time.sleep(0.005)
+    return False
+
+
+def test_concurrent_identical_calls_run_once_and_share_result():
+    flight = SingleFlight()
+    release = threading.Event()
+    executions = []
+
+    def fetch():
+        executions.append(1)
+        release.wait(5)
+        return {"rows": [1, 2]}
+
+    threads, results, errors = run_concurrently(flight, "GET /torneos", fetch, 5)
+    assert wait_for_waiters(flight, "GET /torneos", 4)
+    assert flight.in_flight() == 1
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert executions == [1]
+    assert errors == []
+    assert results == [{"rows": [1, 2]}] * 5
+    assert flight.stats() == {"executed": 1, "saved": 4, "in_flight": 0}
+
+
+def test_error_is_raised_to_every_waiter():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise ConnectionError("caído")
+
+    threads, results, errors = run_concurrently(flight, "k", fail, 3)
+    assert wait_for_waiters(flight, "k", 2)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert results == []
+    assert len(errors) == 3 and all(isinstance(e, ConnectionError) for e in errors)
+
+
+def test_sequential_calls_and_other_keys_are_not_coalesced():
+    flight = SingleFlight()
+    calls = []
+    assert flight.do("a", lambda: calls.append("a") or 1) == 1
+    assert flight.do("a", lambda: calls.append("a") or 2) == 2
+    assert flight.do("b", lambda: calls.append("b") or 3) == 3
+    assert calls == ["a", "a", "b"]
+    assert flight.stats()["saved"] == 0
+
+
+def test_key_is_released_after_failure():
+    flight = SingleFlight()
+    with pytest.raises(ValueError):
+        flight.do("k", lambda: int("x"))
+    assert flight.in_flight() == 0
+    assert flight.do("k", lambda: "ok") == "ok"
@@ -0,0 +1,44 @@
+"""
+Una grabación de tráfico no guarda credenciales: ni el cuerpo del login,
+ni el accessToken que devuelve, ni las contraseñas de los administradores.
+"""
+import json
+
+from api_client import ApiClient
+import traffic_replay
+
+
+def test_recording_omits_passwords_and_tokens(backend, tmp_path):
+    path = tmp_path / "trafico.jsonl"
+    client = ApiClient(base_url=backend.base_url)
+    traffic_replay.start_recording(client, str(path))
+    try:
+        token = client.admin_login("admin", "admin")["accessToken"]
+        client.create_administrador({
+            "nombres": "Ana", "apellidos": "López", "correo": "ana@example.com",
+            "login": "ana", "password": "s3creta",
+        })
+        client.get_all_administradores()
+    finally:
+        traffic_replay.stop_recording(client)
+
+    text = path.read_text(encoding="utf-8")
+    assert token not in text
+    assert "s3creta" not in text
+
+    records = [json.loads(line) for line in text.splitlines()]
+    login = next(r for r in records if r.get("path") == "/api/auth/admin/login")
+    assert login["request_body"] == traffic_replay.REDACTED
+    # La estructura se conserva para poder reproducirla
+    assert json.loads(login["body"])["accessToken"] == traffic_replay.REDACTED
+    create = next(r for r in records if r.get("method") == "POST" and "/apiAdministradores" in r["path"])
+    assert json.loads(create["request_body"])["login"] == "ana"
+
+
+def test_non_json_and_clean_bodies_are_kept_verbatim():
+    assert traffic_replay._redacted(b"pong") == "pong"
+    assert traffic_replay._redacted('{"a":  1}') == '{"a":  1}'
+    assert traffic_replay._redacted(None) is None
+    assert json.loads(traffic_replay._redacted('[{"Password": "x", "n": [{"token": 1}]}]')) == [
+        {"Password": traffic_replay.REDACTED, "n": [{"token": traffic_replay.REDACTED}]}
+    ]
@@ -0,0 +1,110 @@
+"""
+UiBus: un lote por frame en orden de llegada, coalescencia por clave que
+conserva la posición de la última entrada, errores aislados y lo publicado
+durante el drenado queda para el frame siguiente.
+"""
+import os
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+
+import pytest  # noqa: E402
+
+import ui_bus as ui_bus_module  # noqa: E402
+from ui_bus import UiBus, ui_latest, ui_thread  # noqa: E402
+
+
+@pytest.fixture
+def bus():
+    bus = UiBus()
+    bus.triggers = 0
+
+    def trigger():
+        bus.triggers += 1
+    bus._trigger = trigger
+    return bus
+
+
+def test_one_trigger_per_frame_and_fifo_order(bus):
+    calls = []
+    for n in range(5):
+        bus.post(calls.append, n)
+    assert bus.triggers == 1 and bus.pending() == 5
+    bus._drain()
+    assert calls == [0, 1, 2, 3, 4]
+    bus.post(calls.append, 5)
+    assert bus.triggers == 2
+
+
+def test_keyed_updates_keep_only_the_last_in_its_position(bus):
+    calls = []
+    bus.post_latest("rojo", calls.append, "rojo=1")
+    bus.post(calls.append, "popup")
+    bus.post_latest("azul", calls.append, "azul=1")
+    bus.post_latest("rojo", calls.append, "rojo=2")
+    bus.post_latest("rojo", calls.append, "rojo=3")
+    bus._drain()
+
+    assert calls == ["popup", "azul=1", "rojo=3"]
+    stats = bus.stats()
+    assert (stats["posted"], stats["coalesced"], stats["applied"], stats["frames"]) == (5, 2, 3, 1)
+
+
+def test_coalescing_is_per_frame(bus):
+    calls = []
+    bus.post_latest("k", calls.append, 1)
+    bus._drain()
+    bus.post_latest("k", calls.append, 2)
+    bus._drain()
+    assert calls == [1, 2]
+
+
+def test_error_in_one_update_does_not_stop_the_batch(bus):
+    calls = []
+    bus.post(int, "no es número")
+    bus.post(calls.append, "sigue")
+    bus._drain()
+    assert calls == ["sigue"]
+    assert bus.errors == 1
+
+
+def test_posts_made_while_draining_go_to_the_next_frame(bus):
+    calls = []
+
+    def reentrant():
+        calls.append("primero")
+        bus.post(calls.append, "siguiente frame")
+
+    bus.post(reentrant)
+    bus._drain()
+    assert calls == ["primero"]
+    assert bus.pending() == 1 and bus.triggers == 2
+    bus._drain()
+    assert calls == ["primero", "siguiente frame"]
+
+
+def test_decorators_route_through_the_global_bus(bus, monkeypatch):
+    monkeypatch.setattr(ui_bus_module, "ui_bus", bus)
+
+    class Panel:
+        def __init__(self):
+            self.shown = []
+
+        @ui_thread
+        def status(self, text):
+            self.shown.append(text)
+
+        @ui_latest
+        def score(self, value):
+            self.shown.append(value)
+
+    rojo, azul = Panel(), Panel()
+    rojo.status("+1")
+    for value in (1, 2, 3):
+        rojo.score(value)
+    azul.score(9)
+    assert rojo.shown == [] and azul.shown == []
+
+    bus._drain()
+    assert rojo.shown == ["+1", 3]
+    assert azul.shown == [9]
+    assert Panel.score.__wrapped__.__name__ == "score"
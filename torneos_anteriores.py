@@ -13,12 +13,16 @@ from kivy.uix.popup import Popup
 from kivy.uix.textinput import TextInput
 from kivy.utils import platform
 from kivy.clock import Clock
-from threading import Thread
+from task_executor import executor, PRIORITY_NORMAL, PRIORITY_LIST
+from cancel_scope import CancelScope
 from datetime import datetime
 from api_client import api
+import responsive
+from responsive import ResponsiveLayout
 from actualizar_torneos import ActualizarTorneoScreen
 
 # ------------------ UTILIDADES RESPONSIVE ------------------
+@responsive.tracked
 class ResponsiveHelper:
     @staticmethod
     def is_mobile():
@@ -107,15 +111,10 @@ class HoverButton(Button):
             self.rect = RoundedRectangle(pos=self.pos, size=self.size, radius=[self.border_radius])
 
         self.bind(pos=self.update_rect, size=self.update_rect)
-        Window.bind(on_resize=self.on_window_resize)
 
     def update_rect(self, *args):
         self.rect.pos = self.pos
         self.rect.size = self.size
-    
-    def on_window_resize(self, instance, width, height):
-        self.font_size = ResponsiveHelper.get_font_size(18)
-        self.height = ResponsiveHelper.get_button_height()
 
 
 class LightBlueButton(HoverButton):
@@ -259,7 +258,7 @@ class TorneoCard(BoxLayout):
             self.rect = RoundedRectangle(pos=self.pos, size=self.size, radius=[dp(15)])
             self.bind(pos=self.update_rect, size=self.update_rect)
 
-        Window.bind(on_resize=self.on_window_resize)
+        # Sus medidas salen del ResponsiveHelper: la pantalla las reacomoda en su sitio
         self.build_card()
 
     def build_card(self):
@@ -360,13 +359,6 @@ class TorneoCard(BoxLayout):
         self.shadow.pos = (self.pos[0] + dp(3), self.pos[1] - dp(3))
         self.shadow.size = self.size
 
-    def on_window_resize(self, instance, width, height):
-        Clock.schedule_once(lambda dt: self.rebuild_card(), 0.1)
-    
-    def rebuild_card(self):
-        self.height = ResponsiveHelper.get_card_height()
-        self.build_card()
-
     def open_delete_popup(self, instance):
         ConfirmDeletePopup(
             torneo_data=self.torneo_data,
@@ -455,13 +447,20 @@ class TorneosAnterioresScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.torneos_data = []
-        self.build_ui()
-        Window.bind(on_resize=self.on_window_resize)
+        self.scope = CancelScope('torneos_anteriores')
+        self._load_seq = 0
+        self.responsive = ResponsiveLayout(self, build=self.build_ui, reflow=self.reflow_layout)
+        self.responsive.build()
 
     def on_enter(self, *args):
         """Se ejecuta cada vez que se entra a esta pantalla"""
         self.fetch_torneos()
 
+    def on_pre_leave(self, *args):
+        """Cancela las cargas pendientes para no actualizar una pantalla que ya no se ve"""
+        self.scope = self.scope.renew()
+        return super().on_pre_leave(*args)
+
     def fetch_torneos(self):
         """Obtiene los torneos desde el backend"""
         self.torneos_data = []
@@ -475,39 +474,38 @@ class TorneosAnterioresScreen(Screen):
         )
         self.grid.add_widget(loading)
 
-        def _task():
-            try:
-                print("[DEBUG] Solicitando torneos al backend...")
-                resp = api.get_json("/apiTorneos/torneo")
-                status = resp.status_code
-                print(f"[DEBUG] Status code: {status}")
-                
-                if status == 200:
-                    try:
-                        data = resp.json() or []
-                        print(f"[DEBUG] Torneos recibidos: {len(data)}")
-                    except Exception as e:
-                        print(f"[ERROR] Error parseando JSON: {e}")
-                        data = []
-                    
-                    # Mapear datos
-                    mapped = [self._map_torneo(t) for t in data]
-                    
-                    def _ok(dt):
-                        self.torneos_data = mapped
-                        self.populate_torneos()
-                    Clock.schedule_once(_ok, 0)
-                else:
-                    def _err(dt):
-                        self._show_error(f"Error {status} al consultar torneos.")
-                    Clock.schedule_once(_err, 0)
-            except Exception as e:
-                print(f"[ERROR] Exception en fetch_torneos: {e}")
-                def _err(dt, m=str(e)):
-                    self._show_error(f"No se pudo obtener torneos.\n{m}")
-                Clock.schedule_once(_err, 0)
+        self._load_seq += 1
+        seq = self._load_seq
+        scope = self.scope
 
-        Thread(target=_task, daemon=True).start()
+        def _task():
+            print("[DEBUG] Solicitando torneos al backend...")
+            total = 0
+            for batch in api.iter_torneos():
+                # Mapear datos y pintar este lote sin esperar al resto
+                mapped = [self._map_torneo(t) for t in batch]
+                total += len(mapped)
+                executor.deliver(_page, mapped, scope=scope)
+            print(f"[DEBUG] Torneos recibidos: {total}")
+
+        def _page(mapped):
+            if seq != self._load_seq:
+                return
+            if not self.torneos_data:
+                self.grid.clear_widgets()
+            self.torneos_data.extend(mapped)
+            for torneo in mapped:
+                self._add_torneo_card(torneo)
+
+        def _ok(_):
+            if seq == self._load_seq and not self.torneos_data:
+                self.populate_torneos()
+
+        def _err(e):
+            print(f"[ERROR] Exception en fetch_torneos: {e}")
+            self._show_error(f"No se pudo obtener torneos.\n{e}")
+
+        executor.submit(_task, priority=PRIORITY_LIST, on_result=_ok, on_error=_err, scope=scope)
 
     def _show_error(self, msg: str):
         """Muestra un popup con mensaje de error"""
@@ -550,12 +548,15 @@ class TorneosAnterioresScreen(Screen):
             return
 
         for torneo in self.torneos_data:
-            card = TorneoCard(
-                torneo_data=torneo,
-                on_delete=self.delete_torneo,
-                on_edit=self.edit_torneo
-            )
-            self.grid.add_widget(card)
+            self._add_torneo_card(torneo)
+
+    def _add_torneo_card(self, torneo):
+        card = TorneoCard(
+            torneo_data=torneo,
+            on_delete=self.delete_torneo,
+            on_edit=self.edit_torneo
+        )
+        self.grid.add_widget(card)
 
     def build_ui(self):
         self.clear_widgets()
@@ -697,7 +698,7 @@ class TorneosAnterioresScreen(Screen):
                     self.fetch_torneos()
                 Clock.schedule_once(_err, 0)
 
-        Thread(target=_task, daemon=True).start()
+        executor.submit(_task, priority=PRIORITY_NORMAL)
 
     def edit_torneo(self, torneo_original, nuevos_datos):
         """
@@ -715,18 +716,14 @@ class TorneosAnterioresScreen(Screen):
         self.rect.pos = self.layout.pos
         self.rect.size = self.layout.size
 
-    def on_window_resize(self, instance, width, height):
-        Clock.schedule_once(lambda dt: self.rebuild_ui(), 0.1)
-    
-    def rebuild_ui(self):
-        # Actualizar número de columnas
+    def reflow_layout(self):
+        """Lo que build_ui calcula a mano; el resto (tarjetas incluidas) lo actualiza ResponsiveLayout"""
         self.grid.cols = self.calculate_columns()
-        self.grid.spacing = ResponsiveHelper.get_grid_spacing()
-        self.grid.padding = ResponsiveHelper.get_grid_padding()
         self.grid.row_default_height = ResponsiveHelper.get_card_height() + dp(10)
-        
-        # Reconstruir UI completa para ajustar tamaños
-        self.build_ui()
+        self.header.height = dp(100) if Window.width >= 600 else dp(80)
+        self.footer.height = dp(80) if Window.width >= 600 else dp(70)
+        btn_width = 0.3 if Window.width >= 900 else (0.5 if Window.width >= 600 else 0.7)
+        self.btn_volver.size_hint = (btn_width, 1)
 
 
 # ------------------ APLICACIÓN ------------------
@@ -0,0 +1,326 @@
+"""
+Grabación y reproducción del tráfico con el backend.
+
+Grabar: cada petición/respuesta de ApiClient y cada frame de websocket del
+tablero se agrega a un archivo JSONL con su marca de tiempo.
+Reproducir: ReplayAdapter sirve esas respuestas en orden (mismo método y ruta)
+y ReplayWebSocket reemite los frames, a la velocidad original o acelerada,
+sin necesidad de backend.
+"""
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from api_client import PooledAdapter
+from app_log import get_logger
+
+
+log = get_logger("Replay")
+
+# Cabeceras de respuesta que vale la pena conservar (el cuerpo se guarda ya descomprimido)
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+# Claves JSON cuyo valor nunca se escribe en la grabación (comparación sin mayúsculas)
+SENSITIVE_KEYS = frozenset(("password", "contrasena", "contraseña", "token", "accesstoken", "refreshtoken"))
+REDACTED = "<omitido>"
+
+_recorder = None
+_replay = None
+
+
+def _path_of(url):
+    """Ruta + query, sin esquema ni host: la grabación sirve para cualquier servidor."""
+    parts = urlsplit(url)
+    return parts.path + (f"?{parts.query}" if parts.query else "")
+
+
+def _text(body):
+    if body is None:
+        return None
+    if isinstance(body, bytes):
+        return body.decode("utf-8", errors="replace")
+    return str(body)
+
+
+def _scrub(value):
+    if isinstance(value, dict):
+        return {
+            k: REDACTED if k.lower() in SENSITIVE_KEYS else _scrub(v)
+            for k, v in value.items()
+        }
+    if isinstance(value, list):
+        return [_scrub(v) for v in value]
+    return value
+
+
+def _redacted(body):
+    """
+    Texto del cuerpo sin credenciales: en un JSON se reemplaza el valor de
+    las claves de SENSITIVE_KEYS conservando la estructura, para que la
+    reproducción siga funcionando. Lo que no es JSON se guarda tal cual.
+    """
+    text = _text(body)
+    if not text:
+        return text
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return text
+    scrubbed = _scrub(data)
+    return text if scrubbed == data else json.dumps(scrubbed, ensure_ascii=False)
+
+
+class TrafficRecorder:
+    """Escribe el tráfico en JSONL; t = segundos desde que empezó la grabación."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._t0 = time.monotonic()
+        self._file = open(path, "w", encoding="utf-8")
+        self._write({"type": "meta", "recorded_at": time.time()})
+
+    def _write(self, record):
+        record["t"] = round(time.monotonic() - self._t0, 6)
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            if self._file is not None:
+                self._file.write(line + "\n")
+                self._file.flush()
+
+    def record_http(self, request, response, elapsed):
+        path = _path_of(request.url)
+        self._write({
+            "type": "http",
+            "method": request.method,
+            "path": path,
+            # Las credenciales del login no se guardan; del resto se quitan
+            # contraseñas y tokens (p. ej. el accessToken de la respuesta del login)
+            "request_body": REDACTED if "/auth/" in path else _redacted(request.body),
+            "status": response.status_code,
+            "elapsed": round(elapsed, 6),
+            "headers": {k: response.headers[k] for k in KEPT_HEADERS if k in response.headers},
+            "body": _redacted(response.content),
+        })
+
+    def record_ws(self, url, event, data=None):
+        self._write({"type": "ws", "channel": _path_of(url), "event": event, "data": _redacted(data)})
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class Recording:
+    """Grabación cargada en memoria, lista para reproducirse."""
+
+    def __init__(self, path):
+        self.path = path
+        self._http = defaultdict(deque)
+        self._ws = defaultdict(deque)  # canal -> sesiones (listas de frames)
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        opened = {}
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                if record.get("type") == "http":
+                    self._http[(record["method"], record["path"])].append(record)
+                elif record.get("type") == "ws":
+                    channel = record["channel"]
+                    if record["event"] == "open":
+                        opened[channel] = record["t"]
+                        self._ws[channel].append([])
+                    elif record["event"] == "message" and channel in opened:
+                        frame = dict(record, offset=record["t"] - opened[channel])
+                        self._ws[channel][-1].append(frame)
+
+    def next_http(self, method, path):
+        """
+        Siguiente respuesta grabada para (método, ruta), en orden. La última
+        se repite para que los sondeos que se hagan de más sigan funcionando.
+        """
+        with self._lock:
+            entries = self._http.get((method, path))
+            if not entries:
+                return None
+            return entries.popleft() if len(entries) > 1 else entries[0]
+
+    def next_ws_session(self, channel):
+        with self._lock:
+            sessions = self._ws.get(channel)
+            if not sessions:
+                return []
+            return sessions.popleft() if len(sessions) > 1 else sessions[0]
+
+
+def _build_response(request, status, headers, body: bytes, elapsed=0.0):
+    response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = body
+    response._content_consumed = True
+    response.raw = None
+    response.url = request.url
+    response.request = request
+    response.reason = "Replay"
+    response.encoding = "utf-8"
+    response.elapsed = timedelta(seconds=elapsed)
+    return response
+
+
+class ReplayAdapter(PooledAdapter):
+    """
+    Adaptador que responde con la grabación en lugar de ir a la red.
+    Conserva breaker, métricas y conteo de bytes de PooledAdapter.
+    speed: 1 = latencias originales, 10 = diez veces más rápido, 0 = sin espera.
+    """
+
+    def __init__(self, recording: Recording, speed=1.0, **kwargs):
+        super().__init__(**kwargs)
+        self.recording = recording
+        self.speed = speed
+        self.unmatched = 0
+
+    def _transport_send(self, request, **kwargs):
+        entry = self.recording.next_http(request.method, _path_of(request.url))
+        if entry is None:
+            self.unmatched += 1
+            log.warning("Sin grabación para %s %s", request.method, _path_of(request.url))
+            response = _build_response(request, 404, {"Content-Type": "application/json"},
+                                       b'{"error": "no grabado"}')
+        else:
+            if self.speed:
+                time.sleep(entry["elapsed"] / self.speed)
+            body = (entry.get("body") or "").encode("utf-8")
+            response = _build_response(request, entry["status"], entry.get("headers", {}),
+                                       body, entry["elapsed"])
+        response.connection_reused = True
+        return response
+
+
+class _ReplaySocket:
+    def __init__(self):
+        self.connected = False
+
+
+class ReplayWebSocket:
+    """
+    Sustituto de websocket.WebSocketApp que reemite los frames grabados
+    de un canal respetando sus tiempos relativos a la apertura.
+    """
+
+    def __init__(self, url, frames, speed=1.0, on_open=None, on_message=None,
+                 on_error=None, on_close=None):
+        self.url = url
+        self.frames = frames
+        self.speed = speed
+        self.on_open = on_open
+        self.on_message = on_message
+        self.on_error = on_error
+        self.on_close = on_close
+        self.sock = _ReplaySocket()
+        self._closed = threading.Event()
+
+    def run_forever(self, **kwargs):
+        self.sock.connected = True
+        if self.on_open:
+            self.on_open(self)
+        started = time.monotonic()
+        for frame in self.frames:
+            if self.speed:
+                wait = frame["offset"] / self.speed - (time.monotonic() - started)
+                if wait > 0 and self._closed.wait(wait):
+                    break
+            if self._closed.is_set():
+                break
+            if self.on_message:
+                self.on_message(self, frame["data"])
+        # Como un socket real, sigue abierto hasta que lo cierren
+        self._closed.wait()
+        self.sock.connected = False
+        if self.on_close:
+            self.on_close(self, 1000, "replay")
+        return False
+
+    def send(self, data, *args, **kwargs):
+        pass
+
+    def close(self, **kwargs):
+        self._closed.set()
+
+
+def start_recording(client, path) -> TrafficRecorder:
+    """Empieza a grabar todo el tráfico de client (y de los websockets) en path."""
+    global _recorder
+    stop_recording(client)
+    _recorder = TrafficRecorder(path)
+    client.adapter.recorder = _recorder
+    log.info("Grabando tráfico en %s", path)
+    return _recorder
+
+
+def stop_recording(client):
+    global _recorder
+    if _recorder is not None:
+        client.adapter.recorder = None
+        _recorder.close()
+        _recorder = None
+
+
+def start_replay(client, path, speed=1.0) -> ReplayAdapter:
+    """Hace que client responda con la grabación de path en lugar del backend."""
+    global _replay
+    recording = Recording(path)
+    adapter = ReplayAdapter(recording, speed=speed, breakers=client.breakers)
+    client.adapter = adapter
+    client.session.mount("http://", adapter)
+    client.session.mount("https://", adapter)
+    _replay = (recording, speed)
+    log.info("Reproduciendo %s a velocidad x%s", path, speed or '∞')
+    return adapter
+
+
+def websocket_app(url, on_open=None, on_message=None, on_error=None, on_close=None):
+    """
+    Crea el cliente websocket del tablero: el real, el de reproducción si hay
+    una grabación cargada, y en modo grabación registra cada frame recibido.
+    """
+    if _replay is not None:
+        recording, speed = _replay
+        return ReplayWebSocket(
+            url, recording.next_ws_session(_path_of(url)), speed=speed,
+            on_open=on_open, on_message=on_message, on_error=on_error, on_close=on_close
+        )
+
+    recorder = _recorder
+    if recorder is not None:
+        on_open = _recording(recorder, url, "open", on_open)
+        on_message = _recording(recorder, url, "message", on_message)
+        on_close = _recording(recorder, url, "close", on_close)
+
+    import websocket
+    return websocket.WebSocketApp(
+        url, on_open=on_open, on_message=on_message, on_error=on_error, on_close=on_close
+    )
+
+
+def _recording(recorder, url, event, callback):
+    def wrapper(ws, *args):
+        recorder.record_ws(url, event, args[0] if event == "message" else None)
+        if callback:
+            return callback(ws, *args)
+    return wrapper
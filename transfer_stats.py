@@ -0,0 +1,50 @@
+import re
+import threading
+from urllib.parse import urlsplit
+
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_key(url: str) -> str:
+    """
+    Agrupa URLs por endpoint: quita host y query y cambia los ids numéricos
+    por {id} (/apiCombates/combate/15 -> /apiCombates/combate/{id}).
+    """
+    return _ID_SEGMENT.sub("/{id}", urlsplit(url).path) or "/"
+
+
+class TransferStats:
+    """Bytes recibidos por endpoint: en la red (comprimidos) y ya decodificados."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def record(self, url, wire_bytes, decoded_bytes, encoding=None):
+        key = endpoint_key(url)
+        with self._lock:
+            entry = self._endpoints.setdefault(key, {
+                "responses": 0,
+                "compressed": 0,
+                "wire_bytes": 0,
+                "decoded_bytes": 0,
+            })
+            entry["responses"] += 1
+            entry["wire_bytes"] += wire_bytes
+            entry["decoded_bytes"] += decoded_bytes
+            if encoding and encoding != "identity":
+                entry["compressed"] += 1
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+    def stats(self) -> dict:
+        """{endpoint: {responses, compressed, wire_bytes, decoded_bytes, ratio}}"""
+        with self._lock:
+            result = {}
+            for key, entry in self._endpoints.items():
+                decoded = entry["decoded_bytes"]
+                result[key] = dict(entry, ratio=(entry["wire_bytes"] / decoded) if decoded else 1.0)
+            return result
@@ -0,0 +1,134 @@
+"""
+Bus de actualizaciones de UI sincronizado con los frames de Kivy.
+
+Los hilos de fondo (websocket, executor, cola de mutaciones) no tocan
+widgets: publican aquí y el hilo principal aplica todo lo pendiente en un
+solo lote por frame. Las actualizaciones con clave se coalescen: si llegan
+diez score_update del mismo panel en un frame, solo se aplica el último.
+
+    ui_bus.post(self.mostrar_popup_incidencia)                 # en orden, una vez
+    ui_bus.post_latest(("score", self), self.set_api_score, 7)  # gana el último
+
+    @ui_thread                # como @mainthread, pero por el bus
+    @ui_latest                # además coalesce por (método, self)
+"""
+import functools
+import time
+from collections import deque
+
+from kivy.clock import Clock
+
+from app_log import get_logger
+
+
+log = get_logger("UiBus")
+
+
+class UiBus:
+    """
+    Cola sin locks: los productores solo hacen deque.append (atómico en
+    CPython) y nunca esperan al hilo principal. Se drena una vez por frame
+    con un trigger de Clock; la coalescencia se decide al drenar, en el hilo
+    principal: de cada clave se aplica solo la última entrada del lote, en su
+    posición, para no alterar el orden frente al resto de actualizaciones.
+    """
+
+    def __init__(self):
+        self._queue = deque()       # (clave o None, fn, args, kwargs)
+        self._triggered = False
+        self._trigger = None
+        self.posted = 0
+        self.coalesced = 0
+        self.applied = 0
+        self.frames = 0
+        self.errors = 0
+        self.max_batch = 0
+        self.max_drain_ms = 0.0
+
+    def post(self, fn, *args, **kwargs):
+        """Aplica fn(*args, **kwargs) en el hilo principal, en orden de llegada."""
+        self._queue.append((None, fn, args, kwargs))
+        self.posted += 1
+        self._schedule()
+
+    def post_latest(self, key, fn, *args, **kwargs):
+        """Como post, pero dentro de un mismo frame solo se aplica la última con esa clave."""
+        self._queue.append((key, fn, args, kwargs))
+        self.posted += 1
+        self._schedule()
+
+    def _schedule(self):
+        if self._triggered:
+            return
+        self._triggered = True
+        if self._trigger is None:
+            self._trigger = Clock.create_trigger(self._drain, 0)
+        self._trigger()
+
+    def _drain(self, dt=None):
+        """Aplica lo que había al empezar el frame; lo que se publique mientras, va al siguiente."""
+        # Antes de vaciar: lo que llegue desde aquí vuelve a disparar el trigger
+        self._triggered = False
+        started = time.perf_counter()
+        batch = [self._queue.popleft() for _ in range(len(self._queue))]
+
+        last = {}
+        for i, (key, _, _, _) in enumerate(batch):
+            if key is not None:
+                last[key] = i
+
+        applied = 0
+        for i, (key, fn, args, kwargs) in enumerate(batch):
+            if key is not None and last[key] != i:
+                self.coalesced += 1
+                continue
+            try:
+                fn(*args, **kwargs)
+            except Exception as e:
+                self.errors += 1
+                log.error("Error aplicando %s: %r", getattr(fn, "__qualname__", fn), e)
+            applied += 1
+
+        self.frames += 1
+        self.applied += applied
+        self.max_batch = max(self.max_batch, applied)
+        self.max_drain_ms = max(self.max_drain_ms, (time.perf_counter() - started) * 1000)
+
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def stats(self) -> dict:
+        return {
+            "posted": self.posted,
+            "coalesced": self.coalesced,
+            "applied": self.applied,
+            "frames": self.frames,
+            "errors": self.errors,
+            "max_batch": self.max_batch,
+            "max_drain_ms": self.max_drain_ms,
+            "pending": self.pending(),
+        }
+
+
+# Instancia global del bus
+ui_bus = UiBus()
+
+
+def ui_thread(fn):
+    """Reemplazo de @mainthread: la llamada se aplica en el lote del siguiente frame."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        ui_bus.post(fn, *args, **kwargs)
+    return wrapper
+
+
+def ui_latest(fn):
+    """
+    Como ui_thread, pero varias llamadas al mismo método del mismo objeto
+    dentro de un frame se reducen a la última (útil para etiquetas y contadores).
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = (fn, args[0]) if args else fn
+        ui_bus.post_latest(key, fn, *args, **kwargs)
+    return wrapper
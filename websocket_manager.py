@@ -0,0 +1,345 @@
+"""
+Conexión websocket única por canal con máquina de estados explícita.
+
+    idle -> connecting -> open -> draining -> closed
+                 ^         |
+                 +---------+   (caída: reintento con espera creciente,
+                                hasta WEBSOCKET_MAX_RECONNECTS seguidos)
+
+start() no hace nada si ya hay una conexión viva o en curso, así que cada
+combate tiene a lo sumo un socket abierto. El hilo de run_forever es el
+único que decide reconectar, al terminar; los callbacks de una conexión
+vieja se ignoran por número de generación.
+"""
+import json
+import threading
+import time
+from urllib.parse import urlsplit
+
+from config import (
+    API_BASE_URL, WEBSOCKET_PORT, WEBSOCKET_RECONNECT_DELAY,
+    WEBSOCKET_MAX_RECONNECTS, WEBSOCKET_MAX_RECONNECT_DELAY, WEBSOCKET_KEEPALIVE_INTERVAL,
+    WEBSOCKET_RESUME_MAX_GAP,
+)
+from app_log import get_logger
+import traffic_replay
+
+
+log = get_logger("WebSocket")
+
+IDLE = "idle"
+CONNECTING = "connecting"
+OPEN = "open"
+DRAINING = "draining"
+CLOSED = "closed"
+
+# Un canal -> el manager que lo tiene abierto
+_active = {}
+_active_lock = threading.Lock()
+
+
+def tablero_url(combate_id) -> str:
+    """ws://<host del backend>:<WEBSOCKET_PORT>/ws/tablero/{combateId}"""
+    host = urlsplit(API_BASE_URL).hostname or "localhost"
+    return f"ws://{host}:{WEBSOCKET_PORT}/ws/tablero/{combate_id}"
+
+
+class WebSocketManager:
+    """
+    Dueño de la única conexión a url. on_message(texto) se llama desde el
+    hilo del socket; on_state(estado) en cada transición.
+    """
+
+    def __init__(self, url, on_message, on_state=None,
+                 max_reconnects=WEBSOCKET_MAX_RECONNECTS,
+                 reconnect_delay=WEBSOCKET_RECONNECT_DELAY,
+                 max_reconnect_delay=WEBSOCKET_MAX_RECONNECT_DELAY,
+                 keepalive_interval=WEBSOCKET_KEEPALIVE_INTERVAL):
+        self.url = url
+        self.on_message = on_message
+        self.on_state = on_state
+        self.max_reconnects = max_reconnects
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.keepalive_interval = keepalive_interval
+
+        self.state = IDLE
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._app = None
+        self._stop = threading.Event()   # despierta esperas de reconexión y keepalive
+        self._attempt = 0                 # reconexiones seguidas sin llegar a open
+        self._connection = 0              # id del socket actual (cambia en cada reintento)
+
+        self.connects = 0
+        self.reconnects = 0
+        self.failures = 0
+        self.messages = 0
+        self.bytes_received = 0
+        self.opened_at = None
+        self.open_seconds = 0.0
+        self.last_error = None
+        self.last_message_at = None
+
+    # ------------------------------------------------------------------ API
+
+    def start(self):
+        """Abre la conexión si no hay una viva o en curso."""
+        with self._lock:
+            if self.state in (CONNECTING, OPEN):
+                return
+            self._stop.clear()
+            self._attempt = 0
+            self._transition(CONNECTING)
+            generation = self._generation = self._generation + 1
+
+        with _active_lock:
+            previous = _active.get(self.url)
+            _active[self.url] = self
+        if previous is not None and previous is not self:
+            # Otro manager tenía el mismo canal: se cierra para no duplicar el fan-out
+            previous.stop()
+
+        threading.Thread(
+            target=self._run, args=(generation,), name=f"ws-{self.url}", daemon=True
+        ).start()
+
+    def stop(self):
+        """Cierra la conexión y no vuelve a reconectar."""
+        with self._lock:
+            if self.state in (IDLE, CLOSED, DRAINING):
+                if self.state == IDLE:
+                    self._transition(CLOSED)
+                return
+            app = self._app
+            self._transition(DRAINING if app is not None else CLOSED)
+            self._stop.set()
+        with _active_lock:
+            if _active.get(self.url) is self:
+                del _active[self.url]
+        if app is not None:
+            try:
+                app.close()
+            except Exception as e:
+                log.warning("Error al cerrar: %s", e)
+
+    def send(self, text) -> bool:
+        app = self._app
+        if self.state != OPEN or app is None:
+            return False
+        try:
+            app.send(text)
+            return True
+        except Exception as e:
+            log.warning("Error enviando: %s", e)
+            return False
+
+    def is_open(self) -> bool:
+        return self.state == OPEN
+
+    def stats(self) -> dict:
+        with self._lock:
+            open_seconds = self.open_seconds
+            if self.state == OPEN and self.opened_at is not None:
+                open_seconds += time.monotonic() - self.opened_at
+            return {
+                "url": self.url,
+                "state": self.state,
+                "connects": self.connects,
+                "reconnects": self.reconnects,
+                "failures": self.failures,
+                "messages": self.messages,
+                "bytes_received": self.bytes_received,
+                "open_seconds": open_seconds,
+                "last_error": self.last_error,
+                "last_message_at": self.last_message_at,
+            }
+
+    # ------------------------------------------------------------------ internos
+
+    def _transition(self, state):
+        # Se llama con self._lock tomado
+        if state == self.state:
+            return
+        if self.state == OPEN and self.opened_at is not None:
+            self.open_seconds += time.monotonic() - self.opened_at
+            self.opened_at = None
+        log.info("%s: %s -> %s", self.url, self.state, state)
+        self.state = state
+        if self.on_state:
+            try:
+                self.on_state(state)
+            except Exception as e:
+                log.warning("Error en on_state: %s", e)
+
+    def _run(self, generation):
+        """Hilo de la conexión: conecta, atiende y, si se cae sin stop(), reintenta."""
+        while True:
+            with self._lock:
+                self._connection += 1
+                connection = self._connection
+            app = traffic_replay.websocket_app(
+                self.url,
+                on_open=lambda ws: self._on_open(generation, connection),
+                on_message=lambda ws, message: self._on_message(generation, message),
+                on_error=lambda ws, error: self._on_error(generation, error),
+                on_close=lambda ws, code, msg: log.info("Conexión cerrada: %s - %s", code, msg),
+            )
+            with self._lock:
+                if generation != self._generation or self._stop.is_set():
+                    return
+                self._app = app
+                self.connects += 1
+            try:
+                app.run_forever()
+            except Exception as e:
+                self._on_error(generation, e)
+
+            with self._lock:
+                self._app = None
+                if generation != self._generation:
+                    return
+                if self._stop.is_set():
+                    self._transition(CLOSED)
+                    return
+                self._attempt += 1
+                self.failures += 1
+                if self._attempt > self.max_reconnects:
+                    log.warning("%s: sin conexión tras %s reintentos, se deja de intentar",
+                                self.url, self.max_reconnects)
+                    self._transition(CLOSED)
+                    with _active_lock:
+                        if _active.get(self.url) is self:
+                            del _active[self.url]
+                    return
+                delay = min(self.max_reconnect_delay,
+                            self.reconnect_delay * 2 ** (self._attempt - 1))
+                self._transition(CONNECTING)
+            log.info("Reintento %s/%s en %.1fs", self._attempt, self.max_reconnects, delay)
+            if self._stop.wait(delay):
+                with self._lock:
+                    if generation == self._generation:
+                        self._transition(CLOSED)
+                return
+            with self._lock:
+                self.reconnects += 1
+
+    def _on_open(self, generation, connection):
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._attempt = 0
+            self.opened_at = time.monotonic()
+            self._transition(OPEN)
+        if self.keepalive_interval:
+            threading.Thread(
+                target=self._keepalive, args=(connection,), name="ws-keepalive", daemon=True
+            ).start()
+
+    def _on_message(self, generation, message):
+        if generation != self._generation:
+            return
+        self.messages += 1
+        self.bytes_received += len(message)
+        self.last_message_at = time.time()
+        self.on_message(message)
+
+    def _on_error(self, generation, error):
+        if generation == self._generation:
+            self.last_error = str(error)
+            log.warning("Error: %s", error)
+
+    def _keepalive(self, connection):
+        """Envía 'ping' cada keepalive_interval mientras siga abierto este socket."""
+        while not self._stop.wait(self.keepalive_interval):
+            if connection != self._connection or self.state != OPEN:
+                return
+            if self.send("ping"):
+                log.debug("Keepalive ping enviado")
+
+
+# Qué hacer con un evento o un saludo según su seq
+APPLY = "apply"
+DUPLICATE = "duplicate"
+GAP = "gap"
+RESUME = "resume"
+SNAPSHOT = "snapshot"
+UP_TO_DATE = "up_to_date"
+
+
+class SequenceTracker:
+    """
+    Último seq aplicado de un canal. Al reconectar decide si basta con pedir
+    los eventos perdidos (resume) o hay que recargar el marcador por REST
+    (snapshot): primera conexión, servidor sin seq, servidor reiniciado o
+    hueco mayor que max_gap. Descarta eventos repetidos y detecta huecos.
+    """
+
+    def __init__(self, max_gap=WEBSOCKET_RESUME_MAX_GAP):
+        self.max_gap = max_gap
+        self.last = None
+        self.resuming = False
+        self.resumes = 0
+        self.snapshots = 0
+        self.duplicates = 0
+        self.gaps = 0
+
+    def on_connected(self, server_seq) -> str:
+        if server_seq is None:
+            # Servidor sin soporte de seq: comportamiento anterior
+            self.last = None
+            self.snapshots += 1
+            return SNAPSHOT
+        if self.last is None or server_seq < self.last or server_seq - self.last > self.max_gap:
+            self.last = server_seq
+            self.resuming = False
+            self.snapshots += 1
+            return SNAPSHOT
+        if server_seq == self.last:
+            self.resuming = False
+            return UP_TO_DATE
+        return RESUME
+
+    def accept(self, seq) -> str:
+        if seq is None or self.last is None:
+            if seq is not None:
+                self.last = seq
+            return APPLY
+        if seq <= self.last:
+            self.duplicates += 1
+            return DUPLICATE
+        if seq == self.last + 1:
+            self.last = seq
+            return APPLY
+        # Falta algo entre medias: el resume lo vuelve a mandar en orden
+        self.gaps += 1
+        return GAP
+
+    def resume_message(self) -> str:
+        self.resuming = True
+        self.resumes += 1
+        return json.dumps({"action": "resume", "lastSeq": self.last})
+
+    def on_resumed(self, server_seq=None):
+        self.resuming = False
+
+    def on_resume_failed(self, server_seq):
+        self.last = server_seq
+        self.resuming = False
+        self.snapshots += 1
+
+    def stats(self) -> dict:
+        return {
+            "last_seq": self.last,
+            "resumes": self.resumes,
+            "snapshots": self.snapshots,
+            "duplicates": self.duplicates,
+            "gaps": self.gaps,
+        }
+
+
+def active_connections() -> dict:
+    """{url: stats} de las conexiones vivas o en curso."""
+    with _active_lock:
+        managers = list(_active.values())
+    return {m.url: m.stats() for m in managers}